@@ -1,24 +1,61 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import hashlib
 import json
+import os
+import tempfile
 import time
 from datetime import datetime, timedelta
 import pytz
 import uuid
-from fpdf import FPDF
-import urllib.parse
-import requests
-import extra_streamlit_components as stx
 import calendar
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.errors import StreamlitAPIException
+from sheet_mirror import SheetMirror, CachePolicy, MIRROR_DB_PATH
+from single_flight import SingleFlight
+from sheet_gateway import GatewayHTTPClient, QUOTA
+from sheet_connect import connect
+from fake_sheets import fake_bootstrap
+from frame_snapshots import SnapshotStore, SNAPSHOT_DIR
+from rerun_profiler import PROFILER
+from session_bootstrap import SessionCookies, wait_for_cookies, flash, show_flashes
+from sheet_writes import WriteBatch, RowLocator, appended_row, move_rows
+from telegram_outbox import TelegramOutbox
+from order_lines import parse_order_lines, format_order_details, lines_of, order_items, orders_with_item, total_units
+from rent_ledger import CheckpointStore, CHECKPOINT_PATH, build_ledger, checkpointed_ledger
+from translations import LANG
+from app_pages import run_page
 
 # --- CONFIGURATION ---
 SHEET_NAME = "Tally Live Stock"
 IST = pytz.timezone('Asia/Kolkata')
+ARCHIVE_CHUNK_SIZE = 50  # orders moved per atomic archive request
+WARMUP_WORKERS = 4       # threads used to pre-load the sheet caches after login
+
+# 🟢 STALE-WHILE-REVALIDATE (seconds): past soft_ttl the tab refreshes in the background, past hard_ttl
+# it counts as expired, and expired data is still shown for up to max_stale more while it revalidates
+CACHE_POLICIES = {
+    "Stock":  CachePolicy(soft_ttl=30, hard_ttl=60, max_stale=600),
+    "Orders": CachePolicy(soft_ttl=30, hard_ttl=60, max_stale=180),
+}
+
+# 🟢 VERSION PROBES: tiny range read before a full download; the tab is only re-downloaded when it changes
+# (Tally writes "Last Updated: ..." into the Stock header row on every sync)
+VERSION_PROBES = {"Stock": "1:1"}
+
+# 🔒 NEVER ON DISK: tabs kept out of sheet_mirror.db and snapshots/ (the two files that hold copies of sheet
+# data) -- Users has the login passwords in plain text, so it is read from Google and cached in memory only
+IN_MEMORY_ONLY_SHEETS = ("Users",)
+
+# 🟢 DELTA SYNC: tabs the app only ever appends to -- refreshes fetch just the new rows at the bottom,
+# plus one column of the whole tab (Amount / Quantity Found) to notice hand edits of older rows
+APPEND_ONLY_SHEETS = {"Rent Transactions": "E:E", "Audit Logs": "D:D"}
 
 st.set_page_config(page_title="Manglam Tradelink Portal", layout="wide", page_icon="🏭")
+PROFILER.begin() # ⏱️ Timing spans + Sheets requests of this rerun (Admin panel at the bottom of every page)
 # --- CUSTOM STYLE (PREMIUM SAAS UI) ---
 st.markdown("""
     <style>
@@ -119,59 +156,175 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 # --- GOOGLE SHEETS CONNECTION ---
+# Names of the 13 tabs, in the same order as get_gspread_client() returns them ("Stock" = the first tab)
+WORKSHEET_NAMES = ("Stock", "Orders", "Users", "Customers", "Audit Logs", "Master Items", "Tenants",
+                   "Rent Transactions", "Archived Orders", "Invoices", "Manglam Customers", "Manglam Stock", "Manglam Transporters")
+
+def sheets_setting(key, default=None):
+    """Backend config from the environment first, then st.secrets (which raises when no secrets file exists)."""
+    if key in os.environ:
+        return os.environ[key]
+    try:
+        return st.secrets.get(key, default)
+    except Exception:
+        return default
+
+# 🟢 SHEETS_BACKEND="fake" runs the portal on the in-memory fake_sheets backend (local dev / benchmarks)
+FAKE_BACKEND = str(sheets_setting("SHEETS_BACKEND", "google")).lower() == "fake"
+
+@st.cache_resource
+def get_sheets_bootstrap():
+    """ONE shared client + every tab of "Tally Live Stock" from a single metadata fetch -> (client, db, {title: worksheet})."""
+    if FAKE_BACKEND:
+        return fake_bootstrap(sheets_setting("SHEETS_FAKE_DATA"), sheets_setting("SHEETS_FAKE_LATENCY_MS", 0),
+                              sheets_setting("SHEETS_FAKE_ERROR_RATE", 0.0))
+    
+    creds_raw = st.secrets["GOOGLE_CREDENTIALS"]
+    
+    # 🟢 THE BULLETPROOF LOADER: strict=False forces Python to ignore line breaks!
+    if isinstance(creds_raw, str):
+        try:
+            creds_dict = json.loads(creds_raw, strict=False)
+        except Exception:
+            # If it still fails, forcefully fix the literal newlines
+            clean_raw = creds_raw.replace('\n', '\\n').replace('\r', '')
+            creds_dict = json.loads(clean_raw, strict=False)
+    else:
+        creds_dict = dict(creds_raw)
+    
+    # 🟢 Pooled keep-alive session, OAuth token cached on disk across restarts, rate-limited + 429 backoff for every call
+    return connect(creds_dict, "Tally Live Stock", http_client=GatewayHTTPClient, key=st.secrets.get("SPREADSHEET_KEY"))
+
 @st.cache_resource
 def get_gspread_client():
     try:
-        import json
-        creds_raw = st.secrets["GOOGLE_CREDENTIALS"]
-        
-        # 🟢 THE BULLETPROOF LOADER: strict=False forces Python to ignore line breaks!
-        if isinstance(creds_raw, str):
-            try:
-                creds_dict = json.loads(creds_raw, strict=False)
-            except Exception:
-                # If it still fails, forcefully fix the literal newlines
-                clean_raw = creds_raw.replace('\n', '\\n').replace('\r', '')
-                creds_dict = json.loads(clean_raw, strict=False)
-        else:
-            creds_dict = dict(creds_raw)
-            
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client = gspread.authorize(creds)
-        
-        db = client.open("Tally Live Stock")
-        
-        def safe_open(name):
-            try: return db.worksheet(name)
-            except: return None
-
-        return (
-            db.sheet1, # 🟢 THIS FIXES THE DASHBOARD: It automatically grabs your first tab!
-            safe_open("Orders"),
-            safe_open("Users"),
-            safe_open("Customers"),
-            safe_open("Audit Logs"),
-            safe_open("Master Items"),
-            safe_open("Tenants"),
-            safe_open("Rent Transactions"),
-            safe_open("Archived Orders"),
-            safe_open("Invoices"),
-            safe_open("Manglam Customers"),
-            safe_open("Manglam Stock"),
-            safe_open("Manglam Transporters")
-        )
+        client, db, tabs = get_sheets_bootstrap()
+        first_tab = next(iter(tabs.values()), None) # 🟢 THIS FIXES THE DASHBOARD: It automatically grabs your first tab!
+        return (first_tab,) + tuple(tabs.get(name) for name in WORKSHEET_NAMES[1:])
     except Exception as e:
         st.error(f"Failed to connect to Google Sheets: {e}")
         return [None]*13
 
-stock_sheet, orders_sheet, users_sheet, cust_sheet, audit_sheet, master_sheet, tenants_sheet, rent_tx_sheet, archive_sheet, invoices_sheet, manglam_cust_sheet, manglam_stock_sheet, manglam_trans_sheet = get_gspread_client()
+with PROFILER.span("sheets bootstrap"):
+    stock_sheet, orders_sheet, users_sheet, cust_sheet, audit_sheet, master_sheet, tenants_sheet, rent_tx_sheet, archive_sheet, invoices_sheet, manglam_cust_sheet, manglam_stock_sheet, manglam_trans_sheet = ALL_SHEETS = get_gspread_client()
+SHEETS_BY_NAME = dict(zip(WORKSHEET_NAMES, ALL_SHEETS))
+
+# 🟢 SINGLE-FLIGHT: one process-wide registry so concurrent cache misses share one Sheets fetch
+@st.cache_resource
+def get_single_flight():
+    return SingleFlight()
+
+sheet_flight = get_single_flight()
+
+# 🟢 LOCAL SQLITE MIRROR: one background thread syncs every tab; pages only read local tables
+@st.cache_resource
+def get_sheet_mirror(_sheets):
+    # Fake data never touches the real mirror file
+    mirrored = {name: ws for name, ws in _sheets.items() if name not in IN_MEMORY_ONLY_SHEETS}
+    mirror = SheetMirror(mirrored, db_path=":memory:" if FAKE_BACKEND else MIRROR_DB_PATH, policies=CACHE_POLICIES,
+                         flight=get_single_flight(), probes=VERSION_PROBES, append_only=APPEND_ONLY_SHEETS)
+    mirror.forget(*IN_MEMORY_ONLY_SHEETS) # Copies an older version of the app may have stored
+    return mirror.start()
+
+sheet_mirror = get_sheet_mirror(SHEETS_BY_NAME)
+
+def read_sheet_values(_sheet, sheet_name):
+    """All values of a tab (same shape as get_all_values), served from the local mirror."""
+    if sheet_mirror.has(sheet_name):
+        return sheet_mirror.values(sheet_name)
+    return sheet_flight.do(f"direct:{sheet_name}", _sheet.get_all_values)
+
+def values_to_frame(data, sheet_name=None):
+    """Split one tab's values (header + rows) into the DataFrame shape every cache below uses.
+
+    With sheet_name, also tags each row with its physical sheet row (`_Row`) and
+    stamps df.attrs['fetched_at'] for the row locators (and the mirror's data
+    version in df.attrs['version'] for the rent checkpoints).
+    """
+    if not data: return pd.DataFrame()
+    headers = [str(h).strip() for h in data[0]]
+    if len(data) == 1: return pd.DataFrame(columns=headers) # 🟢 Only headers, no data yet -> keep the headers!
+    df = pd.DataFrame(data[1:], columns=headers).replace("", None).dropna(how='all').fillna("")
+    if sheet_name:
+        df['_Row'] = df.index + 2 # 🟢 Physical sheet row (header = 1) so writes can skip .find()
+        df.attrs['fetched_at'] = sheet_mirror.last_synced(sheet_name) or time.time()
+        if sheet_mirror.has(sheet_name): df.attrs['version'] = sheet_mirror.version(sheet_name)
+    return df
+
+# 🟢 ON-DISK SNAPSHOTS: Arrow copy of every page-cache frame, served on cold start / when Sheets is unreachable
+@st.cache_resource
+def get_snapshot_store():
+    store = SnapshotStore(tempfile.mkdtemp(prefix="fake_snapshots_") if FAKE_BACKEND else SNAPSHOT_DIR)
+    for name in IN_MEMORY_ONLY_SHEETS: store.remove(name) # Written by an older version of the app
+    return store
+
+frame_snapshots = get_snapshot_store()
+
+# 📴 OUTAGE FALLBACKS: tabs a page was built from cached data for because Google couldn't be reached (process-wide)
+@st.cache_resource
+def get_cached_fallbacks():
+    return {}  # sheet name -> (when that data was saved / synced, served from a snapshot?)
+
+cached_fallbacks = get_cached_fallbacks()
+
+def load_frame(sheet_name, build):
+    """build() the tab's frame from the mirror and snapshot it to disk.
+
+    If the mirror would first have to wait for Google (cold start, long-expired data) the
+    memory-mapped snapshot is served instantly and the tab revalidates in the background;
+    if Google is unreachable and there is no local copy, the snapshot is the fallback.
+    """
+    if sheet_mirror.has(sheet_name) and sheet_mirror.blocking_reason(sheet_name) in ("empty", "expired"):
+        snap = frame_snapshots.load(sheet_name)
+        if snap is not None:
+            sheet_mirror.revalidate(sheet_name)
+            if sheet_name in sheet_mirror.errors(): cached_fallbacks[sheet_name] = (snap.attrs.get('snapshot_at'), True) # Its last sync failed too
+            return snap
+    try:
+        df = build()
+    except Exception:
+        snap = frame_snapshots.load(sheet_name)
+        if snap is None: raise
+        cached_fallbacks[sheet_name] = (snap.attrs.get('snapshot_at'), True)
+        return snap
+    if sheet_mirror.has(sheet_name) and sheet_name in sheet_mirror.errors():
+        cached_fallbacks[sheet_name] = (sheet_mirror.last_synced(sheet_name), False) # Built from the mirror's last good copy
+    else:
+        cached_fallbacks.pop(sheet_name, None)
+    if not df.empty and sheet_mirror.has(sheet_name) and sheet_name not in IN_MEMORY_ONLY_SHEETS:
+        frame_snapshots.save(sheet_name, df, sheet_mirror.version(sheet_name))
+    return df
+
+def drop_frame_caches(*sheet_names):
+    """Forget the page caches built from these tabs (next rerun rebuilds them from the mirror)."""
+    for name in sheet_names:
+        if name == "Stock": fetch_stock_cache.clear()
+        elif name == "Orders": fetch_orders_cache.clear()
+        elif name in ("Tenants", "Rent Transactions"): fetch_rent_cache.clear()
+        else: fetch_basic_records.clear()
+
+def invalidate_sheets(*sheet_names, appended=False):
+    """Call after writing to Sheets: re-sync those tabs on next read and drop their page caches.
+
+    Pass appended=True when the write only added rows, so append-only tabs keep syncing by delta.
+    """
+    sheet_mirror.invalidate(*sheet_names, appended=appended)
+    drop_frame_caches(*sheet_names)
+
+# 🟢 A background sync that changed a tab (SWR revalidation, snapshot boot) drops its stale page cache right away
+@st.cache_resource
+def register_mirror_listener(_mirror):
+    _mirror.listeners.append(lambda name: drop_frame_caches(name))
+    return True
+
+register_mirror_listener(sheet_mirror)
 
 
 
 # --- COOKIE MANAGER & SESSION STATE ---
-cookie_manager = stx.CookieManager(key="mt_cookie_manager")
-time.sleep(0.5)
+# 🟢 Cookies are read once per session (the iframe's reply triggers the next rerun -- no sleep needed)
+cookie_manager = SessionCookies(key="mt_cookie_manager")
+show_flashes()
 
 if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
@@ -180,8 +333,9 @@ if 'logged_in' not in st.session_state:
     st.session_state.role = ""
 
 if not st.session_state.logged_in:
-    all_cookies = cookie_manager.get_all()
-    c_auth = all_cookies.get("mt_auth")
+    if not cookie_manager.ready:
+        wait_for_cookies() # Stops this run until the browser sends its cookies (or a short timeout passes)
+    c_auth = cookie_manager.get("mt_auth")
     
     if c_auth:
         parts = str(c_auth).split("::")
@@ -190,53 +344,61 @@ if not st.session_state.logged_in:
             st.session_state.user_id = parts[0]
             st.session_state.user_name = parts[1]
             st.session_state.role = parts[2]
-            st.rerun()
 
 # ==========================================
 # 🟢 EARLY FUNCTION: Needed by the auth check below
 # ==========================================
+@PROFILER.profiled
 @st.cache_data(ttl=300)
 def fetch_basic_records(_sheet, sheet_name):
     """Aggressive 5-minute cache for static sheets like Users, Master Items, Tenants."""
+    PROFILER.cache_miss()
     try:
         if _sheet is None: return []
-        return _sheet.get_all_records()
+        def build():
+            data = read_sheet_values(_sheet, sheet_name)
+            if not data: return pd.DataFrame()
+            return pd.DataFrame(data[1:], columns=data[0])
+        df = load_frame(sheet_name, build)
+        headers = list(df.columns)
+        if len(set(headers)) != len(headers): return [] # get_all_records() refuses duplicate headers too
+        return [dict(zip(headers, gspread.utils.numericise_all(row))) for row in df.astype(str).values.tolist()]
     except Exception: return []
 
 # ==========================================
 # 🛑 INTERVAL AUTHENTICATION CHECK (THE "BOUNCER")
 # ==========================================
-if st.session_state.get('logged_in'):
-    now = datetime.now()
-    last_check = st.session_state.get('last_auth_check')
+with PROFILER.span("auth bouncer"):
+    if st.session_state.get('logged_in'):
+        now = datetime.now()
+        last_check = st.session_state.get('last_auth_check')
     
-    # Check if 5 minutes have passed OR if it's never been checked in this session
-    if last_check is None or (now - last_check).total_seconds() > 300:
-        try:
-            current_users_data = fetch_basic_records(users_sheet, "Users")
-            if current_users_data:
-                df_curr_users = pd.DataFrame(current_users_data)
-                df_curr_users.columns = df_curr_users.columns.astype(str).str.strip()
-                
-                if 'Status' in df_curr_users.columns:
-                    user_record = df_curr_users[df_curr_users['User ID'].astype(str).str.strip() == str(st.session_state.user_id).strip()]
-                    if not user_record.empty:
-                        current_status = str(user_record.iloc[0].get('Status', 'Active')).strip()
-                        if current_status == 'Revoked':
-                            st.session_state.logged_in = False
-                            st.session_state.user_id = ""
-                            st.session_state.user_name = ""
-                            st.session_state.role = ""
-                            st.session_state.last_auth_check = None
-                            cookie_manager.delete("mt_auth")
-                            st.error("🚫 Your access has been revoked by an Administrator.")
-                            time.sleep(3)
-                            st.rerun()
+        # Check if 5 minutes have passed OR if it's never been checked in this session
+        if last_check is None or (now - last_check).total_seconds() > 300:
+            try:
+                current_users_data = fetch_basic_records(users_sheet, "Users")
+                if current_users_data:
+                    df_curr_users = pd.DataFrame(current_users_data)
+                    df_curr_users.columns = df_curr_users.columns.astype(str).str.strip()
+                
+                    if 'Status' in df_curr_users.columns:
+                        user_record = df_curr_users[df_curr_users['User ID'].astype(str).str.strip() == str(st.session_state.user_id).strip()]
+                        if not user_record.empty:
+                            current_status = str(user_record.iloc[0].get('Status', 'Active')).strip()
+                            if current_status == 'Revoked':
+                                st.session_state.logged_in = False
+                                st.session_state.user_id = ""
+                                st.session_state.user_name = ""
+                                st.session_state.role = ""
+                                st.session_state.last_auth_check = None
+                                cookie_manager.delete("mt_auth")
+                                flash("🚫 Your access has been revoked by an Administrator.")
+                                st.rerun()
                             
-            # If not revoked, reset the 5-minute timer
-            st.session_state.last_auth_check = now
-        except Exception as e:
-            pass # Fail silently if Sheets API blips so we don't accidentally boot users
+                # If not revoked, reset the 5-minute timer
+                st.session_state.last_auth_check = now
+            except Exception as e:
+                pass # Fail silently if Sheets API blips so we don't accidentally boot users
 
 # ==========================================
 # 🌐 EARLY LANGUAGE INIT (so Login page can also be translated)
@@ -309,8 +471,7 @@ if not st.session_state.logged_in:
                             auth_string = f"{st.session_state.user_id}::{st.session_state.user_name}::{st.session_state.role}"
                             cookie_manager.set("mt_auth", auth_string, expires_at=expire_date)
                             
-                            st.success(_lt["welcome"].format(name=st.session_state.user_name))
-                            time.sleep(2)
+                            flash(_lt["welcome"].format(name=st.session_state.user_name), icon="✅")
                             st.rerun()
                     else:
                         st.error(_lt["invalid"])
@@ -320,16 +481,33 @@ if not st.session_state.logged_in:
 # ==========================================
 # MAIN APP & HELPER FUNCTIONS (3 MEMORY BANKS)
 # ==========================================
-@st.cache_data(ttl=60)
+def normalize_stock(df):
+    """🟢 THE FIX: Global Safety Net to prevent KeyErrors across all pages (runs once per fetch, inside the cache)."""
+    if not df.empty and 'Quantity' in df.columns and 'Item Name' in df.columns:
+        df['Quantity'] = pd.to_numeric(df['Quantity'], errors='coerce').fillna(0)
+        if 'Unit' not in df.columns: df['Unit'] = ''
+        df['Unit'] = df['Unit'].fillna('')
+        # Ensure missing units default to 'units' rather than blank
+        df['Unit'] = df['Unit'].replace('', 'units')
+        df['Item'] = df['Item Name']
+        if 'Group' not in df.columns: df['Group'] = 'Default'
+        df['Display Qty'] = df['Quantity'].map('{:,.0f}'.format) + " " + df['Unit']
+        return df
+    # If the sheet is empty or syncing, load a blank template so the app doesn't crash
+    return pd.DataFrame(columns=['Group', 'Item', 'Quantity', 'Unit', 'Display Qty'])
+
+@PROFILER.profiled
+@st.cache_data(ttl=CACHE_POLICIES["Stock"].soft_ttl) # Cheap miss: the mirror serves stale data while it revalidates
 def fetch_stock_cache(_sheet): 
+    PROFILER.cache_miss()
     try:
-        if _sheet is None: return pd.DataFrame()
-        data = _sheet.get_all_values()
-        if not data: return pd.DataFrame()
-        headers = [str(h).strip() for h in data[0]]
+        if _sheet is None: return normalize_stock(pd.DataFrame())
+        df = load_frame("Stock", lambda: values_to_frame(read_sheet_values(_sheet, "Stock")))
+        headers = list(df.columns)
         
-        # 🟢 FRESHNESS TRACKER (IST)
-        st.session_state.stock_last_synced = datetime.now(IST)
+        # 🟢 FRESHNESS TRACKER (IST) -- a snapshot served on boot reports when it was saved
+        snapshot_at = df.attrs.get('snapshot_at')
+        st.session_state.stock_last_synced = datetime.fromtimestamp(snapshot_at, IST) if snapshot_at else datetime.now(IST)
         
         # 🟢 TALLY SYNC TIMESTAMP — extract from last header column (e.g. "Last Updated: 2026-03-06 16:56:08")
         st.session_state.tally_last_synced = None
@@ -341,21 +519,17 @@ def fetch_stock_cache(_sheet):
                 except Exception:
                     pass
         
-        # 🟢 THE FIX: If there are only headers and no data yet, keep the headers!
-        if len(data) == 1: return pd.DataFrame(columns=headers)
-        df = pd.DataFrame(data[1:], columns=headers).replace("", None).dropna(how='all').fillna("")
-        return df
-    except: return pd.DataFrame()
+        return normalize_stock(df)
+    except: return normalize_stock(pd.DataFrame())
 
-@st.cache_data(ttl=60)
+@PROFILER.profiled
+@st.cache_data(ttl=CACHE_POLICIES["Orders"].soft_ttl)
 def fetch_orders_cache(_sheet): 
+    PROFILER.cache_miss()
     try:
         if _sheet is None: return pd.DataFrame()
-        data = _sheet.get_all_values()
-        if not data: return pd.DataFrame()
-        headers = [str(h).strip() for h in data[0]]
-        if len(data) == 1: return pd.DataFrame(columns=headers)
-        df = pd.DataFrame(data[1:], columns=headers).replace("", None).dropna(how='all').fillna("")
+        df = load_frame("Orders", lambda: values_to_frame(read_sheet_values(_sheet, "Orders"), "Orders"))
+        if df.empty: return df
         
         # 🟢 HIDE DUPLICATE TALLY ORDERS LINKED TO APP ORDERS
         if 'Notes' in df.columns and 'Order ID' in df.columns:
@@ -371,25 +545,96 @@ def fetch_orders_cache(_sheet):
         return df
     except: return pd.DataFrame()
 
+@PROFILER.profiled
 @st.cache_data(ttl=60)
 def fetch_rent_cache(_sheet, sheet_name): # 🟢 THE FIX: Added sheet_name so Streamlit doesn't mix them up!
+    PROFILER.cache_miss()
     try:
         if _sheet is None: return pd.DataFrame()
-        data = _sheet.get_all_values()
-        if not data: return pd.DataFrame()
-        headers = [str(h).strip() for h in data[0]]
-        if len(data) == 1: return pd.DataFrame(columns=headers)
-        df = pd.DataFrame(data[1:], columns=headers).replace("", None).dropna(how='all').fillna("")
-        return df
+        return load_frame(sheet_name, lambda: values_to_frame(read_sheet_values(_sheet, sheet_name), sheet_name))
     except: return pd.DataFrame()
     
 
+# 🟢 RENT LEDGER: balances + running balance in one vectorized pass (rent_ledger.py), rebuilt only when the tab changes
+@st.cache_resource
+def get_rent_checkpoints():
+    # Month-end closing balances per tenant; only the rows after the newest one are aggregated
+    path = os.path.join(tempfile.mkdtemp(prefix="fake_rent_"), CHECKPOINT_PATH) if FAKE_BACKEND else CHECKPOINT_PATH
+    return CheckpointStore(sheet_mirror, "Rent Transactions", path)
+
+@PROFILER.profiled
+@st.cache_data(max_entries=16, show_spinner=False)
+def fetch_rent_ledger(tx_version, _df_tx, optimistic_rows, month):
+    """Ledger of the Rent Transactions frame (+ this session's optimistic rows) for the current `month`."""
+    PROFILER.cache_miss()
+    version, _, sheet_rows = tx_version
+    store = get_rent_checkpoints() if sheet_mirror.has("Rent Transactions") else None
+    return checkpointed_ledger(_df_tx, store, version, month, sheet_rows)
+
+def frame_version(frame):
+    """Identifies a cached tab frame for derived caches: mirror data version, when it was built, rows."""
+    return (frame.attrs.get('version'), frame.attrs.get('fetched_at'), len(frame))
+
+# 🟢 ORDER LINES: "Order Details" strings split into one row per item once per Orders fetch (order_lines.py)
+@PROFILER.profiled
+@st.cache_data(max_entries=16, show_spinner=False)
+def fetch_order_lines(orders_version, _orders_df):
+    PROFILER.cache_miss()
+    return parse_order_lines(_orders_df)
+
 # fetch_basic_records is defined earlier (before the auth check) — see above
 
+# 🟢 ROW LOCATORS: Order ID / Tenant ID -> sheet row, shared by all sessions (replaces .find() before writes)
+@st.cache_resource
+def get_row_locator(sheet_name, _sheet):
+    # The mirror tells the locator when a cached row can be written without probing it first
+    mirror = sheet_mirror if sheet_mirror.has(sheet_name) else None
+    return RowLocator(_sheet, mirror=mirror, sheet_name=sheet_name) if _sheet is not None else None
+
+orders_locator = get_row_locator("Orders", orders_sheet)
+tenants_locator = get_row_locator("Tenants", tenants_sheet)
+
+# ==========================================
+# ⚡ SESSION WARM-UP: load every main tab into the caches in parallel (once per login)
+# ==========================================
+def warm_up_caches():
+    jobs = {
+        "Stock": lambda: fetch_stock_cache(stock_sheet),
+        "Orders": lambda: fetch_orders_cache(orders_sheet),
+        "Rent Transactions": lambda: fetch_rent_cache(rent_tx_sheet, "Rent Transactions"),
+        "Tenants": lambda: fetch_rent_cache(tenants_sheet, "Tenants"),
+        "Users": lambda: fetch_basic_records(users_sheet, "Users"),
+        "Master Items": lambda: fetch_basic_records(master_sheet, "Master Items"),
+        "Customers": lambda: fetch_basic_records(cust_sheet, "Customers"),
+    }
+    ctx = get_script_run_ctx() # Worker threads need the script context to use st.cache_data / session_state
+
+    def timed(job):
+        name, fn = job
+        add_script_run_ctx(threading.current_thread(), ctx)
+        t0 = time.perf_counter()
+        fn()
+        return name, round((time.perf_counter() - t0) * 1000, 1)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WARMUP_WORKERS, thread_name_prefix="cache-warmup") as pool:
+        per_sheet = dict(pool.map(timed, jobs.items()))
+    st.session_state.warmup_timings = {
+        "at": datetime.now(IST).strftime("%d-%b-%Y %I:%M:%S %p IST"),
+        "total_ms": round((time.perf_counter() - t0) * 1000, 1),
+        "per_sheet_ms": per_sheet,
+    }
+
+if st.session_state.get('logged_in') and 'warmup_timings' not in st.session_state:
+    with PROFILER.span("session warm-up"):
+        warm_up_caches()
+
 # 🟢 HINDI DATA MAP — Reads the "Hindi Map" sheet for data translation
+@PROFILER.profiled
 @st.cache_data(ttl=300)
 def fetch_hindi_map(_client_open_func):
     """Load the English→Hindi translation map from the 'Hindi Map' sheet tab."""
+    PROFILER.cache_miss()
     try:
         hindi_sheet = _client_open_func("Hindi Map")
         if hindi_sheet is None: return {}
@@ -403,23 +648,13 @@ def fetch_hindi_map(_client_open_func):
 _hindi_map = {}
 try:
     def _safe_open_hindi(name):
-        """Helper to open a worksheet by name for the Hindi Map."""
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        import json
-        creds_raw = st.secrets["GOOGLE_CREDENTIALS"]
-        if isinstance(creds_raw, str):
-            try: creds_dict = json.loads(creds_raw, strict=False)
-            except: creds_dict = json.loads(creds_raw.replace('\n', '\\n').replace('\r', ''), strict=False)
-        else: creds_dict = dict(creds_raw)
-        from oauth2client.service_account import ServiceAccountCredentials
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client = gspread.authorize(creds)
-        db = client.open("Tally Live Stock")
-        try: return db.worksheet(name)
-        except: return None
+        """Helper to open a worksheet by name for the Hindi Map (resolved by the shared bootstrap, no extra calls)."""
+        return get_sheets_bootstrap()[2].get(name)
     _hindi_map = fetch_hindi_map(_safe_open_hindi)
 except:
     _hindi_map = {}
+# Fingerprint of the map's contents: caches of translated markup take it as a key, so a map edit re-renders them
+hindi_map_version = hashlib.sha1(json.dumps(sorted(_hindi_map.items()), ensure_ascii=False).encode("utf-8")).hexdigest()[:12] if _hindi_map else ""
 
 def hindi(text):
     """Translate data value to Hindi if Hindi mode is ON and translation exists."""
@@ -440,6 +675,32 @@ def hindi_df_columns(dataframe, col_names):
     return display_df
 
 
+# 🧩 PARTIAL RERUNS: carts / forms are @st.fragment units inside the page scripts
+def rerun_fragment():
+    """st.rerun() of just the calling fragment (a full rerun if the fragment ran as part of the whole script)."""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+# ==========================================
+# 📨 TELEGRAM ALERTS (queued, sent by the outbox thread)
+# ==========================================
+@st.cache_resource
+def get_telegram_outbox():
+    token = sheets_setting("TELEGRAM_BOT_TOKEN")
+    return TelegramOutbox(token).start() if token else None
+
+def send_telegram(text):
+    """Queue a message for the TELEGRAM_CHAT_ID group; returns the outbox message id (None if Telegram isn't configured)."""
+    outbox = get_telegram_outbox()
+    chat_id = sheets_setting("TELEGRAM_CHAT_ID")
+    if outbox is None or not chat_id:
+        return None
+    return outbox.enqueue(chat_id, text)
+
+
 # 🟢 LOAD INVENTORY SAFELY
 # ==========================================
 # 🚨 MORNING PENDING ALERT CHECK
@@ -450,6 +711,8 @@ def check_morning_pending_alert():
         if now_ist.weekday() == 6: return # Sunday
         if now_ist.hour >= 11:
             today_str = now_ist.strftime("%Y-%m-%d")
+            if st.session_state.get('morning_alert_checked') == today_str: return # This session already checked today
+            st.session_state.morning_alert_checked = today_str
             import os
             alert_file = "last_morning_alert.txt"
             last_alert = ""
@@ -461,19 +724,13 @@ def check_morning_pending_alert():
                 if not orders_df.empty and 'Status' in orders_df.columns:
                     pending_df = orders_df[orders_df['Status'].isin(['Pending', 'Pending - Awaited Payment'])]
                     if not pending_df.empty:
-                        tg_token = st.secrets.get("TELEGRAM_BOT_TOKEN", None)
-                        tg_chat_id = st.secrets.get("TELEGRAM_CHAT_ID", None)
-                        if tg_token and tg_chat_id:
-                            import urllib.parse
-                            alert_text = "⏳ *MORNING PENDING ORDERS REPORT* ⏳\n\n"
-                            alert_text += f"You have {len(pending_df)} orders pending dispatch:\n\n"
-                            for _, ro in pending_df.iterrows():
-                                alert_text += f"🔸 🆔 {ro.get('Order ID')} | 👤 {hindi(str(ro.get('Customer Name')))}\n"
-                                
-                            alert_text += f"\n👉 Portal: https://manglam-tradelink.streamlit.app"
-                            encoded_text = urllib.parse.quote(alert_text)
-                            import requests
-                            requests.get(f"https://api.telegram.org/bot{tg_token}/sendMessage?chat_id={tg_chat_id}&text={encoded_text}", timeout=5)
+                        alert_text = "⏳ *MORNING PENDING ORDERS REPORT* ⏳\n\n"
+                        alert_text += f"You have {len(pending_df)} orders pending dispatch:\n\n"
+                        for _, ro in pending_df.iterrows():
+                            alert_text += f"🔸 🆔 {ro.get('Order ID')} | 👤 {hindi(str(ro.get('Customer Name')))}\n"
+                            
+                        alert_text += f"\n👉 Portal: https://manglam-tradelink.streamlit.app"
+                        send_telegram(alert_text)
                             
                 # Save state even if no pending orders today to avoid looping
                 with open(alert_file, "w") as f: f.write(today_str)
@@ -483,539 +740,9 @@ def check_morning_pending_alert():
 if st.session_state.get('logged_in'):
     check_morning_pending_alert()
 
-df = fetch_stock_cache(stock_sheet)
-
-# 🟢 THE FIX: Global Safety Net to prevent KeyErrors across all pages
-if not df.empty and 'Quantity' in df.columns and 'Item Name' in df.columns:
-    df['Quantity'] = pd.to_numeric(df['Quantity'], errors='coerce').fillna(0)
-    if 'Unit' not in df.columns: df['Unit'] = ''
-    df['Unit'] = df['Unit'].fillna('')
-    # Ensure missing units default to 'units' rather than blank
-    df['Unit'] = df['Unit'].replace('', 'units')
-    df['Item'] = df['Item Name']
-    if 'Group' not in df.columns: df['Group'] = 'Default'
-    df['Display Qty'] = df['Quantity'].map('{:,.0f}'.format) + " " + df['Unit']
-else:
-    # If the sheet is empty or syncing, load a blank template so the app doesn't crash
-    df = pd.DataFrame(columns=['Group', 'Item', 'Quantity', 'Unit', 'Display Qty'])
-
-def generate_html_table(details_str):
-    items = details_str.split(" | ")
-    html = "<table class='order-table'><tr><th>Stock Item</th><th>Quantity Ordered</th></tr>"
-    for item in items:
-        if ": " in item:
-            name, qty = item.split(": ", 1)
-            html += f"<tr><td><b>{hindi(name)}</b></td><td>{qty}</td></tr>"
-        else:
-            html += f"<tr><td colspan='2'>{item}</td></tr>"
-    html += "</table>"
-    return html
-
-def create_order_pdf(row):
-    def _safe(text):
-        """Sanitize text for FPDF's built-in fonts (latin-1 only)."""
-        return str(text).encode('latin-1', 'replace').decode('latin-1')
-    
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("helvetica", "B", 20)
-    pdf.cell(0, 10, "MANGLAM TRADELINK", ln=True, align="C")
-    pdf.set_font("helvetica", "", 12)
-    pdf.cell(0, 8, "NYC Brand - Official Order Receipt", ln=True, align="C")
-    pdf.ln(10)
-    
-    pdf.set_font("helvetica", "B", 12)
-    pdf.cell(40, 8, "Order ID:", 0, 0)
-    pdf.set_font("helvetica", "", 12)
-    pdf.cell(0, 8, _safe(row.get('Order ID', '')), ln=True)
-    
-    pdf.set_font("helvetica", "B", 12)
-    pdf.cell(40, 8, "Date (IST):", 0, 0)
-    pdf.set_font("helvetica", "", 12)
-    pdf.cell(0, 8, _safe(row.get('Date', '')), ln=True)
-    
-    pdf.set_font("helvetica", "B", 12)
-    pdf.cell(40, 8, "Customer:", 0, 0)
-    pdf.set_font("helvetica", "", 12)
-    pdf.cell(0, 8, _safe(row.get('Customer Name', '')), ln=True)
-    
-    notes = str(row.get('Notes', '')).strip()
-    if notes and notes != 'None':
-        pdf.set_font("helvetica", "B", 12)
-        pdf.cell(40, 8, "Notes:", 0, 0)
-        pdf.set_font("helvetica", "", 12)
-        pdf.multi_cell(0, 8, _safe(notes))
-        
-    pdf.ln(10)
-    pdf.set_font("helvetica", "B", 14)
-    pdf.cell(0, 10, "Order Details & Quantities", ln=True)
-    pdf.set_font("helvetica", "", 12)
-    
-    items = str(row.get('Order Details', '')).split(" | ")
-    for item in items:
-        pdf.cell(0, 8, f"- {_safe(item)}", ln=True)
-        
-    return bytes(pdf.output())
-
-# ==========================================
-# 🌐 LANGUAGE DICTIONARY (full version for main app)
-# ==========================================
+df = fetch_stock_cache(stock_sheet) # Already normalized inside the cache (see normalize_stock)
 
-# 2. Complete Hindi Dictionary for the ENTIRE UI
-LANG = {
-    "English": {
-        # --- Navigation & Header ---
-        "brand": "🏢 NYC Brand",
-        "inv": "📦 Inventory Dashboard",
-        "ord": "📝 Order Desk",
-        "aud": "🔍 Stock Audit",
-        "ai": "🤖 AI Restock Advisor",
-        "rent": "🏢 Rent Tracker",
-        "rep": "📊 Audit Report",
-        "admin": "⚙️ Admin Dashboard",
-        "menu": "🧭 Menu",
-        "refresh": "🔄 Refresh",
-        "logout": "🚪 Logout",
-
-        # --- Login Page ---
-        "portal_title": "🏢 Manglam Tradelink Portal",
-        "secure_login": "Secure Login",
-        "user_id": "User ID",
-        "password": "Password",
-        "login_btn": "Login",
-        "welcome_back": "Welcome back, {name}! Securing login...",
-        "invalid_creds": "❌ Invalid User ID or Password",
-        "db_error_empty": "Database Error: The 'Users' sheet is empty.",
-        "missing_headers": "Missing User ID or Password headers.",
-        "sheets_error": "Failed to connect to Google Sheets: {err}",
-
-        # --- Inventory Dashboard ---
-        "search_item": "🔍 Search Item...",
-        "filter_group": "📂 Filter Group:",
-        "all_groups": "All Groups",
-        "volume_filtered": "📦 Volume (Filtered)",
-        "items_found": "📋 Items Found",
-        "bar_chart": "📊 Bar Chart",
-        "stock_list": "📋 Stock List",
-
-        # --- Order Desk ---
-        "place_order": "➕ Place New Order",
-        "pending_orders": "⏳ Pending Orders",
-        "completed_orders": "✅ Completed Orders",
-        "create_order": "Create a New Order",
-        "customer_details": "👤 **Customer Details**",
-        "search_customer": "Search Existing Customer:",
-        "search_customer_ph": "Start typing to search...",
-        "new_customer_name": "Or manually type a New Customer Name:",
-        "new_customer_ph": "e.g. Sharma Traders",
-        "order_notes_label": "📝 Order Notes (Optional)",
-        "order_notes_ph": "e.g. Dispatch via VRL Logistics, Urgent...",
-        "select_items_cart": "🛒 **Select Items to Add to Cart**",
-        "search_choose_items": "Search and choose items...",
-        "stock_label": "📦 Stock:",
-        "order_qty": "Order Qty",
-        "alt_qty": "Alt Qty",
-        "alt_unit": "Alt Unit",
-        "submit_order": "🚀 Submit Order",
-        "fill_all_details": "Please fill all details.",
-        "order_placed_tg": "✅ Order {oid} placed and alert sent to Warehouse!",
-        "order_placed_db": "✅ Order {oid} placed successfully in Database!",
-        "tg_failed": "⚠️ Telegram failed: {err}",
-        "tg_keys_missing": "⚠️ Telegram keys are missing from Streamlit Secrets.",
-        "tg_system_error": "⚠️ Telegram System Error: {err}",
-        "error_saving_order": "Error saving order: {err}",
-        "mark_complete": "✅ Mark Complete",
-        "share_pdf": "📄 Share PDF",
-        "modify_delete": "✏️ Modify or Delete Order",
-        "customer_name_label": "Customer Name",
-        "modify_items": "🛒 **Modify Items & Quantities**",
-        "add_remove_items": "Add or Remove Items (Exact Names):",
-        "qty_details_for": "Quantity/Details for [{item}]",
-        "notes_label": "Notes",
-        "save_changes": "💾 Save Changes",
-        "delete_order": "❌ Delete Order",
-        "order_updated": "Order Updated!",
-        "failed_update": "Failed to update: {err}",
-        "order_deleted": "Order Deleted!",
-        "failed_delete": "Failed to delete: {err}",
-        "approve_payment": "✅ Payment Received / Allow Delivery",
-        "approve_success": "Order marked as pending for delivery!",
-        "order_completed": "Order Completed!",
-        "adv_filters": "🔎 Advanced Filters & Search",
-        "search_name_id": "Search (Name, ID, Notes)",
-        "search_eg": "e.g. Sharma...",
-        "date_range": "Date Range",
-        "completed_by": "Completed By",
-        "all_employees": "All Employees",
-        "contains_fabric": "Contains Fabric/Item",
-        "all_items_filter": "All Items",
-        "showing_completed": "Showing <b>{count}</b> completed orders matching your criteria.",
-        "download_receipt": "📄 Download Receipt",
-        "delete_record": "🗑️ Delete Record",
-        "record_deleted": "Record Deleted permanently!",
-
-        # --- Stock Audit ---
-        "view_system_qty": "👀 View Current System Quantities (Live Tally Stock)",
-        "stock_syncing": "⚠️ Live stock data is currently syncing or missing.",
-        "audit_db_missing": "Audit Logs database not found. Please ask Admin to create the 'Audit Logs' sheet.",
-        "audit_progress": "📊 Audit Progress",
-        "items_audited": "{done} / {total} Items Audited",
-        "count_batches": "Count scattered batches in the warehouse. Your entries will be summed automatically.",
-        "search_select_item": "Search & Select Item to Count:",
-        "type_item_name": "Type item name...",
-        "live_item_progress": "### 📊 Live Item Progress",
-        "system_expected": "System Expected",
-        "found_so_far": "Found So Far",
-        "variance": "Variance",
-        "found_so_far_yours": "📦 Found So Far (Your Counts)",
-        "log_batch": "➕ Log a Found Batch",
-        "location_rack": "Location / Rack Details (Optional)",
-        "location_rack_ph": "e.g., Aisle 3, Top Shelf",
-        "qty_found_here": "Quantity Found in this specific location",
-        "save_batch": "💾 Save Batch",
-        "qty_negative": "Quantity cannot be negative.",
-        "logged_success": "Successfully logged {qty} for {item}!",
-        "failed_log_audit": "Failed to log audit: {err}",
-        "recent_entries": "**Recent entries for this item:**",
-        "remaining_items": "📋 Remaining Items to Count",
-        "all_audited": "🎉 Incredible job! All inventory items have been physically audited.",
-
-        # --- AI Restock Advisor (was also Audit Report page routing) ---
-        "compare_counts": "Compare physical counts submitted by employees against live Tally stock.",
-        "audit_db_not_found": "Audit Logs database not found.",
-        "no_active_audits": "No active audits running.",
-        "archive_audit": "Archive Current Audit",
-        "archive_warning": "Archiving the audit board resets all items back to 'Pending' for the next full warehouse count.",
-        "archive_btn": "Archive & Reset Audit Board",
-        "archive_success": "Audit Archived Successfully! The board is now clear.",
-        "failed_archive": "Failed to archive: {err}",
-        "no_audit_logs": "No audit logs found.",
-
-        # --- AI Restock Advisor (actual page) ---
-        "supply_chain_title": "🤖 Supply Chain Intelligence",
-        "ai_card_title": "🧠 Gemini AI Predictive Analysis",
-        "ai_card_desc": "Click below to have Gemini analyze your live inventory against the <b>last 15 days of outward sales</b> and your lead times to generate a highly prioritized reordering report.",
-        "ai_key_missing": "Gemini API Key missing or invalid in Secrets.",
-        "generate_report": "✨ Generate Smart Restock Report",
-        "ai_spinner": "Gemini is analyzing burn rates, lead times, and current stock...",
-        "restock_report_title": "### 📊 Predictive Restock Report",
-        "ai_failed": "AI Generation Failed: {err}",
-
-        # --- Admin Dashboard ---
-        "user_mgmt": "⚙️ User Management",
-        "full_name": "Full Name",
-        "create_user_btn": "Create User",
-        "user_created": "User created!",
-        "role_label": "Role",
-
-        # --- Rent Tracker ---
-        "rent_db_error": "⚠️ Database Error: Sheets not found in Google Sheets.",
-        "tab_balances": "📊 Balances & Dashboard",
-        "tab_collect": "💸 Collect Payment",
-        "tab_bills": "⚡ Log Bills",
-        "tab_history": "📜 History",
-        "tab_manage": "⚙️ Manage Tenants",
-        "action_required": "🚨 **ACTION REQUIRED TODAY:** Generate Monthly Bills for: **{names}**",
-        "active_tenants": "🟢 Active Tenants",
-        "no_active_tenants": "No active tenants right now.",
-        "due_label": "DUE: ₹{amt}",
-        "advance_label": "ADVANCE: ₹{amt}",
-        "cleared_label": "CLEARED",
-        "pending_dues_label": "PENDING DUES: ₹{amt}",
-        "refund_due_label": "REFUND DUE: ₹{amt}",
-        "settled_label": "SETTLED",
-        "first_of_month": "1st of Month",
-        "date_of_month": "Date {day} of Month",
-        "view_vacated": "🚪 View Vacated Tenants",
-        "no_tenants_found": "No tenants found. Add one in the 'Manage Tenants' tab.",
-        "record_payment": "Record a Received Payment",
-        "select_tenant": "Select Tenant",
-        "payment_amount": "Payment Amount Received (₹)",
-        "payment_notes": "Notes (e.g. Cash, UPI Reference, Final Settlement)",
-        "save_payment": "💾 Save Payment",
-        "payment_recorded": "Payment of ₹{amt} recorded for {tenant}!",
-        "generate_charges": "Generate Monthly Charges",
-        "select_tenant_bill": "Select Tenant to Bill",
-        "rent_charge": "##### 🏠 Rent Charge",
-        "apply_base_rent": "Apply Base Rent (₹{amt})",
-        "elec_charge": "##### ⚡ Electricity Charge",
-        "elec_covered": "Electricity is covered by the Landlord/Company.",
-        "enter_meter_bill": "💡 Enter the exact meter bill amount you paid for them.",
-        "lump_sum_elec": "Lump Sum Electricity Bill (₹)",
-        "passthrough_bill": "Pass-through Bill to Tenant Ledger",
-        "last_meter": "Last Recorded Meter: **{val}**",
-        "current_meter": "Enter Current Meter Reading",
-        "calc_usage": "**Calculated Usage:** {units} units (Rate: ₹{rate})",
-        "apply_var_elec": "Apply Variable Electricity",
-        "no_elec_tracking": "No electricity tracking configured.",
-        "billing_month": "Billing Month / Notes (e.g., 'March 2026 Rent')",
-        "post_charges": "📝 Post Charges to Ledger",
-        "charges_posted": "Charges successfully posted to the tenant's ledger!",
-        "error_posting": "Error posting charges: {err}",
-        "no_active_to_bill": "No active tenants to bill.",
-        "ledger_history": "Ledger History",
-        "view_history_for": "View History For:",
-        "all_tenants_hist": "All Tenants",
-        "no_tx_history": "No transaction history available yet.",
-        "add_tenant": "➕ Add New Tenant",
-        "tenant_name": "Tenant/Company Name",
-        "location_unit": "Location / Unit Number",
-        "monthly_rent": "Monthly Base Rent (₹)",
-        "security_deposit": "Security Deposit Received (₹)",
-        "elec_config": "⚡ **Electricity Configuration**",
-        "elec_billing_type": "Electricity Billing Type",
-        "rate_per_unit": "Rate Per Unit (₹) - Only if Variable",
-        "elec_paid_by": "Electricity Paid By",
-        "initial_meter": "Initial Meter Reading (Base Units)",
-        "billing_cycle": "📅 **Billing Cycle & Move-In**",
-        "date_keys_given": "Date Keys Given (Billing Start)",
-        "billing_logic": "Billing Logic",
-        "pro_rata_option": "Pro-Rata (Bill on 1st of every month)",
-        "fixed_cycle_option": "Fixed Cycle (Bill on Anniversary Date)",
-        "create_tenant": "Create Tenant Profile",
-        "name_required": "Name is required.",
-        "tenant_added_prorata": "Tenant added! First pro-rata rent of ₹{amt} automatically charged.",
-        "tenant_added_fixed": "Tenant added! Billing set to exactly the {day} of every month.",
-        "edit_vacate": "### ⚙️ Edit / Vacate Existing Tenants",
-        "modify_details": "**Modify Details or Process Move-Out**",
-        "location_label": "Location",
-        "monthly_rent_edit": "Monthly Rent (Increase/Decrease)",
-        "elec_type": "Elec Type",
-        "per_unit_rate": "Per Unit Rate (If Variable)",
-        "security_held": "Security Deposit Held",
-        "pro_rata_q": "Pro Rata Billing?",
-        "tenant_status": "Tenant Status",
-        "save_all": "💾 Save All Changes",
-        "tenant_updated": "Tenant profile for {name} updated!",
-        "error_updating": "Error updating tenant: {err}",
-    },
-    "Hindi": {
-        # --- नेविगेशन और हेडर ---
-        "brand": "🏢 NYC ब्रांड",
-        "inv": "📦 स्टॉक डैशबोर्ड",
-        "ord": "📝 ऑर्डर डेस्क",
-        "aud": "🔍 स्टॉक ऑडिट",
-        "ai": "🤖 AI रीस्टॉक सलाह",
-        "rent": "🏢 किराया ट्रैकर",
-        "rep": "📊 ऑडिट रिपोर्ट",
-        "admin": "⚙️ एडमिन डैशबोर्ड",
-        "menu": "🧭 मेनू",
-        "refresh": "🔄 रिफ्रेश करें",
-        "logout": "🚪 लॉगआउट",
-
-        # --- लॉगिन पेज ---
-        "portal_title": "🏢 मंगलम ट्रेडलिंक पोर्टल",
-        "secure_login": "सुरक्षित लॉगिन",
-        "user_id": "यूज़र आईडी",
-        "password": "पासवर्ड",
-        "login_btn": "लॉगिन",
-        "welcome_back": "फिर से स्वागत है, {name}! लॉगिन सुरक्षित हो रहा है...",
-        "invalid_creds": "❌ गलत यूज़र आईडी या पासवर्ड",
-        "db_error_empty": "डेटाबेस त्रुटि: 'Users' शीट खाली है।",
-        "missing_headers": "User ID या Password हेडर गायब है।",
-        "sheets_error": "Google Sheets से कनेक्ट नहीं हो पाया: {err}",
-
-        # --- इन्वेंटरी डैशबोर्ड ---
-        "search_item": "🔍 आइटम खोजें...",
-        "filter_group": "📂 ग्रुप फ़िल्टर:",
-        "all_groups": "सभी ग्रुप",
-        "volume_filtered": "📦 मात्रा (फ़िल्टर्ड)",
-        "items_found": "📋 आइटम मिले",
-        "bar_chart": "📊 बार चार्ट",
-        "stock_list": "📋 स्टॉक सूची",
-
-        # --- ऑर्डर डेस्क ---
-        "place_order": "➕ नया ऑर्डर दें",
-        "pending_orders": "⏳ पेंडिंग ऑर्डर",
-        "completed_orders": "✅ पूर्ण ऑर्डर",
-        "create_order": "नया ऑर्डर बनाएं",
-        "customer_details": "👤 **ग्राहक विवरण**",
-        "search_customer": "मौजूदा ग्राहक खोजें:",
-        "search_customer_ph": "खोजने के लिए टाइप करें...",
-        "new_customer_name": "या नया ग्राहक नाम टाइप करें:",
-        "new_customer_ph": "जैसे: शर्मा ट्रेडर्स",
-        "order_notes_label": "📝 ऑर्डर नोट्स (वैकल्पिक)",
-        "order_notes_ph": "जैसे: VRL लॉजिस्टिक्स से भेजें, अर्जेंट...",
-        "select_items_cart": "🛒 **कार्ट में आइटम चुनें**",
-        "search_choose_items": "आइटम खोजें और चुनें...",
-        "stock_label": "📦 स्टॉक:",
-        "order_qty": "ऑर्डर मात्रा",
-        "alt_qty": "वैकल्पिक मात्रा",
-        "alt_unit": "वैकल्पिक यूनिट",
-        "submit_order": "🚀 ऑर्डर सबमिट करें",
-        "fill_all_details": "कृपया सभी विवरण भरें।",
-        "order_placed_tg": "✅ ऑर्डर {oid} दर्ज हुआ और वेयरहाउस को अलर्ट भेजा गया!",
-        "order_placed_db": "✅ ऑर्डर {oid} सफलतापूर्वक डेटाबेस में दर्ज हुआ!",
-        "tg_failed": "⚠️ टेलीग्राम विफल: {err}",
-        "tg_keys_missing": "⚠️ Streamlit Secrets में टेलीग्राम कुंजियाँ गायब हैं।",
-        "tg_system_error": "⚠️ टेलीग्राम सिस्टम त्रुटि: {err}",
-        "error_saving_order": "ऑर्डर सेव करने में त्रुटि: {err}",
-        "mark_complete": "✅ पूर्ण करें",
-        "share_pdf": "📄 PDF शेयर करें",
-        "modify_delete": "✏️ ऑर्डर संशोधित / हटाएं",
-        "customer_name_label": "ग्राहक का नाम",
-        "modify_items": "🛒 **आइटम और मात्रा बदलें**",
-        "add_remove_items": "आइटम जोड़ें या हटाएं (सही नाम):",
-        "qty_details_for": "[{item}] के लिए मात्रा/विवरण",
-        "notes_label": "नोट्स",
-        "save_changes": "💾 बदलाव सहेजें",
-        "delete_order": "❌ ऑर्डर हटाएं",
-        "order_updated": "ऑर्डर अपडेट हो गया!",
-        "failed_update": "अपडेट विफल: {err}",
-        "order_deleted": "ऑर्डर हटा दिया गया!",
-        "failed_delete": "हटाने में विफल: {err}",
-        "approve_payment": "✅ पेमेंट प्राप्त / डिलीवरी की अनुमति",
-        "approve_success": "ऑर्डर को डिलीवरी के लिए पेंडिंग में डाल दिया गया!",
-        "order_completed": "ऑर्डर पूरा हो गया!",
-        "adv_filters": "🔎 एडवांस फ़िल्टर और खोज",
-        "search_name_id": "खोजें (नाम, आईडी, नोट्स)",
-        "search_eg": "जैसे: शर्मा...",
-        "date_range": "तारीख सीमा",
-        "completed_by": "पूर्ण किया",
-        "all_employees": "सभी कर्मचारी",
-        "contains_fabric": "कपड़ा/आइटम शामिल",
-        "all_items_filter": "सभी आइटम",
-        "showing_completed": "आपकी शर्तों से मेल खाते <b>{count}</b> पूर्ण ऑर्डर दिख रहे हैं।",
-        "download_receipt": "📄 रसीद डाउनलोड करें",
-        "delete_record": "🗑️ रिकॉर्ड हटाएं",
-        "record_deleted": "रिकॉर्ड स्थायी रूप से हटा दिया गया!",
-
-        # --- स्टॉक ऑडिट ---
-        "view_system_qty": "👀 वर्तमान सिस्टम मात्रा देखें (लाइव टैली स्टॉक)",
-        "stock_syncing": "⚠️ लाइव स्टॉक डेटा अभी सिंक हो रहा है या गायब है।",
-        "audit_db_missing": "ऑडिट लॉग डेटाबेस नहीं मिला। कृपया एडमिन से 'Audit Logs' शीट बनाने को कहें।",
-        "audit_progress": "📊 ऑडिट प्रगति",
-        "items_audited": "{done} / {total} आइटम गिने गए",
-        "count_batches": "गोदाम में बिखरे बैचों की गिनती करें। आपकी एंट्री स्वचालित रूप से जोड़ी जाएंगी।",
-        "search_select_item": "गिनने के लिए आइटम खोजें और चुनें:",
-        "type_item_name": "आइटम का नाम टाइप करें...",
-        "live_item_progress": "### 📊 लाइव आइटम प्रगति",
-        "system_expected": "सिस्टम अनुमान",
-        "found_so_far": "अब तक मिला",
-        "variance": "अंतर",
-        "found_so_far_yours": "📦 अब तक मिला (आपकी गिनती)",
-        "log_batch": "➕ मिला हुआ बैच दर्ज करें",
-        "location_rack": "स्थान / रैक विवरण (वैकल्पिक)",
-        "location_rack_ph": "जैसे: गलियारा 3, ऊपरी शेल्फ",
-        "qty_found_here": "इस विशिष्ट स्थान पर मिली मात्रा",
-        "save_batch": "💾 बैच सहेजें",
-        "qty_negative": "मात्रा नकारात्मक नहीं हो सकती।",
-        "logged_success": "{item} के लिए {qty} सफलतापूर्वक दर्ज हुआ!",
-        "failed_log_audit": "ऑडिट दर्ज करने में विफल: {err}",
-        "recent_entries": "**इस आइटम की हाल की एंट्री:**",
-        "remaining_items": "📋 गिनने के लिए शेष आइटम",
-        "all_audited": "🎉 शानदार काम! सभी इन्वेंटरी आइटम की भौतिक ऑडिट हो गई।",
-
-        # --- AI रीस्टॉक सलाह (ऑडिट रिपोर्ट पेज) ---
-        "compare_counts": "कर्मचारियों द्वारा सबमिट की गई भौतिक गिनती की लाइव टैली स्टॉक से तुलना करें।",
-        "audit_db_not_found": "ऑडिट लॉग डेटाबेस नहीं मिला।",
-        "no_active_audits": "कोई सक्रिय ऑडिट नहीं चल रहा।",
-        "archive_audit": "वर्तमान ऑडिट संग्रहित करें",
-        "archive_warning": "ऑडिट बोर्ड को संग्रहित करने से सभी आइटम अगली पूर्ण गोदाम गिनती के लिए 'पेंडिंग' पर रीसेट हो जाएंगे।",
-        "archive_btn": "ऑडिट संग्रहित करें और रीसेट करें",
-        "archive_success": "ऑडिट सफलतापूर्वक संग्रहित हो गया! बोर्ड अब साफ है।",
-        "failed_archive": "संग्रहित करने में विफल: {err}",
-        "no_audit_logs": "कोई ऑडिट लॉग नहीं मिला।",
-
-        # --- AI रीस्टॉक सलाह (वास्तविक पेज) ---
-        "supply_chain_title": "🤖 सप्लाई चेन इंटेलिजेंस",
-        "ai_card_title": "🧠 Gemini AI भविष्यवाणी विश्लेषण",
-        "ai_card_desc": "नीचे क्लिक करें ताकि Gemini आपकी लाइव इन्वेंटरी का <b>पिछले 15 दिनों की बिक्री</b> और लीड टाइम के साथ विश्लेषण करे और एक प्राथमिकता वाली री-ऑर्डरिंग रिपोर्ट बनाए।",
-        "ai_key_missing": "Gemini API Key Secrets में गायब या अमान्य है।",
-        "generate_report": "✨ स्मार्ट रीस्टॉक रिपोर्ट बनाएं",
-        "ai_spinner": "Gemini बर्न रेट, लीड टाइम और मौजूदा स्टॉक का विश्लेषण कर रहा है...",
-        "restock_report_title": "### 📊 भविष्यवाणी रीस्टॉक रिपोर्ट",
-        "ai_failed": "AI जनरेशन विफल: {err}",
-
-        # --- एडमिन डैशबोर्ड ---
-        "user_mgmt": "⚙️ उपयोगकर्ता प्रबंधन",
-        "full_name": "पूरा नाम",
-        "create_user_btn": "उपयोगकर्ता बनाएं",
-        "user_created": "उपयोगकर्ता बन गया!",
-        "role_label": "भूमिका",
-
-        # --- किराया ट्रैकर ---
-        "rent_db_error": "⚠️ डेटाबेस त्रुटि: Google Sheets में शीट नहीं मिली।",
-        "tab_balances": "📊 बैलेंस और डैशबोर्ड",
-        "tab_collect": "💸 भुगतान लें",
-        "tab_bills": "⚡ बिल दर्ज करें",
-        "tab_history": "📜 इतिहास",
-        "tab_manage": "⚙️ किरायेदार प्रबंधन",
-        "action_required": "🚨 **आज कार्रवाई आवश्यक:** इनके लिए मासिक बिल बनाएं: **{names}**",
-        "active_tenants": "🟢 सक्रिय किरायेदार",
-        "no_active_tenants": "अभी कोई सक्रिय किरायेदार नहीं।",
-        "due_label": "बकाया: ₹{amt}",
-        "advance_label": "अग्रिम: ₹{amt}",
-        "cleared_label": "चुकता",
-        "pending_dues_label": "बकाया राशि: ₹{amt}",
-        "refund_due_label": "वापसी बकाया: ₹{amt}",
-        "settled_label": "निपटान हो गया",
-        "first_of_month": "महीने की 1 तारीख",
-        "date_of_month": "महीने की {day} तारीख",
-        "view_vacated": "🚪 खाली किए गए किरायेदार देखें",
-        "no_tenants_found": "कोई किरायेदार नहीं मिला। 'किरायेदार प्रबंधन' टैब में जोड़ें।",
-        "record_payment": "प्राप्त भुगतान दर्ज करें",
-        "select_tenant": "किरायेदार चुनें",
-        "payment_amount": "भुगतान राशि प्राप्त (₹)",
-        "payment_notes": "नोट्स (जैसे: नकद, UPI संदर्भ, अंतिम निपटान)",
-        "save_payment": "💾 भुगतान सहेजें",
-        "payment_recorded": "₹{amt} का भुगतान {tenant} के लिए दर्ज हो गया!",
-        "generate_charges": "मासिक शुल्क बनाएं",
-        "select_tenant_bill": "बिल के लिए किरायेदार चुनें",
-        "rent_charge": "##### 🏠 किराया शुल्क",
-        "apply_base_rent": "मूल किराया लगाएं (₹{amt})",
-        "elec_charge": "##### ⚡ बिजली शुल्क",
-        "elec_covered": "बिजली मकान मालिक/कंपनी द्वारा वहन की जाती है।",
-        "enter_meter_bill": "💡 उनके लिए भुगतान की गई सटीक मीटर बिल राशि दर्ज करें।",
-        "lump_sum_elec": "एकमुश्त बिजली बिल (₹)",
-        "passthrough_bill": "किरायेदार खाते में बिल पास करें",
-        "last_meter": "अंतिम दर्ज मीटर: **{val}**",
-        "current_meter": "वर्तमान मीटर रीडिंग दर्ज करें",
-        "calc_usage": "**गणना किया गया उपयोग:** {units} यूनिट (दर: ₹{rate})",
-        "apply_var_elec": "वेरिएबल बिजली लगाएं",
-        "no_elec_tracking": "बिजली ट्रैकिंग कॉन्फ़िगर नहीं है।",
-        "billing_month": "बिलिंग माह / नोट्स (जैसे: 'मार्च 2026 किराया')",
-        "post_charges": "📝 शुल्क खाते में दर्ज करें",
-        "charges_posted": "शुल्क सफलतापूर्वक किरायेदार के खाते में दर्ज हो गए!",
-        "error_posting": "शुल्क दर्ज करने में त्रुटि: {err}",
-        "no_active_to_bill": "बिल के लिए कोई सक्रिय किरायेदार नहीं।",
-        "ledger_history": "खाता इतिहास",
-        "view_history_for": "किसका इतिहास देखें:",
-        "all_tenants_hist": "सभी किरायेदार",
-        "no_tx_history": "अभी तक कोई लेन-देन इतिहास उपलब्ध नहीं।",
-        "add_tenant": "➕ नया किरायेदार जोड़ें",
-        "tenant_name": "किरायेदार/कंपनी का नाम",
-        "location_unit": "स्थान / यूनिट नंबर",
-        "monthly_rent": "मासिक मूल किराया (₹)",
-        "security_deposit": "सुरक्षा जमा प्राप्त (₹)",
-        "elec_config": "⚡ **बिजली कॉन्फ़िगरेशन**",
-        "elec_billing_type": "बिजली बिलिंग प्रकार",
-        "rate_per_unit": "प्रति यूनिट दर (₹) - केवल वेरिएबल के लिए",
-        "elec_paid_by": "बिजली का भुगतान कौन करता है",
-        "initial_meter": "प्रारंभिक मीटर रीडिंग (बेस यूनिट)",
-        "billing_cycle": "📅 **बिलिंग चक्र और प्रवेश**",
-        "date_keys_given": "चाबी देने की तारीख (बिलिंग शुरू)",
-        "billing_logic": "बिलिंग तर्क",
-        "pro_rata_option": "प्रो-राटा (हर महीने की 1 तारीख को बिल)",
-        "fixed_cycle_option": "फिक्स्ड साइकल (वर्षगांठ तारीख पर बिल)",
-        "create_tenant": "किरायेदार प्रोफ़ाइल बनाएं",
-        "name_required": "नाम आवश्यक है।",
-        "tenant_added_prorata": "किरायेदार जोड़ा गया! ₹{amt} का पहला प्रो-राटा किराया स्वचालित रूप से चार्ज हुआ।",
-        "tenant_added_fixed": "किरायेदार जोड़ा गया! बिलिंग हर महीने की {day} तारीख पर सेट है।",
-        "edit_vacate": "### ⚙️ मौजूदा किरायेदार संपादित / खाली करें",
-        "modify_details": "**विवरण बदलें या बाहर जाने की प्रक्रिया करें**",
-        "location_label": "स्थान",
-        "monthly_rent_edit": "मासिक किराया (बढ़ाएं/घटाएं)",
-        "elec_type": "बिजली प्रकार",
-        "per_unit_rate": "प्रति यूनिट दर (वेरिएबल के लिए)",
-        "security_held": "सुरक्षा जमा रखी गई",
-        "pro_rata_q": "प्रो-राटा बिलिंग?",
-        "tenant_status": "किरायेदार स्थिति",
-        "save_all": "💾 सभी बदलाव सहेजें",
-        "tenant_updated": "{name} की किरायेदार प्रोफ़ाइल अपडेट हो गई!",
-        "error_updating": "किरायेदार अपडेट करने में त्रुटि: {err}",
-    }
-}
+# 🌐 LANGUAGE DICTIONARY: LANG lives in translations.py (built once per process, not on every rerun)
 
 # Shortcut variable to make writing code faster (moved here so Login page can use it too)
 t = LANG[st.session_state.app_lang]
@@ -1062,6 +789,7 @@ with nav_col:
 with btn1_col:
     if st.button(t["refresh"], use_container_width=True):
         st.cache_data.clear()
+        sheet_mirror.invalidate() # Re-sync every tab from Google Sheets
         st.session_state.last_auth_check = None # Force a fresh auth check
         if 'optimistic_orders' in st.session_state: st.session_state.optimistic_orders = []
         if 'optimistic_rent_tx' in st.session_state: st.session_state.optimistic_rent_tx = []
@@ -1074,1936 +802,63 @@ with btn2_col:
         cookie_manager.delete("mt_userid")
         st.rerun()
 
-st.divider()
-
-# --- PAGE 1: INVENTORY DASHBOARD ---
-if page == t["inv"]:
-    st.header(t["inv"])
-    
-    # 🟢 DATA FRESHNESS INDICATOR (IST)
-    if 'stock_last_synced' in st.session_state and not df.empty:
-        sync_time = st.session_state.stock_last_synced.strftime("%I:%M %p IST")
-        tally_ts = st.session_state.get('tally_last_synced')
-        tally_text = tally_ts.strftime("%d-%b-%Y %I:%M %p IST") if tally_ts else "Unknown"
-        st.markdown(f"<div style='margin-top:-10px; margin-bottom:15px; font-size:13px; color:#10b981; font-weight:500;'>🟢 App Cache Refreshed: {sync_time} &nbsp;|&nbsp; 📡 Tally Synced Database: {tally_text}</div>", unsafe_allow_html=True)
-    elif df.empty:
-        st.markdown("<div style='margin-top:-10px; margin-bottom:15px; font-size:14px; color:#ef4444; font-weight:500;'>🔴 Sync Disconnected (No Data)</div>", unsafe_allow_html=True)
-
-    if not df.empty:
-        with st.form(key="inv_search_form"):
-            col_search, col_filter, col_btn = st.columns([3, 3, 1])
-            with col_search: search_text = st.text_input(t["search_item"], "")
-            with col_filter:
-                groups = [t["all_groups"]] + df['Group'].dropna().unique().tolist()
-                selected_group = st.selectbox(t["filter_group"], groups)
-            with col_btn:
-                st.markdown("<br>", unsafe_allow_html=True)
-                inv_search_submitted = st.form_submit_button("🔍", use_container_width=True)
-
-        filtered_df = df.copy()
-        if search_text: filtered_df = filtered_df[filtered_df['Item'].str.contains(search_text, case=False, na=False)]
-        if selected_group != t["all_groups"]: filtered_df = filtered_df[filtered_df['Group'] == selected_group]
-
-        total_qty = filtered_df['Quantity'].sum()
-        # 🟢 ROLE-BASED: Hide Total Quantity and Items Found for Employees
-        if st.session_state.role != "Employee":
-            m1, m2 = st.columns(2)
-            m1.metric(t["volume_filtered"], f"{total_qty:,.0f}")
-            m2.metric(t["items_found"], len(filtered_df))
-
-        st.divider()
-        # 🟢 ROLE-BASED TABS: Admin sees Stock List first, Employee sees Bar Chart first
-        if st.session_state.role == "Admin":
-            tab2, tab1 = st.tabs([t["stock_list"], t["bar_chart"]])
-        else:
-            tab1, tab2 = st.tabs([t["bar_chart"], t["stock_list"]])
-
-        with tab1:
-            if not filtered_df.empty:
-                chart_df = filtered_df.sort_values('Quantity', ascending=False)
-                display_chart = hindi_df_columns(chart_df, ['Item', 'Group'])
-                fig = px.bar(display_chart, x='Item', y='Quantity', color='Group', hover_data=['Display Qty'])
-                fig.update_layout(xaxis_tickangle=-45, height=500, plot_bgcolor="rgba(0,0,0,0)")
-                st.plotly_chart(fig, use_container_width=True)
-
-        with tab2:
-            sorted_df = filtered_df[['Group', 'Item', 'Quantity', 'Unit']].sort_values(["Group", "Quantity"], ascending=[True, False])
-            st.dataframe(hindi_df_columns(sorted_df, ['Group', 'Item']), use_container_width=True, hide_index=True)
-
-# --- PAGE 2: ORDER DESK ---
-elif page == t["ord"]:
-    st.header(t["ord"])
-    orders_df = fetch_orders_cache(orders_sheet)
-    
-    # 🟢 OPTIMISTIC UI: Inject locally added orders before rendering
-    if 'optimistic_orders' not in st.session_state:
-        st.session_state.optimistic_orders = []
-    
-    if st.session_state.optimistic_orders:
-        opt_df = pd.DataFrame(st.session_state.optimistic_orders)
-        orders_df = pd.concat([opt_df, orders_df], ignore_index=True) # Put new ones at top
-    
-    # 🟢 ROLE-BASED TABS: Employee sees Pending Orders first
-    if st.session_state.role == "Employee":
-        order_tab2, order_tab1, order_tab3 = st.tabs([t["pending_orders"], t["place_order"], t["completed_orders"]])
-    else:
-        order_tab1, order_tab2, order_tab3 = st.tabs([t["place_order"], t["pending_orders"], t["completed_orders"]])
-    
-    with order_tab1:
-        # 🟢 THE FIX: Initialize a Master Reset Key
-        if 'form_reset' not in st.session_state:
-            st.session_state.form_reset = 0
-        r_key = st.session_state.form_reset
-        
-        try:
-            cust_data = fetch_basic_records(cust_sheet, "Customers")
-            customer_list = sorted(list(set([str(row['Customer Name']).strip() for row in cust_data if 'Customer Name' in row and str(row['Customer Name']).strip()])))
-            
-            # 🟢 Build display labels for customers (Hindi if needed, but always store English)
-            if st.session_state.get('app_lang') == 'Hindi':
-                cust_display = [hindi(c) for c in customer_list]
-            else:
-                cust_display = list(customer_list)
-            cust_display_to_real = dict(zip(cust_display, customer_list))
-        except: 
-            customer_list = []
-            cust_display = []
-            cust_display_to_real = {}
-            
-        st.subheader(t["create_order"])
-        st.write(t["customer_details"])
-        
-        # Notice how every input now has f"_{r_key}" attached to it!
-        customer_dropdown_display = st.selectbox(t["search_customer"], cust_display, index=None, placeholder=t["search_customer_ph"], key=f"order_cust_drop_{r_key}")
-        
-        if not customer_dropdown_display: 
-            customer_name = st.text_input(t["new_customer_name"], placeholder=t["new_customer_ph"], key=f"order_cust_text_{r_key}")
-        else: 
-            customer_name = cust_display_to_real.get(customer_dropdown_display, customer_dropdown_display)
-            
-        order_notes = st.text_input(t["order_notes_label"], placeholder=t["order_notes_ph"], key=f"order_notes_{r_key}")
-        
-        st.divider()
-        st.write(t["select_items_cart"])
-        
-        try:
-            master_data = fetch_basic_records(master_sheet, "Master Items")
-            item_list = sorted([str(row['Item Name']).strip() for row in master_data if 'Item Name' in row])
-        except:
-            item_list = df['Item'].tolist() if not df.empty else []
-        
-        # 🟢 Cart-based item adding
-        if 'order_cart' not in st.session_state:
-            st.session_state.order_cart = {}
-        
-        # --- ADD ITEM SECTION ---
-        st.markdown(f"##### {t.get('add_item_title', '➕ Add Item to Cart')}")
-        
-        # Filter out items already in cart
-        available_items = [i for i in item_list if i not in st.session_state.order_cart]
-        
-        # 🟢 Sorting based on Stock Priority
-        item_qty_map = dict(zip(df['Item'], df['Quantity'])) if not df.empty else {}
-        def stock_priority(item):
-            qty = item_qty_map.get(item, 0)
-            if qty > 0: return 0
-            elif qty < 0: return 1
-            else: return 2
-            
-        available_items = sorted(available_items, key=stock_priority)
-        
-        # 🟢 Build dual-language display labels for the single unified selectbox
-        is_hindi = st.session_state.get('app_lang') == 'Hindi'
-        display_options = []
-        display_to_real_item = {}
-        for item in available_items:
-            if is_hindi:
-                h_name = hindi(item)
-                label = f"{h_name} ({item})" if h_name != item else item
-            else:
-                label = item
-            display_options.append(label)
-            display_to_real_item[label] = item
-        
-        # 🟢 SINGLE UNIFIED SELECTBOX — Streamlit's native type-to-search handles filtering
-        pick_display = st.selectbox(
-            t.get("select_match", "🎯 Search & Select Item"),
-            display_options,
-            index=None,
-            placeholder=t.get("search_keyword", "Type to search..."),
-            key=f"unified_item_{r_key}"
-        )
-        
-        pick_item = display_to_real_item.get(pick_display) if pick_display else None
-        
-        if pick_item:
-            item_data = df[df['Item'] == pick_item]
-            if not item_data.empty:
-                avail_qty = item_data['Quantity'].iloc[0]
-                unit = item_data['Unit'].iloc[0]
-                stock_color = "#4CAF50" if avail_qty > 0 else "#dc3545"
-            else:
-                avail_qty = 0
-                unit = "units"
-                stock_color = "#dc3545"
-            
-            st.markdown(f'<div class="item-banner"><h4 style="margin:0; color: #333;">{hindi(pick_item)}</h4><span style="color: {stock_color}; font-weight: bold;">{t["stock_label"]} {avail_qty:,.0f} {unit}</span></div>', unsafe_allow_html=True)
-            st.markdown('<div class="item-inputs">', unsafe_allow_html=True)
-            c1, c2, c3 = st.columns(3)
-            with c1: qty = st.number_input(f"{t['order_qty']} ({unit})", min_value=1.0, value=1.0, step=1.0, key=f"p_add_{r_key}")
-            with c2: alt_qty = st.number_input(t["alt_qty"], min_value=0.0, value=0.0, step=1.0, key=f"a_add_{r_key}")
-            with c3: alt_unit = st.text_input(t["alt_unit"], key=f"u_add_{r_key}")
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            if st.button(t.get("add_to_cart", "➕ Add to Cart"), type="primary", key=f"add_btn_{r_key}"):
-                detail_str = f"{qty} {unit}" + (f" (Alt: {alt_qty} {alt_unit})" if alt_qty > 0 and alt_unit else "")
-                st.session_state.order_cart[pick_item] = detail_str
-                st.rerun()
-        
-        # --- CART SUMMARY ---
-        if st.session_state.order_cart:
-            st.divider()
-            st.markdown(f"##### 🛒 {t.get('cart_title', 'Your Cart')} ({len(st.session_state.order_cart)} {t.get('cart_items', 'items')})")
-            
-            for cart_item, cart_detail in list(st.session_state.order_cart.items()):
-                ic1, ic2, ic3 = st.columns([5, 4, 1])
-                with ic1:
-                    st.markdown(f"**{hindi(cart_item)}**")
-                with ic2:
-                    st.caption(cart_detail)
-                with ic3:
-                    if st.button("❌", key=f"rm_{cart_item}_{r_key}", help=t.get("remove_item", "Remove")):
-                        del st.session_state.order_cart[cart_item]
-                        st.rerun()
-            
-            if st.button(t.get("clear_cart", "🗑️ Clear Cart"), key=f"clear_cart_{r_key}"):
-                st.session_state.order_cart = {}
-                st.rerun()
-        
-        order_details_dict = st.session_state.order_cart
-        
-        if st.button(t["submit_order"], type="primary"):
-            if not customer_name or not order_details_dict:
-                st.error(t["fill_all_details"])
-            else:
-                now_ist = datetime.now(IST)
-                today_prefix = f"TALLY-{now_ist.strftime('%d.%m.%y')}."
-                next_x = 1
-                if not orders_df.empty and 'Order ID' in orders_df.columns:
-                    today_orders = orders_df[orders_df['Order ID'].astype(str).str.startswith(today_prefix)]
-                    if not today_orders.empty: next_x = len(today_orders) + 1
-                
-                order_id = f"{today_prefix}{next_x}"
-                details_str = " | ".join([f"{k}: {v}" for k, v in order_details_dict.items()])
-                try:
-                    orders_sheet.append_row([order_id, now_ist.strftime("%d-%m-%Y %I:%M %p"), customer_name, details_str, "Pending", "", order_notes])
-                    
-                    # Telegram Processing
-                    tg_success = False
-                    try:
-                        tg_token = st.secrets.get("TELEGRAM_BOT_TOKEN")
-                        tg_chat_id = st.secrets.get("TELEGRAM_CHAT_ID")
-                        if tg_token and tg_chat_id:
-                            items_array = details_str.split(" | ")
-                            table_text = "━━━━━━━━━━━━━━━━━━━━\n"
-                            table_text_hi = "━━━━━━━━━━━━━━━━━━━━\n"
-                            for i in items_array:
-                                if ": " in i:
-                                    name, q = i.split(": ", 1)
-                                    table_text += f"▪️ {name} ➔ {q}\n"
-                                    table_text_hi += f"▪️ {hindi(name)} ➔ {q}\n"
-                                else:
-                                    table_text += f"▪️ {i}\n"
-                                    table_text_hi += f"▪️ {hindi(i)}\n"
-                            table_text += "━━━━━━━━━━━━━━━━━━━━\n"
-                            table_text_hi += "━━━━━━━━━━━━━━━━━━━━\n"
-                            
-                            alert_text = "🚨 NEW ORDER ALERT 🚨\n\n"
-                            alert_text += f"🆔 {order_id}\n👤 {customer_name}\n\n{table_text}"
-                            if order_notes and str(order_notes).strip(): alert_text += f"\n📝 Notes: {order_notes}\n"
-                            alert_text += f"\n✅ Placed By: {st.session_state.user_name}"
-                            
-                            # Hindi translation section
-                            alert_text += "\n\n── हिंदी अनुवाद ──\n"
-                            alert_text += f"🚨 नया ऑर्डर 🚨\n"
-                            alert_text += f"🆔 {order_id}\n👤 {hindi(customer_name)}\n\n{table_text_hi}"
-                            if order_notes and str(order_notes).strip(): alert_text += f"📝 नोट: {hindi(str(order_notes))}\n"
-                            alert_text += f"✅ द्वारा: {st.session_state.user_name}"
-                            
-                            encoded_text = urllib.parse.quote(alert_text)
-                            res = requests.get(f"https://api.telegram.org/bot{tg_token}/sendMessage?chat_id={tg_chat_id}&text={encoded_text}")
-                            
-                            if res.status_code == 200:
-                                tg_success = True
-                            else:
-                                st.error(t["tg_failed"].format(err=res.text))
-                        else:
-                            st.error(t["tg_keys_missing"])
-                    except Exception as tg_e:
-                        st.error(t["tg_system_error"].format(err=tg_e))
-                    
-                    if tg_success:
-                        st.success(t["order_placed_tg"].format(oid=order_id))
-                    else:
-                        st.success(t["order_placed_db"].format(oid=order_id))
-
-                    # 🟢 OPTIMISTIC UI: Add to local state immediately instead of waiting for Google Sheets
-                    if 'optimistic_orders' not in st.session_state:
-                        st.session_state.optimistic_orders = []
-                        
-                    st.session_state.optimistic_orders.append({
-                        "Order ID": order_id,
-                        "Date": now_ist.strftime("%d-%m-%Y %I:%M %p"),
-                        "Customer Name": customer_name,
-                        "Order Details": details_str,
-                        "Status": "Pending",
-                        "Completed By": "",
-                        "Notes": order_notes
-                    })
-
-                    st.session_state.form_reset += 1
-                    st.session_state.order_cart = {} # Clear cart cleanly
-                            
-                    st.rerun()
-                except Exception as e: 
-                    st.error(t["error_saving_order"].format(err=e))
-                    
-
-    with order_tab2:
-        if not orders_df.empty and 'Status' in orders_df.columns:
-            # Separate the two types of pending orders
-            manual_pending_df = orders_df[orders_df['Status'] == 'Pending'].iloc[::-1]
-            tally_pending_df = orders_df[orders_df['Status'] == 'Pending - Awaited Payment'].iloc[::-1]
-            
-            # Combine them for the loop, but manual orders first
-            combined_pending = pd.concat([manual_pending_df, tally_pending_df])
-            
-            for idx, row in combined_pending.iterrows():
-                is_tally = row['Status'] == 'Pending - Awaited Payment'
-                
-                # 🟢 Format date as "dd Month" (e.g. "16 March")
-                try:
-                    _parsed_dt = datetime.strptime(str(row.get('Date', '')).strip(), "%d-%m-%Y %I:%M %p")
-                    _disp_date = _parsed_dt.strftime("%d %B")
-                except Exception:
-                    _disp_date = str(row.get('Date', ''))
-                
-                if is_tally:
-                    # Custom UI for Tally auto-pulled orders
-                    card_style = "background-color: #fee2e2; border: 2px solid #b91c1c; border-radius: 8px; padding: 15px; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);"
-                    tag_html = '<div style="background-color: #ef4444; color: white; padding: 5px 10px; border-radius: 4px; display: inline-block; font-weight: bold; margin-bottom: 10px; font-size: 14px;">🚨 NO DELIVERY UNTIL PAYMENT RECEIVED</div><br>'
-                    st.markdown(f'<div style="{card_style}">{tag_html}<h4 style="margin-top:0; color:#991b1b;">Order {row["Order ID"]} (Tally Sync)</h4><b>📅 Date:</b> {_disp_date}<br><b>Customer:</b> {hindi(str(row["Customer Name"]))}<br><b>Notes:</b> {hindi(str(row.get("Notes", "None")))}<br>{generate_html_table(row["Order Details"])}</div>', unsafe_allow_html=True)
-                else:
-                    # Standard UI for manual orders
-                    st.markdown(f'<div class="order-card"><h4 style="margin-top:0; color:#0056b3;">Order {row["Order ID"]}</h4><b>📅 Date:</b> {_disp_date}<br><b>Customer:</b> {hindi(str(row["Customer Name"]))}<br><b>Notes:</b> {hindi(str(row.get("Notes", "None")))}<br>{generate_html_table(row["Order Details"])}</div>', unsafe_allow_html=True)
-                
-                if is_tally:
-                    if st.button(t.get("approve_payment", "✅ Payment Received / Allow Delivery"), key=f"tally_aprv_{row['Order ID']}_{idx}", type="primary", use_container_width=True):
-                        try:
-                            cell = orders_sheet.find(row['Order ID'], in_column=1)
-                            orders_sheet.update_cell(cell.row, 5, 'Pending')
-                            
-                            try:
-                                tg_token = st.secrets.get("TELEGRAM_BOT_TOKEN")
-                                tg_chat_id = st.secrets.get("TELEGRAM_CHAT_ID")
-                                if tg_token and tg_chat_id:
-                                    # Format English items table
-                                    items_eng = ""
-                                    items_hi = ""
-                                    for chunk in str(row['Order Details']).split(" | "):
-                                        if ": " in chunk:
-                                            k, v = chunk.split(": ", 1)
-                                            items_eng += f"🔹 {k} | {v}\n"
-                                            items_hi += f"🔹 {hindi(k)} | {hindi(v)}\n"
-                                        else:
-                                            items_eng += f"🔹 {chunk}\n"
-                                            items_hi += f"🔹 {hindi(chunk)}\n"
-                                            
-                                    comp_text = f"✅ *PAYMENT RECEIVED / DELIVERY APPROVED* ✅\n\n🆔 {row['Order ID']}\n👤 {row['Customer Name']}\n\n📦 *ITEMS TO DELIVER:*\n{items_eng}\n👷 Approved By: {st.session_state.user_name}\n👑 Placed by: Super Admin"
-                                    comp_text += f"\n\n── हिंदी ──\n✅ *पेमेंट प्राप्त / डिलीवरी की अनुमति* ✅\n\n🆔 {row['Order ID']}\n👤 {hindi(str(row['Customer Name']))}\n\n📦 *डिलीवरी के लिए आइटम:*\n{items_hi}\n👷 स्वीकृत: {st.session_state.user_name}\n👑 द्वारा: सुपर एडमिन (Super Admin)"
-                                    encoded_comp = urllib.parse.quote(comp_text)
-                                    requests.get(f"https://api.telegram.org/bot{tg_token}/sendMessage?chat_id={tg_chat_id}&text={encoded_comp}")
-                            except: pass
-                            
-                            st.success(t.get("approve_success", "Order marked as pending for delivery!"))
-                            fetch_orders_cache.clear()
-                            st.rerun()
-                        except Exception as e: st.error(f"Error: {e}")
-
-                c1, c2 = st.columns([1, 1])
-                with c1:
-                    # 🟢 ADMIN DELIVERY OVERRIDE: Admin selects which employee completed the order
-                    if st.session_state.role == "Admin":
-                        admin_assign_key = f"admin_assign_{row['Order ID']}_{idx}"
-                        if st.button(t["mark_complete"], key=f"btn_{row['Order ID']}_{idx}"):
-                            st.session_state[admin_assign_key] = True
-                        
-                        if st.session_state.get(admin_assign_key, False):
-                            # Load employee names from Users sheet
-                            try:
-                                _users_data = fetch_basic_records(users_sheet, "Users")
-                                _emp_names = sorted(list(set([str(u.get('Name', '')).strip() for u in _users_data if str(u.get('Name', '')).strip()])))
-                            except:
-                                _emp_names = [st.session_state.user_name]
-                            
-                            completed_by_name = st.selectbox(
-                                "👷 Select who delivered this order:",
-                                _emp_names,
-                                key=f"assign_emp_{row['Order ID']}_{idx}"
-                            )
-                            if st.button("✅ Confirm Delivery", key=f"confirm_del_{row['Order ID']}_{idx}", type="primary"):
-                                try:
-                                    cell = orders_sheet.find(row['Order ID'], in_column=1)
-                                    orders_sheet.update_cell(cell.row, 5, 'Completed')
-                                    orders_sheet.update_cell(cell.row, 6, completed_by_name)
-                                    
-                                    try:
-                                        tg_token = st.secrets.get("TELEGRAM_BOT_TOKEN")
-                                        tg_chat_id = st.secrets.get("TELEGRAM_CHAT_ID")
-                                        if tg_token and tg_chat_id:
-                                            import re
-                                            total_units = 0.0
-                                            try:
-                                                det = str(row.get('Order Details', ''))
-                                                for m in re.finditer(r'[-—:]\s*([\d,.]+)\s*([a-zA-Z]+)', det):
-                                                    total_units += float(m.group(1).replace(',', ''))
-                                                if total_units == 0:
-                                                    for m in re.finditer(r'\b([\d,.]+)\s*(SQM|Pcs|Nos|Kgs|Ltrs|Mtrs|Units)\b', det, re.IGNORECASE):
-                                                        total_units += float(m.group(1).replace(',', ''))
-                                            except: pass
-                                            
-                                            tu_str = f"📦 Total Units: {total_units:g}\n" if total_units > 0 else ""
-                                            htu_str = f"📦 कुल यूनिट: {total_units:g}\n" if total_units > 0 else ""
-                                            
-                                            comp_text = f"✅ *ORDER COMPLETED* ✅\n\n🆔 {row['Order ID']}\n👤 {row['Customer Name']}\n{tu_str}👷 Completed By: {completed_by_name}\n👑 Assigned By: {st.session_state.user_name}"
-                                            comp_text += f"\n\n── हिंदी ──\n✅ *ऑर्डर पूरा* ✅\n\n🆔 {row['Order ID']}\n👤 {hindi(str(row['Customer Name']))}\n{htu_str}👷 पूरा किया: {completed_by_name}\n👑 द्वारा: {st.session_state.user_name}"
-                                            encoded_comp = urllib.parse.quote(comp_text)
-                                            requests.get(f"https://api.telegram.org/bot{tg_token}/sendMessage?chat_id={tg_chat_id}&text={encoded_comp}")
-                                    except: pass
-                                    
-                                    st.session_state[admin_assign_key] = False
-                                    st.success(t["order_completed"])
-                                    fetch_orders_cache.clear()
-                                    st.rerun()
-                                except Exception as e: st.error(f"Error: {e}")
-                    else:
-                        # Employee: instant complete under their own name
-                        if st.button(t["mark_complete"], key=f"btn_{row['Order ID']}_{idx}"):
-                            try:
-                                cell = orders_sheet.find(row['Order ID'], in_column=1)
-                                orders_sheet.update_cell(cell.row, 5, 'Completed')
-                                orders_sheet.update_cell(cell.row, 6, st.session_state.user_name)
-                                
-                                try:
-                                    tg_token = st.secrets.get("TELEGRAM_BOT_TOKEN")
-                                    tg_chat_id = st.secrets.get("TELEGRAM_CHAT_ID")
-                                    if tg_token and tg_chat_id:
-                                        import re
-                                        total_units = 0.0
-                                        try:
-                                            det = str(row.get('Order Details', ''))
-                                            for m in re.finditer(r'[-—:]\s*([\d,.]+)\s*([a-zA-Z]+)', det):
-                                                total_units += float(m.group(1).replace(',', ''))
-                                            if total_units == 0:
-                                                for m in re.finditer(r'\b([\d,.]+)\s*(SQM|Pcs|Nos|Kgs|Ltrs|Mtrs|Units)\b', det, re.IGNORECASE):
-                                                    total_units += float(m.group(1).replace(',', ''))
-                                        except: pass
-                                        
-                                        tu_str = f"📦 Total Units: {total_units:g}\n" if total_units > 0 else ""
-                                        htu_str = f"📦 कुल यूनिट: {total_units:g}\n" if total_units > 0 else ""
-
-                                        comp_text = f"✅ *ORDER COMPLETED* ✅\n\n🆔 {row['Order ID']}\n👤 {row['Customer Name']}\n{tu_str}👷 Completed By: {st.session_state.user_name}"
-                                        comp_text += f"\n\n── हिंदी ──\n✅ *ऑर्डर पूरा* ✅\n\n🆔 {row['Order ID']}\n👤 {hindi(str(row['Customer Name']))}\n{htu_str}👷 पूरा किया: {st.session_state.user_name}"
-                                        encoded_comp = urllib.parse.quote(comp_text)
-                                        requests.get(f"https://api.telegram.org/bot{tg_token}/sendMessage?chat_id={tg_chat_id}&text={encoded_comp}")
-                                except: pass
-                                
-                                st.success(t["order_completed"])
-                                fetch_orders_cache.clear()
-                                st.rerun()
-                            except Exception as e: st.error(f"Error: {e}")
-                with c2:
-                    pdf_data = create_order_pdf(row)
-                    st.download_button(t["share_pdf"], data=pdf_data, file_name=f"Order_{row['Order ID']}.pdf", mime="application/pdf", key=f"pdf_{row['Order ID']}_{idx}")
-
-                with st.expander(t["modify_delete"]):
-                    mod_cust = st.text_input(t["customer_name_label"], str(row['Customer Name']), key=f"mcust_{row['Order ID']}_{idx}")
-                    
-                    current_items = {}
-                    for chunk in str(row['Order Details']).split(" | "):
-                        if ": " in chunk:
-                            k, v = chunk.split(": ", 1)
-                            current_items[k.strip()] = v.strip()
-                            
-                    all_items = df['Item'].dropna().unique().tolist() if not df.empty else []
-                    for k in current_items.keys():
-                        if k not in all_items: all_items.append(k)
-                            
-                    st.write(t["modify_items"])
-                    mod_selected_items = st.multiselect(
-                        t["add_remove_items"],
-                        options=all_items,
-                        default=list(current_items.keys()),
-                        key=f"mitems_{row['Order ID']}_{idx}"
-                    )
-                    
-                    new_order_dict = {}
-                    for item in mod_selected_items:
-                        default_qty = current_items.get(item, "1.0 units")
-                        new_qty = st.text_input(t["qty_details_for"].format(item=item), value=default_qty, key=f"mqty_{row['Order ID']}_{idx}_{item}")
-                        new_order_dict[item] = new_qty
-                        
-                    mod_notes = st.text_input(t["notes_label"], str(row.get('Notes', '')), key=f"mnot_{row['Order ID']}_{idx}")
-                    
-                    ec1, ec2 = st.columns(2)
-                    with ec1:
-                        if st.button(t["save_changes"], type="primary", key=f"msave_{row['Order ID']}_{idx}"):
-                            reconstructed_details = " | ".join([f"{k}: {v}" for k, v in new_order_dict.items()])
-                            if not reconstructed_details:
-                                st.error("You must have at least one item in the order.")
-                            else:
-                                try:
-                                    cell = orders_sheet.find(row['Order ID'], in_column=1)
-                                    orders_sheet.update_cell(cell.row, 3, mod_cust)
-                                    orders_sheet.update_cell(cell.row, 4, reconstructed_details)
-                                    orders_sheet.update_cell(cell.row, 7, mod_notes)
-                                    st.success(t["order_updated"])
-                                    fetch_orders_cache.clear()
-                                    st.rerun()
-                                except Exception as e: st.error(t["failed_update"].format(err=e))
-                    with ec2:
-                        if st.button(t["delete_order"], key=f"mdel_{row['Order ID']}_{idx}"):
-                            try:
-                                cell = orders_sheet.find(row['Order ID'], in_column=1)
-                                orders_sheet.delete_rows(cell.row)
-                                st.warning(t["order_deleted"])
-                                fetch_orders_cache.clear()
-                                st.rerun()
-                            except Exception as e: st.error(t["failed_delete"].format(err=e))
-
-    with order_tab3:
-        if not orders_df.empty and 'Status' in orders_df.columns:
-            completed_df = orders_df[orders_df['Status'] == 'Completed'].copy()
-            completed_df['Parsed Date'] = pd.to_datetime(completed_df['Date'], format="%d-%m-%Y %I:%M %p", errors='coerce').dt.date
-            
-            with st.form(key="comp_search_form"):
-                fc1, fc2, fc3, fc4, fc5 = st.columns([3, 3, 2, 2, 1])
-                
-                with fc1:
-                    search_query = st.text_input(t["search_name_id"], placeholder=t["search_eg"], key="search_comp")
-                
-                with fc2:
-                    min_date = completed_df['Parsed Date'].dropna().min() if not completed_df['Parsed Date'].dropna().empty else datetime.today().date()
-                    max_date = completed_df['Parsed Date'].dropna().max() if not completed_df['Parsed Date'].dropna().empty else datetime.today().date()
-                    date_filter = st.date_input(t["date_range"], value=(), min_value=min_date, max_value=max_date, key="date_comp")
-                
-                with fc3:
-                    emp_list = [t["all_employees"]] + sorted(completed_df['Completed By'].dropna().unique().tolist())
-                    emp_filter = st.selectbox(t["completed_by"], emp_list, key="emp_comp")
-                    
-                with fc4:
-                    item_list = ([t["all_items_filter"]] + df['Item'].dropna().unique().tolist()) if not df.empty else [t["all_items_filter"]]
-                    item_filter = st.selectbox(t["contains_fabric"], item_list, key="item_comp")
-                
-                with fc5:
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    comp_search_submitted = st.form_submit_button("🔍", use_container_width=True)
-            filtered_df = completed_df.copy()
-            
-            if search_query:
-                filtered_df = filtered_df[
-                    filtered_df['Order ID'].astype(str).str.contains(search_query, case=False, na=False) |
-                    filtered_df['Customer Name'].astype(str).str.contains(search_query, case=False, na=False) |
-                    filtered_df['Notes'].astype(str).str.contains(search_query, case=False, na=False)
-                ]
-                
-            if isinstance(date_filter, tuple) and len(date_filter) == 2:
-                start_date, end_date = date_filter
-                filtered_df = filtered_df[(filtered_df['Parsed Date'] >= start_date) & (filtered_df['Parsed Date'] <= end_date)]
-                
-            if emp_filter != t["all_employees"]:
-                filtered_df = filtered_df[filtered_df['Completed By'] == emp_filter]
-                
-            if item_filter != t["all_items_filter"]:
-                filtered_df = filtered_df[filtered_df['Order Details'].astype(str).str.contains(item_filter, case=False, na=False)]
-
-            filtered_df = filtered_df.iloc[::-1]
-            st.markdown(f"<p style='color: #64748b; font-size: 14px;'>{t['showing_completed'].format(count=len(filtered_df))}</p>", unsafe_allow_html=True)
-
-            for idx, row in filtered_df.iterrows():
-                cb = row.get('Completed By', 'Unknown')
-                st.markdown(f'<div class="completed-card order-card"><h4 style="margin-top:0; color:#10b981;">Order {row["Order ID"]}</h4><b>Customer:</b> {hindi(str(row["Customer Name"]))}<br><b>Notes:</b> {hindi(str(row.get("Notes", "None")))}<br>{generate_html_table(row["Order Details"])}<hr><span style="color: #6c757d;">✅ Completed by: <b>{cb}</b> on {row.get("Date", "")}</span></div>', unsafe_allow_html=True)
-                
-                c1, c2 = st.columns([1, 1])
-                with c1:
-                    pdf_data = create_order_pdf(row)
-                    st.download_button(t["download_receipt"], data=pdf_data, file_name=f"Receipt_{row['Order ID']}.pdf", mime="application/pdf", key=f"pdf_comp_{row['Order ID']}_{idx}")
-                with c2:
-                    if st.session_state.role == "Admin":
-                        if st.button(t["delete_record"], key=f"del_comp_{row['Order ID']}_{idx}"):
-                            try:
-                                cell = orders_sheet.find(row['Order ID'], in_column=1)
-                                orders_sheet.delete_rows(cell.row)
-                                st.warning(t["record_deleted"])
-                                fetch_orders_cache.clear()
-                                st.rerun()
-                            except Exception as e: st.error(t["failed_delete"].format(err=e))
-
-# --- PAGE 3: STOCK AUDIT (EMPLOYEE VIEW) ---
-elif page == t["aud"]:
-    st.header(t["aud"])
-    
-    with st.expander(t["view_system_qty"]):
-        if not df.empty and all(c in df.columns for c in ['Group', 'Item', 'Quantity', 'Unit']):
-            st.dataframe(hindi_df_columns(df[['Group', 'Item', 'Quantity', 'Unit']].sort_values(["Group", "Quantity"], ascending=[True, False]), ['Group', 'Item']), use_container_width=True, hide_index=True)
-        else:
-            st.warning(t["stock_syncing"])
-    
-    if not audit_sheet:
-        st.error(t["audit_db_missing"])
-    else:
-        try:
-            audit_data = fetch_basic_records(audit_sheet, "Audit Logs")
-            audit_df = pd.DataFrame(audit_data)
-            if not audit_df.empty and 'Status' in audit_df.columns:
-                active_audit = audit_df[audit_df['Status'] == 'Active']
-            else:
-                active_audit = pd.DataFrame(columns=['Timestamp', 'Item Name', 'Location', 'Quantity Found', 'Employee Name', 'Status'])
-        except:
-            active_audit = pd.DataFrame(columns=['Timestamp', 'Item Name', 'Location', 'Quantity Found', 'Employee Name', 'Status'])
-
-        all_items = df['Item'].dropna().unique().tolist()
-        audited_items = active_audit['Item Name'].dropna().unique().tolist() if not active_audit.empty else []
-        remaining_items = [i for i in all_items if i not in audited_items]
-        
-        st.metric(t["audit_progress"], t["items_audited"].format(done=len(audited_items), total=len(all_items)))
-        st.progress(len(audited_items) / len(all_items) if len(all_items) > 0 else 0.0)
-        
-        st.divider()
-        st.write(t["count_batches"])
-
-        display_items = [hindi(i) for i in all_items] if st.session_state.get('app_lang') == 'Hindi' else all_items
-        display_to_real = dict(zip(display_items, all_items))
-        audit_item_display = st.selectbox(t["search_select_item"], display_items, index=None, placeholder=t["type_item_name"])
-        audit_item = display_to_real.get(audit_item_display) if audit_item_display else None
-        
-        if audit_item:
-            item_audits = active_audit[active_audit['Item Name'] == audit_item]
-            found_so_far = pd.to_numeric(item_audits['Quantity Found'], errors='coerce').sum() if not item_audits.empty else 0
-            
-            st.markdown(t["live_item_progress"])
-            if st.session_state.role == "Admin":
-                system_qty = df[df['Item'] == audit_item]['Quantity'].iloc[0] if not df.empty else 0
-                variance = found_so_far - system_qty
-                
-                c1, c2, c3 = st.columns(3)
-                c1.metric(t["system_expected"], f"{system_qty:,.0f}")
-                c2.metric(t["found_so_far"], f"{found_so_far:,.0f}")
-                c3.metric(t["variance"], f"{variance:,.0f}", delta_color="inverse")
-            else:
-                st.metric(t["found_so_far_yours"], f"{found_so_far:,.0f}")
-            
-            st.divider()
-            
-            st.subheader(t["log_batch"])
-            with st.form("audit_form", clear_on_submit=True):
-                loc = st.text_input(t["location_rack"], placeholder=t["location_rack_ph"])
-                qty = st.number_input(t["qty_found_here"], min_value=0.0, step=1.0)
-                submit_batch = st.form_submit_button(t["save_batch"], type="primary")
-                
-                if submit_batch:
-                    if qty <= 0:
-                        st.error(t["qty_negative"])
-                    else:
-                        timestamp = datetime.now(IST).strftime("%Y-%m-%d %H:%M:%S")
-                        try:
-                            audit_sheet.append_row([timestamp, audit_item, loc, qty, st.session_state.user_name, "Active"])
-                            st.success(t["logged_success"].format(qty=qty, item=audit_item))
-                            st.rerun()
-                        except Exception as e:
-                            st.error(t["failed_log_audit"].format(err=e))
-                            
-            if not item_audits.empty:
-                st.markdown(t["recent_entries"])
-                st.dataframe(item_audits[['Location', 'Quantity Found', 'Employee Name', 'Timestamp']].iloc[::-1], hide_index=True)
-
-        st.divider()
-        st.subheader(t["remaining_items"])
-        if remaining_items:
-            rem_df = df[df['Item'].isin(remaining_items)][['Group', 'Item']].sort_values(["Group", "Item"])
-            st.dataframe(hindi_df_columns(rem_df, ['Group', 'Item']), use_container_width=True, hide_index=True)
-        else:
-            st.success(t["all_audited"])
-
-# --- PAGE 4: AUDIT REPORT (ADMIN ONLY) ---
-elif page == t["rep"]:
-    st.header(t["rep"])
-    st.write(t["compare_counts"])
-    
-    if not audit_sheet:
-        st.error(t["audit_db_not_found"])
-    else:
-        try:
-            audit_data = fetch_basic_records(audit_sheet, "Audit Logs")
-            audit_df = pd.DataFrame(audit_data)
-        except:
-            audit_df = pd.DataFrame()
-            
-        if not audit_df.empty and 'Status' in audit_df.columns:
-            active_audit = audit_df[audit_df['Status'] == 'Active']
-            
-            if active_audit.empty:
-                st.info(t["no_active_audits"])
-            else:
-                active_audit['Quantity Found'] = pd.to_numeric(active_audit['Quantity Found'], errors='coerce')
-                summary_df = active_audit.groupby('Item Name')['Quantity Found'].sum().reset_index()
-                
-                report_data = []
-                for _, row in summary_df.iterrows():
-                    item = row['Item Name']
-                    physical_qty = row['Quantity Found']
-                    system_qty = df[df['Item'] == item]['Quantity'].iloc[0] if not df[df['Item'] == item].empty else 0
-                    variance = physical_qty - system_qty
-                    report_data.append({
-                        "Item": item,
-                        "System Expected": system_qty,
-                        "Physical Count": physical_qty,
-                        "Variance": variance
-                    })
-                
-                report_df = pd.DataFrame(report_data)
-                st.dataframe(
-                    report_df.style.map(lambda x: 'color: red;' if x < 0 else 'color: green;' if x > 0 else '', subset=['Variance']),
-                    use_container_width=True, hide_index=True
-                )
-                
-                st.divider()
-                st.subheader(t["archive_audit"])
-                st.warning(t["archive_warning"])
-                
-                if st.button(t["archive_btn"], type="primary"):
-                    try:
-                        cell_list = audit_sheet.findall("Active")
-                        for cell in cell_list:
-                            if cell.col == 6:
-                                audit_sheet.update_cell(cell.row, 6, "Closed")
-                        fetch_basic_records.clear()
-                        st.success(t["archive_success"])
-                        time.sleep(2)
-                        st.rerun()
-                    except Exception as e:
-                        st.error(t["failed_archive"].format(err=e))
-        else:
-            st.info(t["no_audit_logs"])
-
-# --- PAGE 5: AI RESTOCK ADVISOR (REMOVED FOR DATA PRIVACY) ---
-# Gemini AI page has been removed to prevent confidential stock/sales data
-# from being sent to external LLM servers.
-
-# --- PAGE 6: ADMIN DASHBOARD ---
-elif page == t["admin"]:
-    st.title(t["user_mgmt"])
-    with st.form("add_user_form"):
-        new_name, new_id, new_pass, new_role = st.text_input(t["full_name"]), st.text_input(t["user_id"]), st.text_input(t["password"], type="password"), st.selectbox(t["role_label"], ["Employee", "Admin"])
-        if st.form_submit_button(t["create_user_btn"]) and new_name and new_id and new_pass:
-            users_sheet.append_row([new_id, new_pass, new_role, new_name, "Active"])
-            st.success(t["user_created"])
-            fetch_basic_records.clear()
-            st.rerun()
-    
-    st.divider()
-    st.markdown("### 🔒 Employee Access Control")
-    st.caption("Revoking an employee will instantly log them out on their next screen interaction.")
-    
-    try:
-        users_data = fetch_basic_records(users_sheet, "Users")
-        if users_data:
-            df_users = pd.DataFrame(users_data)
-            df_users.columns = df_users.columns.astype(str).str.strip()
-            
-            headers = df_users.columns.tolist()
-            if 'Status' not in headers:
-                users_sheet.update_cell(1, len(headers) + 1, "Status")
-                headers.append("Status")
-                
-            status_col_idx = headers.index('Status') + 1
-            
-            for idx, row in df_users.iterrows():
-                u_id = str(row['User ID']).strip()
-                u_name = str(row['Name']).strip()
-                u_role = str(row['Role']).strip()
-                u_status = str(row.get('Status', 'Active')).strip()
-                
-                with st.container():
-                    c1, c2, c3, c4 = st.columns([2, 3, 2, 3])
-                    c1.markdown(f"**{u_id}**")
-                    c2.markdown(f"{u_name} ({u_role})")
-                    
-                    status_text = "🟢 Active" if u_status != 'Revoked' else "🔴 Revoked"
-                    c3.markdown(status_text)
-                    
-                    with c4:
-                        if u_id == st.session_state.user_id:
-                            st.caption("🛡️ Cannot revoke self")
-                        else:
-                            btn_label = "🚫 Set Revoked" if u_status != 'Revoked' else "✅ Set Active"
-                            btn_type = "secondary" if u_status != 'Revoked' else "primary"
-                            
-                            if st.button(btn_label, key=f"togg_usr_{u_id}", use_container_width=True, type=btn_type):
-                                new_val = "Revoked" if u_status != 'Revoked' else "Active"
-                                cell = users_sheet.find(u_id, in_column=1)
-                                users_sheet.update_cell(cell.row, status_col_idx, new_val)
-                                fetch_basic_records.clear()
-                                st.rerun()
-                    st.divider()
-    except Exception as e:
-        st.error(f"Failed to load user controls: {e}")
-
-    # --- 🗄️ DATABASE MAINTENANCE ---
-    st.divider()
-    st.markdown("### 🗄️ Database Maintenance")
-    st.caption("Move old completed orders to an archive sheet to keep the app fast and clean.")
-    
-    if st.button("📦 Archive Orders Older Than 30 Days", type="primary", use_container_width=True):
-        if not orders_sheet or not archive_sheet:
-            st.error("Cannot archive: Orders or Archived Orders sheet is missing.")
-        else:
-            try:
-                all_orders = orders_sheet.get_all_records(expected_headers=['Order ID'])
-                if not all_orders:
-                    st.info("No orders found to archive.")
-                else:
-                    cutoff = datetime.now() - timedelta(days=30)  # naive datetime to match strptime output
-                    rows_to_archive = []
-                    row_indices_to_delete = []  # 1-indexed (header = row 1)
-                    
-                    for i, row in enumerate(all_orders):
-                        if str(row.get('Status', '')).strip() == 'Completed':
-                            try:
-                                order_date = datetime.strptime(str(row.get('Date', '')).strip(), "%d-%m-%Y %I:%M %p")
-                                if order_date < cutoff:
-                                    rows_to_archive.append(list(row.values()))
-                                    row_indices_to_delete.append(i + 2)  # +2 because header=1, data starts at 2
-                            except Exception:
-                                pass  # Skip rows with unparseable dates
-                    
-                    if not rows_to_archive:
-                        st.info("No completed orders older than 30 days found.")
-                    else:
-                        # Step 1: Append to Archive
-                        archive_sheet.append_rows(rows_to_archive)
-                        
-                        # Step 2: Delete from Orders (reverse order to preserve indices)
-                        for row_idx in sorted(row_indices_to_delete, reverse=True):
-                            orders_sheet.delete_rows(row_idx)
-                        
-                        st.success(f"✅ Successfully archived {len(rows_to_archive)} old orders!")
-                        fetch_orders_cache.clear()
-                        st.rerun()
-            except Exception as e:
-                st.error(f"Archive failed: {e}")
-
-# --- PAGE 7: RENT TRACKER ---
-elif page == t["rent"]:
-    st.header(t["rent"])
-    
-    if tenants_sheet is None or rent_tx_sheet is None:
-        st.error(t["rent_db_error"])
-    else:
-        # 1. Fetch data safely using the new named caches
-        df_tenants_raw = fetch_rent_cache(tenants_sheet, "Tenants")
-        df_tx_raw = fetch_rent_cache(rent_tx_sheet, "Rent Transactions")
-
-        df_tenants = df_tenants_raw.copy()
-        df_tx = df_tx_raw.copy()
-        
-        # 🟢 OPTIMISTIC UI INJECTION FOR RENT TRACKER
-        if 'optimistic_rent_tx' not in st.session_state:
-            st.session_state.optimistic_rent_tx = []
-        if 'optimistic_tenants' not in st.session_state:
-            st.session_state.optimistic_tenants = []
-            
-        if st.session_state.optimistic_rent_tx:
-            opt_tx = pd.DataFrame(st.session_state.optimistic_rent_tx)
-            df_tx = pd.concat([df_tx, opt_tx], ignore_index=True)
-            
-        if st.session_state.optimistic_tenants:
-            opt_ten = pd.DataFrame(st.session_state.optimistic_tenants)
-            df_tenants = pd.concat([df_tenants, opt_ten], ignore_index=True)
-
-        # 2. Clean Headers (Remove invisible spaces)
-        if not df_tenants.empty: df_tenants.columns = df_tenants.columns.str.strip()
-        if not df_tx.empty: df_tx.columns = df_tx.columns.str.strip()
-
-        # 3. SAFETY NET: Auto-fill missing new columns so old data doesn't crash the app
-        if not df_tenants.empty:
-            if 'Billing Start Date' not in df_tenants.columns: df_tenants['Billing Start Date'] = datetime.now(IST).strftime('%Y-%m-%d')
-            if 'Pro Rata' not in df_tenants.columns: df_tenants['Pro Rata'] = 'Yes'
-            if 'Status' not in df_tenants.columns: df_tenants['Status'] = 'Active'
-
-        # 4. BULLETPROOF MATH CALCULATION
-        balances = {}
-        if not df_tenants.empty and not df_tx.empty and 'Amount' in df_tx.columns and 'Tenant Name' in df_tx.columns:
-            calc_tx = df_tx.copy()
-            calc_tx['Tenant Name'] = calc_tx['Tenant Name'].astype(str).str.strip()
-            calc_tx['Type'] = calc_tx['Type'].astype(str).str.strip()
-            
-            calc_tx['Safe Amount'] = calc_tx['Amount'].astype(str).str.replace(r'[^\d.]', '', regex=True)
-            calc_tx['Safe Amount'] = pd.to_numeric(calc_tx['Safe Amount'], errors='coerce').fillna(0.0)
-            
-            clean_tenants = df_tenants['Name'].astype(str).str.strip().dropna().unique()
-            
-            for t_name in clean_tenants:
-                t_tx = calc_tx[calc_tx['Tenant Name'] == t_name]
-                charges = t_tx[t_tx['Type'].str.contains('Charge', case=False, na=False)]['Safe Amount'].sum()
-                payments = t_tx[t_tx['Type'].str.contains('Payment', case=False, na=False)]['Safe Amount'].sum()
-                balances[t_name] = charges - payments
-                
-        elif not df_tenants.empty and 'Name' in df_tenants.columns:
-            for t_name in df_tenants['Name'].astype(str).str.strip().dropna().unique(): 
-                balances[t_name] = 0.0
-
-        tab1, tab2, tab3, tab4, tab5 = st.tabs([t["tab_balances"], t["tab_collect"], t["tab_bills"], t["tab_history"], t["tab_manage"]])
-
-        # TAB 1: DASHBOARD & BALANCES
-        # TAB 1: DASHBOARD & BALANCES
-        with tab1:
-            if not df_tenants.empty:
-                active_tenants = df_tenants[df_tenants['Status'] == 'Active']
-                vacated_tenants = df_tenants[df_tenants['Status'] == 'Vacated']
-                today = datetime.now(IST).date()
-                
-                # SMART BILLING REMINDER SYSTEM
-                reminders = []
-                for idx, row in active_tenants.iterrows():
-                    pr_status = str(row.get('Pro Rata', 'Yes')).strip()
-                    sd_str = str(row.get('Billing Start Date', str(today)))
-                    try: sd_date = datetime.strptime(sd_str, "%Y-%m-%d").date()
-                    except: sd_date = today
-                    
-                    due_day = 1 if pr_status == 'Yes' else sd_date.day
-                    if today.day == due_day:
-                        reminders.append(str(row['Name']).strip())
-                
-                if reminders:
-                    st.error(t["action_required"].format(names=', '.join(reminders)))
-                
-                st.subheader(t["active_tenants"])
-                if active_tenants.empty: st.info(t["no_active_tenants"])
-                
-                for idx, row in active_tenants.iterrows():
-                    t_name = str(row['Name']).strip()
-                    bal = balances.get(t_name, 0.0)
-                    
-                    # 🟢 THE NEW ADVANCE LOGIC
-                    if bal > 0:
-                        status_color = "#dc3545" # Red
-                        status_text = t["due_label"].format(amt=f"{bal:,.2f}")
-                    elif bal < 0:
-                        status_color = "#0284c7" # Blue
-                        status_text = t["advance_label"].format(amt=f"{abs(bal):,.2f}")
-                    else:
-                        status_color = "#10b981" # Green
-                        status_text = t["cleared_label"]
-                    
-                    try: sec_dep = float(row.get('Security Deposit', 0.0))
-                    except (ValueError, TypeError): sec_dep = 0.0
-                    
-                    pr_txt = t["first_of_month"] if str(row.get('Pro Rata', 'Yes')).strip() == 'Yes' else t["date_of_month"].format(day=datetime.strptime(str(row.get('Billing Start Date', str(today))), '%Y-%m-%d').day)
-                    
-                    st.markdown(f"""
-                    <div class="order-card">
-                        <h4 style="margin:0; color:#333;">{t_name} <span style="float:right; color:{status_color};">{status_text}</span></h4>
-                        <p style="margin:5px 0 0 0; color:#64748b;">
-                            📍 {row.get('Location', 'N/A')} | 🏠 Rent: ₹{row.get('Rent Amount', 0)} | ⚡ Elec: {row.get('Electricity Type', 'N/A')}<br>
-                            <span style="color: #0284c7; font-weight: 500;">🛡️ Security: ₹{sec_dep:,.2f}</span> | 📅 Cycle: {pr_txt}
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                if not vacated_tenants.empty:
-                    with st.expander(t["view_vacated"]):
-                        for idx, row in vacated_tenants.iterrows():
-                            t_name = str(row['Name']).strip()
-                            bal = balances.get(t_name, 0.0)
-                            
-                            # 🟢 ADVANCE LOGIC FOR VACATED TENANTS (Refunds)
-                            if bal > 0:
-                                color = "#dc3545"
-                                txt = t["pending_dues_label"].format(amt=f"{bal:,.2f}")
-                            elif bal < 0:
-                                color = "#0284c7"
-                                txt = t["refund_due_label"].format(amt=f"{abs(bal):,.2f}")
-                            else:
-                                color = "#6c757d"
-                                txt = t["settled_label"]
-                                
-                            st.markdown(f"**{t_name}** | {row.get('Location', '')} | <span style='color:{color}'>{txt}</span>", unsafe_allow_html=True)
-            else:
-                st.info(t["no_tenants_found"])
-
-        # TAB 2: COLLECT PAYMENT
-        with tab2:
-            st.subheader(t["record_payment"])
-            if not df_tenants.empty:
-                with st.form("payment_form", clear_on_submit=True):
-                    clean_tenant_names = df_tenants['Name'].astype(str).str.strip().tolist()
-                    p_tenant = st.selectbox(t["select_tenant"], clean_tenant_names)
-                    p_amt = st.number_input(t["payment_amount"], min_value=1.0, step=100.0)
-                    p_notes = st.text_input(t["payment_notes"])
-                    
-                    if st.form_submit_button(t["save_payment"], type="primary"):
-                        timestamp = datetime.now(IST).strftime("%d-%m-%Y %I:%M %p")
-                        rent_tx_sheet.append_row([timestamp, p_tenant, "Payment", "Rent", float(p_amt), "", p_notes, st.session_state.user_name])
-                        fetch_rent_cache.clear()
-                        
-                        # 🟢 OPTIMISTIC UI: Instant Update
-                        if 'optimistic_rent_tx' not in st.session_state: st.session_state.optimistic_rent_tx = []
-                        st.session_state.optimistic_rent_tx.append({"Date": timestamp, "Tenant Name": p_tenant, "Type": "Payment", "Category": "Rent", "Amount": float(p_amt), "Meter Details": "", "Notes": p_notes, "Recorded By": st.session_state.user_name})
-                        
-                        st.success(t["payment_recorded"].format(amt=p_amt, tenant=p_tenant))
-                        st.rerun()
-
-        # TAB 3: LOG BILLS (RENT & ELECTRICITY)
-        with tab3:
-            st.subheader(t["generate_charges"])
-            if not df_tenants.empty:
-                active_only = df_tenants[df_tenants['Status'] == 'Active'].copy()
-                if not active_only.empty:
-                    active_only['Name'] = active_only['Name'].astype(str).str.strip()
-                    bill_tenant = st.selectbox(t["select_tenant_bill"], active_only['Name'].tolist(), key="bill_t")
-                    t_data = active_only[active_only['Name'] == bill_tenant].iloc[0]
-                    
-                    c1, c2 = st.columns(2)
-                    with c1:
-                        st.markdown(t["rent_charge"])
-                        try: base_rent = float(t_data.get('Rent Amount', 0.0))
-                        except (ValueError, TypeError): base_rent = 0.0
-                        charge_rent = st.checkbox(t["apply_base_rent"].format(amt=base_rent), value=True)
-                    
-                    with c2:
-                        st.markdown(t["elec_charge"])
-                        e_type = str(t_data.get('Electricity Type', 'None')).strip()
-                        try: e_rate = float(t_data.get('Elec Rate', 0.0))
-                        except (ValueError, TypeError): e_rate = 0.0
-                        
-                        units = 0.0
-                        new_meter = 0.0
-                        e_amt_final = 0.0
-                        
-                        if str(t_data.get('Elec Paid By', '')).strip() == 'Company/Landlord' and e_type not in ['Fixed', 'Direct Bill (Lump Sum)']:
-                            st.info(t["elec_covered"])
-                            charge_elec = False
-                            
-                        elif e_type in ['Fixed', 'Direct Bill (Lump Sum)']:
-                            st.info(t["enter_meter_bill"])
-                            e_amt_input = st.number_input(t["lump_sum_elec"], min_value=0.0, step=100.0, value=0.0)
-                            charge_elec = st.checkbox(t["passthrough_bill"], value=True)
-                            e_amt_final = e_amt_input
-                            
-                        elif e_type in ['Variable', 'Variable (Meter)']:
-                            try: prev_meter = float(t_data.get('Meter Reading', 0.0))
-                            except (ValueError, TypeError): prev_meter = 0.0
-                            
-                            st.info(t["last_meter"].format(val=prev_meter))
-                            new_meter = st.number_input(t["current_meter"], min_value=prev_meter, step=1.0, value=prev_meter)
-                            units = new_meter - prev_meter
-                            st.write(t["calc_usage"].format(units=units, rate=e_rate))
-                            charge_elec = st.checkbox(t["apply_var_elec"], value=True)
-                            e_amt_final = e_rate * units
-                        else:
-                            st.write(t["no_elec_tracking"])
-                            charge_elec = False
-
-                    bill_notes = st.text_input(t["billing_month"], key="bill_n")
-
-                    if st.button(t["post_charges"], type="primary"):
-                        timestamp = datetime.now(IST).strftime("%d-%m-%Y %I:%M %p")
-                        try:
-                            if 'optimistic_rent_tx' not in st.session_state: st.session_state.optimistic_rent_tx = []
-                            
-                            if charge_rent:
-                                rent_tx_sheet.append_row([timestamp, bill_tenant, "Charge", "Rent", base_rent, "", bill_notes, st.session_state.user_name])
-                                st.session_state.optimistic_rent_tx.append({"Date": timestamp, "Tenant Name": bill_tenant, "Type": "Charge", "Category": "Rent", "Amount": float(base_rent), "Meter Details": "", "Notes": bill_notes, "Recorded By": st.session_state.user_name})
-                            
-                            if charge_elec and e_amt_final > 0:
-                                rent_tx_sheet.append_row([timestamp, bill_tenant, "Charge", "Electricity", float(e_amt_final), float(units) if units > 0 else "", bill_notes, st.session_state.user_name])
-                                st.session_state.optimistic_rent_tx.append({"Date": timestamp, "Tenant Name": bill_tenant, "Type": "Charge", "Category": "Electricity", "Amount": float(e_amt_final), "Meter Details": float(units) if units > 0 else "", "Notes": bill_notes, "Recorded By": st.session_state.user_name})
-                                if e_type in ['Variable', 'Variable (Meter)']:
-                                    t_cell = tenants_sheet.find(str(t_data['Tenant ID']), in_column=1)
-                                    tenants_sheet.update_cell(t_cell.row, 8, float(new_meter))
-                                        
-                            fetch_rent_cache.clear()
-                            st.success(t["charges_posted"])
-                            st.rerun()
-                        except Exception as e: st.error(t["error_posting"].format(err=e))
-                else:
-                    st.info(t["no_active_to_bill"])
-
-        # TAB 4: TRANSACTION HISTORY
-        with tab4:
-            st.subheader(t["ledger_history"])
-            if not df_tenants.empty and not df_tx.empty and 'Tenant Name' in df_tx.columns:
-                clean_tenant_list = df_tenants['Name'].astype(str).str.strip().tolist()
-                hist_tenant = st.selectbox(t["view_history_for"], [t["all_tenants_hist"]] + clean_tenant_list)
-                
-                hist_df = df_tx.copy()
-                hist_df['Tenant Name'] = hist_df['Tenant Name'].astype(str).str.strip()
-                
-                if hist_tenant != t["all_tenants_hist"]:
-                    hist_df = hist_df[hist_df['Tenant Name'] == hist_tenant]
-                
-                hist_df = hist_df.dropna(how='all')
-                hist_df = hist_df.iloc[::-1]
-                
-                if 'Type' in hist_df.columns:
-                    hist_df['Type'] = hist_df['Type'].astype(str).str.strip()
-                    st.dataframe(hist_df.style.map(lambda x: 'color: #dc3545; font-weight:bold;' if x == 'Charge' else 'color: #10b981; font-weight:bold;' if x == 'Payment' else '', subset=['Type']), use_container_width=True, hide_index=True)
-                else:
-                    st.dataframe(hist_df, use_container_width=True, hide_index=True)
-            else:
-                st.info(t["no_tx_history"])
-
-        # TAB 5: MANAGE TENANTS (Add/Edit)
-        with tab5:
-            with st.expander(t["add_tenant"], expanded=False):
-                with st.form("add_tenant_form", clear_on_submit=True):
-                    t_id = f"T-{uuid.uuid4().hex[:6].upper()}"
-                    nt_name = st.text_input(t["tenant_name"])
-                    nt_loc = st.text_input(t["location_unit"])
-                    
-                    c1, c2 = st.columns(2)
-                    with c1: nt_rent = st.number_input(t["monthly_rent"], min_value=0.0, step=500.0)
-                    with c2: nt_security = st.number_input(t["security_deposit"], min_value=0.0, step=500.0)
-                    
-                    st.write(t["elec_config"])
-                    nt_etype = st.selectbox(t["elec_billing_type"], ["Direct Bill (Lump Sum)", "Variable (Meter)", "None"])
-                    nt_erate = st.number_input(t["rate_per_unit"], min_value=0.0, step=1.0)
-                    nt_epaid = st.selectbox(t["elec_paid_by"], ["Tenant", "Company/Landlord"])
-                    
-                    nt_meter = 0.0
-                    if nt_etype == "Variable (Meter)":
-                        nt_meter = st.number_input(t["initial_meter"], min_value=0.0, step=1.0)
-                        
-                    st.divider()
-                    st.write(t["billing_cycle"])
-                    k1, k2 = st.columns(2)
-                    with k1: start_date = st.date_input(t["date_keys_given"])
-                    with k2: apply_prorata = st.selectbox(t["billing_logic"], [t["pro_rata_option"], t["fixed_cycle_option"]])
-                    pr_val = "Yes" if t["pro_rata_option"] in apply_prorata else "No"
-                    
-                    # 🟢 OPENING BALANCE (Paper-to-Digital Migration)
-                    st.divider()
-                    st.write("💰 **Opening Balance** (for migrating existing dues/advances)")
-                    ob1, ob2 = st.columns(2)
-                    with ob1: opening_balance = st.number_input("Opening Balance (₹)", min_value=0.0, step=500.0, value=0.0)
-                    with ob2: balance_type = st.selectbox("Balance Type", ["Tenant Owes (Due)", "Tenant Paid in Advance (Credit)"])
-                    
-                    if st.form_submit_button(t["create_tenant"], type="primary"):
-                        if nt_name:
-                            tenants_sheet.append_row([t_id, nt_name, nt_loc, float(nt_rent), nt_etype, float(nt_erate), nt_epaid, float(nt_meter), float(nt_security), str(start_date), pr_val, "Active"])
-                            
-                            if 'optimistic_tenants' not in st.session_state: st.session_state.optimistic_tenants = []
-                            st.session_state.optimistic_tenants.append({
-                                "Tenant ID": t_id, "Name": nt_name, "Location": nt_loc, "Rent Amount": float(nt_rent), 
-                                "Electricity Type": nt_etype, "Elec Rate": float(nt_erate), "Elec Paid By": nt_epaid, 
-                                "Meter Reading": float(nt_meter), "Security Deposit": float(nt_security), 
-                                "Billing Start Date": str(start_date), "Pro Rata": pr_val, "Status": "Active"
-                            })
-                            
-                            now = datetime.now(IST)
-                            timestamp = now.strftime("%d-%m-%Y %I:%M %p")
-                            if 'optimistic_rent_tx' not in st.session_state: st.session_state.optimistic_rent_tx = []
-                            
-                            # 🟢 LOG OPENING BALANCE as a transaction
-                            if opening_balance > 0:
-                                ob_type = "Charge" if balance_type == "Tenant Owes (Due)" else "Payment"
-                                ob_note = "Opening balance migrated from paper records"
-                                
-                                rent_tx_sheet.append_row([
-                                    timestamp, nt_name, ob_type, "Opening Balance", float(opening_balance), "",
-                                    ob_note, st.session_state.user_name
-                                ])
-                                st.session_state.optimistic_rent_tx.append({
-                                    "Date": timestamp, "Tenant Name": nt_name, "Type": ob_type, 
-                                    "Category": "Opening Balance", "Amount": float(opening_balance), 
-                                    "Meter Details": "", "Notes": ob_note, "Recorded By": st.session_state.user_name
-                                })
-                            
-                            # 🟢 PRO-RATA RENT (existing logic preserved)
-                            if pr_val == "Yes" and nt_rent > 0:
-                                days_in_month = calendar.monthrange(now.year, now.month)[1]
-                                days_active = days_in_month - start_date.day + 1
-                                pro_rata_rent = round((float(nt_rent) / days_in_month) * days_active, 2)
-                                
-                                rent_tx_sheet.append_row([
-                                    timestamp, nt_name, "Charge", "Rent (Pro-Rata)", float(pro_rata_rent), "",
-                                    f"Pro-rata rent for {days_active} days in {now.strftime('%b %Y')}", st.session_state.user_name
-                                ])
-                                st.session_state.optimistic_rent_tx.append({"Date": timestamp, "Tenant Name": nt_name, "Type": "Charge", "Category": "Rent (Pro-Rata)", "Amount": float(pro_rata_rent), "Meter Details": "", "Notes": f"Pro-rata rent...", "Recorded By": st.session_state.user_name})
-                                
-                                st.success(t["tenant_added_prorata"].format(amt=pro_rata_rent))
-                            else:
-                                st.success(t["tenant_added_fixed"].format(day=start_date.day))
-                                
-                            st.rerun()
-                        else: st.error(t["name_required"])
-            
-            st.markdown(t["edit_vacate"])
-            if not df_tenants.empty:
-                for idx, row in df_tenants.iterrows():
-                    curr_status = str(row.get('Status', 'Active')).strip()
-                    icon = "🟢" if curr_status == 'Active' else "🚪"
-                    with st.expander(f"{icon} {row['Name']} ({row.get('Location', '')})"):
-                        with st.form(f"edit_form_{idx}"):
-                            st.write(t["modify_details"])
-                            
-                            c1, c2 = st.columns(2)
-                            with c1: e_loc = st.text_input(t["location_label"], str(row.get('Location', '')))
-                            with c2: e_rent = st.number_input(t["monthly_rent_edit"], value=float(row.get('Rent Amount', 0.0)), step=500.0)
-                            
-                            e1, e2 = st.columns(2)
-                            old_etype = str(row.get('Electricity Type', 'None')).strip()
-                            etype_idx = 0 if old_etype in ['Fixed', 'Direct Bill (Lump Sum)'] else 1 if old_etype in ['Variable', 'Variable (Meter)'] else 2
-                            
-                            with e1: e_etype_new = st.selectbox(t["elec_type"], ["Direct Bill (Lump Sum)", "Variable (Meter)", "None"], index=etype_idx)
-                            with e2: e_rate = st.number_input(t["per_unit_rate"], value=float(row.get('Elec Rate', 0.0)), step=1.0)
-                            
-                            s1, s2, s3 = st.columns(3)
-                            with s1: e_sec = st.number_input(t["security_held"], value=float(row.get('Security Deposit', 0.0)), step=500.0)
-                            with s2: e_prorata = st.selectbox(t["pro_rata_q"], ["Yes", "No"], index=0 if str(row.get('Pro Rata', 'Yes')).strip() == 'Yes' else 1)
-                            with s3: e_status = st.selectbox(t["tenant_status"], ["Active", "Vacated"], index=0 if curr_status == 'Active' else 1)
-                            
-                            if st.form_submit_button(t["save_all"], type="primary"):
-                                try:
-                                    cell = tenants_sheet.find(str(row['Tenant ID']), in_column=1)
-                                    tenants_sheet.update_cell(cell.row, 3, e_loc)
-                                    tenants_sheet.update_cell(cell.row, 4, float(e_rent))
-                                    tenants_sheet.update_cell(cell.row, 5, e_etype_new)
-                                    tenants_sheet.update_cell(cell.row, 6, float(e_rate))
-                                    tenants_sheet.update_cell(cell.row, 9, float(e_sec))
-                                    tenants_sheet.update_cell(cell.row, 11, e_prorata)
-                                    tenants_sheet.update_cell(cell.row, 12, e_status)
-                                    fetch_rent_cache.clear()
-                                    
-                                    st.success(t["tenant_updated"].format(name=row['Name']))
-                                    st.rerun()
-                                except Exception as e:
-                                    st.error(t["error_updating"].format(err=e))
-
-# ==========================================
-# PAGE: 🧾 GENERATE INVOICE (ADMIN ONLY)
-# ==========================================
-elif page == "🧾 Generate Invoice":
-    if st.session_state.role == "Admin":
-        st.header("🧾 Generate Invoice")
-        st.caption("Manglam Tradelink — GST Invoice Generator")
-
-        # --- Load Next Invoice Number from Invoices sheet ---
-        next_inv_number = "GST/25-26/0001"
-        try:
-            if invoices_sheet:
-                inv_meta = invoices_sheet.get('N2')
-                if inv_meta and inv_meta[0]:
-                    next_inv_number = str(inv_meta[0][0]).strip()
-            else:
-                st.warning("⚠️ 'Invoices' sheet not found. Using default invoice number.")
-        except Exception as inv_err:
-            st.warning(f"⚠️ Could not load invoice number: {inv_err}")
-        st.info(f"📌 **Next Invoice Number:** `{next_inv_number}`")
-
-        st.divider()
-
-        # ==========================================
-        # SECTION 1: CUSTOMER SELECTION
-        # ==========================================
-        st.subheader("👤 Customer Details")
-
-        # Load Manglam Customers
-        manglam_customers = []
-        manglam_cust_df = pd.DataFrame()
-        if not manglam_cust_sheet:
-            st.warning("⚠️ 'Manglam Customers' sheet not found. Please check Google Sheets.")
-        else:
-            try:
-                mc_data = fetch_basic_records(manglam_cust_sheet, "Manglam Customers")
-                if mc_data:
-                    manglam_cust_df = pd.DataFrame(mc_data)
-                    manglam_cust_df.columns = manglam_cust_df.columns.astype(str).str.strip()
-                    # Robust column matching: find 'Customer Name' case-insensitively
-                    cust_name_col = None
-                    for col in manglam_cust_df.columns:
-                        if col.lower().replace(" ", "") in ("customername", "customer_name", "name", "customer"):
-                            cust_name_col = col
-                            break
-                    if cust_name_col:
-                        manglam_cust_df = manglam_cust_df.rename(columns={cust_name_col: "Customer Name"})
-                        manglam_customers = sorted(manglam_cust_df['Customer Name'].dropna().astype(str).str.strip().unique().tolist())
-                        manglam_customers = [c for c in manglam_customers if c]  # remove empty strings
-                    else:
-                        st.warning(f"⚠️ Could not find 'Customer Name' column. Found columns: {list(manglam_cust_df.columns)}")
-                else:
-                    st.info("ℹ️ 'Manglam Customers' sheet is empty. Add customers to the sheet first.")
-            except Exception as e:
-                st.error(f"❌ Error loading customer data: {e}")
-
-        create_new = st.toggle("➕ Create New Customer", value=False, key="inv_new_cust_toggle")
-
-        if create_new:
-            inv_cust_name = st.text_input("Customer Name", key="inv_new_name")
-            ic1, ic2 = st.columns(2)
-            with ic1:
-                inv_cust_addr = st.text_area("Billing Address", height=80, key="inv_new_addr")
-                inv_cust_gstin = st.text_input("GSTIN", key="inv_new_gstin")
-            with ic2:
-                inv_cust_pan = st.text_input("PAN", key="inv_new_pan")
-                inv_cust_contact = st.text_input("Contact Number", key="inv_new_contact")
-        else:
-            # Debounced searchable dropdown
-            if 'inv_search_term' not in st.session_state:
-                st.session_state.inv_search_term = ""
-
-            search_term = st.text_input("🔍 Search Customer", value=st.session_state.inv_search_term,
-                                        placeholder="Start typing to search...", key="inv_cust_search")
-
-            filtered_customers = manglam_customers
-            if search_term:
-                filtered_customers = [c for c in manglam_customers if search_term.lower() in c.lower()]
-
-            if filtered_customers:
-                selected_idx = st.selectbox("Select Customer", range(len(filtered_customers)),
-                                            format_func=lambda i: filtered_customers[i], key="inv_cust_select")
-                inv_cust_name = filtered_customers[selected_idx]
-
-                # Auto-fill from sheet data (robust column lookup)
-                cust_row = manglam_cust_df[manglam_cust_df['Customer Name'] == inv_cust_name]
-                if not cust_row.empty:
-                    _r = cust_row.iloc[0]
-                    _cols = {c.lower().strip(): c for c in manglam_cust_df.columns}
-                    def _get_col(keys, default=''):
-                        for k in keys:
-                            if k.lower() in _cols:
-                                return str(_r.get(_cols[k.lower()], default)).strip()
-                        return default
-                    inv_cust_addr = _get_col(['Address', 'Billing Address', 'address'])
-                    inv_cust_gstin = _get_col(['GSTIN', 'GST No', 'GST Number', 'gstin'])
-                    inv_cust_pan = _get_col(['PAN', 'PAN No', 'PAN Number', 'pan'])
-                    inv_cust_contact = _get_col(['Contact', 'Phone', 'Mobile', 'Contact Number', 'contact'])
-                else:
-                    inv_cust_addr = inv_cust_gstin = inv_cust_pan = inv_cust_contact = ""
-
-                with st.expander("📝 Customer Info (auto-filled)", expanded=False):
-                    st.text(f"Address: {inv_cust_addr}")
-                    st.text(f"GSTIN: {inv_cust_gstin}  |  PAN: {inv_cust_pan}  |  Contact: {inv_cust_contact}")
-            else:
-                st.warning("No customers found. Toggle 'Create New Customer' to add one.")
-                inv_cust_name = inv_cust_addr = inv_cust_gstin = inv_cust_pan = inv_cust_contact = ""
-
-        st.divider()
-
-        # ==========================================
-        # SECTION 1.25: SHIP TO ADDRESS (Optional)
-        # ==========================================
-        ship_to_different = st.checkbox("📦 Shipping Address is different from Billing Address", key="inv_ship_toggle")
-        ship_to_name = ""
-        ship_to_addr = ""
-        ship_to_gstin = ""
-        if ship_to_different:
-            st.subheader("📦 Ship To Details")
-            st1, st2 = st.columns(2)
-            with st1:
-                ship_to_name = st.text_input("Ship To Name", key="inv_ship_name")
-                ship_to_addr = st.text_area("Ship To Address", height=80, key="inv_ship_addr")
-            with st2:
-                ship_to_gstin = st.text_input("Ship To GSTIN", key="inv_ship_gstin")
-
-        st.divider()
-
-        # ==========================================
-        # SECTION 1.5: DISPATCH DETAILS (Optional)
-        # ==========================================
-        st.subheader("🚚 Dispatch Details (Optional)")
-        
-        # --- Load Transporters ---
-        transporter_names = []
-        trans_df = pd.DataFrame()
-        if manglam_trans_sheet:
-            try:
-                mt_data = fetch_basic_records(manglam_trans_sheet, "Manglam Transporters")
-                if mt_data:
-                    trans_df = pd.DataFrame(mt_data)
-                    trans_df.columns = trans_df.columns.astype(str).str.strip()
-                    if "Transporter Name" in trans_df.columns:
-                        transporter_names = trans_df["Transporter Name"].dropna().astype(str).str.strip().unique().tolist()
-                        transporter_names = [t for t in transporter_names if t]
-            except Exception as e:
-                st.warning(f"⚠️ Could not load transporters: {e}")
-
-        create_new_trans = st.toggle("➕ Add New Transporter", value=False, key="inv_new_trans_toggle")
-        
-        if create_new_trans:
-            nt1, nt2 = st.columns(2)
-            with nt1:
-                inv_transporter = st.text_input("Transporter Name", key="inv_new_trans_name")
-            with nt2:
-                inv_transporter_id = st.text_input("Transporter ID (GSTIN/Enrollment)", key="inv_new_trans_id")
-            
-            if st.button("💾 Save Transporter to List", type="secondary"):
-                if inv_transporter and manglam_trans_sheet:
-                    manglam_trans_sheet.append_row([inv_transporter, inv_transporter_id])
-                    st.success(f"✅ Added {inv_transporter} to the Transporters list!")
-                    fetch_basic_records.clear()
-                    st.rerun()
-                else:
-                    st.warning("Please enter a Transporter Name to save.")
-                    
-            disp1, disp2 = st.columns(2)
-        else:
-            disp_select, disp1, disp2 = st.columns(3)
-            with disp_select:
-                inv_transporter = st.selectbox("Select Transporter (Optional)", [""] + transporter_names, key="inv_transporter")
-                inv_transporter_id = ""
-                if inv_transporter and not trans_df.empty:
-                    match = trans_df[trans_df["Transporter Name"] == inv_transporter]
-                    if not match.empty:
-                        for col in match.columns:
-                            if 'id' in col.lower() or 'gstin' in col.lower():
-                                inv_transporter_id = str(match.iloc[0][col]).strip()
-                                break
-                if inv_transporter:
-                    st.caption(f"📌 Transporter ID: `{inv_transporter_id}`")
-                    
-        with disp1:
-            inv_eway_bill = st.text_input("e-Way Bill Number", key="inv_eway", placeholder="e.g. 1234 5678 9012")
-        with disp2:
-            inv_vehicle_no = st.text_input("Motor Vehicle Number", key="inv_vehicle", placeholder="e.g. DL 01 AB 1234")
-
-        st.divider()
-
-        # ==========================================
-        # SECTION 2: DYNAMIC ITEM CART
-        # ==========================================
-        st.subheader("🛒 Item Cart")
-
-        # --- Load Manglam Stock Data ---
-        manglam_stock_items = []
-        manglam_stock_df = pd.DataFrame()
-        if manglam_stock_sheet:
-            try:
-                ms_data = fetch_basic_records(manglam_stock_sheet, "Manglam Stock")
-                if ms_data:
-                    manglam_stock_df = pd.DataFrame(ms_data)
-                    manglam_stock_df.columns = manglam_stock_df.columns.astype(str).str.strip()
-                    # Normalize column names
-                    col_map = {}
-                    for col in manglam_stock_df.columns:
-                        cl = col.lower().replace(" ", "").replace("%", "")
-                        if "itemname" in cl or cl == "name": col_map[col] = "Item Name"
-                        elif "hsncode" in cl or cl == "hsn": col_map[col] = "HSN Code"
-                        elif "gstrate" in cl or "taxrate" in cl: col_map[col] = "GST Rate %"
-                        elif "avgrate" in cl or "averagerate" in cl: col_map[col] = "Avg Rate"
-                        elif "closingqty" in cl or "qty" in cl: col_map[col] = "Closing Qty"
-                        elif "unit" in cl: col_map[col] = "Unit"
-                    manglam_stock_df = manglam_stock_df.rename(columns=col_map)
-                    
-                    if "Item Name" in manglam_stock_df.columns:
-                        # Convert qty to float for sorting & filtering
-                        def _parse_qty(q):
-                            try: return float(str(q).replace(',', ''))
-                            except: return 0.0
-                        
-                        manglam_stock_df["_sort_qty"] = manglam_stock_df.get("Closing Qty", 0).apply(_parse_qty)
-                        
-                        # Filter out exactly zero stock
-                        valid_stock = manglam_stock_df[manglam_stock_df["_sort_qty"] != 0.0].copy()
-                        
-                        # Sort: positive ascending (or descending, user didn't specify, let's do descending for largest first), then negative
-                        pos_stock = valid_stock[valid_stock["_sort_qty"] > 0].sort_values(by="_sort_qty", ascending=False)
-                        neg_stock = valid_stock[valid_stock["_sort_qty"] < 0].sort_values(by="_sort_qty", ascending=True)
-                        
-                        manglam_stock_items = pos_stock["Item Name"].tolist() + neg_stock["Item Name"].tolist()
-                        manglam_stock_items = [str(s).strip() for s in manglam_stock_items if str(s).strip()]
-            except Exception as stock_err:
-                st.warning(f"⚠️ Could not load stock data: {stock_err}")
-
-        # --- Auto-detect GST Type from Customer GSTIN ---
-        auto_gst_type = "Intra State (CGST + SGST)"  # Default: Delhi
-        try:
-            if inv_cust_gstin and isinstance(inv_cust_gstin, str):
-                g_str = inv_cust_gstin.strip()
-                if len(g_str) >= 2:
-                    state_code = g_str[:2]
-                    # '07' is Delhi, '09' UP, '06' Haryana, etc. 
-                    if state_code != "07":
-                        auto_gst_type = "Inter State (IGST)"
-        except:
-            pass
-
-        if 'invoice_items' not in st.session_state:
-            st.session_state.invoice_items = []
-        if 'inv_form_counter' not in st.session_state:
-            st.session_state.inv_form_counter = 0
-
-        # --- Item Selection (outside form for real-time filtering) ---
-        manual_entry = st.toggle("✏️ Manual Entry (item not in stock list)", value=False, key="inv_manual_toggle")
-
-        # Initialize defaults
-        default_hsn = ""
-        default_rate = 0.0
-        default_gst = 18
-        default_unit = "SQM"
-        item_name = ""
-
-        if not manual_entry and manglam_stock_items:
-            # Type-to-filter: single text input that filters the dropdown
-            item_search = st.text_input("🔍 Type Item Name", key="inv_stock_search",
-                                        placeholder="Start typing to find items...")
-
-            # Filter items as user types
-            if item_search:
-                filtered_items = [s for s in manglam_stock_items if item_search.lower() in s.lower()]
-            else:
-                filtered_items = manglam_stock_items
-
-            if filtered_items:
-                # Build display labels with stock info and avg price
-                def _stock_label(name):
-                    row = manglam_stock_df[manglam_stock_df["Item Name"] == name]
-                    if not row.empty:
-                        r = row.iloc[0]
-                        try: qty = float(str(r.get("Closing Qty", "0")).replace(",", ""))
-                        except: qty = 0.0
-                        try: rate = float(str(r.get("Avg Rate", "0")).replace(",", ""))
-                        except: rate = 0.0
-                        unit = str(r.get("Unit", "")).strip() or "units"
-                        return f"{name}  —  📦 {qty:,.0f} {unit} | ₹{rate:,.2f}"
-                    return name
-
-                sel_idx = st.selectbox(
-                    "Select Item", range(len(filtered_items)),
-                    format_func=lambda i: _stock_label(filtered_items[i]),
-                    key="inv_stock_select"
-                )
-                item_name = filtered_items[sel_idx]
-
-                # Auto-fill defaults from stock data
-                stock_row = manglam_stock_df[manglam_stock_df["Item Name"] == item_name]
-                if not stock_row.empty:
-                    _sr = stock_row.iloc[0]
-                    default_hsn = str(_sr.get("HSN Code", "")).strip()
-                    default_unit = str(_sr.get("Unit", "SQM")).strip() or "SQM"
-                    try: default_rate = float(str(_sr.get("Avg Rate", "0")).replace(",", ""))
-                    except: default_rate = 0.0
-                    try: default_gst = int(float(str(_sr.get("GST Rate %", "18")).replace(",", "")))
-                    except: default_gst = 18
-                    
-                    # Apply specific GST overrides based on HSN criteria
-                    if default_hsn.startswith("5903") or default_hsn.startswith("5407"):
-                        default_gst = 5
-                    elif default_hsn.startswith("3920") or default_hsn.startswith("4202"):
-                        default_gst = 18
-            else:
-                st.warning("No items match. Try a different term or toggle Manual Entry.")
-
-        # --- Form for qty, rate, GST (submits the item to cart) ---
-        # We use dynamic keys based on item_name and a form counter to force Streamlit to update/clear the widgets
-        fc = st.session_state.inv_form_counter
-        dyn_suffix = f"_{sel_idx}_{fc}" if not manual_entry and manglam_stock_items and 'sel_idx' in locals() else f"_manual_{fc}"
-        
-        qty_key = f"inv_qty{dyn_suffix}"
-        rate_key = f"inv_rate{dyn_suffix}"
-        tot_key = f"inv_tot{dyn_suffix}"
-        
-        # Initialize default values in session state if this is a fresh dynamic key
-        if qty_key not in st.session_state: st.session_state[qty_key] = 0.0
-        if rate_key not in st.session_state: st.session_state[rate_key] = default_rate if 'default_rate' in locals() else 0.0
-        if tot_key not in st.session_state: st.session_state[tot_key] = 0.0
-        
-        def calc_total():
-            st.session_state[tot_key] = st.session_state[qty_key] * st.session_state[rate_key]
-            
-        def calc_rate():
-            if st.session_state[qty_key] > 0:
-                st.session_state[rate_key] = st.session_state[tot_key] / st.session_state[qty_key]
-            else:
-                st.session_state[rate_key] = 0.0
-        
-        st.markdown("<div style='padding:15px; border:1px solid var(--secondary-background-color); border-radius:10px; margin-bottom: 20px; background: var(--secondary-background-color);'>", unsafe_allow_html=True)
-        st.markdown("##### ➕ Add Item Details")
-        
-        if manual_entry or not manglam_stock_items:
-            item_name = st.text_input("Item Name", key=f"inv_item_name{dyn_suffix}")
-            hsn_code = st.text_input("HSN / SAC Code", key=f"inv_hsn{dyn_suffix}")
-            ai3, ai4, ai5 = st.columns(3)
-            with ai3:
-                item_qty = st.number_input("Quantity", min_value=0.0, step=1.0, format="%.2f", key=qty_key, on_change=calc_total)
-            with ai4:
-                item_rate = st.number_input("Rate per Unit (₹)", min_value=0.0, step=0.5, format="%.2f", key=rate_key, on_change=calc_total)
-            with ai5:
-                item_total = st.number_input("Total Value (₹) [Auto-Updates Rate]", min_value=0.0, step=1.0, format="%.2f", key=tot_key, on_change=calc_rate)
-        else:
-            if item_name:
-                st.markdown(f"**Selected:** `{item_name}`")
-            ai1, ai2 = st.columns(2)
-            with ai1:
-                hsn_code = st.text_input("HSN / SAC Code", value=default_hsn, key=f"inv_hsn{dyn_suffix}")
-            with ai2:
-                item_unit = st.text_input("Unit", value=default_unit, key=f"inv_unit{dyn_suffix}")
-            ai3, ai4, ai5 = st.columns(3)
-            with ai3:
-                item_qty = st.number_input("Quantity", min_value=0.0, step=1.0, format="%.2f", key=qty_key, on_change=calc_total)
-            with ai4:
-                item_rate = st.number_input("Rate per Unit (₹)", min_value=0.0, step=0.5, format="%.2f", key=rate_key, on_change=calc_total)
-            with ai5:
-                item_total = st.number_input("Total Value (₹) [Auto-Updates Rate]", min_value=0.0, step=1.0, format="%.2f", key=tot_key, on_change=calc_rate)
-
-        g1, g2 = st.columns(2)
-        with g1:
-            gst_options = ["Intra State (CGST + SGST)", "Inter State (IGST)"]
-            gst_default_idx = gst_options.index(auto_gst_type) if auto_gst_type in gst_options else 0
-            gst_type = st.selectbox("GST Type (auto-detected)", gst_options, index=gst_default_idx, key=f"inv_gst_type{dyn_suffix}")
-        with g2:
-            gst_choices = [5, 12, 18, 28]
-            gst_default_pct_idx = gst_choices.index(default_gst) if default_gst in gst_choices else 2
-            gst_percent = st.selectbox("GST %", gst_choices, index=gst_default_pct_idx, key=f"inv_gst_pct{dyn_suffix}")
-
-        add_item_btn = st.button("➕ Add Item to Cart", type="primary")
-
-        if add_item_btn and item_name and item_qty > 0 and item_rate > 0:
-            st.session_state.invoice_items.append({
-                "name": item_name,
-                "hsn": hsn_code,
-                "qty": item_qty,
-                "rate": item_rate,
-                "gst_type": gst_type,
-                "gst_pct": gst_percent,
-                "unit": item_unit if 'item_unit' in locals() else "SQM"
-            })
-            st.session_state.inv_form_counter += 1
-            st.rerun()
-            
-        st.markdown("</div>", unsafe_allow_html=True)
-
-        # Display Cart Table
-        if st.session_state.invoice_items:
-            st.write("**Current Items:**")
-            cart_html = "<table class='order-table'><tr><th>#</th><th>Item</th><th>HSN</th><th>Qty</th><th>Rate</th><th>Taxable</th><th>GST</th><th>Total</th><th></th></tr>"
-            for idx, itm in enumerate(st.session_state.invoice_items):
-                taxable = itm['qty'] * itm['rate']
-                gst_amt = taxable * itm['gst_pct'] / 100
-                line_total = taxable + gst_amt
-                cart_html += f"<tr><td>{idx+1}</td><td><b>{itm['name']}</b></td><td>{itm['hsn']}</td><td>{itm['qty']:.2f}</td><td>₹{itm['rate']:.2f}</td><td>₹{taxable:,.2f}</td><td>{itm['gst_pct']}%</td><td>₹{line_total:,.2f}</td><td></td></tr>"
-            cart_html += "</table>"
-            st.markdown(cart_html, unsafe_allow_html=True)
-
-            # Remove item buttons
-            remove_cols = st.columns(min(len(st.session_state.invoice_items), 6))
-            for idx, itm in enumerate(st.session_state.invoice_items):
-                col_idx = idx % len(remove_cols)
-                with remove_cols[col_idx]:
-                    if st.button(f"❌ {itm['name'][:15]}", key=f"rm_inv_{idx}"):
-                        st.session_state.invoice_items.pop(idx)
-                        st.rerun()
-        else:
-            st.info("Cart is empty. Add items using the form above.")
-
-        st.divider()
-
-        # ==========================================
-        # SECTION 3: LIVE CALCULATIONS
-        # ==========================================
-        st.subheader("💰 Invoice Summary")
-
-        subtotal = 0.0
-        total_cgst = 0.0
-        total_sgst = 0.0
-        total_igst = 0.0
-
-        for itm in st.session_state.invoice_items:
-            taxable = itm['qty'] * itm['rate']
-            subtotal += taxable
-            gst_amt = taxable * itm['gst_pct'] / 100
-            if 'Intra State' in itm['gst_type']:
-                total_cgst += gst_amt / 2
-                total_sgst += gst_amt / 2
-            else:
-                total_igst += gst_amt
-
-        exact_total = subtotal + total_cgst + total_sgst + total_igst
-        grand_total = round(exact_total)
-        round_off = grand_total - exact_total
-
-        s1, s2, s3 = st.columns(3)
-        s1.metric("Subtotal", f"₹{subtotal:,.2f}")
-        s2.metric("CGST", f"₹{total_cgst:,.2f}")
-        s3.metric("SGST", f"₹{total_sgst:,.2f}")
-
-        s4, s5, s6 = st.columns(3)
-        s4.metric("IGST", f"₹{total_igst:,.2f}")
-        s5.metric("Round Off", f"₹{round_off:,.2f}")
-        s6.metric("🎯 Grand Total", f"₹{grand_total:,.2f}")
-
-        # ==========================================
-        # NIC E-WAY BILL PRE-FLIGHT (Before Saving)
-        # ==========================================
-        st.divider()
-        with st.expander("🚛 Generate E-Way Bill JSON (Pre-Flight)", expanded=False):
-            st.caption("You can download the JSON payload to upload to the NIC E-Way Bill portal before finalizing the invoice. Item quantities are intentionally omitted.")
-
-            _eway_items = []
-            for _idx, _itm in enumerate(st.session_state.invoice_items, 1):
-                _taxable = _itm["qty"] * _itm["rate"]
-                _gst_pct = _itm["gst_pct"]
-                _is_local = "Intra State" in _itm["gst_type"]
-                _eway_items.append({
-                    "itemNo": _idx,
-                    "productName": _itm["name"],
-                    "productDesc": _itm["name"],
-                    "hsnCode": int(_itm["hsn"]) if str(_itm["hsn"]).isdigit() else _itm["hsn"],
-                    "taxableAmount": round(_taxable, 2),
-                    "cgstRate": round(_gst_pct / 2, 2) if _is_local else 0,
-                    "sgstRate": round(_gst_pct / 2, 2) if _is_local else 0,
-                    "igstRate": round(_gst_pct, 2) if not _is_local else 0,
-                    "cessRate": 0,
-                    "cessAdvol": 0
-                })
-
-            _eway_payload = {
-                "supplyType": "O",
-                "subSupplyType": "1",
-                "docType": "INV",
-                "docNo": "DRAFT",
-                "docDate": datetime.now(IST).strftime("%d/%m/%Y"),
-                "fromGstin": "07AEFPG3543M1ZF",
-                "fromTrdName": "MANGLAM TRADELINK",
-                "fromAddr1": "6147/2, Gali Gurudwara, Nabi Karim",
-                "fromAddr2": "Delhi 110055",
-                "fromPlace": "Delhi",
-                "fromPincode": 110055,
-                "fromStateCode": 7,
-                "toGstin": inv_cust_gstin or "URP",
-                "toTrdName": inv_cust_name,
-                "toAddr1": (ship_to_addr or inv_cust_addr).split('\n')[0] if (ship_to_addr or inv_cust_addr) else "",
-                "toAddr2": "",
-                "toPlace": "Delhi",
-                "toPincode": 0,
-                "toStateCode": 7,
-                "totalValue": round(subtotal, 2),
-                "cgstValue": round(total_cgst, 2),
-                "sgstValue": round(total_sgst, 2),
-                "igstValue": round(total_igst, 2),
-                "cessValue": 0,
-                "totInvValue": grand_total,
-                "transMode": "1",
-                "transDistance": "",
-                "transporterName": inv_transporter if 'inv_transporter' in locals() else "",
-                "transporterId": inv_transporter_id if 'inv_transporter_id' in locals() else "",
-                "transDocNo": "",
-                "transDocDate": "",
-                "vehicleNo": inv_vehicle_no or "",
-                "vehicleType": "R",
-                "itemList": _eway_items
-            }
-            
-            import json as _json_pre
-            _eway_json_str = _json_pre.dumps(_eway_payload, indent=2, ensure_ascii=False)
-            
-            edited_eway_json = st.text_area(
-                "📝 Edit payload if needed:",
-                value=_eway_json_str,
-                height=250,
-                key="eway_json_editor_preflight"
-            )
-            
-            st.download_button(
-                label="⬇️ Download E-Way Bill JSON",
-                data=edited_eway_json.encode('utf-8'),
-                file_name=f"EwayBill_DRAFT_{datetime.now(IST).strftime('%Y%m%d%H%M')}.json",
-                mime="application/json",
-                use_container_width=True
-            )
-
-        st.divider()
-
-        # ==========================================
-        # SECTION 4: GENERATE & SAVE
-        # ==========================================
-        if st.button("🧾 Generate & Save Invoice", type="primary", use_container_width=True):
-            if not inv_cust_name:
-                st.error("Please select or enter a customer name.")
-            elif not st.session_state.invoice_items:
-                st.error("Please add at least one item to the cart.")
-            else:
-                try:
-                    import json as _json
-                    inv_date = datetime.now(IST).strftime("%d-%m-%Y %I:%M %p")
-                    inv_date_short = datetime.now(IST).strftime("%d-%b-%Y")
-                    items_json = _json.dumps(st.session_state.invoice_items, ensure_ascii=False)
-
-                    # Append row to Invoices sheet (includes Ship To fields)
-                    inv_row = [
-                        next_inv_number,
-                        inv_date,
-                        inv_cust_name,
-                        inv_cust_addr,
-                        inv_cust_gstin,
-                        items_json,
-                        round(subtotal, 2),
-                        round(total_cgst, 2),
-                        round(total_sgst, 2),
-                        round(total_igst, 2),
-                        round(round_off, 2),
-                        grand_total,
-                        st.session_state.user_name,
-                        "",  # N = Next Invoice Number (managed by sync)
-                        "",  # O = Last Synced (managed by sync)
-                        ship_to_name,    # P = Ship To Name
-                        ship_to_addr,    # Q = Ship To Address
-                        ship_to_gstin    # R = Ship To GSTIN
-                    ]
-
-                    if invoices_sheet:
-                        invoices_sheet.append_row(inv_row, value_input_option='USER_ENTERED')
-
-                        # Increment the Next Invoice Number in the sheet
-                        import re as _re
-                        num_match = _re.search(r'(.*?)(\d+)$', next_inv_number)
-                        if num_match:
-                            prefix = num_match.group(1)
-                            current_num = int(num_match.group(2))
-                            num_width = len(num_match.group(2))
-                            new_next = f"{prefix}{str(current_num + 1).zfill(num_width)}"
-                            invoices_sheet.update(values=[[new_next]], range_name='N2')
-                            invoices_sheet.update(values=[[inv_date]], range_name='O2')
-
-                        st.success(f"✅ Invoice **{next_inv_number}** saved successfully!")
-
-                        # --- Generate PDF for download ---
-                        try:
-                            from generate_invoice_pdf import generate_invoice as _gen_pdf
-
-                            # Determine dominant GST rates for the PDF summary
-                            _cgst_pct = ""
-                            _sgst_pct = ""
-                            _igst_pct = ""
-                            for _itm in st.session_state.invoice_items:
-                                if "Intra State" in _itm["gst_type"]:
-                                    _cgst_pct = str(_itm["gst_pct"] // 2)
-                                    _sgst_pct = str(_itm["gst_pct"] // 2)
-                                else:
-                                    _igst_pct = str(_itm["gst_pct"])
-
-                            pdf_data = {
-                                "buyer_name": inv_cust_name,
-                                "buyer_address": inv_cust_addr,
-                                "buyer_gstin": inv_cust_gstin,
-                                "buyer_pan": inv_cust_pan if 'inv_cust_pan' in dir() else "",
-                                "buyer_state": "Delhi",
-                                "buyer_state_code": "07",
-                                "place_of_supply": "Delhi",
-                                "buyer_contact": inv_cust_contact if 'inv_cust_contact' in dir() else "",
-                                "invoice_no": next_inv_number,
-                                "invoice_date": inv_date_short,
-                                "payment_terms": "",
-                                "other_ref": "",
-                                "despatched_through": "",
-                                "destination": "",
-                                "eway_bill_no": inv_eway_bill,
-                                "vehicle_no": inv_vehicle_no,
-                                "ship_to_name": ship_to_name,
-                                "ship_to_address": ship_to_addr,
-                                "ship_to_gstin": ship_to_gstin,
-                                "items": [{
-                                    "name": i["name"], "hsn": i["hsn"],
-                                    "qty": i["qty"], "rate": i["rate"],
-                                    "unit": i.get("unit", "SQM"), "per": i.get("unit", "SQM"),
-                                    "gst_pct": i["gst_pct"], "gst_type": i["gst_type"]
-                                } for i in st.session_state.invoice_items],
-                                "subtotal": round(subtotal, 2),
-                                "cgst": round(total_cgst, 2),
-                                "sgst": round(total_sgst, 2),
-                                "igst": round(total_igst, 2),
-                                "cgst_pct": _cgst_pct,
-                                "sgst_pct": _sgst_pct,
-                                "igst_pct": _igst_pct,
-                                "round_off": round(round_off, 2),
-                                "grand_total": grand_total,
-                            }
-                            # Fix for fpdf string vs bytearray outputs
-                            pdf_bytes = bytes(_gen_pdf(pdf_data))
-
-                            st.download_button(
-                                label="📄 Download Invoice PDF",
-                                data=pdf_bytes,
-                                file_name=f"Invoice_{next_inv_number.replace('/', '-')}.pdf",
-                                mime="application/pdf",
-                                use_container_width=True
-                            )
-                        except Exception as pdf_err:
-                            st.warning(f"⚠️ PDF generation failed: {pdf_err}")
+# 📴 CACHED-DATA BANNER: filled after the page ran, naming only the tabs it was actually shown from a snapshot
+offline_banner = st.empty()
 
+st.divider()
 
+# ⏱️ Page body span -- closed at the end of the script (or by the next rerun after st.rerun()/st.stop())
+PROFILER.set_page(page)
+page_span = PROFILER.open(f"page: {page}")
 
-                    else:
-                        st.error("Invoices sheet not found. Please run the sync script first.")
+# 🟢 LAZY PAGES: only the open page's script (app_pages/) is compiled and run on this rerun
+run_page(page, t, globals())
 
-                except Exception as e:
-                    st.error(f"Failed to save invoice: {e}")
-
-    else:
-        st.error("🚫 Access Denied. This page is for Admins only.")
+sync_errors = sheet_mirror.errors()
+for name, (_, from_snapshot) in list(cached_fallbacks.items()):
+    if not from_snapshot and name not in sync_errors: cached_fallbacks.pop(name, None) # Synced again since
+if cached_fallbacks:
+    cached_tabs = ", ".join(f"{name} (as of {datetime.fromtimestamp(at, IST).strftime('%d %b %I:%M %p')})" if at else name
+                            for name, (at, _) in sorted(cached_fallbacks.items()))
+    offline_banner.warning(f"📴 Google Sheets could not be reached — showing cached data for {cached_tabs}. Saving may fail until the connection is back.")
 
 # ==========================================
-# PAGE: 📁 SAVED INVOICES (ADMIN ONLY)
+# ⏱️ RERUN PROFILER (ADMIN ONLY): where did this rerun's time go?
 # ==========================================
-elif page == "📁 Saved Invoices":
-    if st.session_state.role == "Admin":
-        st.header("📁 Saved Invoices")
-        st.caption("View or Delete previously generated invoices.")
-        
-        if invoices_sheet:
-            inv_data = invoices_sheet.get_all_records()
-            if inv_data:
-                inv_df = pd.DataFrame(inv_data)
-                # We need the physical row number to delete/edit rows starting from 2
-                inv_df["_Row"] = range(2, len(inv_df) + 2)
-                
-                if "Invoice Number" in inv_df.columns:
-                    # Sort list newest top
-                    inv_df = inv_df.sort_values(by="_Row", ascending=False).copy()
-                    
-                    st.dataframe(inv_df.drop(columns=["_Row", "Items JSON"], errors='ignore'), use_container_width=True)
-                    
-                    st.divider()
-                    st.subheader("Manage Invoice")
-                    
-                    action_inv = st.selectbox("Select Invoice to Manage", inv_df["Invoice Number"].tolist())
-                    
-                    if action_inv:
-                        sel_row = inv_df[inv_df["Invoice Number"] == action_inv].iloc[0]
-                        row_idx = int(sel_row["_Row"])
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            if st.button(f"🗑️ Delete {action_inv}", type="primary"):
-                                invoices_sheet.delete_rows(row_idx)
-                                st.success(f"Invoice {action_inv} deleted successfully!")
-                                st.rerun()
-                            st.caption("WARNING: Deleting this row will remove it forever.")
-                        with col2:
-                            if st.button("🗑️ Delete All Invoices", type="secondary"):
-                                # Clear all data rows (keep header)
-                                invoices_sheet.resize(rows=1)
-                                invoices_sheet.resize(rows=500)
-                                st.toast("All invoices deleted!")
-                                st.rerun()
-                            st.info("Edit functionality defaults to direct edits in Google Sheets to prevent out-of-sync carts.")
-                else:
-                    st.warning("Invoice Number column not found in sheet.")
-            else:
-                st.info("No invoices found.")
-        else:
-            st.error("Invoices sheet is not accessible.")
-    else:
-        st.error("🚫 Access Denied.")
+PROFILER.close(page_span)
+rerun_summary = PROFILER.finish()
+if st.session_state.role == "Admin" and rerun_summary:
+    with st.expander("⏱️ Rerun Profiler"):
+        st.markdown(f"**This rerun:** {rerun_summary['total_ms']:,.0f} ms on {rerun_summary['page']} · "
+                    f"{rerun_summary['request_count']} Sheets requests ({rerun_summary['request_ms']:,.0f} ms waiting on Google)")
+        st.dataframe(pd.DataFrame([{
+            "Span": " " * s['depth'] + s['name'],
+            "Start (ms)": s['start_ms'],
+            "Duration (ms)": s['ms'],
+            "Cache": s.get('cache', ''),
+            "Thread": s['thread'],
+        } for s in rerun_summary['spans']]), use_container_width=True, hide_index=True)
+        if rerun_summary['requests']:
+            st.dataframe(pd.DataFrame(rerun_summary['requests']).rename(columns={
+                "at_ms": "At (ms)", "kind": "Kind", "request": "Request", "ms": "Latency (ms)", "status": "Status", "thread": "Thread"}),
+                use_container_width=True, hide_index=True)
+
+        rerun_history = PROFILER.history()
+        st.markdown(f"**Last {len(rerun_history)} reruns of this session:**")
+        st.dataframe(pd.DataFrame([{
+            "At (IST)": datetime.fromtimestamp(r['at'], IST).strftime("%I:%M:%S %p"),
+            "Page": r['page'] or "—",
+            "Total (ms)": r['total_ms'],
+            "Sheets Requests": r['request_count'],
+            "Sheets Time (ms)": r['request_ms'],
+            "Cut Short": "st.rerun / st.stop" if r['interrupted'] else "",
+        } for r in reversed(rerun_history)]), use_container_width=True, hide_index=True)
+
+        bg_requests = PROFILER.background(60)
+        if bg_requests:
+            st.caption(f"Background sync threads (whole server, last 60 s): {len(bg_requests)} requests, "
+                       f"{sum(r['ms'] for r in bg_requests) / len(bg_requests):,.0f} ms average latency")
+
+        st.download_button("📥 Export JSON", data=json.dumps({"reruns": rerun_history, "background": bg_requests}, indent=2, ensure_ascii=False, default=str),
+                           file_name=f"rerun_profile_{datetime.now(IST).strftime('%Y%m%d_%H%M%S')}.json", mime="application/json")
 
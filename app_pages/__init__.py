@@ -0,0 +1,60 @@
+"""
+MANGLAM TRADELINK - Page Scripts
+================================
+Each page of the portal is its own script in this folder instead of one
+branch of a long if/elif chain in app_cloud.py. A rerun only compiles and
+runs the page that is open, and the heavy imports of a page (plotly on the
+Inventory Dashboard, fpdf on the Order Desk) load the first time that page
+is shown instead of on every cold start.
+
+The scripts run with exec() in app_cloud.py's global namespace, exactly like
+the old branches did: they use st, pd, t, df, hindi(), the *_sheet tabs, the
+fetch_* caches etc. from there, and whatever they define stays visible for
+the rest of that rerun. Compiled code is kept per file and recompiled when
+the file changes on disk.
+
+Not called pages/ on purpose: Streamlit turns a pages/ folder next to the
+main script into its own multipage sidebar navigation.
+"""
+
+import os
+from functools import lru_cache
+
+PAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Page label -> script. Keys are LANG keys (t["inv"] ...) or, for the
+# untranslated invoice pages, the label itself.
+# (Page 5, the AI Restock Advisor, was removed so stock/sales data is never sent to external LLM servers.)
+PAGE_REGISTRY = {
+    "inv": "inventory.py",
+    "ord": "order_desk.py",
+    "aud": "stock_audit.py",
+    "rep": "audit_report.py",
+    "admin": "admin_dashboard.py",
+    "rent": "rent_tracker.py",
+    "🧾 Generate Invoice": "generate_invoice.py",
+    "📁 Saved Invoices": "saved_invoices.py",
+}
+
+
+@lru_cache(maxsize=None)
+def _compiled(path, mtime):
+    with open(path, encoding="utf-8") as f:
+        return compile(f.read(), path, "exec")
+
+
+def page_script(page, t):
+    """Path of the script for the nav label `page` in the current language (None if unknown)."""
+    for key, script in PAGE_REGISTRY.items():
+        if t.get(key, key) == page:
+            return os.path.join(PAGE_DIR, script)
+    return None
+
+
+def run_page(page, t, namespace):
+    """Run the selected page's script in `namespace` (app_cloud's globals()); False if no page matches."""
+    path = page_script(page, t)
+    if path is None:
+        return False
+    exec(_compiled(path, os.path.getmtime(path)), namespace)
+    return True
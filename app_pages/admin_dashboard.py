@@ -0,0 +1,179 @@
+"""
+MANGLAM TRADELINK - Admin Dashboard
+===================================
+User creation, employee access control (revoke / restore) and the
+performance debug panel.
+"""
+
+st.title(t["user_mgmt"])
+with st.form("add_user_form"):
+    new_name, new_id, new_pass, new_role = st.text_input(t["full_name"]), st.text_input(t["user_id"]), st.text_input(t["password"], type="password"), st.selectbox(t["role_label"], ["Employee", "Admin"])
+    if st.form_submit_button(t["create_user_btn"]) and new_name and new_id and new_pass:
+        users_sheet.append_row([new_id, new_pass, new_role, new_name, "Active"])
+        st.success(t["user_created"])
+        invalidate_sheets("Users")
+        st.rerun()
+
+st.divider()
+st.markdown("### 🔒 Employee Access Control")
+st.caption("Revoking an employee will instantly log them out on their next screen interaction.")
+
+try:
+    users_data = fetch_basic_records(users_sheet, "Users")
+    if users_data:
+        df_users = pd.DataFrame(users_data)
+        df_users.columns = df_users.columns.astype(str).str.strip()
+        
+        headers = df_users.columns.tolist()
+        if 'Status' not in headers:
+            users_sheet.update_cell(1, len(headers) + 1, "Status")
+            headers.append("Status")
+            
+        status_col_idx = headers.index('Status') + 1
+        
+        for idx, row in df_users.iterrows():
+            u_id = str(row['User ID']).strip()
+            u_name = str(row['Name']).strip()
+            u_role = str(row['Role']).strip()
+            u_status = str(row.get('Status', 'Active')).strip()
+            
+            with st.container():
+                c1, c2, c3, c4 = st.columns([2, 3, 2, 3])
+                c1.markdown(f"**{u_id}**")
+                c2.markdown(f"{u_name} ({u_role})")
+                
+                status_text = "🟢 Active" if u_status != 'Revoked' else "🔴 Revoked"
+                c3.markdown(status_text)
+                
+                with c4:
+                    if u_id == st.session_state.user_id:
+                        st.caption("🛡️ Cannot revoke self")
+                    else:
+                        btn_label = "🚫 Set Revoked" if u_status != 'Revoked' else "✅ Set Active"
+                        btn_type = "secondary" if u_status != 'Revoked' else "primary"
+                        
+                        if st.button(btn_label, key=f"togg_usr_{u_id}", use_container_width=True, type=btn_type):
+                            new_val = "Revoked" if u_status != 'Revoked' else "Active"
+                            cell = users_sheet.find(u_id, in_column=1)
+                            users_sheet.update_cell(cell.row, status_col_idx, new_val)
+                            invalidate_sheets("Users")
+                            st.rerun()
+                st.divider()
+except Exception as e:
+    st.error(f"Failed to load user controls: {e}")
+
+# --- 🗄️ DATABASE MAINTENANCE ---
+st.divider()
+st.markdown("### 🗄️ Database Maintenance")
+st.caption("Move old completed orders to an archive sheet to keep the app fast and clean.")
+
+# 🟢 RESUMABLE ARCHIVE JOB: orders are moved in chunks, top of the sheet first, so the archive gets them
+# in their original order. Each chunk is appended to the archive AND deleted from Orders in one atomic
+# request, so an interrupted run never leaves an order in both sheets -- running it again just picks up
+# the orders that are still live.
+archive_job = st.session_state.get('archive_job')
+if archive_job:
+    st.warning(f"⚠️ Last archive run stopped after {archive_job['done']} / {archive_job['total']} orders: {archive_job['error']}")
+start_archive = st.button("📦 Archive Orders Older Than 30 Days", type="primary", use_container_width=True)
+resume_archive = bool(archive_job) and st.button("▶️ Resume Archiving", use_container_width=True)
+
+if start_archive or resume_archive:
+    if not orders_sheet or not archive_sheet:
+        st.error("Cannot archive: Orders or Archived Orders sheet is missing.")
+    else:
+        done, total = 0, 0
+        try:
+            all_values = orders_sheet.get_all_values()
+            headers = [str(h).strip() for h in all_values[0]] if all_values else []
+            if len(all_values) < 2 or not all(h in headers for h in ['Order ID', 'Status', 'Date']):
+                st.info("No orders found to archive.")
+            else:
+                id_col, status_col, date_col = headers.index('Order ID'), headers.index('Status'), headers.index('Date')
+                cutoff = datetime.now() - timedelta(days=30)  # naive datetime to match strptime output
+                candidates = []  # (sheet row, order id, row values) -- header = row 1
+                
+                for row_no, row_vals in enumerate(all_values[1:], start=2):
+                    if str(row_vals[status_col]).strip() == 'Completed':
+                        try:
+                            order_date = datetime.strptime(str(row_vals[date_col]).strip(), "%d-%m-%Y %I:%M %p")
+                            if order_date < cutoff:
+                                candidates.append((row_no, str(row_vals[id_col]).strip(), row_vals))
+                        except Exception:
+                            pass  # Skip rows with unparseable dates
+                
+                if not candidates:
+                    st.session_state.pop('archive_job', None)
+                    st.info("No completed orders older than 30 days found.")
+                else:
+                    # Orders already in the archive (e.g. from an older, non-atomic run) are only deleted
+                    already_archived = set(str(v).strip() for v in archive_sheet.col_values(1)[1:])
+                    total = len(candidates)
+                    progress = st.progress(0.0, text=f"Archiving 0 / {total} orders...")
+                    
+                    for i in range(0, total, ARCHIVE_CHUNK_SIZE):
+                        # Every earlier chunk sat above this one, so its rows have moved up by the orders already moved
+                        chunk = [(row_no - done, order_id, vals) for row_no, order_id, vals in candidates[i:i + ARCHIVE_CHUNK_SIZE]]
+                        # One small read per chunk: make sure nobody shifted the rows since we looked
+                        live_ids = orders_sheet.col_values(id_col + 1)
+                        for row_no, order_id, _ in chunk:
+                            if row_no > len(live_ids) or str(live_ids[row_no - 1]).strip() != order_id:
+                                raise RuntimeError("the Orders sheet changed while archiving. Please resume.")
+                        
+                        # Archive rows in sheet order; move_rows deletes the ranges bottom-most first by itself
+                        rows_to_archive = [gspread.utils.numericise_all(vals) for _, order_id, vals in chunk if order_id not in already_archived]
+                        deleted_ranges = move_rows(orders_sheet, archive_sheet, [c[0] for c in chunk], rows_to_archive)
+                        for range_start, range_end in deleted_ranges:
+                            orders_locator.on_delete(range_start, range_end - range_start + 1)
+                        
+                        done += len(chunk)
+                        progress.progress(done / total, text=f"Archiving {done} / {total} orders...")
+                    
+                    st.session_state.pop('archive_job', None)
+                    st.success(f"✅ Successfully archived {total} old orders!")
+                    invalidate_sheets("Orders", "Archived Orders")
+                    st.rerun()
+        except Exception as e:
+            st.session_state.archive_job = {"done": done, "total": total, "error": str(e)}
+            if done: invalidate_sheets("Orders", "Archived Orders")
+            st.error(f"Archive failed: {e}")
+
+# --- 🛠️ PERFORMANCE DEBUG ---
+st.divider()
+with st.expander("🛠️ Performance Debug"):
+    warmup = st.session_state.get('warmup_timings')
+    if warmup:
+        st.markdown(f"**Session warm-up:** {warmup['total_ms']:,.0f} ms for {len(warmup['per_sheet_ms'])} sheets ({WARMUP_WORKERS} threads) at {warmup['at']}")
+        st.dataframe(pd.DataFrame(list(warmup['per_sheet_ms'].items()), columns=["Sheet", "Load Time (ms)"]), use_container_width=True, hide_index=True)
+    else:
+        st.caption("No warm-up recorded for this session yet.")
+
+    quota = QUOTA.snapshot()
+    st.markdown("**📊 Google Sheets API quota (last 60 s, whole server):**")
+    q1, q2 = st.columns(2)
+    for col, kind in ((q1, "read"), (q2, "write")):
+        used, limit = quota[kind]['used'], quota[kind]['limit']
+        col.progress(min(1.0, used / limit) if limit else 0.0, text=f"{kind.title()}s: {used}/{limit} per min ({quota[kind]['pct']:.0f}%)")
+    totals = quota['totals']
+    st.caption(f"Since server start: {totals['requests']:,} requests · {totals['rate_limited']:,} hit the 429 quota · {totals['retries']:,} retried · {totals['failed']:,} failed · {totals['throttle_wait_s']:.1f} s paced by the rate limiter")
+
+    flight_stats = sheet_flight.stats()
+    if flight_stats:
+        saved = sum(v['coalesced'] for v in flight_stats.values())
+        ran = sum(v['executed'] for v in flight_stats.values())
+        st.markdown(f"**Single-flight (since server start):** {ran:,} Sheets fetches ran, {saved:,} concurrent misses coalesced (= read requests saved)")
+        st.dataframe(pd.DataFrame([{"Fetch": k, "Executed": v['executed'], "Coalesced": v['coalesced']} for k, v in sorted(flight_stats.items())]), use_container_width=True, hide_index=True)
+
+    outbox = get_telegram_outbox()
+    if outbox is not None:
+        st.markdown(f"**📨 Telegram outbox:** {outbox.pending()} queued · {outbox.stats['sent']:,} sent · {outbox.stats['retried']:,} retries · {outbox.stats['failed']:,} failed (since server start)")
+        failed = [m for m in outbox.recent() if m['status'] == 'failed']
+        if failed:
+            st.dataframe(pd.DataFrame([{"Queued": datetime.fromtimestamp(m['queued_at'], IST).strftime("%d-%m %I:%M %p"), "Attempts": m['attempts'],
+                                        "Error": m['error'], "Message": m['text'][:80]} for m in failed]), use_container_width=True, hide_index=True)
+
+    probe_stats = sheet_mirror.probe_stats
+    if probe_stats['probes']:
+        st.markdown(f"**Version probes:** {probe_stats['probes']:,} probe reads — {probe_stats['unchanged']:,} full downloads skipped, {probe_stats['changed']:,} tabs changed")
+    delta_stats = sheet_mirror.delta_stats
+    if delta_stats['deltas'] or delta_stats['full_reloads']:
+        st.markdown(f"**Delta sync ({', '.join(APPEND_ONLY_SHEETS)}):** {delta_stats['deltas']:,} incremental reads, {delta_stats['rows']:,} new rows, {delta_stats['full_reloads']:,} full reloads after edits/deletes")
@@ -0,0 +1,64 @@
+"""
+MANGLAM TRADELINK - Audit Report
+================================
+Admin only: active audit log vs. system stock, and archiving of the audit.
+"""
+
+st.header(t["rep"])
+st.write(t["compare_counts"])
+
+if not audit_sheet:
+    st.error(t["audit_db_not_found"])
+else:
+    try:
+        audit_data = fetch_basic_records(audit_sheet, "Audit Logs")
+        audit_df = pd.DataFrame(audit_data)
+    except:
+        audit_df = pd.DataFrame()
+        
+    if not audit_df.empty and 'Status' in audit_df.columns:
+        active_audit = audit_df[audit_df['Status'] == 'Active']
+        
+        if active_audit.empty:
+            st.info(t["no_active_audits"])
+        else:
+            active_audit['Quantity Found'] = pd.to_numeric(active_audit['Quantity Found'], errors='coerce')
+            summary_df = active_audit.groupby('Item Name')['Quantity Found'].sum().reset_index()
+            
+            report_data = []
+            for _, row in summary_df.iterrows():
+                item = row['Item Name']
+                physical_qty = row['Quantity Found']
+                system_qty = df[df['Item'] == item]['Quantity'].iloc[0] if not df[df['Item'] == item].empty else 0
+                variance = physical_qty - system_qty
+                report_data.append({
+                    "Item": item,
+                    "System Expected": system_qty,
+                    "Physical Count": physical_qty,
+                    "Variance": variance
+                })
+            
+            report_df = pd.DataFrame(report_data)
+            st.dataframe(
+                report_df.style.map(lambda x: 'color: red;' if x < 0 else 'color: green;' if x > 0 else '', subset=['Variance']),
+                use_container_width=True, hide_index=True
+            )
+            
+            st.divider()
+            st.subheader(t["archive_audit"])
+            st.warning(t["archive_warning"])
+            
+            if st.button(t["archive_btn"], type="primary"):
+                try:
+                    cell_list = audit_sheet.findall("Active")
+                    with WriteBatch(audit_sheet) as wb:
+                        for cell in cell_list:
+                            if cell.col == 6:
+                                wb.update_cell(cell.row, 6, "Closed")
+                    invalidate_sheets("Audit Logs")
+                    flash(t["archive_success"], icon="✅")
+                    st.rerun()
+                except Exception as e:
+                    st.error(t["failed_archive"].format(err=e))
+    else:
+        st.info(t["no_audit_logs"])
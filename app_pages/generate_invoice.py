@@ -0,0 +1,670 @@
+"""
+MANGLAM TRADELINK - Generate Invoice
+====================================
+Admin only: GST invoice builder (generate_invoice_pdf is imported on save).
+"""
+
+if st.session_state.role == "Admin":
+    st.header("🧾 Generate Invoice")
+    st.caption("Manglam Tradelink — GST Invoice Generator")
+
+    # --- Load Next Invoice Number from Invoices sheet ---
+    next_inv_number = "GST/25-26/0001"
+    try:
+        if invoices_sheet:
+            inv_meta = invoices_sheet.get('N2')
+            if inv_meta and inv_meta[0]:
+                next_inv_number = str(inv_meta[0][0]).strip()
+        else:
+            st.warning("⚠️ 'Invoices' sheet not found. Using default invoice number.")
+    except Exception as inv_err:
+        st.warning(f"⚠️ Could not load invoice number: {inv_err}")
+    st.info(f"📌 **Next Invoice Number:** `{next_inv_number}`")
+
+    st.divider()
+
+    # ==========================================
+    # SECTION 1: CUSTOMER SELECTION
+    # ==========================================
+    st.subheader("👤 Customer Details")
+
+    # Load Manglam Customers
+    manglam_customers = []
+    manglam_cust_df = pd.DataFrame()
+    if not manglam_cust_sheet:
+        st.warning("⚠️ 'Manglam Customers' sheet not found. Please check Google Sheets.")
+    else:
+        try:
+            mc_data = fetch_basic_records(manglam_cust_sheet, "Manglam Customers")
+            if mc_data:
+                manglam_cust_df = pd.DataFrame(mc_data)
+                manglam_cust_df.columns = manglam_cust_df.columns.astype(str).str.strip()
+                # Robust column matching: find 'Customer Name' case-insensitively
+                cust_name_col = None
+                for col in manglam_cust_df.columns:
+                    if col.lower().replace(" ", "") in ("customername", "customer_name", "name", "customer"):
+                        cust_name_col = col
+                        break
+                if cust_name_col:
+                    manglam_cust_df = manglam_cust_df.rename(columns={cust_name_col: "Customer Name"})
+                    manglam_customers = sorted(manglam_cust_df['Customer Name'].dropna().astype(str).str.strip().unique().tolist())
+                    manglam_customers = [c for c in manglam_customers if c]  # remove empty strings
+                else:
+                    st.warning(f"⚠️ Could not find 'Customer Name' column. Found columns: {list(manglam_cust_df.columns)}")
+            else:
+                st.info("ℹ️ 'Manglam Customers' sheet is empty. Add customers to the sheet first.")
+        except Exception as e:
+            st.error(f"❌ Error loading customer data: {e}")
+
+    create_new = st.toggle("➕ Create New Customer", value=False, key="inv_new_cust_toggle")
+
+    if create_new:
+        inv_cust_name = st.text_input("Customer Name", key="inv_new_name")
+        ic1, ic2 = st.columns(2)
+        with ic1:
+            inv_cust_addr = st.text_area("Billing Address", height=80, key="inv_new_addr")
+            inv_cust_gstin = st.text_input("GSTIN", key="inv_new_gstin")
+        with ic2:
+            inv_cust_pan = st.text_input("PAN", key="inv_new_pan")
+            inv_cust_contact = st.text_input("Contact Number", key="inv_new_contact")
+    else:
+        # Debounced searchable dropdown
+        if 'inv_search_term' not in st.session_state:
+            st.session_state.inv_search_term = ""
+
+        search_term = st.text_input("🔍 Search Customer", value=st.session_state.inv_search_term,
+                                    placeholder="Start typing to search...", key="inv_cust_search")
+
+        filtered_customers = manglam_customers
+        if search_term:
+            filtered_customers = [c for c in manglam_customers if search_term.lower() in c.lower()]
+
+        if filtered_customers:
+            selected_idx = st.selectbox("Select Customer", range(len(filtered_customers)),
+                                        format_func=lambda i: filtered_customers[i], key="inv_cust_select")
+            inv_cust_name = filtered_customers[selected_idx]
+
+            # Auto-fill from sheet data (robust column lookup)
+            cust_row = manglam_cust_df[manglam_cust_df['Customer Name'] == inv_cust_name]
+            if not cust_row.empty:
+                _r = cust_row.iloc[0]
+                _cols = {c.lower().strip(): c for c in manglam_cust_df.columns}
+                def _get_col(keys, default=''):
+                    for k in keys:
+                        if k.lower() in _cols:
+                            return str(_r.get(_cols[k.lower()], default)).strip()
+                    return default
+                inv_cust_addr = _get_col(['Address', 'Billing Address', 'address'])
+                inv_cust_gstin = _get_col(['GSTIN', 'GST No', 'GST Number', 'gstin'])
+                inv_cust_pan = _get_col(['PAN', 'PAN No', 'PAN Number', 'pan'])
+                inv_cust_contact = _get_col(['Contact', 'Phone', 'Mobile', 'Contact Number', 'contact'])
+            else:
+                inv_cust_addr = inv_cust_gstin = inv_cust_pan = inv_cust_contact = ""
+
+            with st.expander("📝 Customer Info (auto-filled)", expanded=False):
+                st.text(f"Address: {inv_cust_addr}")
+                st.text(f"GSTIN: {inv_cust_gstin}  |  PAN: {inv_cust_pan}  |  Contact: {inv_cust_contact}")
+        else:
+            st.warning("No customers found. Toggle 'Create New Customer' to add one.")
+            inv_cust_name = inv_cust_addr = inv_cust_gstin = inv_cust_pan = inv_cust_contact = ""
+
+    st.divider()
+
+    # ==========================================
+    # SECTION 1.25: SHIP TO ADDRESS (Optional)
+    # ==========================================
+    ship_to_different = st.checkbox("📦 Shipping Address is different from Billing Address", key="inv_ship_toggle")
+    ship_to_name = ""
+    ship_to_addr = ""
+    ship_to_gstin = ""
+    if ship_to_different:
+        st.subheader("📦 Ship To Details")
+        st1, st2 = st.columns(2)
+        with st1:
+            ship_to_name = st.text_input("Ship To Name", key="inv_ship_name")
+            ship_to_addr = st.text_area("Ship To Address", height=80, key="inv_ship_addr")
+        with st2:
+            ship_to_gstin = st.text_input("Ship To GSTIN", key="inv_ship_gstin")
+
+    st.divider()
+
+    # ==========================================
+    # SECTION 1.5: DISPATCH DETAILS (Optional)
+    # ==========================================
+    st.subheader("🚚 Dispatch Details (Optional)")
+    
+    # --- Load Transporters ---
+    transporter_names = []
+    trans_df = pd.DataFrame()
+    if manglam_trans_sheet:
+        try:
+            mt_data = fetch_basic_records(manglam_trans_sheet, "Manglam Transporters")
+            if mt_data:
+                trans_df = pd.DataFrame(mt_data)
+                trans_df.columns = trans_df.columns.astype(str).str.strip()
+                if "Transporter Name" in trans_df.columns:
+                    transporter_names = trans_df["Transporter Name"].dropna().astype(str).str.strip().unique().tolist()
+                    transporter_names = [t for t in transporter_names if t]
+        except Exception as e:
+            st.warning(f"⚠️ Could not load transporters: {e}")
+
+    create_new_trans = st.toggle("➕ Add New Transporter", value=False, key="inv_new_trans_toggle")
+    
+    if create_new_trans:
+        nt1, nt2 = st.columns(2)
+        with nt1:
+            inv_transporter = st.text_input("Transporter Name", key="inv_new_trans_name")
+        with nt2:
+            inv_transporter_id = st.text_input("Transporter ID (GSTIN/Enrollment)", key="inv_new_trans_id")
+        
+        if st.button("💾 Save Transporter to List", type="secondary"):
+            if inv_transporter and manglam_trans_sheet:
+                manglam_trans_sheet.append_row([inv_transporter, inv_transporter_id])
+                st.success(f"✅ Added {inv_transporter} to the Transporters list!")
+                invalidate_sheets("Manglam Transporters")
+                st.rerun()
+            else:
+                st.warning("Please enter a Transporter Name to save.")
+                
+        disp1, disp2 = st.columns(2)
+    else:
+        disp_select, disp1, disp2 = st.columns(3)
+        with disp_select:
+            inv_transporter = st.selectbox("Select Transporter (Optional)", [""] + transporter_names, key="inv_transporter")
+            inv_transporter_id = ""
+            if inv_transporter and not trans_df.empty:
+                match = trans_df[trans_df["Transporter Name"] == inv_transporter]
+                if not match.empty:
+                    for col in match.columns:
+                        if 'id' in col.lower() or 'gstin' in col.lower():
+                            inv_transporter_id = str(match.iloc[0][col]).strip()
+                            break
+            if inv_transporter:
+                st.caption(f"📌 Transporter ID: `{inv_transporter_id}`")
+                
+    with disp1:
+        inv_eway_bill = st.text_input("e-Way Bill Number", key="inv_eway", placeholder="e.g. 1234 5678 9012")
+    with disp2:
+        inv_vehicle_no = st.text_input("Motor Vehicle Number", key="inv_vehicle", placeholder="e.g. DL 01 AB 1234")
+
+    st.divider()
+
+    # 🟢 FRAGMENT: the item cart, live totals, e-way pre-flight and save rerun on their own --
+    # adding or removing a line doesn't reload the customer / transporter masters above.
+    # The customer and dispatch fields are read from the last full run (changing them reruns the page).
+    @st.fragment
+    def invoice_cart_fragment():
+        # ==========================================
+        # SECTION 2: DYNAMIC ITEM CART
+        # ==========================================
+        st.subheader("🛒 Item Cart")
+
+        # --- Load Manglam Stock Data ---
+        manglam_stock_items = []
+        manglam_stock_df = pd.DataFrame()
+        if manglam_stock_sheet:
+            try:
+                ms_data = fetch_basic_records(manglam_stock_sheet, "Manglam Stock")
+                if ms_data:
+                    manglam_stock_df = pd.DataFrame(ms_data)
+                    manglam_stock_df.columns = manglam_stock_df.columns.astype(str).str.strip()
+                    # Normalize column names
+                    col_map = {}
+                    for col in manglam_stock_df.columns:
+                        cl = col.lower().replace(" ", "").replace("%", "")
+                        if "itemname" in cl or cl == "name": col_map[col] = "Item Name"
+                        elif "hsncode" in cl or cl == "hsn": col_map[col] = "HSN Code"
+                        elif "gstrate" in cl or "taxrate" in cl: col_map[col] = "GST Rate %"
+                        elif "avgrate" in cl or "averagerate" in cl: col_map[col] = "Avg Rate"
+                        elif "closingqty" in cl or "qty" in cl: col_map[col] = "Closing Qty"
+                        elif "unit" in cl: col_map[col] = "Unit"
+                    manglam_stock_df = manglam_stock_df.rename(columns=col_map)
+                
+                    if "Item Name" in manglam_stock_df.columns:
+                        # Convert qty to float for sorting & filtering
+                        def _parse_qty(q):
+                            try: return float(str(q).replace(',', ''))
+                            except: return 0.0
+                    
+                        manglam_stock_df["_sort_qty"] = manglam_stock_df.get("Closing Qty", 0).apply(_parse_qty)
+                    
+                        # Filter out exactly zero stock
+                        valid_stock = manglam_stock_df[manglam_stock_df["_sort_qty"] != 0.0].copy()
+                    
+                        # Sort: positive ascending (or descending, user didn't specify, let's do descending for largest first), then negative
+                        pos_stock = valid_stock[valid_stock["_sort_qty"] > 0].sort_values(by="_sort_qty", ascending=False)
+                        neg_stock = valid_stock[valid_stock["_sort_qty"] < 0].sort_values(by="_sort_qty", ascending=True)
+                    
+                        manglam_stock_items = pos_stock["Item Name"].tolist() + neg_stock["Item Name"].tolist()
+                        manglam_stock_items = [str(s).strip() for s in manglam_stock_items if str(s).strip()]
+            except Exception as stock_err:
+                st.warning(f"⚠️ Could not load stock data: {stock_err}")
+
+        # --- Auto-detect GST Type from Customer GSTIN ---
+        auto_gst_type = "Intra State (CGST + SGST)"  # Default: Delhi
+        try:
+            if inv_cust_gstin and isinstance(inv_cust_gstin, str):
+                g_str = inv_cust_gstin.strip()
+                if len(g_str) >= 2:
+                    state_code = g_str[:2]
+                    # '07' is Delhi, '09' UP, '06' Haryana, etc. 
+                    if state_code != "07":
+                        auto_gst_type = "Inter State (IGST)"
+        except:
+            pass
+
+        if 'invoice_items' not in st.session_state:
+            st.session_state.invoice_items = []
+        if 'inv_form_counter' not in st.session_state:
+            st.session_state.inv_form_counter = 0
+
+        # --- Item Selection (outside form for real-time filtering) ---
+        manual_entry = st.toggle("✏️ Manual Entry (item not in stock list)", value=False, key="inv_manual_toggle")
+
+        # Initialize defaults
+        default_hsn = ""
+        default_rate = 0.0
+        default_gst = 18
+        default_unit = "SQM"
+        item_name = ""
+
+        if not manual_entry and manglam_stock_items:
+            # Type-to-filter: single text input that filters the dropdown
+            item_search = st.text_input("🔍 Type Item Name", key="inv_stock_search",
+                                        placeholder="Start typing to find items...")
+
+            # Filter items as user types
+            if item_search:
+                filtered_items = [s for s in manglam_stock_items if item_search.lower() in s.lower()]
+            else:
+                filtered_items = manglam_stock_items
+
+            if filtered_items:
+                # Build display labels with stock info and avg price
+                def _stock_label(name):
+                    row = manglam_stock_df[manglam_stock_df["Item Name"] == name]
+                    if not row.empty:
+                        r = row.iloc[0]
+                        try: qty = float(str(r.get("Closing Qty", "0")).replace(",", ""))
+                        except: qty = 0.0
+                        try: rate = float(str(r.get("Avg Rate", "0")).replace(",", ""))
+                        except: rate = 0.0
+                        unit = str(r.get("Unit", "")).strip() or "units"
+                        return f"{name}  —  📦 {qty:,.0f} {unit} | ₹{rate:,.2f}"
+                    return name
+
+                sel_idx = st.selectbox(
+                    "Select Item", range(len(filtered_items)),
+                    format_func=lambda i: _stock_label(filtered_items[i]),
+                    key="inv_stock_select"
+                )
+                item_name = filtered_items[sel_idx]
+
+                # Auto-fill defaults from stock data
+                stock_row = manglam_stock_df[manglam_stock_df["Item Name"] == item_name]
+                if not stock_row.empty:
+                    _sr = stock_row.iloc[0]
+                    default_hsn = str(_sr.get("HSN Code", "")).strip()
+                    default_unit = str(_sr.get("Unit", "SQM")).strip() or "SQM"
+                    try: default_rate = float(str(_sr.get("Avg Rate", "0")).replace(",", ""))
+                    except: default_rate = 0.0
+                    try: default_gst = int(float(str(_sr.get("GST Rate %", "18")).replace(",", "")))
+                    except: default_gst = 18
+                
+                    # Apply specific GST overrides based on HSN criteria
+                    if default_hsn.startswith("5903") or default_hsn.startswith("5407"):
+                        default_gst = 5
+                    elif default_hsn.startswith("3920") or default_hsn.startswith("4202"):
+                        default_gst = 18
+            else:
+                st.warning("No items match. Try a different term or toggle Manual Entry.")
+
+        # --- Form for qty, rate, GST (submits the item to cart) ---
+        # We use dynamic keys based on item_name and a form counter to force Streamlit to update/clear the widgets
+        fc = st.session_state.inv_form_counter
+        dyn_suffix = f"_{sel_idx}_{fc}" if not manual_entry and manglam_stock_items and 'sel_idx' in locals() else f"_manual_{fc}"
+    
+        qty_key = f"inv_qty{dyn_suffix}"
+        rate_key = f"inv_rate{dyn_suffix}"
+        tot_key = f"inv_tot{dyn_suffix}"
+    
+        # Initialize default values in session state if this is a fresh dynamic key
+        if qty_key not in st.session_state: st.session_state[qty_key] = 0.0
+        if rate_key not in st.session_state: st.session_state[rate_key] = default_rate if 'default_rate' in locals() else 0.0
+        if tot_key not in st.session_state: st.session_state[tot_key] = 0.0
+    
+        def calc_total():
+            st.session_state[tot_key] = st.session_state[qty_key] * st.session_state[rate_key]
+        
+        def calc_rate():
+            if st.session_state[qty_key] > 0:
+                st.session_state[rate_key] = st.session_state[tot_key] / st.session_state[qty_key]
+            else:
+                st.session_state[rate_key] = 0.0
+    
+        st.markdown("<div style='padding:15px; border:1px solid var(--secondary-background-color); border-radius:10px; margin-bottom: 20px; background: var(--secondary-background-color);'>", unsafe_allow_html=True)
+        st.markdown("##### ➕ Add Item Details")
+    
+        if manual_entry or not manglam_stock_items:
+            item_name = st.text_input("Item Name", key=f"inv_item_name{dyn_suffix}")
+            hsn_code = st.text_input("HSN / SAC Code", key=f"inv_hsn{dyn_suffix}")
+            ai3, ai4, ai5 = st.columns(3)
+            with ai3:
+                item_qty = st.number_input("Quantity", min_value=0.0, step=1.0, format="%.2f", key=qty_key, on_change=calc_total)
+            with ai4:
+                item_rate = st.number_input("Rate per Unit (₹)", min_value=0.0, step=0.5, format="%.2f", key=rate_key, on_change=calc_total)
+            with ai5:
+                item_total = st.number_input("Total Value (₹) [Auto-Updates Rate]", min_value=0.0, step=1.0, format="%.2f", key=tot_key, on_change=calc_rate)
+        else:
+            if item_name:
+                st.markdown(f"**Selected:** `{item_name}`")
+            ai1, ai2 = st.columns(2)
+            with ai1:
+                hsn_code = st.text_input("HSN / SAC Code", value=default_hsn, key=f"inv_hsn{dyn_suffix}")
+            with ai2:
+                item_unit = st.text_input("Unit", value=default_unit, key=f"inv_unit{dyn_suffix}")
+            ai3, ai4, ai5 = st.columns(3)
+            with ai3:
+                item_qty = st.number_input("Quantity", min_value=0.0, step=1.0, format="%.2f", key=qty_key, on_change=calc_total)
+            with ai4:
+                item_rate = st.number_input("Rate per Unit (₹)", min_value=0.0, step=0.5, format="%.2f", key=rate_key, on_change=calc_total)
+            with ai5:
+                item_total = st.number_input("Total Value (₹) [Auto-Updates Rate]", min_value=0.0, step=1.0, format="%.2f", key=tot_key, on_change=calc_rate)
+
+        g1, g2 = st.columns(2)
+        with g1:
+            gst_options = ["Intra State (CGST + SGST)", "Inter State (IGST)"]
+            gst_default_idx = gst_options.index(auto_gst_type) if auto_gst_type in gst_options else 0
+            gst_type = st.selectbox("GST Type (auto-detected)", gst_options, index=gst_default_idx, key=f"inv_gst_type{dyn_suffix}")
+        with g2:
+            gst_choices = [5, 12, 18, 28]
+            gst_default_pct_idx = gst_choices.index(default_gst) if default_gst in gst_choices else 2
+            gst_percent = st.selectbox("GST %", gst_choices, index=gst_default_pct_idx, key=f"inv_gst_pct{dyn_suffix}")
+
+        add_item_btn = st.button("➕ Add Item to Cart", type="primary")
+
+        if add_item_btn and item_name and item_qty > 0 and item_rate > 0:
+            st.session_state.invoice_items.append({
+                "name": item_name,
+                "hsn": hsn_code,
+                "qty": item_qty,
+                "rate": item_rate,
+                "gst_type": gst_type,
+                "gst_pct": gst_percent,
+                "unit": item_unit if 'item_unit' in locals() else "SQM"
+            })
+            st.session_state.inv_form_counter += 1
+            rerun_fragment()
+        
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        # Display Cart Table
+        if st.session_state.invoice_items:
+            st.write("**Current Items:**")
+            cart_html = "<table class='order-table'><tr><th>#</th><th>Item</th><th>HSN</th><th>Qty</th><th>Rate</th><th>Taxable</th><th>GST</th><th>Total</th><th></th></tr>"
+            for idx, itm in enumerate(st.session_state.invoice_items):
+                taxable = itm['qty'] * itm['rate']
+                gst_amt = taxable * itm['gst_pct'] / 100
+                line_total = taxable + gst_amt
+                cart_html += f"<tr><td>{idx+1}</td><td><b>{itm['name']}</b></td><td>{itm['hsn']}</td><td>{itm['qty']:.2f}</td><td>₹{itm['rate']:.2f}</td><td>₹{taxable:,.2f}</td><td>{itm['gst_pct']}%</td><td>₹{line_total:,.2f}</td><td></td></tr>"
+            cart_html += "</table>"
+            st.markdown(cart_html, unsafe_allow_html=True)
+
+            # Remove item buttons
+            remove_cols = st.columns(min(len(st.session_state.invoice_items), 6))
+            for idx, itm in enumerate(st.session_state.invoice_items):
+                col_idx = idx % len(remove_cols)
+                with remove_cols[col_idx]:
+                    if st.button(f"❌ {itm['name'][:15]}", key=f"rm_inv_{idx}"):
+                        st.session_state.invoice_items.pop(idx)
+                        rerun_fragment()
+        else:
+            st.info("Cart is empty. Add items using the form above.")
+
+        st.divider()
+
+        # ==========================================
+        # SECTION 3: LIVE CALCULATIONS
+        # ==========================================
+        st.subheader("💰 Invoice Summary")
+
+        subtotal = 0.0
+        total_cgst = 0.0
+        total_sgst = 0.0
+        total_igst = 0.0
+
+        for itm in st.session_state.invoice_items:
+            taxable = itm['qty'] * itm['rate']
+            subtotal += taxable
+            gst_amt = taxable * itm['gst_pct'] / 100
+            if 'Intra State' in itm['gst_type']:
+                total_cgst += gst_amt / 2
+                total_sgst += gst_amt / 2
+            else:
+                total_igst += gst_amt
+
+        exact_total = subtotal + total_cgst + total_sgst + total_igst
+        grand_total = round(exact_total)
+        round_off = grand_total - exact_total
+
+        s1, s2, s3 = st.columns(3)
+        s1.metric("Subtotal", f"₹{subtotal:,.2f}")
+        s2.metric("CGST", f"₹{total_cgst:,.2f}")
+        s3.metric("SGST", f"₹{total_sgst:,.2f}")
+
+        s4, s5, s6 = st.columns(3)
+        s4.metric("IGST", f"₹{total_igst:,.2f}")
+        s5.metric("Round Off", f"₹{round_off:,.2f}")
+        s6.metric("🎯 Grand Total", f"₹{grand_total:,.2f}")
+
+        # ==========================================
+        # NIC E-WAY BILL PRE-FLIGHT (Before Saving)
+        # ==========================================
+        st.divider()
+        with st.expander("🚛 Generate E-Way Bill JSON (Pre-Flight)", expanded=False):
+            st.caption("You can download the JSON payload to upload to the NIC E-Way Bill portal before finalizing the invoice. Item quantities are intentionally omitted.")
+
+            _eway_items = []
+            for _idx, _itm in enumerate(st.session_state.invoice_items, 1):
+                _taxable = _itm["qty"] * _itm["rate"]
+                _gst_pct = _itm["gst_pct"]
+                _is_local = "Intra State" in _itm["gst_type"]
+                _eway_items.append({
+                    "itemNo": _idx,
+                    "productName": _itm["name"],
+                    "productDesc": _itm["name"],
+                    "hsnCode": int(_itm["hsn"]) if str(_itm["hsn"]).isdigit() else _itm["hsn"],
+                    "taxableAmount": round(_taxable, 2),
+                    "cgstRate": round(_gst_pct / 2, 2) if _is_local else 0,
+                    "sgstRate": round(_gst_pct / 2, 2) if _is_local else 0,
+                    "igstRate": round(_gst_pct, 2) if not _is_local else 0,
+                    "cessRate": 0,
+                    "cessAdvol": 0
+                })
+
+            _eway_payload = {
+                "supplyType": "O",
+                "subSupplyType": "1",
+                "docType": "INV",
+                "docNo": "DRAFT",
+                "docDate": datetime.now(IST).strftime("%d/%m/%Y"),
+                "fromGstin": "07AEFPG3543M1ZF",
+                "fromTrdName": "MANGLAM TRADELINK",
+                "fromAddr1": "6147/2, Gali Gurudwara, Nabi Karim",
+                "fromAddr2": "Delhi 110055",
+                "fromPlace": "Delhi",
+                "fromPincode": 110055,
+                "fromStateCode": 7,
+                "toGstin": inv_cust_gstin or "URP",
+                "toTrdName": inv_cust_name,
+                "toAddr1": (ship_to_addr or inv_cust_addr).split('\n')[0] if (ship_to_addr or inv_cust_addr) else "",
+                "toAddr2": "",
+                "toPlace": "Delhi",
+                "toPincode": 0,
+                "toStateCode": 7,
+                "totalValue": round(subtotal, 2),
+                "cgstValue": round(total_cgst, 2),
+                "sgstValue": round(total_sgst, 2),
+                "igstValue": round(total_igst, 2),
+                "cessValue": 0,
+                "totInvValue": grand_total,
+                "transMode": "1",
+                "transDistance": "",
+                "transporterName": inv_transporter,
+                "transporterId": inv_transporter_id,
+                "transDocNo": "",
+                "transDocDate": "",
+                "vehicleNo": inv_vehicle_no or "",
+                "vehicleType": "R",
+                "itemList": _eway_items
+            }
+        
+            import json as _json_pre
+            _eway_json_str = _json_pre.dumps(_eway_payload, indent=2, ensure_ascii=False)
+        
+            edited_eway_json = st.text_area(
+                "📝 Edit payload if needed:",
+                value=_eway_json_str,
+                height=250,
+                key="eway_json_editor_preflight"
+            )
+        
+            st.download_button(
+                label="⬇️ Download E-Way Bill JSON",
+                data=edited_eway_json.encode('utf-8'),
+                file_name=f"EwayBill_DRAFT_{datetime.now(IST).strftime('%Y%m%d%H%M')}.json",
+                mime="application/json",
+                use_container_width=True
+            )
+
+        st.divider()
+
+        # ==========================================
+        # SECTION 4: GENERATE & SAVE
+        # ==========================================
+        if st.button("🧾 Generate & Save Invoice", type="primary", use_container_width=True):
+            if not inv_cust_name:
+                st.error("Please select or enter a customer name.")
+            elif not st.session_state.invoice_items:
+                st.error("Please add at least one item to the cart.")
+            else:
+                try:
+                    import json as _json
+                    inv_date = datetime.now(IST).strftime("%d-%m-%Y %I:%M %p")
+                    inv_date_short = datetime.now(IST).strftime("%d-%b-%Y")
+                    items_json = _json.dumps(st.session_state.invoice_items, ensure_ascii=False)
+
+                    # Append row to Invoices sheet (includes Ship To fields)
+                    inv_row = [
+                        next_inv_number,
+                        inv_date,
+                        inv_cust_name,
+                        inv_cust_addr,
+                        inv_cust_gstin,
+                        items_json,
+                        round(subtotal, 2),
+                        round(total_cgst, 2),
+                        round(total_sgst, 2),
+                        round(total_igst, 2),
+                        round(round_off, 2),
+                        grand_total,
+                        st.session_state.user_name,
+                        "",  # N = Next Invoice Number (managed by sync)
+                        "",  # O = Last Synced (managed by sync)
+                        ship_to_name,    # P = Ship To Name
+                        ship_to_addr,    # Q = Ship To Address
+                        ship_to_gstin    # R = Ship To GSTIN
+                    ]
+
+                    if invoices_sheet:
+                        invoices_sheet.append_row(inv_row, value_input_option='USER_ENTERED')
+
+                        # Increment the Next Invoice Number in the sheet
+                        import re as _re
+                        num_match = _re.search(r'(.*?)(\d+)$', next_inv_number)
+                        if num_match:
+                            prefix = num_match.group(1)
+                            current_num = int(num_match.group(2))
+                            num_width = len(num_match.group(2))
+                            new_next = f"{prefix}{str(current_num + 1).zfill(num_width)}"
+                            invoices_sheet.update(values=[[new_next]], range_name='N2')
+                            invoices_sheet.update(values=[[inv_date]], range_name='O2')
+
+                        st.success(f"✅ Invoice **{next_inv_number}** saved successfully!")
+
+                        # --- Generate PDF for download ---
+                        try:
+                            from generate_invoice_pdf import generate_invoice as _gen_pdf
+
+                            # Determine dominant GST rates for the PDF summary
+                            _cgst_pct = ""
+                            _sgst_pct = ""
+                            _igst_pct = ""
+                            for _itm in st.session_state.invoice_items:
+                                if "Intra State" in _itm["gst_type"]:
+                                    _cgst_pct = str(_itm["gst_pct"] // 2)
+                                    _sgst_pct = str(_itm["gst_pct"] // 2)
+                                else:
+                                    _igst_pct = str(_itm["gst_pct"])
+
+                            pdf_data = {
+                                "buyer_name": inv_cust_name,
+                                "buyer_address": inv_cust_addr,
+                                "buyer_gstin": inv_cust_gstin,
+                                "buyer_pan": inv_cust_pan,
+                                "buyer_state": "Delhi",
+                                "buyer_state_code": "07",
+                                "place_of_supply": "Delhi",
+                                "buyer_contact": inv_cust_contact,
+                                "invoice_no": next_inv_number,
+                                "invoice_date": inv_date_short,
+                                "payment_terms": "",
+                                "other_ref": "",
+                                "despatched_through": "",
+                                "destination": "",
+                                "eway_bill_no": inv_eway_bill,
+                                "vehicle_no": inv_vehicle_no,
+                                "ship_to_name": ship_to_name,
+                                "ship_to_address": ship_to_addr,
+                                "ship_to_gstin": ship_to_gstin,
+                                "items": [{
+                                    "name": i["name"], "hsn": i["hsn"],
+                                    "qty": i["qty"], "rate": i["rate"],
+                                    "unit": i.get("unit", "SQM"), "per": i.get("unit", "SQM"),
+                                    "gst_pct": i["gst_pct"], "gst_type": i["gst_type"]
+                                } for i in st.session_state.invoice_items],
+                                "subtotal": round(subtotal, 2),
+                                "cgst": round(total_cgst, 2),
+                                "sgst": round(total_sgst, 2),
+                                "igst": round(total_igst, 2),
+                                "cgst_pct": _cgst_pct,
+                                "sgst_pct": _sgst_pct,
+                                "igst_pct": _igst_pct,
+                                "round_off": round(round_off, 2),
+                                "grand_total": grand_total,
+                            }
+                            # Fix for fpdf string vs bytearray outputs
+                            pdf_bytes = bytes(_gen_pdf(pdf_data))
+
+                            st.download_button(
+                                label="📄 Download Invoice PDF",
+                                data=pdf_bytes,
+                                file_name=f"Invoice_{next_inv_number.replace('/', '-')}.pdf",
+                                mime="application/pdf",
+                                use_container_width=True
+                            )
+                        except Exception as pdf_err:
+                            st.warning(f"⚠️ PDF generation failed: {pdf_err}")
+
+
+
+                    else:
+                        st.error("Invoices sheet not found. Please run the sync script first.")
+
+                except Exception as e:
+                    st.error(f"Failed to save invoice: {e}")
+
+    invoice_cart_fragment()
+
+else:
+    st.error("🚫 Access Denied. This page is for Admins only.")
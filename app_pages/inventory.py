@@ -0,0 +1,68 @@
+"""
+MANGLAM TRADELINK - Inventory Dashboard
+=======================================
+Live stock list with group / item filters and the stock bar chart.
+plotly is imported here, so it only loads once someone opens this page.
+"""
+import plotly.express as px
+
+st.header(t["inv"])
+
+# 🟢 DATA FRESHNESS INDICATOR (IST)
+if 'stock_last_synced' in st.session_state and not df.empty:
+    sync_time = st.session_state.stock_last_synced.strftime("%I:%M %p IST")
+    tally_ts = st.session_state.get('tally_last_synced')
+    tally_text = tally_ts.strftime("%d-%b-%Y %I:%M %p IST") if tally_ts else "Unknown"
+    mirror_ts = sheet_mirror.last_synced("Stock")
+    mirror_text = datetime.fromtimestamp(mirror_ts, IST).strftime("%I:%M:%S %p IST") if mirror_ts else "Pending"
+    freshness = sheet_mirror.freshness("Stock")
+    if freshness == "fresh":
+        fresh_color, fresh_text = "#10b981", "🟢 App Cache Refreshed"
+    elif freshness == "revalidating":
+        fresh_color, fresh_text = "#10b981", "🔄 Revalidating in background — App Cache Refreshed"
+    else:
+        fresh_color, fresh_text = "#f59e0b", "🟡 Showing older data while revalidating — App Cache Refreshed"
+    st.markdown(f"<div style='margin-top:-10px; margin-bottom:15px; font-size:13px; color:{fresh_color}; font-weight:500;'>{fresh_text}: {sync_time} &nbsp;|&nbsp; 🗄️ Local Mirror Synced: {mirror_text} &nbsp;|&nbsp; 📡 Tally Synced Database: {tally_text}</div>", unsafe_allow_html=True)
+elif df.empty:
+    st.markdown("<div style='margin-top:-10px; margin-bottom:15px; font-size:14px; color:#ef4444; font-weight:500;'>🔴 Sync Disconnected (No Data)</div>", unsafe_allow_html=True)
+
+if not df.empty:
+    with st.form(key="inv_search_form"):
+        col_search, col_filter, col_btn = st.columns([3, 3, 1])
+        with col_search: search_text = st.text_input(t["search_item"], "")
+        with col_filter:
+            groups = [t["all_groups"]] + df['Group'].dropna().unique().tolist()
+            selected_group = st.selectbox(t["filter_group"], groups)
+        with col_btn:
+            st.markdown("<br>", unsafe_allow_html=True)
+            inv_search_submitted = st.form_submit_button("🔍", use_container_width=True)
+
+    filtered_df = df.copy()
+    if search_text: filtered_df = filtered_df[filtered_df['Item'].str.contains(search_text, case=False, na=False)]
+    if selected_group != t["all_groups"]: filtered_df = filtered_df[filtered_df['Group'] == selected_group]
+
+    total_qty = filtered_df['Quantity'].sum()
+    # 🟢 ROLE-BASED: Hide Total Quantity and Items Found for Employees
+    if st.session_state.role != "Employee":
+        m1, m2 = st.columns(2)
+        m1.metric(t["volume_filtered"], f"{total_qty:,.0f}")
+        m2.metric(t["items_found"], len(filtered_df))
+
+    st.divider()
+    # 🟢 ROLE-BASED TABS: Admin sees Stock List first, Employee sees Bar Chart first
+    if st.session_state.role == "Admin":
+        tab2, tab1 = st.tabs([t["stock_list"], t["bar_chart"]])
+    else:
+        tab1, tab2 = st.tabs([t["bar_chart"], t["stock_list"]])
+
+    with tab1:
+        if not filtered_df.empty:
+            chart_df = filtered_df.sort_values('Quantity', ascending=False)
+            display_chart = hindi_df_columns(chart_df, ['Item', 'Group'])
+            fig = px.bar(display_chart, x='Item', y='Quantity', color='Group', hover_data=['Display Qty'])
+            fig.update_layout(xaxis_tickangle=-45, height=500, plot_bgcolor="rgba(0,0,0,0)")
+            st.plotly_chart(fig, use_container_width=True)
+
+    with tab2:
+        sorted_df = filtered_df[['Group', 'Item', 'Quantity', 'Unit']].sort_values(["Group", "Quantity"], ascending=[True, False])
+        st.dataframe(hindi_df_columns(sorted_df, ['Group', 'Item']), use_container_width=True, hide_index=True)
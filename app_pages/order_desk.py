@@ -0,0 +1,588 @@
+"""
+MANGLAM TRADELINK - Order Desk
+==============================
+New orders (cart), pending / awaited-payment dispatch cards and completed
+orders. The order-card HTML table and the fpdf receipt builder live here, so
+fpdf only loads once someone opens this page.
+
+Pending / completed orders are shown one page of cards at a time
+(ORDER_PAGE_SIZE, from the environment or st.secrets); card HTML is cached
+per order and receipt PDFs are only built when a download is clicked.
+
+Items are read from `order_lines` (order_lines.py: one row per item, keyed
+by the order's `_Row`) instead of re-splitting "Order Details".
+"""
+from functools import partial
+
+from fpdf import FPDF
+
+ORDER_PAGE_SIZE = int(sheets_setting("ORDER_PAGE_SIZE", 20))
+
+def generate_html_table(items):
+    html = "<table class='order-table'><tr><th>Stock Item</th><th>Quantity Ordered</th></tr>"
+    for name, qty in items:
+        if name:
+            html += f"<tr><td><b>{hindi(name)}</b></td><td>{qty}</td></tr>"
+        else:
+            html += f"<tr><td colspan='2'>{qty}</td></tr>"
+    html += "</table>"
+    return html
+
+def create_order_pdf(row, items):
+    def _safe(text):
+        """Sanitize text for FPDF's built-in fonts (latin-1 only)."""
+        return str(text).encode('latin-1', 'replace').decode('latin-1')
+    
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("helvetica", "B", 20)
+    pdf.cell(0, 10, "MANGLAM TRADELINK", ln=True, align="C")
+    pdf.set_font("helvetica", "", 12)
+    pdf.cell(0, 8, "NYC Brand - Official Order Receipt", ln=True, align="C")
+    pdf.ln(10)
+    
+    pdf.set_font("helvetica", "B", 12)
+    pdf.cell(40, 8, "Order ID:", 0, 0)
+    pdf.set_font("helvetica", "", 12)
+    pdf.cell(0, 8, _safe(row.get('Order ID', '')), ln=True)
+    
+    pdf.set_font("helvetica", "B", 12)
+    pdf.cell(40, 8, "Date (IST):", 0, 0)
+    pdf.set_font("helvetica", "", 12)
+    pdf.cell(0, 8, _safe(row.get('Date', '')), ln=True)
+    
+    pdf.set_font("helvetica", "B", 12)
+    pdf.cell(40, 8, "Customer:", 0, 0)
+    pdf.set_font("helvetica", "", 12)
+    pdf.cell(0, 8, _safe(row.get('Customer Name', '')), ln=True)
+    
+    notes = str(row.get('Notes', '')).strip()
+    if notes and notes != 'None':
+        pdf.set_font("helvetica", "B", 12)
+        pdf.cell(40, 8, "Notes:", 0, 0)
+        pdf.set_font("helvetica", "", 12)
+        pdf.multi_cell(0, 8, _safe(notes))
+        
+    pdf.ln(10)
+    pdf.set_font("helvetica", "B", 14)
+    pdf.cell(0, 10, "Order Details & Quantities", ln=True)
+    pdf.set_font("helvetica", "", 12)
+    
+    for name, qty in items:
+        pdf.cell(0, 8, f"- {_safe(f'{name}: {qty}' if name else qty)}", ln=True)
+        
+    return bytes(pdf.output())
+
+
+@st.cache_data(max_entries=5000, show_spinner=False)
+def order_card_html(kind, order_id, date, customer, notes, items, completed_by, lang, hindi_version):
+    """Card markup for one order ("pending" / "tally" / "completed"), cached on the order's contents, the UI
+    language and -- in Hindi -- the Hindi map version."""
+    if kind == "completed":
+        return f'<div class="completed-card order-card"><h4 style="margin-top:0; color:#10b981;">Order {order_id}</h4><b>Customer:</b> {hindi(customer)}<br><b>Notes:</b> {hindi(notes)}<br>{generate_html_table(items)}<hr><span style="color: #6c757d;">✅ Completed by: <b>{completed_by}</b> on {date}</span></div>'
+
+    # 🟢 Format date as "dd Month" (e.g. "16 March")
+    try:
+        _parsed_dt = datetime.strptime(date.strip(), "%d-%m-%Y %I:%M %p")
+        _disp_date = _parsed_dt.strftime("%d %B")
+    except Exception:
+        _disp_date = date
+
+    if kind == "tally":
+        # Custom UI for Tally auto-pulled orders
+        card_style = "background-color: #fee2e2; border: 2px solid #b91c1c; border-radius: 8px; padding: 15px; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);"
+        tag_html = '<div style="background-color: #ef4444; color: white; padding: 5px 10px; border-radius: 4px; display: inline-block; font-weight: bold; margin-bottom: 10px; font-size: 14px;">🚨 NO DELIVERY UNTIL PAYMENT RECEIVED</div><br>'
+        return f'<div style="{card_style}">{tag_html}<h4 style="margin-top:0; color:#991b1b;">Order {order_id} (Tally Sync)</h4><b>📅 Date:</b> {_disp_date}<br><b>Customer:</b> {hindi(customer)}<br><b>Notes:</b> {hindi(notes)}<br>{generate_html_table(items)}</div>'
+    # Standard UI for manual orders
+    return f'<div class="order-card"><h4 style="margin-top:0; color:#0056b3;">Order {order_id}</h4><b>📅 Date:</b> {_disp_date}<br><b>Customer:</b> {hindi(customer)}<br><b>Notes:</b> {hindi(notes)}<br>{generate_html_table(items)}</div>'
+
+def render_order_card(row, kind):
+    st.markdown(order_card_html(kind, str(row["Order ID"]), str(row.get("Date", "")), str(row["Customer Name"]),
+                                str(row.get("Notes", "None")), order_items(order_lines, row["_Row"]), row.get("Completed By", "Unknown"),
+                                st.session_state.get("app_lang"),
+                                hindi_map_version if st.session_state.get("app_lang") == "Hindi" else ""), unsafe_allow_html=True)
+
+def paginate(frame, key):
+    """Page-size / page pickers above a card list; returns only the rows of the current page."""
+    sizes = sorted({10, 20, 50, 100, ORDER_PAGE_SIZE})
+    total = len(frame)
+    if total <= sizes[0]:
+        return frame
+    pc1, pc2, pc3 = st.columns([2, 2, 4])
+    with pc1:
+        size = st.selectbox(t["per_page"], sizes, index=sizes.index(ORDER_PAGE_SIZE), key=f"{key}_size")
+    pages = -(-total // size)
+    if st.session_state.get(f"{key}_page", 1) > pages: st.session_state[f"{key}_page"] = pages # Filters / page size shrank the list
+    with pc2:
+        page_no = st.number_input(t["page_no"], min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+    start = (page_no - 1) * size
+    with pc3:
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.caption(t["page_range"].format(start=start + 1, end=min(start + size, total), total=total, page=page_no, pages=pages))
+    return frame.iloc[start:start + size]
+
+
+st.header(t["ord"])
+orders_df = fetch_orders_cache(orders_sheet)
+if orders_locator is not None: orders_locator.load(orders_df, 'Order ID')
+order_lines = fetch_order_lines(frame_version(orders_df), orders_df)
+
+# 🟢 OPTIMISTIC UI: Inject locally added orders before rendering
+if 'optimistic_orders' not in st.session_state:
+    st.session_state.optimistic_orders = []
+
+if st.session_state.optimistic_orders:
+    opt_df = pd.DataFrame(st.session_state.optimistic_orders)
+    opt_df['_Row'] = -pd.RangeIndex(1, len(opt_df) + 1) # Not in the sheet yet: negative keys for their order lines
+    orders_df = pd.concat([opt_df, orders_df], ignore_index=True) # Put new ones at top
+    order_lines = pd.concat([parse_order_lines(opt_df), order_lines]).sort_index(kind="stable")
+
+# 🟢 ROLE-BASED TABS: Employee sees Pending Orders first
+if st.session_state.role == "Employee":
+    order_tab2, order_tab1, order_tab3 = st.tabs([t["pending_orders"], t["place_order"], t["completed_orders"]])
+else:
+    order_tab1, order_tab2, order_tab3 = st.tabs([t["place_order"], t["pending_orders"], t["completed_orders"]])
+
+# 🟢 FRAGMENT: adding / removing cart items reruns only this tab, not the orders fetch and the pending-order cards
+@st.fragment
+def order_cart_fragment():
+    # 🟢 THE FIX: Initialize a Master Reset Key
+    if 'form_reset' not in st.session_state:
+        st.session_state.form_reset = 0
+    r_key = st.session_state.form_reset
+    
+    try:
+        cust_data = fetch_basic_records(cust_sheet, "Customers")
+        customer_list = sorted(list(set([str(row['Customer Name']).strip() for row in cust_data if 'Customer Name' in row and str(row['Customer Name']).strip()])))
+        
+        # 🟢 Build display labels for customers (Hindi if needed, but always store English)
+        if st.session_state.get('app_lang') == 'Hindi':
+            cust_display = [hindi(c) for c in customer_list]
+        else:
+            cust_display = list(customer_list)
+        cust_display_to_real = dict(zip(cust_display, customer_list))
+    except: 
+        customer_list = []
+        cust_display = []
+        cust_display_to_real = {}
+        
+    st.subheader(t["create_order"])
+    st.write(t["customer_details"])
+    
+    # Notice how every input now has f"_{r_key}" attached to it!
+    customer_dropdown_display = st.selectbox(t["search_customer"], cust_display, index=None, placeholder=t["search_customer_ph"], key=f"order_cust_drop_{r_key}")
+    
+    if not customer_dropdown_display: 
+        customer_name = st.text_input(t["new_customer_name"], placeholder=t["new_customer_ph"], key=f"order_cust_text_{r_key}")
+    else: 
+        customer_name = cust_display_to_real.get(customer_dropdown_display, customer_dropdown_display)
+        
+    order_notes = st.text_input(t["order_notes_label"], placeholder=t["order_notes_ph"], key=f"order_notes_{r_key}")
+    
+    st.divider()
+    st.write(t["select_items_cart"])
+    
+    try:
+        master_data = fetch_basic_records(master_sheet, "Master Items")
+        item_list = sorted([str(row['Item Name']).strip() for row in master_data if 'Item Name' in row])
+    except:
+        item_list = df['Item'].tolist() if not df.empty else []
+    
+    # 🟢 Cart-based item adding
+    if 'order_cart' not in st.session_state:
+        st.session_state.order_cart = {}
+    
+    # --- ADD ITEM SECTION ---
+    st.markdown(f"##### {t.get('add_item_title', '➕ Add Item to Cart')}")
+    
+    # Filter out items already in cart
+    available_items = [i for i in item_list if i not in st.session_state.order_cart]
+    
+    # 🟢 Sorting based on Stock Priority
+    item_qty_map = dict(zip(df['Item'], df['Quantity'])) if not df.empty else {}
+    def stock_priority(item):
+        qty = item_qty_map.get(item, 0)
+        if qty > 0: return 0
+        elif qty < 0: return 1
+        else: return 2
+        
+    available_items = sorted(available_items, key=stock_priority)
+    
+    # 🟢 Build dual-language display labels for the single unified selectbox
+    is_hindi = st.session_state.get('app_lang') == 'Hindi'
+    display_options = []
+    display_to_real_item = {}
+    for item in available_items:
+        if is_hindi:
+            h_name = hindi(item)
+            label = f"{h_name} ({item})" if h_name != item else item
+        else:
+            label = item
+        display_options.append(label)
+        display_to_real_item[label] = item
+    
+    # 🟢 SINGLE UNIFIED SELECTBOX — Streamlit's native type-to-search handles filtering
+    pick_display = st.selectbox(
+        t.get("select_match", "🎯 Search & Select Item"),
+        display_options,
+        index=None,
+        placeholder=t.get("search_keyword", "Type to search..."),
+        key=f"unified_item_{r_key}"
+    )
+    
+    pick_item = display_to_real_item.get(pick_display) if pick_display else None
+    
+    if pick_item:
+        item_data = df[df['Item'] == pick_item]
+        if not item_data.empty:
+            avail_qty = item_data['Quantity'].iloc[0]
+            unit = item_data['Unit'].iloc[0]
+            stock_color = "#4CAF50" if avail_qty > 0 else "#dc3545"
+        else:
+            avail_qty = 0
+            unit = "units"
+            stock_color = "#dc3545"
+        
+        st.markdown(f'<div class="item-banner"><h4 style="margin:0; color: #333;">{hindi(pick_item)}</h4><span style="color: {stock_color}; font-weight: bold;">{t["stock_label"]} {avail_qty:,.0f} {unit}</span></div>', unsafe_allow_html=True)
+        st.markdown('<div class="item-inputs">', unsafe_allow_html=True)
+        c1, c2, c3 = st.columns(3)
+        with c1: qty = st.number_input(f"{t['order_qty']} ({unit})", min_value=1.0, value=1.0, step=1.0, key=f"p_add_{r_key}")
+        with c2: alt_qty = st.number_input(t["alt_qty"], min_value=0.0, value=0.0, step=1.0, key=f"a_add_{r_key}")
+        with c3: alt_unit = st.text_input(t["alt_unit"], key=f"u_add_{r_key}")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        if st.button(t.get("add_to_cart", "➕ Add to Cart"), type="primary", key=f"add_btn_{r_key}"):
+            detail_str = f"{qty} {unit}" + (f" (Alt: {alt_qty} {alt_unit})" if alt_qty > 0 and alt_unit else "")
+            st.session_state.order_cart[pick_item] = detail_str
+            rerun_fragment()
+    
+    # --- CART SUMMARY ---
+    if st.session_state.order_cart:
+        st.divider()
+        st.markdown(f"##### 🛒 {t.get('cart_title', 'Your Cart')} ({len(st.session_state.order_cart)} {t.get('cart_items', 'items')})")
+        
+        for cart_item, cart_detail in list(st.session_state.order_cart.items()):
+            ic1, ic2, ic3 = st.columns([5, 4, 1])
+            with ic1:
+                st.markdown(f"**{hindi(cart_item)}**")
+            with ic2:
+                st.caption(cart_detail)
+            with ic3:
+                if st.button("❌", key=f"rm_{cart_item}_{r_key}", help=t.get("remove_item", "Remove")):
+                    del st.session_state.order_cart[cart_item]
+                    rerun_fragment()
+        
+        if st.button(t.get("clear_cart", "🗑️ Clear Cart"), key=f"clear_cart_{r_key}"):
+            st.session_state.order_cart = {}
+            rerun_fragment()
+    
+    order_details_dict = st.session_state.order_cart
+    
+    if st.button(t["submit_order"], type="primary"):
+        if not customer_name or not order_details_dict:
+            st.error(t["fill_all_details"])
+        else:
+            now_ist = datetime.now(IST)
+            today_prefix = f"TALLY-{now_ist.strftime('%d.%m.%y')}."
+            next_x = 1
+            if not orders_df.empty and 'Order ID' in orders_df.columns:
+                today_orders = orders_df[orders_df['Order ID'].astype(str).str.startswith(today_prefix)]
+                if not today_orders.empty: next_x = len(today_orders) + 1
+            
+            order_id = f"{today_prefix}{next_x}"
+            details_str = format_order_details(order_details_dict)
+            try:
+                append_res = orders_sheet.append_row([order_id, now_ist.strftime("%d-%m-%Y %I:%M %p"), customer_name, details_str, "Pending", "", order_notes])
+                orders_locator.on_append(order_id, appended_row(append_res))
+                
+                # Telegram Processing: queued for the outbox thread, so a slow Telegram can't hold up the Order Desk
+                tg_queued = None
+                try:
+                    table_text = "━━━━━━━━━━━━━━━━━━━━\n"
+                    table_text_hi = "━━━━━━━━━━━━━━━━━━━━\n"
+                    for name, q in order_details_dict.items(): # The cart is already one entry per item
+                        table_text += f"▪️ {name} ➔ {q}\n"
+                        table_text_hi += f"▪️ {hindi(name)} ➔ {q}\n"
+                    table_text += "━━━━━━━━━━━━━━━━━━━━\n"
+                    table_text_hi += "━━━━━━━━━━━━━━━━━━━━\n"
+                    
+                    alert_text = "🚨 NEW ORDER ALERT 🚨\n\n"
+                    alert_text += f"🆔 {order_id}\n👤 {customer_name}\n\n{table_text}"
+                    if order_notes and str(order_notes).strip(): alert_text += f"\n📝 Notes: {order_notes}\n"
+                    alert_text += f"\n✅ Placed By: {st.session_state.user_name}"
+                    
+                    # Hindi translation section
+                    alert_text += "\n\n── हिंदी अनुवाद ──\n"
+                    alert_text += f"🚨 नया ऑर्डर 🚨\n"
+                    alert_text += f"🆔 {order_id}\n👤 {hindi(customer_name)}\n\n{table_text_hi}"
+                    if order_notes and str(order_notes).strip(): alert_text += f"📝 नोट: {hindi(str(order_notes))}\n"
+                    alert_text += f"✅ द्वारा: {st.session_state.user_name}"
+                    
+                    tg_queued = send_telegram(alert_text)
+                    if not tg_queued: flash(t["tg_keys_missing"], icon="⚠️")
+                except Exception as tg_e:
+                    flash(t["tg_system_error"].format(err=tg_e), icon="⚠️")
+                
+                if tg_queued:
+                    flash(t["order_placed_tg"].format(oid=order_id), icon="📨")
+                else:
+                    flash(t["order_placed_db"].format(oid=order_id), icon="✅")
+
+                # 🟢 OPTIMISTIC UI: Add to local state immediately instead of waiting for Google Sheets
+                if 'optimistic_orders' not in st.session_state:
+                    st.session_state.optimistic_orders = []
+                    
+                st.session_state.optimistic_orders.append({
+                    "Order ID": order_id,
+                    "Date": now_ist.strftime("%d-%m-%Y %I:%M %p"),
+                    "Customer Name": customer_name,
+                    "Order Details": details_str,
+                    "Status": "Pending",
+                    "Completed By": "",
+                    "Notes": order_notes
+                })
+
+                st.session_state.form_reset += 1
+                st.session_state.order_cart = {} # Clear cart cleanly
+                        
+                st.rerun() # Whole page: the new order has to show up under Pending Orders
+            except Exception as e: 
+                st.error(t["error_saving_order"].format(err=e))
+                
+
+with order_tab1:
+    order_cart_fragment()
+
+with order_tab2:
+    if not orders_df.empty and 'Status' in orders_df.columns:
+        # Separate the two types of pending orders
+        manual_pending_df = orders_df[orders_df['Status'] == 'Pending'].iloc[::-1]
+        tally_pending_df = orders_df[orders_df['Status'] == 'Pending - Awaited Payment'].iloc[::-1]
+        
+        # Combine them for the loop, but manual orders first
+        combined_pending = pd.concat([manual_pending_df, tally_pending_df])
+        
+        # 🟢 PAGINATED: cards, buttons and editors are only built for the orders on the current page
+        stock_item_names = df['Item'].dropna().unique().tolist() if not df.empty else []
+        for idx, row in paginate(combined_pending, "pending_orders_pg").iterrows():
+            is_tally = row['Status'] == 'Pending - Awaited Payment'
+            render_order_card(row, "tally" if is_tally else "pending")
+            
+            if is_tally:
+                if st.button(t.get("approve_payment", "✅ Payment Received / Allow Delivery"), key=f"tally_aprv_{row['Order ID']}_{idx}", type="primary", use_container_width=True):
+                    try:
+                        order_row = orders_locator.locate(row['Order ID'], row.get('_Row'))
+                        orders_sheet.update_cell(order_row, 5, 'Pending')
+                        
+                        try:
+                            # Format English items table
+                            items_eng = ""
+                            items_hi = ""
+                            for k, v in order_items(order_lines, row['_Row']):
+                                if k:
+                                    items_eng += f"🔹 {k} | {v}\n"
+                                    items_hi += f"🔹 {hindi(k)} | {hindi(v)}\n"
+                                else:
+                                    items_eng += f"🔹 {v}\n"
+                                    items_hi += f"🔹 {hindi(v)}\n"
+                                    
+                            comp_text = f"✅ *PAYMENT RECEIVED / DELIVERY APPROVED* ✅\n\n🆔 {row['Order ID']}\n👤 {row['Customer Name']}\n\n📦 *ITEMS TO DELIVER:*\n{items_eng}\n👷 Approved By: {st.session_state.user_name}\n👑 Placed by: Super Admin"
+                            comp_text += f"\n\n── हिंदी ──\n✅ *पेमेंट प्राप्त / डिलीवरी की अनुमति* ✅\n\n🆔 {row['Order ID']}\n👤 {hindi(str(row['Customer Name']))}\n\n📦 *डिलीवरी के लिए आइटम:*\n{items_hi}\n👷 स्वीकृत: {st.session_state.user_name}\n👑 द्वारा: सुपर एडमिन (Super Admin)"
+                            if send_telegram(comp_text): flash(t["tg_queued"], icon="📨")
+                        except: pass
+                        
+                        flash(t.get("approve_success", "Order marked as pending for delivery!"), icon="✅")
+                        invalidate_sheets("Orders")
+                        st.rerun()
+                    except Exception as e: st.error(f"Error: {e}")
+
+            c1, c2 = st.columns([1, 1])
+            with c1:
+                # 🟢 ADMIN DELIVERY OVERRIDE: Admin selects which employee completed the order
+                if st.session_state.role == "Admin":
+                    admin_assign_key = f"admin_assign_{row['Order ID']}_{idx}"
+                    if st.button(t["mark_complete"], key=f"btn_{row['Order ID']}_{idx}"):
+                        st.session_state[admin_assign_key] = True
+                    
+                    if st.session_state.get(admin_assign_key, False):
+                        # Load employee names from Users sheet
+                        try:
+                            _users_data = fetch_basic_records(users_sheet, "Users")
+                            _emp_names = sorted(list(set([str(u.get('Name', '')).strip() for u in _users_data if str(u.get('Name', '')).strip()])))
+                        except:
+                            _emp_names = [st.session_state.user_name]
+                        
+                        completed_by_name = st.selectbox(
+                            "👷 Select who delivered this order:",
+                            _emp_names,
+                            key=f"assign_emp_{row['Order ID']}_{idx}"
+                        )
+                        if st.button("✅ Confirm Delivery", key=f"confirm_del_{row['Order ID']}_{idx}", type="primary"):
+                            try:
+                                order_row = orders_locator.locate(row['Order ID'], row.get('_Row'))
+                                with WriteBatch(orders_sheet) as wb:
+                                    wb.update_cell(order_row, 5, 'Completed')
+                                    wb.update_cell(order_row, 6, completed_by_name)
+                                
+                                try:
+                                    units = total_units(lines_of(order_lines, row['_Row']))
+                                    
+                                    tu_str = f"📦 Total Units: {units:g}\n" if units > 0 else ""
+                                    htu_str = f"📦 कुल यूनिट: {units:g}\n" if units > 0 else ""
+                                    
+                                    comp_text = f"✅ *ORDER COMPLETED* ✅\n\n🆔 {row['Order ID']}\n👤 {row['Customer Name']}\n{tu_str}👷 Completed By: {completed_by_name}\n👑 Assigned By: {st.session_state.user_name}"
+                                    comp_text += f"\n\n── हिंदी ──\n✅ *ऑर्डर पूरा* ✅\n\n🆔 {row['Order ID']}\n👤 {hindi(str(row['Customer Name']))}\n{htu_str}👷 पूरा किया: {completed_by_name}\n👑 द्वारा: {st.session_state.user_name}"
+                                    if send_telegram(comp_text): flash(t["tg_queued"], icon="📨")
+                                except: pass
+                                
+                                st.session_state[admin_assign_key] = False
+                                flash(t["order_completed"], icon="✅")
+                                invalidate_sheets("Orders")
+                                st.rerun()
+                            except Exception as e: st.error(f"Error: {e}")
+                else:
+                    # Employee: instant complete under their own name
+                    if st.button(t["mark_complete"], key=f"btn_{row['Order ID']}_{idx}"):
+                        try:
+                            order_row = orders_locator.locate(row['Order ID'], row.get('_Row'))
+                            with WriteBatch(orders_sheet) as wb:
+                                wb.update_cell(order_row, 5, 'Completed')
+                                wb.update_cell(order_row, 6, st.session_state.user_name)
+                            
+                            try:
+                                units = total_units(lines_of(order_lines, row['_Row']))
+                                
+                                tu_str = f"📦 Total Units: {units:g}\n" if units > 0 else ""
+                                htu_str = f"📦 कुल यूनिट: {units:g}\n" if units > 0 else ""
+
+                                comp_text = f"✅ *ORDER COMPLETED* ✅\n\n🆔 {row['Order ID']}\n👤 {row['Customer Name']}\n{tu_str}👷 Completed By: {st.session_state.user_name}"
+                                comp_text += f"\n\n── हिंदी ──\n✅ *ऑर्डर पूरा* ✅\n\n🆔 {row['Order ID']}\n👤 {hindi(str(row['Customer Name']))}\n{htu_str}👷 पूरा किया: {st.session_state.user_name}"
+                                if send_telegram(comp_text): flash(t["tg_queued"], icon="📨")
+                            except: pass
+                            
+                            flash(t["order_completed"], icon="✅")
+                            invalidate_sheets("Orders")
+                            st.rerun()
+                        except Exception as e: st.error(f"Error: {e}")
+            with c2:
+                # PDF is built on click (deferred download), not for every card on every rerun
+                st.download_button(t["share_pdf"], data=partial(create_order_pdf, row.to_dict(), order_items(order_lines, row['_Row'])), file_name=f"Order_{row['Order ID']}.pdf", mime="application/pdf", key=f"pdf_{row['Order ID']}_{idx}")
+
+            with st.expander(t["modify_delete"]):
+                mod_cust = st.text_input(t["customer_name_label"], str(row['Customer Name']), key=f"mcust_{row['Order ID']}_{idx}")
+                
+                current_items = {k: v for k, v in order_items(order_lines, row['_Row']) if k}
+                        
+                all_items = list(stock_item_names)
+                for k in current_items.keys():
+                    if k not in all_items: all_items.append(k)
+                        
+                st.write(t["modify_items"])
+                mod_selected_items = st.multiselect(
+                    t["add_remove_items"],
+                    options=all_items,
+                    default=list(current_items.keys()),
+                    key=f"mitems_{row['Order ID']}_{idx}"
+                )
+                
+                new_order_dict = {}
+                for item in mod_selected_items:
+                    default_qty = current_items.get(item, "1.0 units")
+                    new_qty = st.text_input(t["qty_details_for"].format(item=item), value=default_qty, key=f"mqty_{row['Order ID']}_{idx}_{item}")
+                    new_order_dict[item] = new_qty
+                    
+                mod_notes = st.text_input(t["notes_label"], str(row.get('Notes', '')), key=f"mnot_{row['Order ID']}_{idx}")
+                
+                ec1, ec2 = st.columns(2)
+                with ec1:
+                    if st.button(t["save_changes"], type="primary", key=f"msave_{row['Order ID']}_{idx}"):
+                        reconstructed_details = format_order_details(new_order_dict)
+                        if not reconstructed_details:
+                            st.error("You must have at least one item in the order.")
+                        else:
+                            try:
+                                order_row = orders_locator.locate(row['Order ID'], row.get('_Row'))
+                                with WriteBatch(orders_sheet) as wb:
+                                    wb.update_range(f"C{order_row}:D{order_row}", [[mod_cust, reconstructed_details]])
+                                    wb.update_cell(order_row, 7, mod_notes)
+                                st.success(t["order_updated"])
+                                invalidate_sheets("Orders")
+                                st.rerun()
+                            except Exception as e: st.error(t["failed_update"].format(err=e))
+                with ec2:
+                    if st.button(t["delete_order"], key=f"mdel_{row['Order ID']}_{idx}"):
+                        try:
+                            order_row = orders_locator.locate(row['Order ID'], row.get('_Row'))
+                            orders_sheet.delete_rows(order_row)
+                            orders_locator.on_delete(order_row)
+                            st.warning(t["order_deleted"])
+                            invalidate_sheets("Orders")
+                            st.rerun()
+                        except Exception as e: st.error(t["failed_delete"].format(err=e))
+
+with order_tab3:
+    if not orders_df.empty and 'Status' in orders_df.columns:
+        completed_df = orders_df[orders_df['Status'] == 'Completed'].copy()
+        completed_df['Parsed Date'] = pd.to_datetime(completed_df['Date'], format="%d-%m-%Y %I:%M %p", errors='coerce').dt.date
+        
+        with st.form(key="comp_search_form"):
+            fc1, fc2, fc3, fc4, fc5 = st.columns([3, 3, 2, 2, 1])
+            
+            with fc1:
+                search_query = st.text_input(t["search_name_id"], placeholder=t["search_eg"], key="search_comp")
+            
+            with fc2:
+                min_date = completed_df['Parsed Date'].dropna().min() if not completed_df['Parsed Date'].dropna().empty else datetime.today().date()
+                max_date = completed_df['Parsed Date'].dropna().max() if not completed_df['Parsed Date'].dropna().empty else datetime.today().date()
+                date_filter = st.date_input(t["date_range"], value=(), min_value=min_date, max_value=max_date, key="date_comp")
+            
+            with fc3:
+                emp_list = [t["all_employees"]] + sorted(completed_df['Completed By'].dropna().unique().tolist())
+                emp_filter = st.selectbox(t["completed_by"], emp_list, key="emp_comp")
+                
+            with fc4:
+                item_list = ([t["all_items_filter"]] + df['Item'].dropna().unique().tolist()) if not df.empty else [t["all_items_filter"]]
+                item_filter = st.selectbox(t["contains_fabric"], item_list, key="item_comp")
+            
+            with fc5:
+                st.markdown("<br>", unsafe_allow_html=True)
+                comp_search_submitted = st.form_submit_button("🔍", use_container_width=True)
+        filtered_df = completed_df.copy()
+        
+        if search_query:
+            filtered_df = filtered_df[
+                filtered_df['Order ID'].astype(str).str.contains(search_query, case=False, na=False) |
+                filtered_df['Customer Name'].astype(str).str.contains(search_query, case=False, na=False) |
+                filtered_df['Notes'].astype(str).str.contains(search_query, case=False, na=False)
+            ]
+            
+        if isinstance(date_filter, tuple) and len(date_filter) == 2:
+            start_date, end_date = date_filter
+            filtered_df = filtered_df[(filtered_df['Parsed Date'] >= start_date) & (filtered_df['Parsed Date'] <= end_date)]
+            
+        if emp_filter != t["all_employees"]:
+            filtered_df = filtered_df[filtered_df['Completed By'] == emp_filter]
+            
+        if item_filter != t["all_items_filter"]:
+            filtered_df = filtered_df[filtered_df['_Row'].isin(orders_with_item(order_lines, item_filter))] # Join on the parsed lines, no substring scan
+
+        filtered_df = filtered_df.iloc[::-1]
+        st.markdown(f"<p style='color: #64748b; font-size: 14px;'>{t['showing_completed'].format(count=len(filtered_df))}</p>", unsafe_allow_html=True)
+
+        for idx, row in paginate(filtered_df, "completed_orders_pg").iterrows():
+            render_order_card(row, "completed")
+            
+            c1, c2 = st.columns([1, 1])
+            with c1:
+                st.download_button(t["download_receipt"], data=partial(create_order_pdf, row.to_dict(), order_items(order_lines, row['_Row'])), file_name=f"Receipt_{row['Order ID']}.pdf", mime="application/pdf", key=f"pdf_comp_{row['Order ID']}_{idx}")
+            with c2:
+                if st.session_state.role == "Admin":
+                    if st.button(t["delete_record"], key=f"del_comp_{row['Order ID']}_{idx}"):
+                        try:
+                            order_row = orders_locator.locate(row['Order ID'], row.get('_Row'))
+                            orders_sheet.delete_rows(order_row)
+                            orders_locator.on_delete(order_row)
+                            st.warning(t["record_deleted"])
+                            invalidate_sheets("Orders")
+                            st.rerun()
+                        except Exception as e: st.error(t["failed_delete"].format(err=e))
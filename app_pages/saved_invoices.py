@@ -0,0 +1,55 @@
+"""
+MANGLAM TRADELINK - Saved Invoices
+==================================
+Admin only: view or delete previously generated invoices.
+"""
+
+if st.session_state.role == "Admin":
+    st.header("📁 Saved Invoices")
+    st.caption("View or Delete previously generated invoices.")
+    
+    if invoices_sheet:
+        inv_data = invoices_sheet.get_all_records()
+        if inv_data:
+            inv_df = pd.DataFrame(inv_data)
+            # We need the physical row number to delete/edit rows starting from 2
+            inv_df["_Row"] = range(2, len(inv_df) + 2)
+            
+            if "Invoice Number" in inv_df.columns:
+                # Sort list newest top
+                inv_df = inv_df.sort_values(by="_Row", ascending=False).copy()
+                
+                st.dataframe(inv_df.drop(columns=["_Row", "Items JSON"], errors='ignore'), use_container_width=True)
+                
+                st.divider()
+                st.subheader("Manage Invoice")
+                
+                action_inv = st.selectbox("Select Invoice to Manage", inv_df["Invoice Number"].tolist())
+                
+                if action_inv:
+                    sel_row = inv_df[inv_df["Invoice Number"] == action_inv].iloc[0]
+                    row_idx = int(sel_row["_Row"])
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.button(f"🗑️ Delete {action_inv}", type="primary"):
+                            invoices_sheet.delete_rows(row_idx)
+                            st.success(f"Invoice {action_inv} deleted successfully!")
+                            st.rerun()
+                        st.caption("WARNING: Deleting this row will remove it forever.")
+                    with col2:
+                        if st.button("🗑️ Delete All Invoices", type="secondary"):
+                            # Clear all data rows (keep header)
+                            invoices_sheet.resize(rows=1)
+                            invoices_sheet.resize(rows=500)
+                            st.toast("All invoices deleted!")
+                            st.rerun()
+                        st.info("Edit functionality defaults to direct edits in Google Sheets to prevent out-of-sync carts.")
+            else:
+                st.warning("Invoice Number column not found in sheet.")
+        else:
+            st.info("No invoices found.")
+    else:
+        st.error("Invoices sheet is not accessible.")
+else:
+    st.error("🚫 Access Denied.")
@@ -0,0 +1,101 @@
+"""
+MANGLAM TRADELINK - Stock Audit
+===============================
+Employee view: log physical counts in batches; shows the items still to be counted.
+"""
+
+st.header(t["aud"])
+
+with st.expander(t["view_system_qty"]):
+    if not df.empty and all(c in df.columns for c in ['Group', 'Item', 'Quantity', 'Unit']):
+        st.dataframe(hindi_df_columns(df[['Group', 'Item', 'Quantity', 'Unit']].sort_values(["Group", "Quantity"], ascending=[True, False]), ['Group', 'Item']), use_container_width=True, hide_index=True)
+    else:
+        st.warning(t["stock_syncing"])
+
+if not audit_sheet:
+    st.error(t["audit_db_missing"])
+else:
+    def load_active_audit():
+        try:
+            audit_data = fetch_basic_records(audit_sheet, "Audit Logs")
+            audit_df = pd.DataFrame(audit_data)
+            if not audit_df.empty and 'Status' in audit_df.columns:
+                return audit_df[audit_df['Status'] == 'Active']
+        except:
+            pass
+        return pd.DataFrame(columns=['Timestamp', 'Item Name', 'Location', 'Quantity Found', 'Employee Name', 'Status'])
+
+    active_audit = load_active_audit()
+
+    all_items = df['Item'].dropna().unique().tolist()
+    audited_items = active_audit['Item Name'].dropna().unique().tolist() if not active_audit.empty else []
+    remaining_items = [i for i in all_items if i not in audited_items]
+    
+    st.metric(t["audit_progress"], t["items_audited"].format(done=len(audited_items), total=len(all_items)))
+    st.progress(len(audited_items) / len(all_items) if len(all_items) > 0 else 0.0)
+    
+    st.divider()
+    st.write(t["count_batches"])
+
+    # 🟢 FRAGMENT: picking an item and logging batches reruns only this part, not the stock tables around it
+    @st.fragment
+    def audit_batch_fragment():
+        show_flashes()
+        display_items = [hindi(i) for i in all_items] if st.session_state.get('app_lang') == 'Hindi' else all_items
+        display_to_real = dict(zip(display_items, all_items))
+        audit_item_display = st.selectbox(t["search_select_item"], display_items, index=None, placeholder=t["type_item_name"])
+        audit_item = display_to_real.get(audit_item_display) if audit_item_display else None
+    
+        if audit_item:
+            active_audit = load_active_audit() # Fresh on fragment reruns, after a batch was logged
+            item_audits = active_audit[active_audit['Item Name'] == audit_item]
+            found_so_far = pd.to_numeric(item_audits['Quantity Found'], errors='coerce').sum() if not item_audits.empty else 0
+        
+            st.markdown(t["live_item_progress"])
+            if st.session_state.role == "Admin":
+                system_qty = df[df['Item'] == audit_item]['Quantity'].iloc[0] if not df.empty else 0
+                variance = found_so_far - system_qty
+            
+                c1, c2, c3 = st.columns(3)
+                c1.metric(t["system_expected"], f"{system_qty:,.0f}")
+                c2.metric(t["found_so_far"], f"{found_so_far:,.0f}")
+                c3.metric(t["variance"], f"{variance:,.0f}", delta_color="inverse")
+            else:
+                st.metric(t["found_so_far_yours"], f"{found_so_far:,.0f}")
+        
+            st.divider()
+        
+            st.subheader(t["log_batch"])
+            with st.form("audit_form", clear_on_submit=True):
+                loc = st.text_input(t["location_rack"], placeholder=t["location_rack_ph"])
+                qty = st.number_input(t["qty_found_here"], min_value=0.0, step=1.0)
+                submit_batch = st.form_submit_button(t["save_batch"], type="primary")
+            
+                if submit_batch:
+                    if qty <= 0:
+                        st.error(t["qty_negative"])
+                    else:
+                        timestamp = datetime.now(IST).strftime("%Y-%m-%d %H:%M:%S")
+                        try:
+                            audit_sheet.append_row([timestamp, audit_item, loc, qty, st.session_state.user_name, "Active"])
+                            invalidate_sheets("Audit Logs", appended=True)
+                            flash(t["logged_success"].format(qty=qty, item=audit_item), icon="✅")
+                            # A further batch of an already-counted item only changes this fragment; a first one moves the overall progress
+                            if item_audits.empty: st.rerun()
+                            else: rerun_fragment()
+                        except Exception as e:
+                            st.error(t["failed_log_audit"].format(err=e))
+                        
+            if not item_audits.empty:
+                st.markdown(t["recent_entries"])
+                st.dataframe(item_audits[['Location', 'Quantity Found', 'Employee Name', 'Timestamp']].iloc[::-1], hide_index=True)
+
+    audit_batch_fragment()
+
+    st.divider()
+    st.subheader(t["remaining_items"])
+    if remaining_items:
+        rem_df = df[df['Item'].isin(remaining_items)][['Group', 'Item']].sort_values(["Group", "Item"])
+        st.dataframe(hindi_df_columns(rem_df, ['Group', 'Item']), use_container_width=True, hide_index=True)
+    else:
+        st.success(t["all_audited"])
@@ -0,0 +1,144 @@
+"""
+MANGLAM TRADELINK - Fast-Path Parity Checks
+============================================
+The page caches replace a few straightforward computations with faster ones.
+This script runs both on generated data and fails when they disagree:
+
+  * ledger -- checkpointed_ledger() (rent_ledger.py) against a full
+    build_ledger(): the same totals and the same running balance on every row,
+    with and without month-end checkpoints, and after an edit above one
+  * order_lines -- total_units() of parse_order_lines() (order_lines.py)
+    against the regex the completion alerts used before the orders were
+    parsed once per fetch, on cart, Tally and free-text "Order Details"
+
+    python benchmarks/check_parity.py                  # benchmarks/data/scale_0.05.json, generated if missing
+    python benchmarks/check_parity.py --data benchmarks/data/scale_1.json
+
+Exits with status 1 when a check fails.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import pandas as pd
+
+import generate_data
+from order_lines import lines_of, parse_order_lines, total_units
+from rent_ledger import CheckpointStore, build_ledger, checkpointed_ledger
+
+DEFAULT_SCALE = 0.05
+
+# "Order Details" strings in every format the Orders tab has held
+ORDER_DETAILS = [
+    "Tile A: 12.0 SQM (Alt: 3.0 Box) | Tile B: 5.0 Pcs",        # cart
+    "Tile A — 12 SQM | Tile B — 4 Box",                          # Tally sync
+    "Tile A - 1,200 Nos",
+    "Tile A-1 — 7 Pcs | Grout 2x2 - 3 Kgs",
+    "Tile A-1 — 7 Pcs | loose 3 sqm",
+    "Tile A 12 SQM | Tile B 1,000.5 pcs",                         # typed in by hand
+    "Call before delivery",
+]
+
+
+class StaticMirror:
+    """The two SheetMirror reads CheckpointStore makes, for a tab that only changes when told to."""
+
+    def __init__(self):
+        self.data_version = 1
+        self.edits = {}  # version -> lowest edited row
+
+    def version(self, name):
+        return self.data_version
+
+    def edits_since(self, name, version):
+        rows = [row for v, row in self.edits.items() if v > version]
+        return min(rows) if rows else None
+
+    def edit(self, row):
+        self.data_version += 1
+        self.edits[self.data_version] = row
+
+
+def _frame(grid):
+    df = pd.DataFrame(grid[1:], columns=[str(h).strip() for h in grid[0]]).astype(str)  # Sheets returns strings
+    df["_Row"] = df.index + 2
+    return df
+
+
+def _same_ledger(df, got):
+    want_totals, want_running = build_ledger(df)
+    totals, running = got
+    pd.testing.assert_frame_equal(totals.sort_index(), want_totals.sort_index(), check_exact=False, check_like=True, check_names=False, check_dtype=False)
+    pd.testing.assert_series_equal(running, want_running, check_exact=False, check_names=False, check_dtype=False)
+
+
+def check_ledger(grids):
+    df = _frame(grids["Rent Transactions"])
+    month = pd.Timestamp.now().strftime("%Y-%m")
+    mirror = StaticMirror()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CheckpointStore(mirror, path=os.path.join(tmp, "checkpoints.json"))
+        _same_ledger(df, checkpointed_ledger(df, None, None, month, len(df)))     # no checkpoints at all
+        _same_ledger(df, checkpointed_ledger(df, store, 1, month, len(df)))      # closes the previous month
+        assert store.checkpoints(), "no checkpoint was created"
+        _same_ledger(df, checkpointed_ledger(df, store, 1, month, len(df)))      # served from the checkpoint
+
+        edited = df.copy()
+        edited.loc[len(df) // 3, "Amount"] = "12345"
+        mirror.edit(int(edited.loc[len(df) // 3, "_Row"]))
+        _same_ledger(edited, checkpointed_ledger(edited, store, 2, month, len(edited)))  # checkpoint dropped
+    return f"{len(df):,} transactions"
+
+
+def legacy_total_units(details):
+    """The alerts' "Total Units" before order_lines.py: a regex pass over the whole string."""
+    total = sum(float(m.group(1).replace(",", "")) for m in re.finditer(r"[-—:]\s*([\d,.]+)\s*([a-zA-Z]+)", details))
+    if total == 0:
+        total = sum(float(m.group(1).replace(",", "")) for m in
+                    re.finditer(r"\b([\d,.]+)\s*(SQM|Pcs|Nos|Kgs|Ltrs|Mtrs|Units)\b", details, re.IGNORECASE))
+    return total
+
+
+def check_order_lines(grids):
+    orders = _frame(grids["Orders"])
+    extra = pd.DataFrame({"Order ID": [f"X{i}" for i in range(len(ORDER_DETAILS))], "Order Details": ORDER_DETAILS})
+    extra["_Row"] = range(len(orders) + 2, len(orders) + 2 + len(extra))
+    orders = pd.concat([orders, extra], ignore_index=True)
+    lines = parse_order_lines(orders)
+    wrong = [(details, total_units(lines_of(lines, row)), legacy_total_units(details))
+             for row, details in zip(orders["_Row"], orders["Order Details"])
+             if abs(total_units(lines_of(lines, row)) - legacy_total_units(details)) > 1e-9]
+    assert not wrong, f"{len(wrong)} orders differ, e.g. {wrong[:3]}"
+    return f"{len(orders):,} orders"
+
+
+CHECKS = {"ledger": check_ledger, "order_lines": check_order_lines}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the app's fast paths against full recomputation")
+    parser.add_argument("--data", help="fake Sheets JSON (default: benchmarks/data/scale_0.05.json, generated if missing)")
+    args = parser.parse_args()
+
+    data_path = args.data or generate_data.data_path(DEFAULT_SCALE)
+    if not args.data and not os.path.exists(data_path):
+        generate_data.write(data_path, DEFAULT_SCALE)
+    with open(data_path, encoding="utf-8") as f:
+        grids = json.load(f)
+
+    failed = 0
+    for name, check in CHECKS.items():
+        try:
+            print(f"  {name:<12} ok   {check(grids)}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  {name:<12} FAIL {e}")
+    sys.exit(1 if failed else 0)
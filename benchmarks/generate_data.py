@@ -0,0 +1,165 @@
+"""
+MANGLAM TRADELINK - Synthetic Benchmark Data
+=============================================
+Builds a {tab title: grid} JSON file for the fake Sheets backend
+(fake_sheets.py), with every tab in the same layout and value formats the
+real "Tally Live Stock" spreadsheet uses.
+
+Default sizes are the growth targets we benchmark against:
+20k orders, 5k stock items, 500 tenants with 50k rent transactions and
+10k invoices. --scale shrinks or grows all of them together.
+
+    python benchmarks/generate_data.py                      # -> benchmarks/data/scale_1.json
+    python benchmarks/generate_data.py --scale 0.1          # -> benchmarks/data/scale_0.1.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fake_sheets import DEFAULT_TABS
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# --- TARGET SIZES (scale = 1.0) ---
+SIZES = {
+    "orders": 20000,
+    "stock_items": 5000,
+    "tenants": 500,
+    "rent_transactions": 50000,
+    "invoices": 10000,
+    "customers": 800,
+    "audit_logs": 1500,
+    "manglam_customers": 300,
+    "manglam_stock": 1000,
+}
+
+GROUPS = ["Tiles", "Sanitary", "Adhesives", "Grout", "Faucets", "Pipes", "Fittings", "Laminates",
+          "Plywood", "Hardware", "Paint", "Electricals", "Granite", "Marble", "Cement", "Tools"]
+UNITS = ["box", "pcs", "sqft", "bag", "kg", "ltr", "nos", "set"]
+WORDS = ["Glossy", "Matt", "Ivory", "Grey", "Onyx", "Royal", "Classic", "Nova", "Prime", "Ultra", "Satin",
+         "Rustic", "Pearl", "Slate", "Urban", "Aqua", "Crystal", "Velvet", "Sand", "Teak"]
+CITIES = ["Jaipur", "Kota", "Ajmer", "Udaipur", "Jodhpur", "Bikaner", "Alwar", "Bhilwara"]
+STAFF = ["Admin", "Ramesh", "Suresh", "Mahesh", "Dinesh"]
+START = datetime(2024, 4, 1, 9, 0)
+
+
+def _date(rng, days=730):
+    return START + timedelta(days=rng.randrange(days), minutes=rng.randrange(600))
+
+
+def build(scale=1.0, seed=42):
+    """Return {tab title: grid (header row + data rows)} for the fake backend."""
+    rng = random.Random(seed)
+    n = {k: max(1, int(v * scale)) for k, v in SIZES.items()}
+    tabs = {name: [list(header)] for name, header in DEFAULT_TABS.items()}
+
+    # Stock (first tab) + Master Items
+    items = [f"{rng.choice(WORDS)} {rng.choice(GROUPS)} {i:05d}" for i in range(1, n["stock_items"] + 1)]
+    for item in items:
+        tabs["Sheet1"].append([rng.choice(GROUPS), item, rng.randint(-20, 2000), rng.choice(UNITS)])
+        tabs["Master Items"].append([item])
+
+    # Users (User ID / Password / Role / Name / Status)
+    tabs["Users"] += [["A1", "admin", "Admin", "Admin", "Active"]] + \
+                     [[f"E{i}", "emp", "Employee", name, "Active"] for i, name in enumerate(STAFF[1:], start=1)]
+
+    customers = [f"{rng.choice(WORDS)} Traders {rng.choice(CITIES)} {i:04d}" for i in range(1, n["customers"] + 1)]
+    tabs["Customers"] += [[c] for c in customers]
+
+    # Orders: "Item: qty unit | Item: qty unit", mostly completed, ~1% pending of each kind
+    per_day = {}
+    for _ in range(n["orders"]):
+        when = _date(rng)
+        day = when.strftime("%d.%m.%y")
+        per_day[day] = per_day.get(day, 0) + 1
+        details = " | ".join(f"{rng.choice(items)}: {rng.randint(1, 200)} {rng.choice(UNITS)}"
+                             for _ in range(rng.randint(1, 6)))
+        roll = rng.random()
+        status = "Pending" if roll < 0.01 else "Pending - Awaited Payment" if roll < 0.02 else "Completed"
+        tabs["Orders"].append([f"TALLY-{day}.{per_day[day]}", when.strftime("%d-%m-%Y %I:%M %p"), rng.choice(customers),
+                               details, status, "" if status != "Completed" else rng.choice(STAFF),
+                               rng.choice(["", "", "Urgent", "Deliver after 4 PM", "Call before dispatch"])])
+
+    # Audit Logs (active audit in progress)
+    for item in rng.sample(items, min(n["audit_logs"], len(items))):
+        tabs["Audit Logs"].append([_date(rng).strftime("%Y-%m-%d %H:%M:%S"), item, rng.choice(["Godown A", "Godown B", "Shop"]),
+                                   rng.randint(0, 2000), rng.choice(STAFF), "Active"])
+
+    # Tenants + Rent Transactions (monthly charges and payments)
+    tenants = []
+    for i in range(1, n["tenants"] + 1):
+        name = f"Tenant {i:04d} {rng.choice(WORDS)}"
+        tenants.append(name)
+        etype = rng.choice(["Direct Bill (Lump Sum)", "Variable (Meter)", "None"])
+        tabs["Tenants"].append([f"T-{i:06X}", name, f"Unit {rng.randint(1, 300)}, {rng.choice(CITIES)}",
+                                rng.randrange(5000, 60000, 500), etype, 9 if etype == "Variable (Meter)" else 0,
+                                rng.choice(["Tenant", "Company/Landlord"]), rng.randint(0, 9000),
+                                rng.randrange(0, 100000, 5000), _date(rng).strftime("%Y-%m-%d"),
+                                rng.choice(["Yes", "No"]), "Active" if rng.random() < 0.9 else "Vacated"])
+    for _ in range(n["rent_transactions"]):
+        kind = rng.choice(["Charge", "Payment"])
+        category = rng.choice(["Rent", "Rent", "Electricity"]) if kind == "Charge" else "Rent"
+        tabs["Rent Transactions"].append([_date(rng).strftime("%d-%m-%Y %I:%M %p"), rng.choice(tenants), kind, category,
+                                          rng.randrange(500, 60000, 50), rng.randint(1, 400) if category == "Electricity" else "",
+                                          rng.choice(["", "Cash", "UPI", "Monthly bill"]), rng.choice(STAFF)])
+
+    # Manglam invoicing masters
+    m_customers = [f"{rng.choice(WORDS)} Builders {i:03d}" for i in range(1, n["manglam_customers"] + 1)]
+    for c in m_customers:
+        tabs["Manglam Customers"].append([c, f"{rng.randint(1, 500)}, Main Road, {rng.choice(CITIES)}, Rajasthan",
+                                          f"08AAAC{rng.randint(1000, 9999)}A1Z{rng.randint(1, 9)}", "", f"98{rng.randint(10000000, 99999999)}"])
+    m_items = []
+    for i in range(1, n["manglam_stock"] + 1):
+        m_items.append(f"{rng.choice(WORDS)} {rng.choice(GROUPS)} M{i:04d}")
+        tabs["Manglam Stock"].append([m_items[-1], rng.choice(["6907", "6910", "3824", "7324", "4418"]),
+                                      rng.choice([5, 12, 18, 28]), round(rng.uniform(20, 4000), 2), rng.randint(0, 3000), rng.choice(UNITS)])
+    tabs["Manglam Transporters"] += [[f"{city} Roadways", f"08AABCT{i:04d}R1Z5"] for i, city in enumerate(CITIES)]
+    tabs["Hindi Map"] += [[g, g] for g in GROUPS]
+
+    # Invoices (Items JSON like the Generate Invoice page writes; N2 = next invoice number)
+    for i in range(1, n["invoices"] + 1):
+        lines = [{"name": rng.choice(m_items), "hsn": "6907", "qty": rng.randint(1, 500), "rate": round(rng.uniform(20, 900), 2),
+                  "gst_type": "Intra State (CGST + SGST)", "gst_pct": 18, "unit": rng.choice(UNITS)}
+                 for _ in range(rng.randint(1, 8))]
+        subtotal = round(sum(l["qty"] * l["rate"] for l in lines), 2)
+        tax = round(subtotal * 0.09, 2)
+        grand = round(subtotal + 2 * tax)
+        customer = rng.choice(m_customers)
+        tabs["Invoices"].append([f"GST/25-26/{i:04d}", _date(rng).strftime("%d-%m-%Y %I:%M %p"), customer, "Jaipur", "",
+                                 json.dumps(lines), subtotal, tax, tax, 0, round(grand - subtotal - 2 * tax, 2), grand,
+                                 "Admin", "", "", customer, "Jaipur", ""])
+    if len(tabs["Invoices"]) > 1:
+        tabs["Invoices"][1][13] = f"GST/25-26/{n['invoices'] + 1:04d}"
+        tabs["Invoices"][1][14] = START.strftime("%d-%m-%Y %I:%M %p")
+    return tabs
+
+
+def data_path(scale=1.0):
+    """Default file for a given scale (shared with run_benchmarks.py)."""
+    return os.path.join(DATA_DIR, f"scale_{scale:g}.json")
+
+
+def write(path, scale=1.0, seed=42):
+    tabs = build(scale, seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tabs, f, ensure_ascii=False)
+    return {name: len(grid) - 1 for name, grid in tabs.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic data for the fake Sheets backend")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier on the target sizes (default 1.0)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="output JSON (default: benchmarks/data/scale_<scale>.json)")
+    args = parser.parse_args()
+    out = args.out or data_path(args.scale)
+    counts = write(out, args.scale, args.seed)
+    print(f"Wrote {out}")
+    for name, rows in counts.items():
+        print(f"  {name:<22} {rows:>7,} rows")
@@ -0,0 +1,186 @@
+"""
+MANGLAM TRADELINK - Page Rerun Benchmarks
+==========================================
+Drives app_cloud.py through Streamlit's AppTest harness on the fake Sheets
+backend (SHEETS_BACKEND=fake) loaded with generated data, and times every
+page branch:
+
+  * cold_ms  -- first render of the page with empty st.cache_data caches
+  * warm_ms  -- median / p95 / min of `--runs` plain reruns afterwards
+  * api_calls -- fake Sheets requests made during the cold render
+
+Streamlit runs the body of every st.tabs() tab on each rerun, so the Order
+Desk and Rent Tracker timings cover all of their tabs together.
+
+    python benchmarks/run_benchmarks.py                             # full-size data, prints results
+    python benchmarks/run_benchmarks.py --save benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --scale 0.1 --pages "📝 Order Desk"
+
+--compare exits with status 1 when a page's warm median is more than
+--threshold times slower than in the baseline.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+APP_PATH = os.path.join(REPO_DIR, "app_cloud.py")
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import generate_data
+from sheet_gateway import QUOTA
+
+# Page labels exactly as they appear in the navigation dropdown (English, Admin)
+PAGES = [
+    "📦 Inventory Dashboard",
+    "📝 Order Desk",
+    "🔍 Stock Audit",
+    "📊 Audit Report",
+    "🏢 Rent Tracker",
+    "🧾 Generate Invoice",
+    "📁 Saved Invoices",
+]
+DEFAULT_RUNS = 5
+DEFAULT_THRESHOLD = 1.25
+APP_TIMEOUT = 300
+
+
+def _session(at):
+    """A logged-in Admin session, the same state a successful login leaves behind."""
+    at.session_state.logged_in = True
+    at.session_state.user_id = "A1"
+    at.session_state.user_name = "Admin"
+    at.session_state.role = "Admin"
+    at.session_state.app_lang = "English"
+    return at
+
+
+def _timed_run(at, widget=None):
+    requests_before = QUOTA.snapshot()["totals"]["requests"]
+    t0 = time.perf_counter()
+    (widget or at).run(timeout=APP_TIMEOUT)
+    elapsed = (time.perf_counter() - t0) * 1000
+    if at.exception:
+        raise RuntimeError(f"app raised: {at.exception[0].value}")
+    return round(elapsed, 1), QUOTA.snapshot()["totals"]["requests"] - requests_before
+
+
+def _nav(at):
+    return next(s for s in at.selectbox if PAGES[0] in s.options)
+
+
+def bench_page(page, runs):
+    at = _session(AppTest.from_file(APP_PATH, default_timeout=APP_TIMEOUT))
+    _timed_run(at)  # landing render: login warm-up, mirror + fake backend boot
+    st.cache_data.clear()
+    cold_ms, api_calls = _timed_run(at, _nav(at).select(page))
+    warm = [_timed_run(at)[0] for _ in range(runs)]
+    return {
+        "cold_ms": cold_ms,
+        "warm_ms": {
+            "median": round(statistics.median(warm), 1),
+            "p95": round(sorted(warm)[max(0, int(round(0.95 * len(warm))) - 1)], 1),
+            "min": min(warm),
+        },
+        "api_calls": api_calls,
+    }
+
+
+def run(data_path, pages, runs, latency_ms=0):
+    os.environ["SHEETS_BACKEND"] = "fake"
+    os.environ["SHEETS_FAKE_DATA"] = os.path.abspath(data_path)
+    os.environ["SHEETS_FAKE_LATENCY_MS"] = str(latency_ms)
+    os.chdir(tempfile.mkdtemp(prefix="mt_bench_"))  # keeps alert files etc. out of the repo
+    logging.disable(logging.WARNING)  # AppTest resets Streamlit's log level; its bare-mode warnings would drown the table
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    with open(data_path, encoding="utf-8") as f:
+        sizes = {name: len(grid) - 1 for name, grid in json.load(f).items()}
+    results = {}
+    for page in pages:
+        print(f"  {page} ...", end="", flush=True)
+        results[page] = bench_page(page, runs)
+        print(f" cold {results[page]['cold_ms']:>9,.1f} ms | warm median {results[page]['warm_ms']['median']:>9,.1f} ms")
+    return {
+        "meta": {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "data": os.path.basename(data_path),
+            "rows": sizes,
+            "runs": runs,
+            "latency_ms": latency_ms,
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+            "machine": platform.machine(),
+        },
+        "pages": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Print a per-page table against `baseline`; returns the pages slower than `threshold`x."""
+    regressions = []
+    print(f"\n{'Page':<26}{'base warm':>12}{'now warm':>12}{'ratio':>8}{'base cold':>12}{'now cold':>12}")
+    for page, now in current["pages"].items():
+        base = baseline["pages"].get(page)
+        if not base:
+            print(f"{page:<26}{'-':>12}{now['warm_ms']['median']:>12,.1f}{'new':>8}")
+            continue
+        ratio = now["warm_ms"]["median"] / max(base["warm_ms"]["median"], 0.1)
+        flag = "  <-- slower" if ratio > threshold else ""
+        if flag:
+            regressions.append(page)
+        print(f"{page:<26}{base['warm_ms']['median']:>12,.1f}{now['warm_ms']['median']:>12,.1f}{ratio:>8.2f}"
+              f"{base['cold_ms']:>12,.1f}{now['cold_ms']:>12,.1f}{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time every page of app_cloud.py on generated data")
+    parser.add_argument("--data", help="fake Sheets JSON (default: benchmarks/data/scale_<scale>.json, generated if missing)")
+    parser.add_argument("--scale", type=float, default=1.0, help="data size multiplier when generating")
+    parser.add_argument("--pages", nargs="+", default=PAGES, help="page labels to run (default: all)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="warm reruns per page")
+    parser.add_argument("--latency-ms", type=int, default=0, help="simulated latency per Sheets call")
+    parser.add_argument("--save", help="write the results JSON here (e.g. a new baseline)")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="slowdown ratio counted as a regression")
+    args = parser.parse_args()
+
+    data_path = args.data
+    if not data_path:
+        data_path = generate_data.data_path(args.scale)
+        if not os.path.exists(data_path):
+            print(f"Generating {data_path} ...")
+            generate_data.write(data_path, args.scale)
+    data_path = os.path.abspath(data_path)
+    save_path = os.path.abspath(args.save) if args.save else None
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    print(f"Benchmarking {len(args.pages)} page(s) on {os.path.basename(data_path)}:")
+    results = run(data_path, args.pages, args.runs, args.latency_ms)
+
+    if save_path:
+        with open(save_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nSaved {save_path}")
+    if compare_path:
+        with open(compare_path, encoding="utf-8") as f:
+            slower = compare(results, json.load(f), args.threshold)
+        if slower:
+            print(f"\n{len(slower)} page(s) slower than {args.threshold}x baseline: {', '.join(slower)}")
+            sys.exit(1)
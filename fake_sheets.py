@@ -0,0 +1,399 @@
+"""
+MANGLAM TRADELINK - In-Memory Fake Google Sheets Backend
+=========================================================
+A local stand-in for the gspread objects app_cloud.py talks to, so the whole
+portal can run (and be benchmarked / load-tested) against generated data
+without network access or real credentials.
+
+FakeWorksheet implements the Worksheet methods the app and its helper
+modules use: get_all_values, get_all_records, get, col_values, row_values,
+cell, append_row(s), update_cell, update, batch_update, find, findall,
+delete_rows and resize. FakeSpreadsheet implements worksheets(),
+worksheet(), sheet1, values_batch_get (sheet_mirror.py) and batch_update
+with appendCells / deleteDimension requests (sheet_writes.move_rows).
+
+Values are stored as strings, the way Google returns formatted values.
+Every call can add simulated latency and fail with a simulated 429 quota
+error. Calls go through sheet_gateway.send_with_retries like real requests:
+they wait for the shared read/write token bucket, are counted in the quota
+tracker, and a simulated 429 is retried with backoff before the app sees it.
+
+Select it in .streamlit/secrets.toml or the environment:
+
+    SHEETS_BACKEND         = "fake"
+    SHEETS_FAKE_DATA       = "benchmarks/data/small.json"   # optional, {tab: grid}
+    SHEETS_FAKE_LATENCY_MS = 150                            # optional
+    SHEETS_FAKE_ERROR_RATE = 0.02                           # optional, share of calls -> 429
+"""
+
+import json
+import random
+import re
+import threading
+import time
+
+from gspread.cell import Cell
+from gspread.exceptions import APIError, GSpreadException
+from gspread.utils import a1_range_to_grid_range, numericise_all, rowcol_to_a1
+from gspread.worksheet import ValueRange
+
+from sheet_gateway import send_with_retries
+
+# Header rows of every tab the portal opens, used when no data file is given
+DEFAULT_TABS = {
+    "Sheet1": ["Group", "Item Name", "Quantity", "Unit", "Last Updated: 2026-01-01 00:00:00"],
+    "Orders": ["Order ID", "Date", "Customer Name", "Order Details", "Status", "Completed By", "Notes"],
+    "Users": ["User ID", "Password", "Role", "Name", "Status"],
+    "Customers": ["Customer Name"],
+    "Audit Logs": ["Timestamp", "Item Name", "Location", "Quantity Found", "Employee Name", "Status"],
+    "Master Items": ["Item Name"],
+    "Tenants": ["Tenant ID", "Name", "Location", "Rent Amount", "Electricity Type", "Elec Rate", "Elec Paid By",
+                "Meter Reading", "Security Deposit", "Billing Start Date", "Pro Rata", "Status"],
+    "Rent Transactions": ["Date", "Tenant Name", "Type", "Category", "Amount", "Meter Details", "Notes", "Recorded By"],
+    "Archived Orders": ["Order ID", "Date", "Customer Name", "Order Details", "Status", "Completed By", "Notes"],
+    "Invoices": ["Invoice Number", "Date", "Customer Name", "Customer Address", "Customer GSTIN", "Items JSON",
+                 "Subtotal", "CGST", "SGST", "IGST", "Round Off", "Grand Total", "Created By",
+                 "Next Invoice Number", "Last Synced", "Ship To Name", "Ship To Address", "Ship To GSTIN"],
+    "Manglam Customers": ["Customer Name", "Address", "GSTIN", "PAN", "Contact"],
+    "Manglam Stock": ["Item Name", "HSN Code", "GST Rate %", "Avg Rate", "Closing Qty", "Unit"],
+    "Manglam Transporters": ["Transporter Name", "Transporter ID"],
+    "Hindi Map": ["English", "Hindi"],
+}
+
+_ABS_RANGE = re.compile(r"^'((?:[^']|'')*)'(?:!(.*))?$")
+
+
+def _fmt(value):
+    """How Sheets shows a written value (USER_ENTERED numbers lose a trailing .0)."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else "%.10g" % value
+    return str(value)
+
+
+def _trim(grid):
+    """Drop trailing blank cells and rows, as the Sheets API does in responses."""
+    out = [list(r) for r in grid]
+    for r in out:
+        while r and r[-1] == "":
+            r.pop()
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+class _ErrorResponse:
+    """Just enough of a requests.Response for gspread's APIError."""
+
+    def __init__(self, status_code=429, text="Quota exceeded (simulated)", status="RESOURCE_EXHAUSTED"):
+        self.status_code = status_code
+        self.text = text
+        self.status = status
+
+    def json(self):
+        return {"error": {"code": self.status_code, "message": self.text, "status": self.status}}
+
+
+def _invalid(message):
+    return APIError(_ErrorResponse(400, message, "INVALID_ARGUMENT"))
+
+
+class FakeBackend:
+    """Latency / failure injection shared by all fake tabs of one spreadsheet."""
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.calls = 0
+
+    def call(self, kind, label=""):
+        """One simulated API request of `kind` ("read" / "write"), paced and retried by the gateway."""
+        send_with_retries(kind, f"{'GET' if kind == 'read' else 'POST'} {label}", self._attempt)
+
+    def _attempt(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency * self.random.uniform(0.8, 1.2))
+        if self.error_rate and self.random.random() < self.error_rate:
+            raise APIError(_ErrorResponse())
+
+
+class FakeWorksheet:
+    """In-memory gspread.Worksheet lookalike."""
+
+    def __init__(self, spreadsheet, title, sheet_id, rows=None, row_count=1000, col_count=26):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self._rows = _trim([[_fmt(c) for c in r] for r in (rows or [])])
+        self.row_count = max(row_count, len(self._rows))
+        self.col_count = max([col_count] + [len(r) for r in self._rows])
+
+    def __repr__(self):
+        return f"<FakeWorksheet {self.title!r} id:{self.id}>"
+
+    @property
+    def _backend(self):
+        return self.spreadsheet.backend
+
+    # --- internal grid helpers (no simulated cost) ---
+    def _grid(self):
+        width = max([0] + [len(r) for r in self._rows])
+        return [r + [""] * (width - len(r)) for r in self._rows]
+
+    def _slice(self, range_name=None):
+        if not range_name:
+            return _trim(self._rows)
+        g = a1_range_to_grid_range(range_name)
+        rows = self._rows[g.get("startRowIndex", 0):g.get("endRowIndex")]
+        return _trim([r[g.get("startColumnIndex", 0):g.get("endColumnIndex")] for r in rows])
+
+    def _set(self, row, col, value):
+        while len(self._rows) < row:
+            self._rows.append([])
+        r = self._rows[row - 1]
+        while len(r) < col:
+            r.append("")
+        r[col - 1] = _fmt(value)
+        self.row_count = max(self.row_count, row)
+        self.col_count = max(self.col_count, col)
+
+    def _write_range(self, range_name, values):
+        g = a1_range_to_grid_range(range_name)
+        top, left = g.get("startRowIndex", 0) + 1, g.get("startColumnIndex", 0) + 1
+        for i, row in enumerate(values):
+            for j, value in enumerate(row):
+                self._set(top + i, left + j, value)
+        self._rows = _trim(self._rows)
+
+    # --- reads ---
+    def get_all_values(self, *args, **kwargs):
+        self._backend.call("read", f"{self.title}: get_all_values")
+        with self._backend.lock:
+            return self._grid()
+
+    def get_all_records(self, *args, **kwargs):
+        values = self.get_all_values()
+        if not values:
+            return []
+        headers = values[0]
+        if len(set(headers)) != len(headers):
+            raise GSpreadException("the header row in the worksheet is not unique")
+        return [dict(zip(headers, numericise_all(row))) for row in values[1:]]
+
+    def get(self, range_name=None, *args, **kwargs):
+        self._backend.call("read", f"{self.title}: get")
+        with self._backend.lock:
+            values = self._slice(range_name)
+        rng = f"'{self.title}'!{range_name}" if range_name else f"'{self.title}'"
+        return ValueRange.from_json({"range": rng, "majorDimension": "ROWS", "values": values})
+
+    def col_values(self, col, *args, **kwargs):
+        self._backend.call("read", f"{self.title}: col_values")
+        with self._backend.lock:
+            values = [r[col - 1] if len(r) >= col else "" for r in self._rows]
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def row_values(self, row, *args, **kwargs):
+        self._backend.call("read", f"{self.title}: row_values")
+        with self._backend.lock:
+            return list(self._rows[row - 1]) if row <= len(self._rows) else []
+
+    def cell(self, row, col, *args, **kwargs):
+        self._backend.call("read", f"{self.title}: cell")
+        with self._backend.lock:
+            r = self._rows[row - 1] if row <= len(self._rows) else []
+            return Cell(row, col, r[col - 1] if len(r) >= col else "")
+
+    def _matches(self, query, in_column=None, in_row=None, case_sensitive=True):
+        match = (lambda v: bool(query.search(v))) if isinstance(query, re.Pattern) else (
+            (lambda v: v == str(query)) if case_sensitive else (lambda v: v.lower() == str(query).lower()))
+        with self._backend.lock:
+            for i, r in enumerate(self._rows, start=1):
+                if in_row is not None and i != in_row:
+                    continue
+                for j, v in enumerate(r, start=1):
+                    if (in_column is None or j == in_column) and match(v):
+                        yield Cell(i, j, v)
+
+    def find(self, query, in_column=None, in_row=None, case_sensitive=True):
+        self._backend.call("read", f"{self.title}: find")
+        return next(self._matches(query, in_column, in_row, case_sensitive), None)
+
+    def findall(self, query, in_column=None, in_row=None, case_sensitive=True):
+        self._backend.call("read", f"{self.title}: findall")
+        return list(self._matches(query, in_column, in_row, case_sensitive))
+
+    # --- writes ---
+    def _append(self, rows):
+        with self._backend.lock:
+            start = len(self._rows) + 1
+            for row in rows:
+                self._rows.append([_fmt(v) for v in row])
+            self.row_count = max(self.row_count, len(self._rows))
+            self.col_count = max([self.col_count] + [len(r) for r in rows])
+            end = start + len(rows) - 1
+            width = max([1] + [len(r) for r in rows])
+        rng = f"'{self.title}'!A{start}:{rowcol_to_a1(end, width)}"
+        return {"spreadsheetId": self.spreadsheet.id, "tableRange": f"'{self.title}'!A1",
+                "updates": {"updatedRange": rng, "updatedRows": len(rows)}}
+
+    def append_row(self, values, *args, **kwargs):
+        self._backend.call("write", f"{self.title}: append_row")
+        return self._append([list(values)])
+
+    def append_rows(self, values, *args, **kwargs):
+        self._backend.call("write", f"{self.title}: append_rows")
+        return self._append([list(v) for v in values])
+
+    def update_cell(self, row, col, value):
+        self._backend.call("write", f"{self.title}: update_cell")
+        with self._backend.lock:
+            self._set(row, col, value)
+            self._rows = _trim(self._rows)
+        return {"updatedRange": f"'{self.title}'!{rowcol_to_a1(row, col)}"}
+
+    def update(self, values=None, range_name=None, *args, **kwargs):
+        # gspread still accepts the old update(range_name, values) argument order
+        if isinstance(values, str) and not isinstance(range_name, str):
+            values, range_name = range_name, values
+        if values and not isinstance(values[0], (list, tuple)):
+            values = [values]
+        self._backend.call("write", f"{self.title}: update")
+        with self._backend.lock:
+            self._write_range(range_name or "A1", values or [])
+        return {"updatedRange": f"'{self.title}'!{range_name or 'A1'}"}
+
+    def batch_update(self, data, *args, **kwargs):
+        self._backend.call("write", f"{self.title}: batch_update")
+        with self._backend.lock:
+            for item in data:
+                self._write_range(item["range"], item["values"])
+        return {"totalUpdatedCells": sum(len(r) for item in data for r in item["values"])}
+
+    def delete_rows(self, start_index, end_index=None):
+        self._backend.call("write", f"{self.title}: delete_rows")
+        with self._backend.lock:
+            self._delete(start_index, end_index or start_index)
+
+    def _delete(self, start, end):
+        del self._rows[start - 1:end]
+        self.row_count = max(1, self.row_count - (end - start + 1))
+
+    def resize(self, rows=None, cols=None):
+        self._backend.call("write", f"{self.title}: resize")
+        with self._backend.lock:
+            if rows is not None:
+                del self._rows[rows:]
+                self.row_count = rows
+            if cols is not None:
+                self._rows = _trim([r[:cols] for r in self._rows])
+                self.col_count = cols
+
+
+class FakeSpreadsheet:
+    """In-memory gspread.Spreadsheet lookalike holding FakeWorksheets."""
+
+    def __init__(self, title="Tally Live Stock", grids=None, latency=0.0, error_rate=0.0, seed=None):
+        self.title = title
+        self.id = "fake-" + re.sub(r"\W+", "-", title.lower())
+        self.backend = FakeBackend(latency, error_rate, seed)
+        self._tabs = {}
+        for name, grid in (grids if grids is not None else {n: [h] for n, h in DEFAULT_TABS.items()}).items():
+            self.add_worksheet(name, rows=grid)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Load {tab title: grid} from a JSON file (see benchmarks/)."""
+        with open(path, encoding="utf-8") as f:
+            return cls(grids=json.load(f), **kwargs)
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({name: ws._grid() for name, ws in self._tabs.items()}, f, ensure_ascii=False)
+
+    def add_worksheet(self, title, rows=None, cols=26, **kwargs):
+        rows_data = rows if isinstance(rows, list) else None
+        ws = FakeWorksheet(self, title, len(self._tabs), rows_data,
+                           row_count=rows if isinstance(rows, int) else 1000, col_count=cols)
+        self._tabs[title] = ws
+        return ws
+
+    def worksheets(self, *args, **kwargs):
+        self.backend.call("read", "worksheets")
+        return list(self._tabs.values())
+
+    def worksheet(self, title):
+        self.backend.call("read", "worksheet")
+        return self._tabs[title]
+
+    @property
+    def sheet1(self):
+        return next(iter(self._tabs.values()))
+
+    def _by_id(self, sheet_id):
+        return next((ws for ws in self._tabs.values() if ws.id == sheet_id), None)
+
+    def values_batch_get(self, ranges, params=None):
+        self.backend.call("read", "values_batch_get")
+        value_ranges = []
+        with self.backend.lock:
+            for full in ranges:
+                m = _ABS_RANGE.match(full)
+                title, rng = (m.group(1).replace("''", "'"), m.group(2)) if m else (full, None)
+                ws = self._tabs[title]
+                value_ranges.append({"range": full, "majorDimension": "ROWS", "values": ws._slice(rng)})
+        return {"spreadsheetId": self.id, "valueRanges": value_ranges}
+
+    def batch_update(self, body):
+        """Supports the appendCells / deleteDimension(ROWS) requests used by move_rows().
+
+        All-or-nothing like Google: the tabs it touches are restored and a 400 is raised
+        if any request is invalid (unknown sheet or request, rows outside the grid).
+        """
+        self.backend.call("write", "batch_update")
+        with self.backend.lock:
+            saved = {}  # sheet id -> (worksheet, its rows, row_count) before this batch
+
+            def tab(sheet_id, i):
+                ws = self._by_id(sheet_id)
+                if ws is None:
+                    raise _invalid(f"Invalid requests[{i}]: No grid with id: {sheet_id}")
+                saved.setdefault(sheet_id, (ws, list(ws._rows), ws.row_count))
+                return ws
+
+            try:
+                for i, req in enumerate(body.get("requests", [])):
+                    if "appendCells" in req:
+                        ws = tab(req["appendCells"]["sheetId"], i)
+                        for row in req["appendCells"]["rows"]:
+                            ws._rows.append([_fmt(next(iter(c.get("userEnteredValue", {"": ""}).values())))
+                                             for c in row["values"]])
+                        ws.row_count = max(ws.row_count, len(ws._rows))
+                    elif "deleteDimension" in req and req["deleteDimension"]["range"]["dimension"] == "ROWS":
+                        r = req["deleteDimension"]["range"]
+                        ws = tab(r["sheetId"], i)
+                        if not 0 <= r["startIndex"] < r["endIndex"] <= ws.row_count:
+                            raise _invalid(f"Invalid requests[{i}].deleteDimension: rows {r['startIndex']}-{r['endIndex']} are outside the grid")
+                        ws._delete(r["startIndex"] + 1, r["endIndex"])
+                    else:
+                        raise _invalid(f"Invalid requests[{i}]: unsupported request {sorted(req)}")
+            except Exception:
+                for ws, rows, row_count in saved.values():
+                    ws._rows, ws.row_count = rows, row_count
+                raise
+        return {"spreadsheetId": self.id, "replies": [{} for _ in body.get("requests", [])]}
+
+
+def fake_bootstrap(data_path=None, latency_ms=0, error_rate=0.0, seed=None):
+    """Same shape as sheet_connect.connect(): (client, spreadsheet, {tab title: worksheet})."""
+    kwargs = {"latency": float(latency_ms or 0) / 1000.0, "error_rate": float(error_rate or 0), "seed": seed}
+    db = FakeSpreadsheet.from_file(data_path, **kwargs) if data_path else FakeSpreadsheet(**kwargs)
+    return None, db, {ws.title: ws for ws in db._tabs.values()}
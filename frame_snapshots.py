@@ -0,0 +1,112 @@
+"""
+MANGLAM TRADELINK - On-Disk DataFrame Snapshots
+================================================
+Every st.cache_data entry is lost when the Streamlit process restarts, so the
+first users after a restart used to wait for all tabs to download again. The
+page caches now also write their DataFrames to SNAPSHOT_DIR as uncompressed
+Arrow IPC files (one per tab), and on boot those files are memory-mapped and
+served right away while the real data revalidates in the background.
+
+The same snapshots back the read-only degraded mode: when Google Sheets is
+unreachable the pages show the last saved data (with a banner) instead of an
+empty table.
+
+A snapshot is a full copy of its tab on disk; app_cloud.py never saves the
+tabs listed in IN_MEMORY_ONLY_SHEETS (Users, with its passwords) and remove()s
+any file an older version left behind.
+
+Columns are stored positionally (c0, c1, ...) with the real header names in the
+schema metadata, so tabs with duplicate or blank headers snapshot fine.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+SNAPSHOT_DIR = "snapshots"
+
+
+class SnapshotStore:
+    """Arrow IPC snapshot per tab: save() after each fresh build, load() on boot or outage."""
+
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._saved_versions = {}  # name -> data version last written, to skip identical rewrites
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        safe = "".join(ch if ch.isalnum() else "_" for ch in name)
+        return os.path.join(self.directory, f"{safe}.arrow")
+
+    def save(self, name, df, version=None):
+        """Write `df` (all-string columns plus optional int `_Row`) atomically. Never raises."""
+        if version is not None and self._saved_versions.get(name) == version:
+            return False
+        try:
+            table = pa.Table.from_pandas(
+                pd.DataFrame({f"c{i}": df.iloc[:, i] for i in range(df.shape[1])}, index=range(len(df))),
+                preserve_index=False,
+            )
+            meta = {
+                "columns": [str(c) for c in df.columns],
+                "attrs": {k: v for k, v in df.attrs.items() if isinstance(v, (int, float, str, bool))},
+                "saved_at": time.time(),
+            }
+            table = table.replace_schema_metadata({"snapshot": json.dumps(meta)})
+            with self._lock:
+                fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".arrow.tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f, pa.ipc.new_file(f, table.schema) as writer:
+                        writer.write_table(table)
+                    os.replace(tmp, self._path(name))
+                except BaseException:
+                    try:
+                        os.remove(tmp)  # Don't leave half-written .arrow.tmp files behind
+                    except OSError:
+                        pass
+                    raise
+                self._saved_versions[name] = version
+            return True
+        except Exception:
+            return False
+
+    def load(self, name):
+        """Memory-map the snapshot of `name` into a DataFrame (None if there is none).
+
+        df.attrs gets the saved attrs plus `snapshot_at` (epoch seconds of the save).
+        """
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            meta = json.loads(table.schema.metadata[b"snapshot"])
+            df = table.to_pandas()
+            df.columns = meta["columns"]
+            df.attrs.update(meta["attrs"])
+            df.attrs["snapshot_at"] = meta["saved_at"]
+            return df
+        except Exception:
+            return None
+
+    def remove(self, name):
+        """Delete the snapshot of `name`, if any."""
+        with self._lock:
+            self._saved_versions.pop(name, None)
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+
+    def saved_at(self, name):
+        try:
+            return os.path.getmtime(self._path(name))
+        except OSError:
+            return None
@@ -0,0 +1,104 @@
+"""
+MANGLAM TRADELINK - Order Lines
+===============================
+Orders keep their items in one "Order Details" string:
+
+    "Item A: 12.0 SQM (Alt: 3.0 Box) | Item B: 5.0 Pcs"
+
+That string used to be re-split by every reader -- the order cards, receipt
+PDFs, Telegram alerts, the modify-order editor -- and the completed-orders
+item filter ran a substring scan over every order's string.
+
+parse_order_lines() splits all orders once into a table with one row per item:
+
+    index "_Row"  physical sheet row of the order (unique, unlike Order ID)
+    Order ID, Line (0-based position in the order), Item, Detail (text after
+    "Item: "), Qty, Unit, Alt Qty, Alt Unit (numbers / units parsed from
+    Detail; NaN / "" when none is found), Item Key (casefolded Item, for the
+    item filter)
+
+A chunk without "Item: " keeps its text in Detail with an empty Item. Details
+that don't follow the cart format -- Tally-synced orders write
+"Tile A — 12 SQM" or "Tile A - 1,200 Nos" -- still get Qty / Unit from the
+last "-", "—" or ":" followed by a number and a unit, or -- in an order where
+no line has a quantity that way -- from the first number followed by a known
+unit word (SQM, Pcs, Nos ...). total_units() adds
+them up the way the completion alerts always counted "Total Units".
+
+app_cloud.py builds it once per Orders fetch (fetch_order_lines); the Order
+Desk reads it through order_items() / lines_of() / orders_with_item().
+"""
+
+import re
+
+import pandas as pd
+
+LINE_SEPARATOR = " | "
+LINE_COLUMNS = ["Order ID", "Line", "Item", "Detail", "Qty", "Unit", "Alt Qty", "Alt Unit", "Item Key"]
+DETAIL_PATTERN = r"^(?P<qty>[\d,.]+)\s*(?P<unit>[^(]*?)\s*(?:\(Alt:\s*(?P<alt_qty>[\d,.]+)\s*(?P<alt_unit>[^)]*?)\s*\))?$"
+SEGMENT_PATTERN = r"^.*[-—:]\s*(?P<qty>[\d,.]+)\s*(?P<unit>[a-zA-Z]+)"                       # "Tile A — 12 SQM"
+UNIT_PATTERN = r"\b(?P<qty>[\d,.]+)\s*(?P<unit>SQM|Pcs|Nos|Kgs|Ltrs|Mtrs|Units)\b"           # "12 SQM" anywhere
+
+
+def format_order_details(items):
+    """Inverse of the parser: {item: detail} (or (item, detail) pairs) -> the "Order Details" string."""
+    pairs = items.items() if isinstance(items, dict) else items
+    return LINE_SEPARATOR.join(f"{item}: {detail}" for item, detail in pairs)
+
+
+def parse_order_lines(orders):
+    """One row per item of every order in `orders` (needs Order ID + Order Details), indexed by `_Row`."""
+    if orders.empty or not {"Order ID", "Order Details"} <= set(orders.columns):
+        return pd.DataFrame(columns=LINE_COLUMNS, index=pd.Index([], name="_Row"))
+    keys = orders["_Row"] if "_Row" in orders.columns else pd.Series(orders.index, index=orders.index)
+    chunks = orders["Order Details"].astype(str).str.split(LINE_SEPARATOR, regex=False).explode()
+    chunks = chunks[chunks.str.strip() != ""]
+
+    parts = chunks.str.split(": ", n=1, expand=True).reindex(columns=[0, 1])
+    has_item = parts[1].notna()
+    lines = pd.DataFrame({
+        "Order ID": orders.loc[chunks.index, "Order ID"].astype(str).to_numpy(),
+        "Item": parts[0].str.strip().where(has_item, "").to_numpy(),
+        "Detail": parts[1].where(has_item, chunks).str.strip().to_numpy(),
+    }, index=pd.Index(keys.loc[chunks.index].to_numpy(), name="_Row"))
+
+    amounts = lines["Detail"].str.extract(DETAIL_PATTERN).reset_index(drop=True)
+    details = lines["Detail"].reset_index(drop=True)
+    loose = amounts["qty"].isna()
+    if loose.any():  # Not the cart format: Tally "Item — qty unit"
+        amounts.loc[loose, ["qty", "unit"]] = details[loose].str.extract(SEGMENT_PATTERN)[["qty", "unit"]]
+        # A bare "12 SQM" only counts in orders where nothing else did (as the alerts always counted)
+        bare = amounts["qty"].isna() & ~amounts["qty"].notna().groupby(lines.index.to_numpy()).transform("any")
+        if bare.any():
+            amounts.loc[bare, ["qty", "unit"]] = details[bare].str.extract(UNIT_PATTERN, flags=re.IGNORECASE)[["qty", "unit"]]
+    amounts.index = lines.index
+    lines["Qty"] = pd.to_numeric(amounts["qty"].str.replace(",", "", regex=False), errors="coerce")
+    lines["Unit"] = amounts["unit"].fillna("")
+    lines["Alt Qty"] = pd.to_numeric(amounts["alt_qty"].str.replace(",", "", regex=False), errors="coerce")
+    lines["Alt Unit"] = amounts["alt_unit"].fillna("")
+    lines["Item Key"] = lines["Item"].str.casefold()
+    lines["Line"] = lines.groupby(level=0).cumcount()
+    return lines[LINE_COLUMNS].sort_index(kind="stable")  # Sorted index -> each order's lines are one slice
+
+
+def lines_of(lines, row_key):
+    """The lines of one order (empty frame if it has none)."""
+    try:
+        return lines.loc[[row_key]]
+    except KeyError:
+        return lines.iloc[0:0]
+
+
+def order_items(lines, row_key):
+    """((item, detail), ...) of one order in line order -- hashable, for cached card markup."""
+    return tuple(lines_of(lines, row_key)[["Item", "Detail"]].itertuples(index=False, name=None))
+
+
+def total_units(lines):
+    """Every quantity of `lines` added up, alt quantities included (the "Total Units" of an order alert)."""
+    return float(lines["Qty"].sum() + lines["Alt Qty"].sum())
+
+
+def orders_with_item(lines, item):
+    """`_Row` keys of the orders that contain `item` (case-insensitive exact item name)."""
+    return lines.index[lines["Item Key"] == str(item).strip().casefold()].unique()
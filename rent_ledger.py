@@ -0,0 +1,204 @@
+"""
+MANGLAM TRADELINK - Rent Ledger Engine
+======================================
+Tenant balances used to come from a Python loop over every tenant that
+filtered the whole Rent Transactions frame and ran two str.contains scans per
+tenant -- O(tenants x transactions) on every rerun of the Rent Tracker.
+
+build_ledger() does it in one vectorized pass over cleaned, typed columns:
+
+  * per tenant: total charges, total payments and the balance
+    (charges - payments; negative = advance), via one groupby
+  * per transaction: the tenant's running balance after that row (in sheet
+    order, i.e. the order the rows were recorded), for the History tab
+
+The amount / type rules are the ones the Rent Tracker always used: every
+character except digits and "." is dropped from Amount, and a row counts as a
+charge / payment when its Type contains "Charge" / "Payment" (any case).
+
+app_cloud.py caches the result per version of the Rent Transactions tab
+(fetch_rent_ledger), so reruns that didn't change the sheet reuse it.
+
+Checkpoints keep that pass flat as the history grows: once a month has closed,
+checkpointed_ledger() stores every tenant's closing charges / payments through
+the last sheet row dated in a closed month (CheckpointStore, a JSON file), and
+from then on only the rows below that row are aggregated on top of it. The
+running balance still covers every row: the rows up to the checkpoint get a
+plain per-tenant cumsum, whose last value per tenant is the checkpoint itself,
+and the rows after it continue from the checkpoint's totals. A
+checkpoint is dropped as soon as the sheet mirror reports an edit or deletion
+at or above its last row (SheetMirror.edits_since), and rebuilt from the
+previous one -- or from scratch -- on the next pass.
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+TOTAL_COLUMNS = ["Charges", "Payments", "Balance"]
+
+# --- CHECKPOINT SETTINGS ---
+CHECKPOINT_PATH  = "rent_checkpoints.json"
+KEEP_CHECKPOINTS = 24                     # month-ends kept to fall back on when a recent month is edited
+DATE_FORMAT      = "%d-%m-%Y %I:%M %p"    # how the Rent Tracker writes the Date column
+
+
+def clean_transactions(df_tx):
+    """Typed copy of the transaction columns the ledger needs (same index as df_tx)."""
+    tx = pd.DataFrame(index=df_tx.index)
+    tx["Tenant Name"] = df_tx["Tenant Name"].astype(str).str.strip()
+    kind = df_tx["Type"].astype(str).str.strip() if "Type" in df_tx.columns else pd.Series("", index=df_tx.index)
+    amount = pd.to_numeric(df_tx["Amount"].astype(str).str.replace(r"[^\d.]", "", regex=True), errors="coerce").fillna(0.0)
+    tx["Charge"] = amount.where(kind.str.contains("Charge", case=False, na=False), 0.0)
+    tx["Payment"] = amount.where(kind.str.contains("Payment", case=False, na=False), 0.0)
+    return tx
+
+
+def build_ledger(df_tx, opening=None):
+    """-> (totals, running): totals is indexed by tenant name with TOTAL_COLUMNS,
+    running is each transaction's running balance for its tenant (same index as df_tx).
+
+    opening: {tenant: [charges, payments]} carried in from a checkpoint, added to
+    the totals and to the start of every tenant's running balance.
+    """
+    opening_totals = pd.DataFrame.from_dict(opening or {}, orient="index", columns=TOTAL_COLUMNS[:2], dtype=float)
+    if df_tx.empty or "Amount" not in df_tx.columns or "Tenant Name" not in df_tx.columns:
+        tx = pd.DataFrame({"Tenant Name": pd.Series(dtype=str), "Charge": pd.Series(dtype=float),
+                           "Payment": pd.Series(dtype=float)})
+    else:
+        tx = clean_transactions(df_tx)
+    tx["Net"] = tx["Charge"] - tx["Payment"]
+    totals = tx.groupby("Tenant Name", sort=False)[["Charge", "Payment"]].sum()
+    totals.columns = TOTAL_COLUMNS[:2]
+    if not opening_totals.empty:
+        totals = totals.add(opening_totals, fill_value=0.0)
+    totals["Balance"] = totals["Charges"] - totals["Payments"]
+    running = tx.groupby("Tenant Name", sort=False)["Net"].cumsum()
+    if not opening_totals.empty and not running.empty:
+        opening_balance = opening_totals["Charges"] - opening_totals["Payments"]
+        running = running + tx["Tenant Name"].map(opening_balance).fillna(0.0)
+    return totals, running.reindex(df_tx.index)
+
+
+def _parse_dates(dates):
+    parsed = pd.to_datetime(dates, format=DATE_FORMAT, errors="coerce")
+    other = parsed.isna() & dates.astype(str).str.strip().ne("")
+    if other.any():  # Rows typed into the sheet by hand
+        parsed[other] = pd.to_datetime(dates[other], dayfirst=True, errors="coerce", format="mixed")
+    return parsed
+
+
+def _previous_month(month):
+    return (pd.Period(month, freq="M") - 1).strftime("%Y-%m")
+
+
+class CheckpointStore:
+    """Month-end closing totals per tenant (oldest first), kept in a JSON file.
+
+    Each checkpoint: {"month": "2026-09", "through_row": <last sheet row covered>,
+    "version": <mirror version of the data it was built from>, "totals": {tenant: [charges, payments]}}
+    """
+
+    def __init__(self, mirror, sheet_name="Rent Transactions", path=CHECKPOINT_PATH):
+        self.mirror = mirror
+        self.sheet_name = sheet_name
+        self.path = path
+        self.stats = {"created": 0, "invalidated": 0}
+        self._lock = threading.Lock()
+        self._checkpoints = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _save(self):
+        """Rewrite the file atomically (caller holds the lock)."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".rent_checkpoints_", suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._checkpoints, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # still used from memory; only restart-safety is lost
+
+    def checkpoints(self):
+        with self._lock:
+            return [dict(cp) for cp in self._checkpoints]
+
+    def latest(self, version, last_row):
+        """Newest checkpoint usable with data at mirror `version` whose last sheet row is `last_row`.
+
+        Checkpoints whose rows were edited or deleted since they were taken are dropped for good.
+        """
+        mirror_version = self.mirror.version(self.sheet_name)
+        with self._lock:
+            kept, found = len(self._checkpoints), None
+            for i in range(len(self._checkpoints) - 1, -1, -1):
+                cp = self._checkpoints[i]
+                first_edit = self.mirror.edits_since(self.sheet_name, cp["version"])
+                # (A version the mirror hasn't reached means its database was rebuilt -- nothing to compare against)
+                if (first_edit is not None and first_edit <= cp["through_row"]) or cp["version"] > mirror_version:
+                    kept = i  # this one and every newer one cover the edited row
+                    continue
+                if cp["version"] <= version and cp["through_row"] <= last_row:
+                    found = cp
+                    break
+            if kept < len(self._checkpoints):
+                self.stats["invalidated"] += len(self._checkpoints) - kept
+                del self._checkpoints[kept:]
+                self._save()
+            return found
+
+    def add(self, checkpoint):
+        with self._lock:
+            if self._checkpoints and self._checkpoints[-1]["month"] >= checkpoint["month"]:
+                return self._checkpoints[-1]  # Another session got there first
+            self._checkpoints.append(checkpoint)
+            del self._checkpoints[:-KEEP_CHECKPOINTS]
+            self.stats["created"] += 1
+            self._save()
+            return checkpoint
+
+
+def checkpointed_ledger(df_tx, store, version, month, sheet_rows):
+    """build_ledger() that only aggregates the totals of the rows after the newest valid checkpoint
+(the running balance is returned for every row of df_tx, as build_ledger(df_tx) would).
+
+    df_tx: the Rent Transactions frame (with `_Row`), whose first `sheet_rows` rows come from
+    the sheet at mirror `version` (anything after them, e.g. optimistic rows, is never
+    checkpointed); month: the current "YYYY-MM" -- the month before it is the one closed.
+    """
+    if store is None or version is None or not {"Date", "_Row", "Amount", "Tenant Name"} <= set(df_tx.columns):
+        return build_ledger(df_tx)
+    sheet_row = pd.to_numeric(df_tx["_Row"].iloc[:sheet_rows], errors="coerce").fillna(0).to_numpy()
+    base = store.latest(version, int(sheet_row[-1]) if sheet_rows else 0)
+    start = int(np.searchsorted(sheet_row, base["through_row"], side="right")) if base else 0
+
+    closed_month = _previous_month(month)
+    if base is None or base["month"] < closed_month:
+        # Close the month: everything up to the last row dated before this month goes into a new checkpoint
+        dated = _parse_dates(df_tx["Date"].iloc[start:sheet_rows])
+        closed = np.flatnonzero((dated < pd.Timestamp(f"{month}-01")).to_numpy())
+        end = start + int(closed[-1]) + 1 if closed.size else start
+        totals, _ = build_ledger(df_tx.iloc[start:end], base["totals"] if base else None)
+        base = store.add({
+            "month": closed_month,
+            "through_row": int(sheet_row[end - 1]) if end else (base["through_row"] if base else 0),
+            "version": version,
+            "totals": {name: [float(c), float(p)] for name, c, p in
+                       zip(totals.index, totals["Charges"], totals["Payments"])},
+        })
+        start = int(np.searchsorted(sheet_row, base["through_row"], side="right"))
+    totals, running = build_ledger(df_tx.iloc[start:], base["totals"])
+    if start:
+        _, covered = build_ledger(df_tx.iloc[:start])  # Ends on each tenant's checkpointed balance
+        running = pd.concat([covered, running])
+    return totals, running
@@ -0,0 +1,228 @@
+"""
+MANGLAM TRADELINK - Per-Rerun Profiler
+=======================================
+Every click re-runs the whole of app_cloud.py, and Sheets fetches, pandas
+work, HTML building and PDF generation all happen inside that one pass. The
+profiler splits a rerun into named timing spans (auth bouncer, session
+warm-up, each fetch_* call with cache hit/miss, the page body) and
+records every Google Sheets request made on behalf of the session with its
+latency, so the Admin panel can show where the time went.
+
+One RerunProfiler (PROFILER) serves the whole process; the profile of the
+rerun in progress and the last HISTORY_SIZE finished ones live in each
+session's st.session_state. Requests made by threads without a script
+context (mirror sync, SWR refreshes) are kept in a process-wide "background"
+list instead.
+
+    PROFILER.begin()                      # first thing in the script
+    with PROFILER.span("auth bouncer"): ...
+    @PROFILER.profiled                    # on top of @st.cache_data
+    def fetch_x(...): PROFILER.cache_miss(); ...
+    PROFILER.finish()                     # last thing in the script
+"""
+
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from sheet_gateway import REQUEST_OBSERVERS
+
+HISTORY_SIZE      = 20     # finished reruns kept per session
+BACKGROUND_WINDOW = 300    # seconds of background requests kept process-wide
+CURRENT_KEY = "rerun_profile"
+HISTORY_KEY = "rerun_profile_history"
+
+
+class RerunProfile:
+    """Spans and Sheets requests of one script run of one session."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.at = time.time()
+        self.page = None
+        self.spans = []
+        self.requests = []
+        self.last_seen = self.t0
+        self._lock = threading.Lock()
+
+    def _ms(self, t=None):
+        return round(((t or time.perf_counter()) - self.t0) * 1000, 1)
+
+    def open(self, name, depth=0, **meta):
+        now = time.perf_counter()
+        span = {"name": name, "start_ms": self._ms(now), "ms": None, "depth": depth,
+                "thread": threading.current_thread().name, **meta}
+        with self._lock:
+            self.spans.append(span)
+            self.last_seen = now
+        return span
+
+    def close(self, span, **meta):
+        now = time.perf_counter()
+        with self._lock:
+            if span["ms"] is None:
+                span["ms"] = round(self._ms(now) - span["start_ms"], 1)
+                span.update(meta)
+            self.last_seen = now
+
+    def add_request(self, kind, label, ms, status):
+        now = time.perf_counter()
+        with self._lock:
+            self.requests.append({"at_ms": self._ms(now), "kind": kind, "request": label, "ms": round(ms, 1),
+                                  "status": status, "thread": threading.current_thread().name})
+            self.last_seen = now
+
+    def summary(self, interrupted=False):
+        """Close what is still open and return a JSON-able dict of this rerun."""
+        with self._lock:
+            end = time.perf_counter() if not interrupted else self.last_seen
+            for span in self.spans:
+                if span["ms"] is None:  # st.rerun() / st.stop() left the span open
+                    span["ms"] = round(self._ms(end) - span["start_ms"], 1)
+                    span["interrupted"] = True
+            return {
+                "at": self.at,
+                "page": self.page,
+                "total_ms": self._ms(end),
+                "interrupted": interrupted,
+                "request_count": len(self.requests),
+                "request_ms": round(sum(r["ms"] for r in self.requests), 1),
+                "spans": list(self.spans),
+                "requests": list(self.requests),
+            }
+
+
+class RerunProfiler:
+    """Process-wide entry point; finds the calling session's RerunProfile through st.session_state."""
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self.history_size = history_size
+        self._local = threading.local()  # per thread: stack of open spans (for nesting + cache_miss)
+        self._background = deque()
+        self._bg_lock = threading.Lock()
+        REQUEST_OBSERVERS.append(self._on_request)
+
+    # --- session plumbing ---
+    def current(self):
+        """Profile of the calling thread's session (None outside a script run)."""
+        if get_script_run_ctx() is None:
+            return None
+        try:
+            return st.session_state.get(CURRENT_KEY)
+        except Exception:
+            return None
+
+    def _push_history(self, summary):
+        history = st.session_state.setdefault(HISTORY_KEY, [])
+        history.append(summary)
+        del history[:-self.history_size]
+
+    def begin(self):
+        """Start profiling this rerun; a previous run cut short by st.rerun()/st.stop() is filed first."""
+        previous = st.session_state.get(CURRENT_KEY)
+        if previous is not None:
+            self._push_history(previous.summary(interrupted=True))
+        self._local.stack = []
+        st.session_state[CURRENT_KEY] = RerunProfile()
+
+    def finish(self):
+        """File this rerun in the session's history; returns its summary (None if not profiling)."""
+        profile = st.session_state.get(CURRENT_KEY)
+        if profile is None:
+            return None
+        st.session_state[CURRENT_KEY] = None
+        summary = profile.summary()
+        self._push_history(summary)
+        return summary
+
+    def set_page(self, page):
+        profile = self.current()
+        if profile is not None:
+            profile.page = page
+
+    # --- spans ---
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def open(self, name, **meta):
+        """Start a span that is closed later with close() (for code that can't sit in a with-block)."""
+        profile = self.current()
+        if profile is None:
+            return None
+        stack = self._stack()
+        span = profile.open(name, depth=len(stack), **meta)
+        stack.append(span)
+        return profile, span
+
+    def close(self, handle, **meta):
+        if handle is None:
+            return
+        profile, span = handle
+        profile.close(span, **meta)
+        stack = self._stack()
+        for i, open_span in enumerate(stack):
+            if open_span is span:
+                del stack[i:]
+                break
+
+    @contextmanager
+    def span(self, name, **meta):
+        handle = self.open(name, **meta)
+        try:
+            yield
+        finally:
+            self.close(handle)
+
+    def profiled(self, fn):
+        """Decorator for st.cache_data fetchers: one span per call, labelled with the sheet name."""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            sheet = kwargs.get("sheet_name") or next((a for a in args if isinstance(a, str)), None)
+            name = f"{getattr(fn, '__name__', 'fetch')}({sheet})" if sheet else getattr(fn, "__name__", "fetch")
+            handle = self.open(name, cache="hit")
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.close(handle)
+        if hasattr(fn, "clear"):
+            wrapper.clear = fn.clear  # drop_frame_caches() clears through the wrapper
+        return wrapper
+
+    def cache_miss(self):
+        """Call first thing inside a cached function body: marks the enclosing fetch span as a miss."""
+        stack = self._stack()
+        if stack:
+            stack[-1]["cache"] = "miss"
+
+    # --- requests ---
+    def _on_request(self, kind, label, ms, status):
+        profile = self.current()
+        if profile is not None:
+            profile.add_request(kind, label, ms, status)
+            return
+        now = time.time()
+        with self._bg_lock:
+            self._background.append({"at": now, "kind": kind, "request": label, "ms": round(ms, 1), "status": status,
+                                     "thread": threading.current_thread().name})
+            while self._background and now - self._background[0]["at"] > BACKGROUND_WINDOW:
+                self._background.popleft()
+
+    def history(self):
+        """Finished reruns of this session, oldest first."""
+        return list(st.session_state.get(HISTORY_KEY, []))
+
+    def background(self, window=60):
+        """Requests made by background threads (mirror sync, revalidation) in the last `window` seconds."""
+        now = time.time()
+        with self._bg_lock:
+            return [dict(r) for r in self._background if now - r["at"] <= window]
+
+
+PROFILER = RerunProfiler()
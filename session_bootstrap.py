@@ -0,0 +1,122 @@
+"""
+MANGLAM TRADELINK - Non-Blocking Session Bootstrap
+===================================================
+The browser cookies (login + language) are only known once the
+extra_streamlit_components cookie iframe has mounted and sent them back,
+which always happens on a *later* rerun. The app used to time.sleep() to
+"give it a moment" on every rerun, and again after every cookie write so the
+write iframe could run before st.rerun() threw it away.
+
+Instead:
+
+  * SessionCookies renders the getAll component with default=None, so
+    "not loaded yet" (None) is told apart from "no cookies" ({}). Its reply
+    triggers the rerun that continues the bootstrap -- no delay needed. If it
+    never answers, a one-shot st.fragment timer carries on without cookies
+    after COOKIE_READY_TIMEOUT.
+  * Once read, the cookies are kept in st.session_state, so every later rerun
+    of the session skips the component entirely.
+  * set()/delete() are queued and rendered on every rerun until the browser
+    confirms them, so callers can st.rerun() straight away.
+  * flash() queues a message for st.toast on the next rerun, replacing the
+    st.success(); time.sleep(2); st.rerun() pattern.
+"""
+
+import time
+
+import streamlit as st
+from extra_streamlit_components.CookieManager import CookieManager, _component_func
+
+COOKIE_READY_TIMEOUT = 3.0   # seconds to wait for the cookie iframe before showing the login without it
+CACHE_KEY   = "browser_cookies"
+PENDING_KEY = "pending_cookie_ops"
+WAIT_KEY    = "cookie_wait_started"
+FLASH_KEY   = "flash_messages"
+
+
+class SessionCookies(CookieManager):
+    """CookieManager that reads the browser cookies once per session and queues writes until confirmed."""
+
+    def __init__(self, key="init"):
+        self.key = key
+        self.cookie_manager = _component_func
+        if CACHE_KEY in st.session_state:
+            self.cookies = st.session_state[CACHE_KEY]
+            self.ready = True
+        else:
+            raw = self.cookie_manager(method="getAll", key=key, default=None)
+            self.ready = raw is not None
+            self.cookies = dict(raw or {})
+            if self.ready:
+                st.session_state[CACHE_KEY] = self.cookies
+        self.flush()
+
+    def _queue(self, op):
+        st.session_state.setdefault(PENDING_KEY, [])
+        st.session_state[f"{PENDING_KEY}_seq"] = seq = st.session_state.get(f"{PENDING_KEY}_seq", 0) + 1
+        op["key"] = f"{self.key}_op_{seq}"  # fresh key per write: a new iframe that reports back once
+        st.session_state[PENDING_KEY].append(op)
+        self.flush()
+
+    def set(self, cookie, val, expires_at=None, **kwargs):
+        if not cookie:
+            return
+        self.cookies[cookie] = val
+        self._queue({"method": "set", "cookie": cookie, "value": val,
+                     "expires": expires_at.isoformat() if expires_at else None})
+
+    def delete(self, cookie, key=None):
+        if not cookie:
+            return
+        self.cookies.pop(cookie, None)
+        self._queue({"method": "delete", "cookie": cookie})
+
+    def flush(self):
+        """(Re-)render every queued write; drop the ones the browser has confirmed."""
+        pending = st.session_state.get(PENDING_KEY)
+        if not pending:
+            return
+        self._remove_extra_spacing()
+        still_pending = []
+        for op in pending:
+            if op["method"] == "set":
+                options = {"path": "/", "sameSite": "strict"}
+                if op["expires"]:
+                    options["expires"] = op["expires"]
+                done = self.cookie_manager(method="set", cookie=op["cookie"], value=op["value"],
+                                           options=options, key=op["key"], default=False)
+            else:
+                done = self.cookie_manager(method="delete", cookie=op["cookie"], key=op["key"], default=False)
+            if not done:
+                still_pending.append(op)
+        st.session_state[PENDING_KEY] = still_pending
+
+
+def wait_for_cookies(message="Restoring your session..."):
+    """Show a placeholder and stop this run until the cookie iframe answers (or COOKIE_READY_TIMEOUT passes).
+
+    Returns without stopping once the timeout has passed, so the caller carries on without cookies.
+    """
+    started = st.session_state.setdefault(WAIT_KEY, time.time())
+    if time.time() - started >= COOKIE_READY_TIMEOUT:
+        return
+    st.markdown(f"<div style='text-align:center; margin-top:80px; opacity:0.7;'>⏳ {message}</div>", unsafe_allow_html=True)
+
+    @st.fragment(run_every=COOKIE_READY_TIMEOUT)
+    def _give_up_waiting():
+        # First call renders with the page; the timed re-run restarts the app without cookies
+        if time.time() - started >= COOKIE_READY_TIMEOUT:
+            st.rerun()
+
+    _give_up_waiting()
+    st.stop()
+
+
+def flash(message, icon=None):
+    """Queue a toast for the next rerun (use right before st.rerun() instead of sleeping)."""
+    st.session_state.setdefault(FLASH_KEY, []).append((message, icon))
+
+
+def show_flashes():
+    for message, icon in st.session_state.pop(FLASH_KEY, []):
+        st.toast(message, icon=icon)
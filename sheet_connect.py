@@ -0,0 +1,151 @@
+"""
+MANGLAM TRADELINK - Google Sheets Connection Bootstrap
+=======================================================
+Opens "Tally Live Stock" once per process with as few API calls as possible:
+
+  * ONE spreadsheet metadata fetch resolves every tab (Orders, Tenants, ...,
+    Hindi Map) instead of one db.worksheet(name) metadata call per tab;
+  * one authorized client is shared by the whole app, on a keep-alive HTTP
+    session with a connection pool big enough for the sync/warm-up threads;
+  * the OAuth access token and the spreadsheet ID are cached on disk
+    (TOKEN_CACHE_PATH), so a restarted process skips the token exchange and
+    the Drive "find spreadsheet by name" lookup while the token is valid.
+
+Import connect() from app_cloud.py and keep its result in st.cache_resource.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import gspread
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+from gspread.exceptions import APIError, SpreadsheetNotFound
+from gspread.http_client import HTTPClient
+from gspread.spreadsheet import Spreadsheet
+from gspread.worksheet import Worksheet
+from requests.adapters import HTTPAdapter
+
+# --- CONNECTION SETTINGS ---
+TOKEN_CACHE_PATH   = ".gspread_token.json"
+HTTP_POOL_SIZE     = 16    # keep-alive connections (sync thread + SWR refreshes + warm-up workers)
+TOKEN_MIN_VALIDITY = 120   # seconds left on a cached token for it to be reused
+SCOPES = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+
+
+class BootstrapCache:
+    """Small JSON file with the last access token and the spreadsheet IDs by title."""
+
+    def __init__(self, path=TOKEN_CACHE_PATH):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.data = json.load(f)
+        except Exception:
+            self.data = {}
+
+    def _save(self):
+        # Atomic replace, readable by this user only (the file holds a bearer token)
+        try:
+            folder = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp = tempfile.mkstemp(dir=folder, prefix=".gspread_token.")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.data, f)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass  # A read-only disk only costs us the faster restart
+
+    def restore_token(self, creds):
+        """Put the cached token on `creds` if it belongs to this account and is still valid."""
+        token, expiry = self.data.get("token"), self.data.get("expiry")
+        if not token or not expiry or self.data.get("account") != creds.service_account_email:
+            return False
+        expiry = datetime.fromisoformat(expiry)
+        if expiry - datetime.utcnow() < timedelta(seconds=TOKEN_MIN_VALIDITY):
+            return False
+        creds.token, creds.expiry = token, expiry
+        return True
+
+    def save_token(self, creds):
+        if creds.token and creds.expiry and creds.token != self.data.get("token"):
+            self.data.update(token=creds.token, expiry=creds.expiry.isoformat(), account=creds.service_account_email)
+            self._save()
+
+    def spreadsheet_id(self, title):
+        return self.data.get("spreadsheets", {}).get(title)
+
+    def remember_spreadsheet(self, title, key):
+        if self.spreadsheet_id(title) != key:
+            self.data.setdefault("spreadsheets", {})[title] = key
+            self._save()
+
+    def forget_spreadsheet(self, title):
+        if self.data.get("spreadsheets", {}).pop(title, None):
+            self._save()
+
+
+class TokenCachingSession(AuthorizedSession):
+    """AuthorizedSession that writes every newly issued access token to the BootstrapCache."""
+
+    def __init__(self, credentials, cache, pool_size=HTTP_POOL_SIZE):
+        super().__init__(credentials)
+        self._cache = cache
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, *args, **kwargs):
+        response = super().request(*args, **kwargs)
+        self._cache.save_token(self.credentials)
+        return response
+
+
+class BootstrapSpreadsheet(Spreadsheet):
+    """Spreadsheet that keeps the tab list from the metadata it fetches when opened."""
+
+    def fetch_sheet_metadata(self, params=None):
+        metadata = super().fetch_sheet_metadata(params)
+        if params is None and "sheets" in metadata:
+            self._sheets_metadata = metadata["sheets"]
+        return metadata
+
+    def cached_worksheets(self):
+        """All tabs, in sheet order, without another API call."""
+        return [Worksheet(self, s["properties"], self.id, self.client) for s in self._sheets_metadata]
+
+
+def _find_spreadsheet_id(client, title):
+    for f in client.list_spreadsheet_files(title):
+        if f.get("name") == title:
+            return f["id"]
+    raise SpreadsheetNotFound(f"Spreadsheet {title!r} not found")
+
+
+def connect(creds_info, title, http_client=HTTPClient, key=None, cache_path=TOKEN_CACHE_PATH):
+    """Authorize once and resolve every tab of `title`.
+
+    creds_info  -- service-account JSON as a dict
+    http_client -- gspread HTTPClient class to use (e.g. the rate-limited gateway)
+    key         -- optional spreadsheet ID, skips the Drive lookup by name
+    Returns (client, spreadsheet, {tab title: Worksheet}) with tabs in sheet order.
+    """
+    cache = BootstrapCache(cache_path)
+    creds = Credentials.from_service_account_info(creds_info, scopes=SCOPES)
+    cache.restore_token(creds)
+    client = gspread.Client(auth=creds, session=TokenCachingSession(creds, cache), http_client=http_client)
+    client.http_client.auth = creds  # gspread leaves .auth unset when a session is passed in
+
+    cached_key = None if key else cache.spreadsheet_id(title)
+    try:
+        db = BootstrapSpreadsheet(client.http_client, {"id": key or cached_key or _find_spreadsheet_id(client, title)})
+    except APIError as e:
+        if not cached_key or e.code != 404:
+            raise
+        cache.forget_spreadsheet(title)  # The cached ID is gone (sheet re-created) -- look it up again
+        db = BootstrapSpreadsheet(client.http_client, {"id": _find_spreadsheet_id(client, title)})
+    if not key:
+        cache.remember_spreadsheet(title, db.id)
+    return client, db, {ws.title: ws for ws in db.cached_worksheets()}
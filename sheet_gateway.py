@@ -0,0 +1,208 @@
+"""
+MANGLAM TRADELINK - Google Sheets API Gateway
+==============================================
+Every gspread call of the portal goes through GatewayHTTPClient (passed to
+gspread.authorize as http_client), so rate limiting and retries live in one
+place instead of in the try/except around each get_all_values/append_row:
+
+  * a process-wide token bucket each for READ and WRITE requests keeps us
+    under the per-minute Sheets quota instead of running into it;
+  * reads are retried on 429 (quota) / 408 / 5xx and dropped connections,
+    with jittered exponential backoff, before the error reaches the page;
+    writes (append, batchUpdate, delete ...) are NOT idempotent -- after a
+    timeout or 5xx the first attempt may already be applied -- so they are
+    only retried on 429 or when the connection failed before anything was
+    sent. All retries of one call sleep RETRY_BUDGET_SECONDS at most;
+  * QuotaTracker counts the requests of the last 60 seconds so the Admin
+    Dashboard can show how close the app is to the limit;
+  * every attempt is reported with its latency to REQUEST_OBSERVERS (the
+    per-rerun profiler in rerun_profiler.py).
+
+send_with_retries() is that loop on its own; the in-memory fake backend
+(fake_sheets.py) sends its simulated requests through it too.
+"""
+
+import functools
+import random
+import threading
+import time
+import urllib.parse
+from collections import deque
+
+import requests
+from gspread.exceptions import APIError
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from gspread.http_client import HTTPClient
+
+# --- QUOTA SETTINGS (Sheets API: 60 reads + 60 writes per minute per user) ---
+READ_QUOTA_PER_MINUTE  = 60
+WRITE_QUOTA_PER_MINUTE = 60
+BUCKET_BURST           = 20    # requests allowed back-to-back before the bucket paces them
+MAX_RETRIES            = 5
+BACKOFF_BASE_SECONDS   = 1.0
+BACKOFF_MAX_SECONDS    = 32.0
+RETRY_BUDGET_SECONDS   = 15.0  # total backoff sleep per call, so a retrying call can't hold a rerun for a minute
+RETRY_STATUS_CODES     = {408, 429, 500, 502, 503, 504}   # reads
+WRITE_RETRY_STATUS     = {429}                            # writes: rejected before they were applied
+
+
+class TokenBucket:
+    """Classic token bucket: `rate_per_minute` refill, up to `capacity` saved tokens."""
+
+    def __init__(self, rate_per_minute, capacity):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take one token, sleeping until one is available. Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class QuotaTracker:
+    """Sliding 60-second window of sent requests, plus retry/throttle counters."""
+
+    def __init__(self, limits):
+        self.limits = dict(limits)  # {"read": 60, "write": 60}
+        self._sent = {kind: deque() for kind in self.limits}
+        self._lock = threading.Lock()
+        self.totals = {"requests": 0, "retries": 0, "rate_limited": 0, "failed": 0, "throttle_wait_s": 0.0}
+
+    def _trim(self, now):
+        for q in self._sent.values():
+            while q and now - q[0] > 60:
+                q.popleft()
+
+    def record(self, kind, waited=0.0):
+        now = time.time()
+        with self._lock:
+            self._sent[kind].append(now)
+            self._trim(now)
+            self.totals["requests"] += 1
+            self.totals["throttle_wait_s"] += waited
+
+    def count(self, key):
+        with self._lock:
+            self.totals[key] += 1
+
+    def snapshot(self):
+        """{"read": {"used": n, "limit": m, "pct": p}, "write": {...}, "totals": {...}}"""
+        now = time.time()
+        with self._lock:
+            self._trim(now)
+            usage = {
+                kind: {"used": len(q), "limit": self.limits[kind],
+                       "pct": round(100.0 * len(q) / self.limits[kind], 1) if self.limits[kind] else 0.0}
+                for kind, q in self._sent.items()
+            }
+            usage["totals"] = dict(self.totals)
+        return usage
+
+
+# Process-wide: every client/session of this Streamlit server shares one quota
+BUCKETS = {
+    "read": TokenBucket(READ_QUOTA_PER_MINUTE, BUCKET_BURST),
+    "write": TokenBucket(WRITE_QUOTA_PER_MINUTE, BUCKET_BURST),
+}
+QUOTA = QuotaTracker({"read": READ_QUOTA_PER_MINUTE, "write": WRITE_QUOTA_PER_MINUTE})
+
+
+# Callables fn(kind, label, ms, status) told about every request attempt (status: HTTP code or "error")
+REQUEST_OBSERVERS = []
+
+
+def notify_request(kind, label, ms, status):
+    for fn in list(REQUEST_OBSERVERS):
+        try:
+            fn(kind, label, ms, status)
+        except Exception:
+            pass  # Instrumentation must never break a Sheets call
+
+
+def endpoint_label(method, endpoint):
+    """Short, ID-free name of a request, e.g. "GET values/'Orders'!A1:Z" or "POST values:batchGet"."""
+    parsed = urllib.parse.urlparse(endpoint)
+    path = urllib.parse.unquote(parsed.path)
+    if "/spreadsheets/" in path:
+        rest = path.split("/spreadsheets/", 1)[1]
+        path = rest.split("/", 1)[1] if "/" in rest else ("metadata" if ":" not in rest else rest.split(":", 1)[1])
+    return f"{method.upper()} {path}"
+
+
+def request_kind(method, endpoint):
+    """Reads are GETs (values, batchGet, metadata, Drive lookups); everything else spends write quota."""
+    return "read" if method.upper() == "GET" else "write"
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff: random in [0, min(max, base * 2**attempt)]."""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+def sent_nothing(err):
+    """True if a connection error happened before the request was sent (so even a write can be retried)."""
+    if isinstance(err, requests.ConnectTimeout):
+        return True
+    cause = err.args[0] if err.args else None
+    return isinstance(cause, NewConnectionError) or isinstance(getattr(cause, "reason", None), (NewConnectionError, ConnectTimeoutError))
+
+
+def send_with_retries(kind, label, send):
+    """Call send() -- one attempt of a `kind` ("read" / "write") request -- paced by the shared
+    bucket and retried by the rules above. Returns its response."""
+    retry_codes = RETRY_STATUS_CODES if kind == "read" else WRITE_RETRY_STATUS
+    attempt, slept = 0, 0.0
+    while True:
+        QUOTA.record(kind, BUCKETS[kind].acquire())
+        t0 = time.perf_counter()
+        try:
+            response = send()
+            notify_request(kind, label, (time.perf_counter() - t0) * 1000, getattr(response, "status_code", 200))
+            return response
+        except APIError as err:
+            notify_request(kind, label, (time.perf_counter() - t0) * 1000, err.code)
+            if err.code == 429:
+                QUOTA.count("rate_limited")
+            if err.code not in retry_codes or attempt >= MAX_RETRIES or slept >= RETRY_BUDGET_SECONDS:
+                QUOTA.count("failed")
+                raise
+        except (requests.ConnectionError, requests.Timeout) as err:
+            notify_request(kind, label, (time.perf_counter() - t0) * 1000, "error")
+            unsafe = kind == "write" and not sent_nothing(err)  # A write that may have reached Google
+            if unsafe or attempt >= MAX_RETRIES or slept >= RETRY_BUDGET_SECONDS:
+                QUOTA.count("failed")
+                raise
+        QUOTA.count("retries")
+        delay = min(backoff_delay(attempt), RETRY_BUDGET_SECONDS - slept)
+        time.sleep(delay)
+        slept += delay
+        attempt += 1
+
+
+class GatewayHTTPClient(HTTPClient):
+    """gspread HTTP client that paces requests through the shared buckets and retries what is safe to retry."""
+
+    def request(self, method, endpoint, *args, **kwargs):
+        send = functools.partial(super().request, method, endpoint, *args, **kwargs)
+        return send_with_retries(request_kind(method, endpoint), endpoint_label(method, endpoint), send)
@@ -0,0 +1,594 @@
+"""
+MANGLAM TRADELINK - Local Google Sheets Mirror
+===============================================
+Keeps a SQLite copy of every worksheet in "Tally Live Stock" so the portal
+pages read from local, indexed tables instead of calling Google Sheets on
+every cache miss. One background thread owns the Sheets reads; app_cloud.py
+only reads from the mirror and marks tabs dirty after it writes to them.
+
+A full sync cycle pulls every tab in ONE values:batchGet request instead of
+one get_all_values() per tab.
+
+Reads follow a per-tab stale-while-revalidate policy (CachePolicy): data past
+its soft TTL is still served and refreshed in the background; past the hard
+TTL it is "expired" but may be served for up to max_stale more seconds while
+it revalidates. Only tabs the app itself just wrote to, or data older than
+that, make the reader wait for Google.
+
+Tabs with a version probe (e.g. the Stock header row, where the Tally sync
+writes "Last Updated: ...") are checked with a tiny read first; the full grid
+is only downloaded when that marker changed, the app wrote to the tab, or
+FULL_REFRESH_SECONDS passed since the last full download.
+
+Append-only tabs (Rent Transactions, Audit Logs) are synced by delta: only
+the rows below the last known row are fetched, together with that last row
+itself and one narrow check column of the whole tab (e.g. Amount), in the same
+batchGet. If the last row no longer matches, or the check column differs from
+the local copy's, rows were deleted or edited and the tab is reloaded in full
+-- so a hand edit of an older row's amount shows up on the next sync. Writes
+that edit such a tab must call invalidate() without appended=True so the next
+sync is a full one. Full syncs that edit or delete existing rows are logged,
+so edits_since() can tell whether anything above a given row changed since a
+version (used by the rent balance checkpoints).
+
+Each worksheet is stored as one table (row 1 = header row, column c1 =
+primary key column, indexed) plus a row in `_sync_meta` with the last sync
+time, so the dashboard can show how fresh every tab is. The database file
+(MIRROR_DB_PATH) therefore holds a full copy of every mirrored tab; tabs that
+must not be written to disk are simply not passed in (and forget() removes
+copies stored earlier).
+
+Import SheetMirror from app_cloud.py and keep one instance per process
+(st.cache_resource).
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from gspread.utils import a1_range_to_grid_range, absolute_range_name, rowcol_to_a1
+
+from single_flight import SingleFlight
+
+# --- MIRROR SETTINGS ---
+MIRROR_DB_PATH        = "sheet_mirror.db"
+SYNC_INTERVAL_SECONDS = 30    # background loop period
+STALE_AFTER_SECONDS   = 300   # older than this -> reader syncs inline first (default policy)
+FULL_REFRESH_SECONDS  = 900   # probed tabs are still downloaded in full at least this often
+DELTA_CHECK_RANGE     = "A:A" # column of an append-only tab compared in full on every delta sync (default)
+CHECK_SUFFIX          = " #check"  # batchGet label of that column's range
+
+# Seconds since the last sync: <= soft_ttl fresh | <= hard_ttl served + background refresh
+# | <= hard_ttl + max_stale served as "expired" while revalidating | older -> reader waits
+CachePolicy = namedtuple("CachePolicy", ["soft_ttl", "hard_ttl", "max_stale"])
+DEFAULT_POLICY = CachePolicy(STALE_AFTER_SECONDS, STALE_AFTER_SECONDS, 0)
+
+
+def _row_hash(row):
+    return hashlib.sha1(json.dumps(row, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def batch_get_values(worksheets, ranges=None):
+    """Fetch every worksheet of one spreadsheet in a single values:batchGet call.
+
+    worksheets -- {name: gspread.Worksheet}; returns {name: list of rows}
+    ranges     -- optional {name: A1 range inside that tab}; other tabs are read whole
+    """
+    names = list(worksheets)
+    if not names:
+        return {}
+    ranges = ranges or {}
+    spreadsheet = worksheets[names[0]].spreadsheet
+    ranges = [absolute_range_name(worksheets[n].title, ranges.get(n)) for n in names]
+    response = spreadsheet.values_batch_get(ranges)
+    value_ranges = response.get("valueRanges", [])
+    return {name: vr.get("values", []) for name, vr in zip(names, value_ranges)}
+
+
+def _marker(cells):
+    """Hash of a probe range, ignoring trailing blanks (the API omits them too)."""
+    rows = [[str(c) for c in r] for r in cells]
+    for r in rows:
+        while r and r[-1] == "":
+            r.pop()
+    while rows and not rows[-1]:
+        rows.pop()
+    return _row_hash(rows)
+
+
+def _slice(values, probe):
+    """Cut an A1 probe range (e.g. "1:1", "Z1") out of a full grid."""
+    g = a1_range_to_grid_range(probe)
+    rows = values[g.get("startRowIndex", 0):g.get("endRowIndex")]
+    return [r[g.get("startColumnIndex", 0):g.get("endColumnIndex")] for r in rows]
+
+
+def _pad(values):
+    """Make the grid rectangular, exactly like gspread's get_all_values()."""
+    if not values:
+        return []
+    width = max(len(r) for r in values)
+    return [[str(c) for c in r] + [""] * (width - len(r)) for r in values]
+
+
+class SheetMirror:
+    """SQLite mirror of a set of worksheets, refreshed by a background thread."""
+
+    def __init__(self, worksheets, db_path=MIRROR_DB_PATH, interval=SYNC_INTERVAL_SECONDS, policies=None,
+                 flight=None, probes=None, append_only=()):
+        # worksheets: {"Orders": <gspread.Worksheet>, ...} -- missing tabs (None) are skipped
+        # policies:   {"Orders": CachePolicy(...), ...} -- other tabs use DEFAULT_POLICY
+        # flight:     process-wide SingleFlight, so concurrent misses share one Sheets fetch
+        # probes:     {"Stock": "1:1", ...} -- A1 range read first as that tab's version marker
+        # append_only: tabs synced by delta (new rows only) until something else changes them; a dict
+        #              {"Rent Transactions": "E:E"} also names the column checked in full (default DELTA_CHECK_RANGE)
+        self.worksheets = {name: ws for name, ws in worksheets.items() if ws is not None}
+        self.probes = {name: rng for name, rng in (probes or {}).items() if name in self.worksheets}
+        self.probe_stats = {"probes": 0, "unchanged": 0, "changed": 0}
+        self.append_only = {name for name in append_only if name in self.worksheets}
+        self.delta_checks = {name: append_only[name] if isinstance(append_only, dict) else DELTA_CHECK_RANGE
+                             for name in self.append_only}
+        self.delta_stats = {"deltas": 0, "rows": 0, "full_reloads": 0}
+        self._needs_full = set()  # append-only tabs edited/deleted by the app -> next sync reloads them whole
+        self.flight = flight or SingleFlight()
+        self.interval = interval
+        self.policies = dict(policies or {})
+        self._revalidating = set()
+        self._revalidate_lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        self._dirty = set()
+        self._dirty_gen = {}  # name -> invalidate() count, so a sync only clears marks it has covered
+        self._wake = threading.Event()
+        self.listeners = []  # callables(name), run after a sync changed a tab's data
+        self._thread = None
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS _sync_meta ("
+                " sheet TEXT PRIMARY KEY, last_synced REAL, row_count INTEGER,"
+                " col_count INTEGER, version INTEGER DEFAULT 0, last_error TEXT)"
+            )
+            # One row per sync that edited or deleted existing rows (not pure appends), for edits_since()
+            self._conn.execute("CREATE TABLE IF NOT EXISTS _row_edits (sheet TEXT, version INTEGER, first_row INTEGER)")
+            columns = [r[1] for r in self._conn.execute("PRAGMA table_info(_sync_meta)")]
+            for col, kind in (("marker", "TEXT"), ("last_full", "REAL")):
+                if col not in columns:
+                    self._conn.execute(f"ALTER TABLE _sync_meta ADD COLUMN {col} {kind}")
+
+    # ------------------------------------------------------------------
+    # Storage helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _table(name):
+        return '"ws_' + name.replace('"', '""') + '"'
+
+    def _ensure_table(self, name, col_count):
+        table = self._table(name)
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (_row INTEGER PRIMARY KEY, _hash TEXT)")
+        existing = [r[1] for r in self._conn.execute(f"PRAGMA table_info({table})")]
+        for i in range(1, col_count + 1):
+            if f"c{i}" not in existing:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN c{i} TEXT")
+                if i == 1:
+                    index = '"ix_' + name.replace('"', '""') + '_key"'
+                    self._conn.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table}(c1)")
+
+    def _store(self, name, values, fetched_at):
+        """Write a freshly fetched grid, touching only the rows that changed."""
+        values = _pad(values)
+        col_count = len(values[0]) if values else 0
+        marker = _marker(_slice(values, self.probes[name])) if name in self.probes else None
+        table = self._table(name)
+        with self._db_lock, self._conn:
+            newer = self._conn.execute("SELECT last_synced FROM _sync_meta WHERE sheet = ?", (name,)).fetchone()
+            if newer and newer[0] and newer[0] > fetched_at:
+                return  # A later fetch of this tab was already stored
+            self._ensure_table(name, col_count)
+            old = dict(self._conn.execute(f"SELECT _row, _hash FROM {table}"))
+            changed = []
+            for i, row in enumerate(values, start=1):
+                h = _row_hash(row)
+                if old.get(i) != h:
+                    changed.append((i, h, row))
+            if changed:
+                cols = ", ".join(f"c{i}" for i in range(1, col_count + 1))
+                marks = ", ".join("?" * (col_count + 2))
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} (_row, _hash, {cols}) VALUES ({marks})",
+                    [(i, h, *row) for i, h, row in changed],
+                )
+            removed = self._conn.execute(f"DELETE FROM {table} WHERE _row > ?", (len(values),)).rowcount
+            bump = 1 if (changed or removed) else 0
+            # Lowest pre-existing row that changed or went away (a first download counts as row 1)
+            known_rows = max(old) if old else 0
+            edited = [i for i, _, _ in changed if i <= known_rows] + ([len(values) + 1] if removed else [])
+            first_edit = min(edited) if edited else (1 if not old and bump else None)
+            self._conn.execute(
+                "INSERT INTO _sync_meta (sheet, last_synced, row_count, col_count, version, last_error, marker, last_full)"
+                " VALUES (?, ?, ?, ?, 1, NULL, ?, ?)"
+                " ON CONFLICT(sheet) DO UPDATE SET last_synced=excluded.last_synced,"
+                " row_count=excluded.row_count, col_count=excluded.col_count,"
+                " version=version + ?, last_error=NULL, marker=excluded.marker, last_full=excluded.last_full",
+                (name, fetched_at, len(values), col_count, marker, fetched_at, bump),
+            )
+            if first_edit is not None:
+                self._conn.execute(
+                    "INSERT INTO _row_edits (sheet, version, first_row)"
+                    " SELECT sheet, version, ? FROM _sync_meta WHERE sheet = ?", (first_edit, name),
+                )
+        if bump:
+            self._notify(name)
+
+    def _notify(self, name):
+        for listener in list(self.listeners):
+            try:
+                listener(name)
+            except Exception:
+                pass
+
+    def _touch(self, name, fetched_at):
+        """The probe proved the local copy current -- count it as a sync without a download."""
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "UPDATE _sync_meta SET last_synced = MAX(COALESCE(last_synced, 0), ?), last_error = NULL WHERE sheet = ?",
+                (fetched_at, name),
+            )
+
+    def _check_marker(self, name, row_count):
+        """Marker of the local copy's check column over rows 1..row_count (caller holds the DB lock)."""
+        g = a1_range_to_grid_range(self.delta_checks[name])
+        first, last = g.get("startColumnIndex", 0) + 1, g.get("endColumnIndex", g.get("startColumnIndex", 0) + 1)
+        cols = ", ".join(f"COALESCE(c{i}, '')" for i in range(first, last + 1))
+        rows = self._conn.execute(f"SELECT {cols} FROM {self._table(name)} WHERE _row <= ? ORDER BY _row", (row_count,))
+        return _marker([list(r) for r in rows])
+
+    def _apply_delta(self, name, values, fetched_at, check=None):
+        """Append the rows of a delta read (starting AT the last known row). False if the tab changed underneath.
+
+        check: the tab's check column as fetched with the delta -- compared with the local copy over the known rows.
+        """
+        table = self._table(name)
+        with self._db_lock, self._conn:
+            meta = self._conn.execute(
+                "SELECT last_synced, row_count, col_count FROM _sync_meta WHERE sheet = ?", (name,)
+            ).fetchone()
+            if not meta:
+                return False
+            last_synced, row_count, col_count = meta
+            if last_synced and last_synced > fetched_at:
+                return True  # A later fetch of this tab was already stored
+            rows = [[str(c) for c in r] + [""] * (col_count - len(r)) for r in values]
+            if any(len(r) > col_count for r in rows):
+                return False  # New columns -- needs a full reload
+            anchor = self._conn.execute(f"SELECT _hash FROM {table} WHERE _row = ?", (row_count,)).fetchone()
+            if not rows or not anchor or anchor[0] != _row_hash(rows[0]):
+                return False  # Last known row moved or changed: rows were deleted or edited
+            if check is not None and _marker(check[:row_count]) != self._check_marker(name, row_count):
+                return False  # A row above it was edited or deleted
+            new = rows[1:]
+            if new:
+                cols = ", ".join(f"c{i}" for i in range(1, col_count + 1))
+                marks = ", ".join("?" * (col_count + 2))
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} (_row, _hash, {cols}) VALUES ({marks})",
+                    [(row_count + i, _row_hash(r), *r) for i, r in enumerate(new, start=1)],
+                )
+            self._conn.execute(
+                "UPDATE _sync_meta SET last_synced = ?, row_count = ?, version = version + ?, last_error = NULL"
+                " WHERE sheet = ?",
+                (fetched_at, row_count + len(new), 1 if new else 0, name),
+            )
+        self.delta_stats["deltas"] += 1
+        self.delta_stats["rows"] += len(new)
+        if new:
+            self._notify(name)
+        return True
+
+    def _record_error(self, name, err):
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO _sync_meta (sheet, last_error) VALUES (?, ?)"
+                " ON CONFLICT(sheet) DO UPDATE SET last_error=excluded.last_error",
+                (name, str(err)[:500]),
+            )
+
+    _META_FIELDS = ["last_synced", "row_count", "col_count", "version", "last_error", "marker", "last_full"]
+
+    def _meta(self, name):
+        with self._db_lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self._META_FIELDS)} FROM _sync_meta WHERE sheet = ?", (name,),
+            ).fetchone()
+        if not row:
+            return {"last_synced": None, "row_count": 0, "col_count": 0, "version": 0, "last_error": None,
+                    "marker": None, "last_full": None}
+        return dict(zip(self._META_FIELDS, row))
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+    def sync(self, name):
+        """Download one worksheet and store it. Concurrent callers share one fetch."""
+        # A batch that is already downloading this tab serves us too
+        if self.flight.join(lambda key: key.startswith("batch:") and name in key[6:].split(",")):
+            return
+        self.flight.do(f"sync:{name}", self._sync_one, name)
+
+    def _clear_dirty(self, names, gens):
+        # Tabs invalidated again while we were fetching stay dirty
+        for name in names:
+            if self._dirty_gen.get(name, 0) == gens.get(name, 0):
+                self._dirty.discard(name)
+                self._needs_full.discard(name)
+
+    def _fetch(self, names, deltas):
+        """One batchGet: whole tabs, delta ranges and their check columns -> ({name: rows}, {name: check rows})."""
+        sheets = {name: self.worksheets[name] for name in names}
+        ranges = dict(deltas)
+        for name in deltas:
+            sheets[name + CHECK_SUFFIX] = self.worksheets[name]
+            ranges[name + CHECK_SUFFIX] = self.delta_checks[name]
+        grids = batch_get_values(sheets, ranges)
+        return ({name: grids.get(name, []) for name in names},
+                {name: grids.get(name + CHECK_SUFFIX, []) for name in deltas})
+
+    def _delta_ranges(self, names):
+        """{name: A1 range} for the append-only tabs in `names` that can be synced by delta."""
+        now = time.time()
+        ranges = {}
+        for name in names:
+            if name not in self.append_only or name in self._needs_full:
+                continue
+            meta = self._meta(name)
+            if meta["row_count"] > 1 and meta["col_count"] and now - (meta["last_full"] or 0) < FULL_REFRESH_SECONDS:
+                last_col = rowcol_to_a1(1, meta["col_count"]).rstrip("0123456789")
+                ranges[name] = f"A{meta['row_count']}:{last_col}"  # last known row + everything below
+        return ranges
+
+    def _unchanged(self, names):
+        """Probe the version markers of `names` in one small batchGet; return the tabs that did not change."""
+        now = time.time()
+        candidates = {}
+        for name in names:
+            meta = self._meta(name)
+            if (name in self.probes and name not in self._dirty and meta["marker"] is not None
+                    and now - (meta["last_full"] or 0) < FULL_REFRESH_SECONDS):
+                candidates[name] = meta["marker"]
+        if not candidates:
+            return set()
+        spreadsheet = self.worksheets[next(iter(candidates))].spreadsheet
+        ranges = [absolute_range_name(self.worksheets[n].title, self.probes[n]) for n in candidates]
+        self.probe_stats["probes"] += 1
+        try:
+            response = spreadsheet.values_batch_get(ranges)
+        except Exception:
+            return set()  # Probe failed -- just do the full download
+        unchanged = set()
+        for (name, marker), vr in zip(candidates.items(), response.get("valueRanges", [])):
+            if _marker(vr.get("values", [])) == marker:
+                self._touch(name, now)
+                unchanged.add(name)
+        self.probe_stats["unchanged"] += len(unchanged)
+        self.probe_stats["changed"] += len(candidates) - len(unchanged)
+        return unchanged
+
+    def _sync_one(self, name):
+        if self._unchanged([name]):
+            return
+        gens = dict(self._dirty_gen)
+        fetched_at = time.time()
+        delta = self._delta_ranges([name])
+        try:
+            if delta:
+                grids, checks = self._fetch([name], delta)
+                values = grids[name]
+            else:
+                values = self.worksheets[name].get_all_values()
+        except Exception as e:
+            self._record_error(name, e)
+            raise
+        if delta:
+            if not self._apply_delta(name, values, fetched_at, checks[name]):
+                self.delta_stats["full_reloads"] += 1
+                self._needs_full.add(name)
+                return self._sync_one(name)
+        else:
+            self._store(name, values, fetched_at)
+        self._clear_dirty([name], gens)
+
+    def sync_all(self, names=None):
+        """Refresh several tabs (default: all) with a single batchGet.
+
+        Falls back to per-tab syncs if the batch request fails. Concurrent
+        callers asking for the same tabs wait for the batch already in flight.
+        """
+        names = [n for n in (names or self.worksheets) if n in self.worksheets]
+        if names:
+            self.flight.do("batch:" + ",".join(names), self._sync_batch, names)
+
+    def _sync_batch(self, names):
+        unchanged = self._unchanged(names)
+        names = [n for n in names if n not in unchanged]
+        if not names:
+            return
+        gens = dict(self._dirty_gen)
+        fetched_at = time.time()
+        deltas = self._delta_ranges(names)
+        try:
+            grids, checks = self._fetch(names, deltas)
+        except Exception:
+            for name in names:
+                try:
+                    # Not self.sync(): that would wait on this very batch
+                    self.flight.do(f"sync:{name}", self._sync_one, name)
+                except Exception:
+                    pass  # Error is recorded in _sync_meta; the next cycle retries
+            return
+        reload = []
+        for name in names:
+            if name not in deltas:
+                self._store(name, grids.get(name, []), fetched_at)
+            elif not self._apply_delta(name, grids.get(name, []), fetched_at, checks[name]):
+                reload.append(name)
+        self._clear_dirty([n for n in names if n not in reload], gens)
+        for name in reload:
+            self.delta_stats["full_reloads"] += 1
+            self._needs_full.add(name)
+            try:
+                self.flight.do(f"sync:{name}", self._sync_one, name)
+            except Exception:
+                pass  # Error is recorded in _sync_meta; the next cycle retries
+
+    def _loop(self):
+        while True:
+            try:
+                self.sync_all()
+            except Exception:
+                pass  # Keep the thread alive; readers fall back to inline syncs
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        """Start the background sync thread (idempotent)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="sheet-mirror-sync", daemon=True)
+            self._thread.start()
+        return self
+
+    def invalidate(self, *names, appended=False):
+        """Mark tabs as changed by the app so the next read re-syncs them first.
+
+        appended=True means the app only appended rows, so append-only tabs may
+        still sync by delta; any other write forces a full reload of them.
+        """
+        for name in (names or list(self.worksheets)):
+            if name in self.worksheets:
+                self._dirty_gen[name] = self._dirty_gen.get(name, 0) + 1
+                if not appended:
+                    self._needs_full.add(name)
+                self._dirty.add(name)
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def has(self, name):
+        return name in self.worksheets
+
+    def forget(self, *names):
+        """Delete everything stored for tabs that are no longer mirrored (table, sync status, edit log)."""
+        with self._db_lock, self._conn:
+            for name in names:
+                if name in self.worksheets:
+                    continue
+                self._conn.execute(f"DROP TABLE IF EXISTS {self._table(name)}")
+                self._conn.execute("DELETE FROM _sync_meta WHERE sheet = ?", (name,))
+                self._conn.execute("DELETE FROM _row_edits WHERE sheet = ?", (name,))
+
+    def policy(self, name):
+        return self.policies.get(name, DEFAULT_POLICY)
+
+    def _age(self, meta):
+        return time.time() - meta["last_synced"] if meta["last_synced"] is not None else None
+
+    def _needs_sync(self, name, meta):
+        """True when the reader has to wait: our own unsynced write, no data, or too stale to serve."""
+        if name in self._dirty or meta["last_synced"] is None:
+            return True
+        policy = self.policy(name)
+        return self._age(meta) > policy.hard_ttl + policy.max_stale
+
+    def blocking_reason(self, name):
+        """Why values(name) would wait for Google right now: None, "dirty", "empty" or "expired"."""
+        meta = self._meta(name)
+        if name in self._dirty:
+            return "dirty"
+        if meta["last_synced"] is None:
+            return "empty"
+        return "expired" if self._needs_sync(name, meta) else None
+
+    def errors(self):
+        """{name: last error} for tabs whose most recent sync failed (the local copy may be outdated)."""
+        return {name: meta["last_error"] for name, meta in self.status().items() if meta["last_error"]}
+
+    def _background_sync(self, name):
+        try:
+            self.sync(name)
+        except Exception:
+            pass  # Error is recorded in _sync_meta; readers keep getting the old data
+        finally:
+            with self._revalidate_lock:
+                self._revalidating.discard(name)
+
+    def revalidate(self, name):
+        """Refresh a tab in a background thread (at most one per tab at a time)."""
+        with self._revalidate_lock:
+            if name in self._revalidating:
+                return
+            self._revalidating.add(name)
+        threading.Thread(target=self._background_sync, args=(name,), name=f"sheet-mirror-swr-{name}", daemon=True).start()
+
+    def freshness(self, name):
+        """"fresh", "revalidating" (past soft TTL, refresh running) or "expired" (past hard TTL, still served)."""
+        meta = self._meta(name)
+        age = self._age(meta)
+        if age is None:
+            return "expired"
+        policy = self.policy(name)
+        if age > policy.hard_ttl:
+            return "expired"
+        if age > policy.soft_ttl or name in self._revalidating:
+            return "revalidating"
+        return "fresh"
+
+    def values(self, name):
+        """Return the worksheet as a list of rows (same shape as get_all_values)."""
+        meta = self._meta(name)
+        if not self._needs_sync(name, meta) and self._age(meta) > self.policy(name).soft_ttl:
+            self.revalidate(name)  # Serve what we have now, refresh behind the reader
+        if self._needs_sync(name, meta):
+            # Cold start / "Refresh All": fetch every pending tab in one batch, not one call each
+            pending = [n for n in self.worksheets if self._needs_sync(n, self._meta(n))]
+            try:
+                if len(pending) > 1:
+                    self.sync_all(pending)
+                    meta = self._meta(name)
+                    if meta["last_synced"] is None:
+                        raise RuntimeError(meta["last_error"] or f"{name} could not be synced")
+                else:
+                    self.sync(name)
+            except Exception:
+                if meta["last_synced"] is None:
+                    raise  # Nothing local to fall back on
+        table = self._table(name)
+        with self._db_lock:
+            try:
+                rows = self._conn.execute(f"SELECT * FROM {table} ORDER BY _row").fetchall()
+            except sqlite3.OperationalError:
+                return []
+            col_count = self._conn.execute("SELECT col_count FROM _sync_meta WHERE sheet = ?", (name,)).fetchone()
+        width = col_count[0] if col_count and col_count[0] else 0
+        return [[c if c is not None else "" for c in r[2:2 + width]] for r in rows]
+
+    def version(self, name):
+        """Counter bumped whenever a sync changed the tab's data."""
+        return self._meta(name)["version"]
+
+    def edits_since(self, name, version):
+        """Lowest row edited or deleted by a sync after `version` (None if only rows were appended since)."""
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT MIN(first_row) FROM _row_edits WHERE sheet = ? AND version > ?", (name, version),
+            ).fetchone()
+        return row[0] if row else None
+
+    def last_synced(self, name):
+        """Epoch seconds of the last successful sync of a tab (None if never)."""
+        return self._meta(name)["last_synced"]
+
+    def status(self):
+        """Per-tab sync summary for the dashboard."""
+        return {name: dict(self._meta(name), freshness=self.freshness(name)) for name in self.worksheets}
@@ -0,0 +1,326 @@
+"""
+MANGLAM TRADELINK - Batched Google Sheets Writes
+=================================================
+Every update_cell() is its own HTTP request and uses one unit of the Sheets
+write quota. WriteBatch collects the cell/range writes of one user action on
+one worksheet and sends them as a single values batch_update.
+
+Usage from app_cloud.py:
+
+    with WriteBatch(tenants_sheet) as wb:
+        wb.update_cell(row, 3, e_loc)
+        wb.update_cell(row, 4, float(e_rent))
+    # -> one request; raises SheetWriteError (with per-write results) if Google rejects
+    #    writes as invalid, or the APIError / ConnectionError itself on quota or outage
+
+RowLocator maps a primary key (Order ID, Tenant ID) to its physical sheet row
+so write paths can skip the worksheet.find() round trip, which downloads the
+whole tab.
+
+move_rows() copies rows to another tab and deletes them from the source in a
+single spreadsheets.batchUpdate, which Google applies all-or-nothing.
+"""
+
+import re
+import threading
+import time
+from collections import namedtuple
+
+from gspread.exceptions import APIError
+from gspread.utils import rowcol_to_a1
+
+WriteResult = namedtuple("WriteResult", ["label", "range", "ok", "error"])
+
+
+class SheetWriteError(Exception):
+    """Raised when one or more queued writes could not be committed."""
+
+    def __init__(self, results):
+        self.results = results
+        failed = [r for r in results if not r.ok]
+        detail = "; ".join(f"{r.label or r.range}: {r.error}" for r in failed)
+        super().__init__(f"{len(failed)} of {len(results)} sheet writes failed ({detail})")
+
+
+class WriteBatch:
+    """Queue of cell/range writes for one worksheet, committed in order as one request."""
+
+    def __init__(self, worksheet, value_input_option="USER_ENTERED"):
+        self.worksheet = worksheet
+        self.value_input_option = value_input_option
+        self._writes = []  # [(range, values, label)] in commit order
+
+    def __len__(self):
+        return len(self._writes)
+
+    def update_cell(self, row, col, value, label=None):
+        """Queue one cell. A later write to the same cell replaces the earlier one."""
+        if int(row) < 1 or int(col) < 1:
+            raise ValueError(f"Invalid cell position ({row}, {col})")
+        self.update_range(rowcol_to_a1(int(row), int(col)), [[value]], label)
+
+    def update_range(self, range_name, values, label=None):
+        """Queue a rectangular range write, e.g. update_range("C5:D5", [["x", 1]])."""
+        # Coalesce: drop an earlier write to the exact same range, keep the newest at the end
+        self._writes = [w for w in self._writes if w[0] != range_name]
+        self._writes.append((range_name, values, label))
+
+    def _send(self, writes):
+        self.worksheet.batch_update(
+            [{"range": rng, "values": values} for rng, values, _ in writes],
+            value_input_option=self.value_input_option,
+        )
+
+    def flush(self):
+        """Commit all queued writes. Returns one WriteResult per write, in order.
+
+        If Google rejects the batch as invalid (400) the writes are replayed one by one.
+        Any other failure (quota, 5xx, network) is re-raised with the writes put back in
+        the queue -- replaying them would only spend N more requests on the same outage.
+        """
+        writes, self._writes = self._writes, []
+        if not writes:
+            return []
+        try:
+            self._send(writes)
+            return [WriteResult(label, rng, True, None) for rng, _, label in writes]
+        except APIError as e:
+            if e.code != 400:
+                self._writes = writes + self._writes
+                raise
+        except Exception:
+            self._writes = writes + self._writes
+            raise
+
+        # One bad range (e.g. a row deleted meanwhile) fails the whole batch -- replay one
+        # by one (still in order) so every write gets its own status and valid writes are not lost.
+        results = []
+        for write in writes:
+            rng, _, label = write
+            try:
+                self._send([write])
+                results.append(WriteResult(label, rng, True, None))
+            except Exception as e:
+                results.append(WriteResult(label, rng, False, e))
+        return results
+
+    def commit(self):
+        """flush(), raising SheetWriteError if anything failed."""
+        results = self.flush()
+        if not all(r.ok for r in results):
+            raise SheetWriteError(results)
+        return results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self._writes = []  # The action failed before commit -- write nothing
+        return False
+
+
+def appended_row(response):
+    """Physical row number written by append_row(), parsed from the API response."""
+    try:
+        match = re.search(r"![A-Z]+(\d+)", response["updates"]["updatedRange"])
+        return int(match.group(1)) if match else None
+    except Exception:
+        return None
+
+
+class RowLocator:
+    """Primary key -> physical sheet row index that survives our own deletes and appends.
+
+    The index is loaded from a cached frame carrying a `_Row` column. Callers
+    pass the `_Row` of the frame row the user acted on, since keys like Order ID
+    are not always unique; without one the index row is used.
+
+    That row is written without a round trip while the sheet mirror vouches for
+    it: the tab has no unsynced write of ours, its data is neither expired nor
+    failing to sync, and no sync since the frame's version recorded an edit or
+    deletion at or above the row (SheetMirror.edits_since). Otherwise -- or
+    without a mirror -- the row is confirmed with a one-cell probe of the key
+    column first. A mismatch or a missing key falls back to a search of the key
+    column (refusing to guess between duplicates) and repairs the index.
+    """
+
+    def __init__(self, worksheet, key_col=1, mirror=None, sheet_name=None):
+        self.worksheet = worksheet
+        self.key_col = key_col
+        self.mirror = mirror
+        self.sheet_name = sheet_name or worksheet.title
+        self._rows = {}
+        self._duplicates = set()  # keys on several rows -- the index can't tell which one is meant
+        self._stamp = 0.0  # fetched_at of the frame the index was built from
+        self._version = None  # its mirror data version
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "trusted": 0, "probes": 0, "fallbacks": 0}
+
+    def load(self, frame, key_column):
+        """(Re)build the index from a frame with a `_Row` column, if it is newer."""
+        stamp = frame.attrs.get("fetched_at", time.time())
+        if stamp <= self._stamp or "_Row" not in frame.columns or key_column not in frame.columns:
+            return
+        keys = frame[key_column].astype(str).str.strip()
+        rows = {k: int(r) for k, r in zip(keys, frame["_Row"]) if k and r == r}
+        duplicates = set(keys[keys.duplicated() & keys.ne("")])
+        with self._lock:
+            self._rows = rows
+            self._duplicates = duplicates
+            self._stamp = stamp
+            self._version = frame.attrs.get("version")
+
+    def _trusted(self, row):
+        """True if the mirror shows nothing at or above `row` has moved since the indexed frame."""
+        if self.mirror is None or self._version is None:
+            return False
+        name = self.sheet_name
+        if self.mirror.blocking_reason(name) is not None or name in self.mirror.errors():
+            return False  # Our own write isn't synced yet, or the data is too old to vouch for anything
+        if self._version > self.mirror.version(name):
+            return False  # The mirror was rebuilt since
+        first_edit = self.mirror.edits_since(name, self._version)
+        return first_edit is None or row < first_edit
+
+    @staticmethod
+    def _hint(row):
+        return int(row) if row is not None and row == row and int(row) >= 2 else None
+
+    def _candidate(self, key, row):
+        """(row to check, trusted?) for `key` -- the caller's `_Row` if it has one, else the index."""
+        hint = self._hint(row)
+        with self._lock:
+            if hint is None and key in self._duplicates:
+                return None, False
+            candidate = hint if hint is not None else self._rows.get(key)
+        return candidate, candidate is not None and self._trusted(candidate)
+
+    def _probe(self, row, key):
+        self.stats["probes"] += 1
+        return str(self.worksheet.cell(row, self.key_col).value or "").strip() == key
+
+    def locate(self, key, row=None):
+        """Return the sheet row holding `key` (probed first unless the mirror vouches for it). Raises
+        LookupError if it no longer exists -- or, for a key on several rows, if the caller's row can't be confirmed.
+
+        row: the `_Row` the caller's frame had for this record (ignored if missing / not a sheet row).
+        """
+        key = str(key).strip()
+        candidate, trusted = self._candidate(key, row)
+        if trusted:
+            self.stats["trusted"] += 1
+            return candidate
+        if candidate is not None and self._probe(candidate, key):
+            self.stats["hits"] += 1
+            return candidate
+
+        # Rows moved or the index never saw this key -- re-resolve from the sheet
+        self.stats["fallbacks"] += 1
+        cells = self.worksheet.findall(key, in_column=self.key_col)
+        with self._lock:
+            if not cells:
+                self._rows.pop(key, None)
+                raise LookupError(f"{key} not found in {self.worksheet.title}")
+            if len(cells) > 1:
+                raise LookupError(f"{key} is on {len(cells)} rows of {self.worksheet.title} -- refresh and try again")
+            self._rows[key] = cells[0].row
+        return cells[0].row
+
+    def locate_many(self, keys_rows):
+        """locate() for several records: [(key, row), ...] -> their sheet rows, in the same order.
+
+        Rows the mirror can't vouch for are all checked against ONE read of the key column
+        instead of a probe each, and re-resolved from it. Raises LookupError (before anything
+        is written) if any key is missing, or on several rows and its caller's row doesn't match.
+        """
+        keys = [str(key).strip() for key, _ in keys_rows]
+        found = [self._candidate(key, row) for key, (_, row) in zip(keys, keys_rows)]
+        self.stats["trusted"] += sum(trusted for _, trusted in found)
+        if all(trusted for _, trusted in found):
+            return [candidate for candidate, _ in found]
+
+        self.stats["probes"] += 1
+        column = [str(v or "").strip() for v in self.worksheet.col_values(self.key_col)]
+        where = {}
+        for i, value in enumerate(column[1:], start=2):
+            where.setdefault(value, []).append(i)
+        rows = []
+        for key, (_, row), (candidate, trusted) in zip(keys, keys_rows, found):
+            unambiguous = self._hint(row) is not None or len(where.get(key, [])) == 1  # An index row can be the wrong twin
+            if trusted or (candidate is not None and candidate <= len(column) and column[candidate - 1] == key and unambiguous):
+                self.stats["hits"] += not trusted
+                rows.append(candidate)
+                continue
+            self.stats["fallbacks"] += 1
+            matches = where.get(key, [])
+            if len(matches) != 1:
+                raise LookupError(f"{key} not found in {self.worksheet.title}" if not matches else
+                                  f"{key} is on {len(matches)} rows of {self.worksheet.title} -- refresh and try again")
+            rows.append(matches[0])
+        with self._lock:
+            self._rows.update((key, row) for key, row in zip(keys, rows) if key not in self._duplicates)
+        return rows
+
+    def on_delete(self, start, count=1):
+        """Keep the index correct after rows start..start+count-1 were deleted."""
+        end = start + count
+        with self._lock:
+            self._rows = {k: (r - count if r >= end else r) for k, r in self._rows.items() if not (start <= r < end)}
+
+    def on_append(self, key, row):
+        if row:
+            key = str(key).strip()
+            with self._lock:
+                if self._rows.get(key, int(row)) != int(row):
+                    self._duplicates.add(key)
+                self._rows[key] = int(row)
+
+
+def contiguous_ranges(rows):
+    """Group row numbers into (start, end) runs, bottom-most first.
+
+    >>> contiguous_ranges([2, 3, 4, 7, 9, 10])
+    [(9, 10), (7, 7), (2, 4)]
+
+    Deleting in this order never shifts a range that is still to be deleted.
+    """
+    ranges = []
+    for r in sorted(set(int(x) for x in rows)):
+        if ranges and r == ranges[-1][1] + 1:
+            ranges[-1][1] = r
+        else:
+            ranges.append([r, r])
+    return [tuple(x) for x in reversed(ranges)]
+
+
+def _cell_data(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return {"userEnteredValue": {"stringValue": "" if value is None else str(value)}}
+    return {"userEnteredValue": {"numberValue": value}}
+
+
+def move_rows(src, dst, rows, values):
+    """Append `values` to `dst` and delete `rows` from `src` in ONE atomic batchUpdate.
+
+    rows   -- physical row numbers in `src` (1 = header)
+    values -- row values to append to `dst`; may be empty (delete only)
+    Returns the deleted (start, end) ranges, bottom-most first.
+    """
+    ranges = contiguous_ranges(rows)
+    requests = []
+    if values:
+        requests.append({"appendCells": {
+            "sheetId": dst.id,
+            "rows": [{"values": [_cell_data(v) for v in row]} for row in values],
+            "fields": "userEnteredValue",
+        }})
+    for start, end in ranges:
+        requests.append({"deleteDimension": {"range": {
+            "sheetId": src.id, "dimension": "ROWS", "startIndex": start - 1, "endIndex": end,
+        }}})
+    if requests:
+        src.spreadsheet.batch_update({"requests": requests})
+    return ranges
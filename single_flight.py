@@ -0,0 +1,77 @@
+"""
+MANGLAM TRADELINK - Single-Flight Request Coalescing
+=====================================================
+When several sessions miss the same cache at the same moment (e.g. everyone
+opens the Order Desk right after a TTL expiry), only the first caller runs
+the Google Sheets fetch; the others wait for it and share its result (or its
+exception) instead of sending duplicate requests.
+
+One SingleFlight instance is shared by the whole process (st.cache_resource
+in app_cloud.py). `stats()` reports, per key, how many fetches really ran and
+how many callers were coalesced onto an in-flight one -- each coalesced call
+is one read request saved.
+"""
+
+import threading
+from collections import defaultdict
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one fetch per key at a time; concurrent callers share its outcome."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call in flight
+        self._stats = defaultdict(lambda: {"executed": 0, "coalesced": 0})
+
+    def do(self, key, fn, *args, **kwargs):
+        """Return fn(*args, **kwargs), or the result of the identical call already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats[key]["executed"] += 1
+            else:
+                self._stats[key]["coalesced"] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def join(self, match):
+        """Wait for every in-flight call whose key satisfies match(key). True if any was joined."""
+        with self._lock:
+            calls = [(k, c) for k, c in self._calls.items() if match(k)]
+            for k, _ in calls:
+                self._stats[k]["coalesced"] += 1
+        for _, call in calls:
+            call.done.wait()
+        return bool(calls)
+
+    def in_flight(self):
+        with self._lock:
+            return list(self._calls)
+
+    def stats(self):
+        """{key: {"executed": n, "coalesced": m}} -- `coalesced` = requests saved."""
+        with self._lock:
+            return {k: dict(v) for k, v in self._stats.items()}
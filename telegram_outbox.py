@@ -0,0 +1,185 @@
+"""
+MANGLAM TRADELINK - Telegram Notification Outbox
+=================================================
+Order alerts (new order, payment approved, order completed, the morning
+pending report) used to call the Telegram sendMessage API inline, in the
+Streamlit script thread -- placing an order had no timeout at all, so a slow
+Telegram endpoint froze the Order Desk for whoever clicked.
+
+Now the page only enqueue()s the message and shows it as "queued"; one
+background thread sends it:
+
+  * The queue lives in memory and is rewritten to OUTBOX_PATH (JSON) on every
+    change, so messages still waiting survive a restart of the app.
+  * One requests.Session (keep-alive) is reused for every send.
+  * Messages to the same chat go out in order, at most one per
+    CHAT_MIN_INTERVAL seconds (Telegram allows ~1 message/second per chat).
+  * Network errors, 5xx and 429 are retried with exponential backoff (a 429's
+    retry_after is honoured); other 4xx replies and messages that still fail
+    after MAX_ATTEMPTS are dropped and kept in recent() for the Admin panel.
+
+Import TelegramOutbox from app_cloud.py and keep one instance per process
+(st.cache_resource).
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+
+import requests
+
+# --- OUTBOX SETTINGS ---
+OUTBOX_PATH       = "telegram_outbox.json"
+API_URL           = "https://api.telegram.org/bot{token}/sendMessage"
+SEND_TIMEOUT      = 10     # seconds per HTTP attempt
+MAX_ATTEMPTS      = 8
+BACKOFF_SECONDS   = 2      # first retry delay, doubled per failed attempt...
+BACKOFF_MAX       = 300    # ...up to this
+CHAT_MIN_INTERVAL = 1.0    # seconds between two messages to the same chat
+RECENT_SIZE       = 50     # sent / failed messages kept for status lookups
+
+
+class TelegramOutbox:
+    """File-backed message queue + one daemon thread that delivers it."""
+
+    def __init__(self, token, path=OUTBOX_PATH, session=None):
+        self.token = token
+        self.path = path
+        self.session = session or requests.Session()
+        self.stats = {"sent": 0, "retried": 0, "failed": 0}
+        self._cond = threading.Condition()
+        self._queue = deque(self._load())
+        self._last_sent = {}   # chat_id -> time.monotonic() of the last send
+        self._recent = deque(maxlen=RECENT_SIZE)
+        self._thread = None
+
+    # --- persistence ---
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return [m for m in json.load(f) if m.get("status") == "queued"]
+        except (OSError, ValueError):
+            return []
+
+    def _save(self):
+        """Rewrite the pending queue atomically (caller holds the lock)."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".outbox_", suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(list(self._queue), f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # still delivered from memory; only restart-safety is lost
+
+    # --- producer side (script threads) ---
+    def enqueue(self, chat_id, text):
+        """Queue `text` for `chat_id`; returns the message id right away."""
+        now = time.time()
+        msg = {"id": uuid.uuid4().hex[:12], "chat_id": str(chat_id), "text": text, "status": "queued",
+               "attempts": 0, "queued_at": now, "next_at": now, "error": None}
+        with self._cond:
+            self._queue.append(msg)
+            self._save()
+            self._cond.notify()
+        self.start()
+        return msg["id"]
+
+    def status(self, msg_id):
+        """"queued" / "sent" / "failed" (None if unknown, e.g. pushed out of recent())."""
+        with self._cond:
+            for msg in list(self._queue) + list(self._recent):
+                if msg["id"] == msg_id:
+                    return msg["status"]
+        return None
+
+    def pending(self):
+        with self._cond:
+            return len(self._queue)
+
+    def recent(self):
+        """Sent / failed messages, newest first."""
+        with self._cond:
+            return [dict(m) for m in reversed(self._recent)]
+
+    # --- worker ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="telegram-outbox", daemon=True)
+            self._thread.start()
+        return self
+
+    def _next_ready(self):
+        """(message, 0) when one can be sent now, else (None, seconds to wait). Caller holds the lock."""
+        best, best_at, seen_chats = None, None, set()
+        for msg in self._queue:
+            if msg["chat_id"] in seen_chats:
+                continue  # per-chat FIFO: only the oldest message of each chat is a candidate
+            seen_chats.add(msg["chat_id"])
+            last = self._last_sent.get(msg["chat_id"])
+            ready_at = max(msg["next_at"], time.time() + (last + CHAT_MIN_INTERVAL - time.monotonic()) if last else 0)
+            if best_at is None or ready_at < best_at:
+                best, best_at = msg, ready_at
+        if best is None:
+            return None, None
+        wait = best_at - time.time()
+        return (best, 0) if wait <= 0 else (None, wait)
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                msg, wait = self._next_ready()
+                if msg is None:
+                    self._cond.wait(timeout=wait)
+                    continue
+            self._deliver(msg)
+
+    def _deliver(self, msg):
+        retry_after, error = None, None
+        try:
+            res = self.session.post(API_URL.format(token=self.token), timeout=SEND_TIMEOUT,
+                                    data={"chat_id": msg["chat_id"], "text": msg["text"]})
+            if res.status_code == 200:
+                return self._finish(msg, "sent")
+            error = f"HTTP {res.status_code}: {res.text[:200]}"
+            if res.status_code == 429:
+                try:
+                    retry_after = float(res.json().get("parameters", {}).get("retry_after", 0)) or None
+                except ValueError:
+                    pass
+            elif 400 <= res.status_code < 500:
+                return self._finish(msg, "failed", error)  # bad token / chat / text: retrying won't help
+        except requests.RequestException as e:
+            error = str(e)
+        self._retry(msg, error, retry_after)
+
+    def _retry(self, msg, error, retry_after=None):
+        with self._cond:
+            msg["attempts"] += 1
+            msg["error"] = error
+            if msg["attempts"] >= MAX_ATTEMPTS:
+                self._finish(msg, "failed", error)
+                return
+            delay = retry_after or min(BACKOFF_MAX, BACKOFF_SECONDS * 2 ** (msg["attempts"] - 1))
+            msg["next_at"] = time.time() + delay
+            self.stats["retried"] += 1
+            self._save()
+
+    def _finish(self, msg, status, error=None):
+        with self._cond:
+            if status == "sent":
+                self._last_sent[msg["chat_id"]] = time.monotonic()
+            msg["status"] = status
+            msg["error"] = error
+            msg["done_at"] = time.time()
+            self.stats[status] += 1
+            try:
+                self._queue.remove(msg)
+            except ValueError:
+                pass
+            self._recent.append(msg)
+            self._save()
@@ -0,0 +1,511 @@
+"""
+MANGLAM TRADELINK - UI Translations
+====================================
+English / Hindi strings for the main app, keyed by the short names used as
+t["..."] in app_cloud.py and the page scripts in app_pages/. Kept in a module
+so the dictionary is built once per process instead of on every rerun.
+(The small login-page dictionary stays in app_cloud.py.)
+"""
+
+LANG = {
+    "English": {
+        # --- Navigation & Header ---
+        "brand": "🏢 NYC Brand",
+        "inv": "📦 Inventory Dashboard",
+        "ord": "📝 Order Desk",
+        "aud": "🔍 Stock Audit",
+        "ai": "🤖 AI Restock Advisor",
+        "rent": "🏢 Rent Tracker",
+        "rep": "📊 Audit Report",
+        "admin": "⚙️ Admin Dashboard",
+        "menu": "🧭 Menu",
+        "refresh": "🔄 Refresh",
+        "logout": "🚪 Logout",
+
+        # --- Login Page ---
+        "portal_title": "🏢 Manglam Tradelink Portal",
+        "secure_login": "Secure Login",
+        "user_id": "User ID",
+        "password": "Password",
+        "login_btn": "Login",
+        "welcome_back": "Welcome back, {name}! Securing login...",
+        "invalid_creds": "❌ Invalid User ID or Password",
+        "db_error_empty": "Database Error: The 'Users' sheet is empty.",
+        "missing_headers": "Missing User ID or Password headers.",
+        "sheets_error": "Failed to connect to Google Sheets: {err}",
+
+        # --- Inventory Dashboard ---
+        "search_item": "🔍 Search Item...",
+        "filter_group": "📂 Filter Group:",
+        "all_groups": "All Groups",
+        "volume_filtered": "📦 Volume (Filtered)",
+        "items_found": "📋 Items Found",
+        "bar_chart": "📊 Bar Chart",
+        "stock_list": "📋 Stock List",
+
+        # --- Order Desk ---
+        "place_order": "➕ Place New Order",
+        "pending_orders": "⏳ Pending Orders",
+        "completed_orders": "✅ Completed Orders",
+        "create_order": "Create a New Order",
+        "customer_details": "👤 **Customer Details**",
+        "search_customer": "Search Existing Customer:",
+        "search_customer_ph": "Start typing to search...",
+        "new_customer_name": "Or manually type a New Customer Name:",
+        "new_customer_ph": "e.g. Sharma Traders",
+        "order_notes_label": "📝 Order Notes (Optional)",
+        "order_notes_ph": "e.g. Dispatch via VRL Logistics, Urgent...",
+        "select_items_cart": "🛒 **Select Items to Add to Cart**",
+        "search_choose_items": "Search and choose items...",
+        "stock_label": "📦 Stock:",
+        "order_qty": "Order Qty",
+        "alt_qty": "Alt Qty",
+        "alt_unit": "Alt Unit",
+        "submit_order": "🚀 Submit Order",
+        "fill_all_details": "Please fill all details.",
+        "order_placed_tg": "✅ Order {oid} placed! Warehouse alert queued 📨",
+        "order_placed_db": "✅ Order {oid} placed successfully in Database!",
+        "tg_failed": "⚠️ Telegram failed: {err}",
+        "tg_keys_missing": "⚠️ Telegram keys are missing from Streamlit Secrets.",
+        "tg_system_error": "⚠️ Telegram System Error: {err}",
+        "tg_queued": "Telegram alert queued",
+        "error_saving_order": "Error saving order: {err}",
+        "mark_complete": "✅ Mark Complete",
+        "share_pdf": "📄 Share PDF",
+        "modify_delete": "✏️ Modify or Delete Order",
+        "customer_name_label": "Customer Name",
+        "modify_items": "🛒 **Modify Items & Quantities**",
+        "add_remove_items": "Add or Remove Items (Exact Names):",
+        "qty_details_for": "Quantity/Details for [{item}]",
+        "notes_label": "Notes",
+        "save_changes": "💾 Save Changes",
+        "delete_order": "❌ Delete Order",
+        "order_updated": "Order Updated!",
+        "failed_update": "Failed to update: {err}",
+        "order_deleted": "Order Deleted!",
+        "failed_delete": "Failed to delete: {err}",
+        "approve_payment": "✅ Payment Received / Allow Delivery",
+        "approve_success": "Order marked as pending for delivery!",
+        "order_completed": "Order Completed!",
+        "adv_filters": "🔎 Advanced Filters & Search",
+        "search_name_id": "Search (Name, ID, Notes)",
+        "search_eg": "e.g. Sharma...",
+        "date_range": "Date Range",
+        "completed_by": "Completed By",
+        "all_employees": "All Employees",
+        "contains_fabric": "Contains Fabric/Item",
+        "all_items_filter": "All Items",
+        "showing_completed": "Showing <b>{count}</b> completed orders matching your criteria.",
+        "per_page": "Orders per page",
+        "page_no": "Page",
+        "page_range": "Showing {start}–{end} of {total} · page {page} of {pages}",
+        "download_receipt": "📄 Download Receipt",
+        "delete_record": "🗑️ Delete Record",
+        "record_deleted": "Record Deleted permanently!",
+
+        # --- Stock Audit ---
+        "view_system_qty": "👀 View Current System Quantities (Live Tally Stock)",
+        "stock_syncing": "⚠️ Live stock data is currently syncing or missing.",
+        "audit_db_missing": "Audit Logs database not found. Please ask Admin to create the 'Audit Logs' sheet.",
+        "audit_progress": "📊 Audit Progress",
+        "items_audited": "{done} / {total} Items Audited",
+        "count_batches": "Count scattered batches in the warehouse. Your entries will be summed automatically.",
+        "search_select_item": "Search & Select Item to Count:",
+        "type_item_name": "Type item name...",
+        "live_item_progress": "### 📊 Live Item Progress",
+        "system_expected": "System Expected",
+        "found_so_far": "Found So Far",
+        "variance": "Variance",
+        "found_so_far_yours": "📦 Found So Far (Your Counts)",
+        "log_batch": "➕ Log a Found Batch",
+        "location_rack": "Location / Rack Details (Optional)",
+        "location_rack_ph": "e.g., Aisle 3, Top Shelf",
+        "qty_found_here": "Quantity Found in this specific location",
+        "save_batch": "💾 Save Batch",
+        "qty_negative": "Quantity cannot be negative.",
+        "logged_success": "Successfully logged {qty} for {item}!",
+        "failed_log_audit": "Failed to log audit: {err}",
+        "recent_entries": "**Recent entries for this item:**",
+        "remaining_items": "📋 Remaining Items to Count",
+        "all_audited": "🎉 Incredible job! All inventory items have been physically audited.",
+
+        # --- AI Restock Advisor (was also Audit Report page routing) ---
+        "compare_counts": "Compare physical counts submitted by employees against live Tally stock.",
+        "audit_db_not_found": "Audit Logs database not found.",
+        "no_active_audits": "No active audits running.",
+        "archive_audit": "Archive Current Audit",
+        "archive_warning": "Archiving the audit board resets all items back to 'Pending' for the next full warehouse count.",
+        "archive_btn": "Archive & Reset Audit Board",
+        "archive_success": "Audit Archived Successfully! The board is now clear.",
+        "failed_archive": "Failed to archive: {err}",
+        "no_audit_logs": "No audit logs found.",
+
+        # --- AI Restock Advisor (actual page) ---
+        "supply_chain_title": "🤖 Supply Chain Intelligence",
+        "ai_card_title": "🧠 Gemini AI Predictive Analysis",
+        "ai_card_desc": "Click below to have Gemini analyze your live inventory against the <b>last 15 days of outward sales</b> and your lead times to generate a highly prioritized reordering report.",
+        "ai_key_missing": "Gemini API Key missing or invalid in Secrets.",
+        "generate_report": "✨ Generate Smart Restock Report",
+        "ai_spinner": "Gemini is analyzing burn rates, lead times, and current stock...",
+        "restock_report_title": "### 📊 Predictive Restock Report",
+        "ai_failed": "AI Generation Failed: {err}",
+
+        # --- Admin Dashboard ---
+        "user_mgmt": "⚙️ User Management",
+        "full_name": "Full Name",
+        "create_user_btn": "Create User",
+        "user_created": "User created!",
+        "role_label": "Role",
+
+        # --- Rent Tracker ---
+        "rent_db_error": "⚠️ Database Error: Sheets not found in Google Sheets.",
+        "tab_balances": "📊 Balances & Dashboard",
+        "tab_collect": "💸 Collect Payment",
+        "tab_bills": "⚡ Log Bills",
+        "tab_history": "📜 History",
+        "tab_manage": "⚙️ Manage Tenants",
+        "action_required": "🚨 **ACTION REQUIRED TODAY:** Generate Monthly Bills for: **{names}**",
+        "active_tenants": "🟢 Active Tenants",
+        "no_active_tenants": "No active tenants right now.",
+        "due_label": "DUE: ₹{amt}",
+        "advance_label": "ADVANCE: ₹{amt}",
+        "cleared_label": "CLEARED",
+        "pending_dues_label": "PENDING DUES: ₹{amt}",
+        "refund_due_label": "REFUND DUE: ₹{amt}",
+        "settled_label": "SETTLED",
+        "first_of_month": "1st of Month",
+        "date_of_month": "Date {day} of Month",
+        "view_vacated": "🚪 View Vacated Tenants",
+        "no_tenants_found": "No tenants found. Add one in the 'Manage Tenants' tab.",
+        "record_payment": "Record a Received Payment",
+        "select_tenant": "Select Tenant",
+        "payment_amount": "Payment Amount Received (₹)",
+        "payment_notes": "Notes (e.g. Cash, UPI Reference, Final Settlement)",
+        "save_payment": "💾 Save Payment",
+        "payment_recorded": "Payment of ₹{amt} recorded for {tenant}!",
+        "generate_charges": "Generate Monthly Charges",
+        "select_tenant_bill": "Select Tenant to Bill",
+        "rent_charge": "##### 🏠 Rent Charge",
+        "apply_base_rent": "Apply Base Rent (₹{amt})",
+        "elec_charge": "##### ⚡ Electricity Charge",
+        "elec_covered": "Electricity is covered by the Landlord/Company.",
+        "enter_meter_bill": "💡 Enter the exact meter bill amount you paid for them.",
+        "lump_sum_elec": "Lump Sum Electricity Bill (₹)",
+        "passthrough_bill": "Pass-through Bill to Tenant Ledger",
+        "last_meter": "Last Recorded Meter: **{val}**",
+        "current_meter": "Enter Current Meter Reading",
+        "calc_usage": "**Calculated Usage:** {units} units (Rate: ₹{rate})",
+        "apply_var_elec": "Apply Variable Electricity",
+        "no_elec_tracking": "No electricity tracking configured.",
+        "billing_month": "Billing Month / Notes (e.g., 'March 2026 Rent')",
+        "post_charges": "📝 Post Charges to Ledger",
+        "charges_posted": "Charges successfully posted to the tenant's ledger!",
+        "bill_mode_single": "👤 Single Tenant",
+        "bill_mode_run": "🗓️ Monthly Billing Run",
+        "bill_run_all": "Include all active tenants (not only those due today)",
+        "bill_run_none_due": "No tenant's billing day is today.",
+        "bill_run_info": "Tenants due on {date}: untick anyone to skip, enter current meter readings / lump-sum bills, then post everything at once.",
+        "bill_run_already": "⚠️ Rent already charged today (unticked): {names}",
+        "col_post": "Post",
+        "col_tenant": "Tenant",
+        "col_rent": "Rent",
+        "col_elec": "Electricity",
+        "col_prev_meter": "Previous Meter",
+        "col_cur_meter": "Current Meter",
+        "col_lump": "Lump-Sum Bill",
+        "bill_run_meter_low": "Current meter is below the previous reading for: {names}",
+        "bill_run_tenants": "Tenants",
+        "bill_run_rent": "Rent",
+        "bill_run_elec": "Electricity",
+        "bill_run_post": "🚀 Post {n} Charges",
+        "bill_run_posted": "Posted {n} charges for {tenants} tenants!",
+        "bill_run_meter_failed": "Charges posted, but the new meter readings could not be saved: {err}",
+        "error_posting": "Error posting charges: {err}",
+        "no_active_to_bill": "No active tenants to bill.",
+        "ledger_history": "Ledger History",
+        "view_history_for": "View History For:",
+        "all_tenants_hist": "All Tenants",
+        "no_tx_history": "No transaction history available yet.",
+        "add_tenant": "➕ Add New Tenant",
+        "tenant_name": "Tenant/Company Name",
+        "location_unit": "Location / Unit Number",
+        "monthly_rent": "Monthly Base Rent (₹)",
+        "security_deposit": "Security Deposit Received (₹)",
+        "elec_config": "⚡ **Electricity Configuration**",
+        "elec_billing_type": "Electricity Billing Type",
+        "rate_per_unit": "Rate Per Unit (₹) - Only if Variable",
+        "elec_paid_by": "Electricity Paid By",
+        "initial_meter": "Initial Meter Reading (Base Units)",
+        "billing_cycle": "📅 **Billing Cycle & Move-In**",
+        "date_keys_given": "Date Keys Given (Billing Start)",
+        "billing_logic": "Billing Logic",
+        "pro_rata_option": "Pro-Rata (Bill on 1st of every month)",
+        "fixed_cycle_option": "Fixed Cycle (Bill on Anniversary Date)",
+        "create_tenant": "Create Tenant Profile",
+        "name_required": "Name is required.",
+        "tenant_added_prorata": "Tenant added! First pro-rata rent of ₹{amt} automatically charged.",
+        "tenant_added_fixed": "Tenant added! Billing set to exactly the {day} of every month.",
+        "edit_vacate": "### ⚙️ Edit / Vacate Existing Tenants",
+        "modify_details": "**Modify Details or Process Move-Out**",
+        "location_label": "Location",
+        "monthly_rent_edit": "Monthly Rent (Increase/Decrease)",
+        "elec_type": "Elec Type",
+        "per_unit_rate": "Per Unit Rate (If Variable)",
+        "security_held": "Security Deposit Held",
+        "pro_rata_q": "Pro Rata Billing?",
+        "tenant_status": "Tenant Status",
+        "save_all": "💾 Save All Changes",
+        "tenant_updated": "Tenant profile for {name} updated!",
+        "error_updating": "Error updating tenant: {err}",
+    },
+    "Hindi": {
+        # --- नेविगेशन और हेडर ---
+        "brand": "🏢 NYC ब्रांड",
+        "inv": "📦 स्टॉक डैशबोर्ड",
+        "ord": "📝 ऑर्डर डेस्क",
+        "aud": "🔍 स्टॉक ऑडिट",
+        "ai": "🤖 AI रीस्टॉक सलाह",
+        "rent": "🏢 किराया ट्रैकर",
+        "rep": "📊 ऑडिट रिपोर्ट",
+        "admin": "⚙️ एडमिन डैशबोर्ड",
+        "menu": "🧭 मेनू",
+        "refresh": "🔄 रिफ्रेश करें",
+        "logout": "🚪 लॉगआउट",
+
+        # --- लॉगिन पेज ---
+        "portal_title": "🏢 मंगलम ट्रेडलिंक पोर्टल",
+        "secure_login": "सुरक्षित लॉगिन",
+        "user_id": "यूज़र आईडी",
+        "password": "पासवर्ड",
+        "login_btn": "लॉगिन",
+        "welcome_back": "फिर से स्वागत है, {name}! लॉगिन सुरक्षित हो रहा है...",
+        "invalid_creds": "❌ गलत यूज़र आईडी या पासवर्ड",
+        "db_error_empty": "डेटाबेस त्रुटि: 'Users' शीट खाली है।",
+        "missing_headers": "User ID या Password हेडर गायब है।",
+        "sheets_error": "Google Sheets से कनेक्ट नहीं हो पाया: {err}",
+
+        # --- इन्वेंटरी डैशबोर्ड ---
+        "search_item": "🔍 आइटम खोजें...",
+        "filter_group": "📂 ग्रुप फ़िल्टर:",
+        "all_groups": "सभी ग्रुप",
+        "volume_filtered": "📦 मात्रा (फ़िल्टर्ड)",
+        "items_found": "📋 आइटम मिले",
+        "bar_chart": "📊 बार चार्ट",
+        "stock_list": "📋 स्टॉक सूची",
+
+        # --- ऑर्डर डेस्क ---
+        "place_order": "➕ नया ऑर्डर दें",
+        "pending_orders": "⏳ पेंडिंग ऑर्डर",
+        "completed_orders": "✅ पूर्ण ऑर्डर",
+        "create_order": "नया ऑर्डर बनाएं",
+        "customer_details": "👤 **ग्राहक विवरण**",
+        "search_customer": "मौजूदा ग्राहक खोजें:",
+        "search_customer_ph": "खोजने के लिए टाइप करें...",
+        "new_customer_name": "या नया ग्राहक नाम टाइप करें:",
+        "new_customer_ph": "जैसे: शर्मा ट्रेडर्स",
+        "order_notes_label": "📝 ऑर्डर नोट्स (वैकल्पिक)",
+        "order_notes_ph": "जैसे: VRL लॉजिस्टिक्स से भेजें, अर्जेंट...",
+        "select_items_cart": "🛒 **कार्ट में आइटम चुनें**",
+        "search_choose_items": "आइटम खोजें और चुनें...",
+        "stock_label": "📦 स्टॉक:",
+        "order_qty": "ऑर्डर मात्रा",
+        "alt_qty": "वैकल्पिक मात्रा",
+        "alt_unit": "वैकल्पिक यूनिट",
+        "submit_order": "🚀 ऑर्डर सबमिट करें",
+        "fill_all_details": "कृपया सभी विवरण भरें।",
+        "order_placed_tg": "✅ ऑर्डर {oid} दर्ज हुआ! वेयरहाउस अलर्ट कतार में 📨",
+        "order_placed_db": "✅ ऑर्डर {oid} सफलतापूर्वक डेटाबेस में दर्ज हुआ!",
+        "tg_failed": "⚠️ टेलीग्राम विफल: {err}",
+        "tg_keys_missing": "⚠️ Streamlit Secrets में टेलीग्राम कुंजियाँ गायब हैं।",
+        "tg_system_error": "⚠️ टेलीग्राम सिस्टम त्रुटि: {err}",
+        "tg_queued": "टेलीग्राम अलर्ट कतार में",
+        "error_saving_order": "ऑर्डर सेव करने में त्रुटि: {err}",
+        "mark_complete": "✅ पूर्ण करें",
+        "share_pdf": "📄 PDF शेयर करें",
+        "modify_delete": "✏️ ऑर्डर संशोधित / हटाएं",
+        "customer_name_label": "ग्राहक का नाम",
+        "modify_items": "🛒 **आइटम और मात्रा बदलें**",
+        "add_remove_items": "आइटम जोड़ें या हटाएं (सही नाम):",
+        "qty_details_for": "[{item}] के लिए मात्रा/विवरण",
+        "notes_label": "नोट्स",
+        "save_changes": "💾 बदलाव सहेजें",
+        "delete_order": "❌ ऑर्डर हटाएं",
+        "order_updated": "ऑर्डर अपडेट हो गया!",
+        "failed_update": "अपडेट विफल: {err}",
+        "order_deleted": "ऑर्डर हटा दिया गया!",
+        "failed_delete": "हटाने में विफल: {err}",
+        "approve_payment": "✅ पेमेंट प्राप्त / डिलीवरी की अनुमति",
+        "approve_success": "ऑर्डर को डिलीवरी के लिए पेंडिंग में डाल दिया गया!",
+        "order_completed": "ऑर्डर पूरा हो गया!",
+        "adv_filters": "🔎 एडवांस फ़िल्टर और खोज",
+        "search_name_id": "खोजें (नाम, आईडी, नोट्स)",
+        "search_eg": "जैसे: शर्मा...",
+        "date_range": "तारीख सीमा",
+        "completed_by": "पूर्ण किया",
+        "all_employees": "सभी कर्मचारी",
+        "contains_fabric": "कपड़ा/आइटम शामिल",
+        "all_items_filter": "सभी आइटम",
+        "showing_completed": "आपकी शर्तों से मेल खाते <b>{count}</b> पूर्ण ऑर्डर दिख रहे हैं।",
+        "per_page": "प्रति पेज ऑर्डर",
+        "page_no": "पेज",
+        "page_range": "{total} में से {start}–{end} · पेज {page} / {pages}",
+        "download_receipt": "📄 रसीद डाउनलोड करें",
+        "delete_record": "🗑️ रिकॉर्ड हटाएं",
+        "record_deleted": "रिकॉर्ड स्थायी रूप से हटा दिया गया!",
+
+        # --- स्टॉक ऑडिट ---
+        "view_system_qty": "👀 वर्तमान सिस्टम मात्रा देखें (लाइव टैली स्टॉक)",
+        "stock_syncing": "⚠️ लाइव स्टॉक डेटा अभी सिंक हो रहा है या गायब है।",
+        "audit_db_missing": "ऑडिट लॉग डेटाबेस नहीं मिला। कृपया एडमिन से 'Audit Logs' शीट बनाने को कहें।",
+        "audit_progress": "📊 ऑडिट प्रगति",
+        "items_audited": "{done} / {total} आइटम गिने गए",
+        "count_batches": "गोदाम में बिखरे बैचों की गिनती करें। आपकी एंट्री स्वचालित रूप से जोड़ी जाएंगी।",
+        "search_select_item": "गिनने के लिए आइटम खोजें और चुनें:",
+        "type_item_name": "आइटम का नाम टाइप करें...",
+        "live_item_progress": "### 📊 लाइव आइटम प्रगति",
+        "system_expected": "सिस्टम अनुमान",
+        "found_so_far": "अब तक मिला",
+        "variance": "अंतर",
+        "found_so_far_yours": "📦 अब तक मिला (आपकी गिनती)",
+        "log_batch": "➕ मिला हुआ बैच दर्ज करें",
+        "location_rack": "स्थान / रैक विवरण (वैकल्पिक)",
+        "location_rack_ph": "जैसे: गलियारा 3, ऊपरी शेल्फ",
+        "qty_found_here": "इस विशिष्ट स्थान पर मिली मात्रा",
+        "save_batch": "💾 बैच सहेजें",
+        "qty_negative": "मात्रा नकारात्मक नहीं हो सकती।",
+        "logged_success": "{item} के लिए {qty} सफलतापूर्वक दर्ज हुआ!",
+        "failed_log_audit": "ऑडिट दर्ज करने में विफल: {err}",
+        "recent_entries": "**इस आइटम की हाल की एंट्री:**",
+        "remaining_items": "📋 गिनने के लिए शेष आइटम",
+        "all_audited": "🎉 शानदार काम! सभी इन्वेंटरी आइटम की भौतिक ऑडिट हो गई।",
+
+        # --- AI रीस्टॉक सलाह (ऑडिट रिपोर्ट पेज) ---
+        "compare_counts": "कर्मचारियों द्वारा सबमिट की गई भौतिक गिनती की लाइव टैली स्टॉक से तुलना करें।",
+        "audit_db_not_found": "ऑडिट लॉग डेटाबेस नहीं मिला।",
+        "no_active_audits": "कोई सक्रिय ऑडिट नहीं चल रहा।",
+        "archive_audit": "वर्तमान ऑडिट संग्रहित करें",
+        "archive_warning": "ऑडिट बोर्ड को संग्रहित करने से सभी आइटम अगली पूर्ण गोदाम गिनती के लिए 'पेंडिंग' पर रीसेट हो जाएंगे।",
+        "archive_btn": "ऑडिट संग्रहित करें और रीसेट करें",
+        "archive_success": "ऑडिट सफलतापूर्वक संग्रहित हो गया! बोर्ड अब साफ है।",
+        "failed_archive": "संग्रहित करने में विफल: {err}",
+        "no_audit_logs": "कोई ऑडिट लॉग नहीं मिला।",
+
+        # --- AI रीस्टॉक सलाह (वास्तविक पेज) ---
+        "supply_chain_title": "🤖 सप्लाई चेन इंटेलिजेंस",
+        "ai_card_title": "🧠 Gemini AI भविष्यवाणी विश्लेषण",
+        "ai_card_desc": "नीचे क्लिक करें ताकि Gemini आपकी लाइव इन्वेंटरी का <b>पिछले 15 दिनों की बिक्री</b> और लीड टाइम के साथ विश्लेषण करे और एक प्राथमिकता वाली री-ऑर्डरिंग रिपोर्ट बनाए।",
+        "ai_key_missing": "Gemini API Key Secrets में गायब या अमान्य है।",
+        "generate_report": "✨ स्मार्ट रीस्टॉक रिपोर्ट बनाएं",
+        "ai_spinner": "Gemini बर्न रेट, लीड टाइम और मौजूदा स्टॉक का विश्लेषण कर रहा है...",
+        "restock_report_title": "### 📊 भविष्यवाणी रीस्टॉक रिपोर्ट",
+        "ai_failed": "AI जनरेशन विफल: {err}",
+
+        # --- एडमिन डैशबोर्ड ---
+        "user_mgmt": "⚙️ उपयोगकर्ता प्रबंधन",
+        "full_name": "पूरा नाम",
+        "create_user_btn": "उपयोगकर्ता बनाएं",
+        "user_created": "उपयोगकर्ता बन गया!",
+        "role_label": "भूमिका",
+
+        # --- किराया ट्रैकर ---
+        "rent_db_error": "⚠️ डेटाबेस त्रुटि: Google Sheets में शीट नहीं मिली।",
+        "tab_balances": "📊 बैलेंस और डैशबोर्ड",
+        "tab_collect": "💸 भुगतान लें",
+        "tab_bills": "⚡ बिल दर्ज करें",
+        "tab_history": "📜 इतिहास",
+        "tab_manage": "⚙️ किरायेदार प्रबंधन",
+        "action_required": "🚨 **आज कार्रवाई आवश्यक:** इनके लिए मासिक बिल बनाएं: **{names}**",
+        "active_tenants": "🟢 सक्रिय किरायेदार",
+        "no_active_tenants": "अभी कोई सक्रिय किरायेदार नहीं।",
+        "due_label": "बकाया: ₹{amt}",
+        "advance_label": "अग्रिम: ₹{amt}",
+        "cleared_label": "चुकता",
+        "pending_dues_label": "बकाया राशि: ₹{amt}",
+        "refund_due_label": "वापसी बकाया: ₹{amt}",
+        "settled_label": "निपटान हो गया",
+        "first_of_month": "महीने की 1 तारीख",
+        "date_of_month": "महीने की {day} तारीख",
+        "view_vacated": "🚪 खाली किए गए किरायेदार देखें",
+        "no_tenants_found": "कोई किरायेदार नहीं मिला। 'किरायेदार प्रबंधन' टैब में जोड़ें।",
+        "record_payment": "प्राप्त भुगतान दर्ज करें",
+        "select_tenant": "किरायेदार चुनें",
+        "payment_amount": "भुगतान राशि प्राप्त (₹)",
+        "payment_notes": "नोट्स (जैसे: नकद, UPI संदर्भ, अंतिम निपटान)",
+        "save_payment": "💾 भुगतान सहेजें",
+        "payment_recorded": "₹{amt} का भुगतान {tenant} के लिए दर्ज हो गया!",
+        "generate_charges": "मासिक शुल्क बनाएं",
+        "select_tenant_bill": "बिल के लिए किरायेदार चुनें",
+        "rent_charge": "##### 🏠 किराया शुल्क",
+        "apply_base_rent": "मूल किराया लगाएं (₹{amt})",
+        "elec_charge": "##### ⚡ बिजली शुल्क",
+        "elec_covered": "बिजली मकान मालिक/कंपनी द्वारा वहन की जाती है।",
+        "enter_meter_bill": "💡 उनके लिए भुगतान की गई सटीक मीटर बिल राशि दर्ज करें।",
+        "lump_sum_elec": "एकमुश्त बिजली बिल (₹)",
+        "passthrough_bill": "किरायेदार खाते में बिल पास करें",
+        "last_meter": "अंतिम दर्ज मीटर: **{val}**",
+        "current_meter": "वर्तमान मीटर रीडिंग दर्ज करें",
+        "calc_usage": "**गणना किया गया उपयोग:** {units} यूनिट (दर: ₹{rate})",
+        "apply_var_elec": "वेरिएबल बिजली लगाएं",
+        "no_elec_tracking": "बिजली ट्रैकिंग कॉन्फ़िगर नहीं है।",
+        "billing_month": "बिलिंग माह / नोट्स (जैसे: 'मार्च 2026 किराया')",
+        "post_charges": "📝 शुल्क खाते में दर्ज करें",
+        "charges_posted": "शुल्क सफलतापूर्वक किरायेदार के खाते में दर्ज हो गए!",
+        "bill_mode_single": "👤 एक किरायेदार",
+        "bill_mode_run": "🗓️ मासिक बिलिंग रन",
+        "bill_run_all": "सभी सक्रिय किरायेदार शामिल करें (सिर्फ़ आज वाले नहीं)",
+        "bill_run_none_due": "आज किसी किरायेदार का बिलिंग दिन नहीं है।",
+        "bill_run_info": "{date} को देय किरायेदार: जिसे छोड़ना हो उसका टिक हटाएं, नई मीटर रीडिंग / एकमुश्त बिल भरें, फिर सब एक साथ दर्ज करें।",
+        "bill_run_already": "⚠️ आज किराया पहले ही दर्ज हो चुका है (टिक हटाया गया): {names}",
+        "col_post": "दर्ज करें",
+        "col_tenant": "किरायेदार",
+        "col_rent": "किराया",
+        "col_elec": "बिजली",
+        "col_prev_meter": "पिछली रीडिंग",
+        "col_cur_meter": "नई रीडिंग",
+        "col_lump": "एकमुश्त बिल",
+        "bill_run_meter_low": "इनकी नई मीटर रीडिंग पिछली से कम है: {names}",
+        "bill_run_tenants": "किरायेदार",
+        "bill_run_rent": "किराया",
+        "bill_run_elec": "बिजली",
+        "bill_run_post": "🚀 {n} शुल्क दर्ज करें",
+        "bill_run_posted": "{tenants} किरायेदारों के {n} शुल्क दर्ज हो गए!",
+        "bill_run_meter_failed": "शुल्क दर्ज हो गए, पर नई मीटर रीडिंग सेव नहीं हो सकी: {err}",
+        "error_posting": "शुल्क दर्ज करने में त्रुटि: {err}",
+        "no_active_to_bill": "बिल के लिए कोई सक्रिय किरायेदार नहीं।",
+        "ledger_history": "खाता इतिहास",
+        "view_history_for": "किसका इतिहास देखें:",
+        "all_tenants_hist": "सभी किरायेदार",
+        "no_tx_history": "अभी तक कोई लेन-देन इतिहास उपलब्ध नहीं।",
+        "add_tenant": "➕ नया किरायेदार जोड़ें",
+        "tenant_name": "किरायेदार/कंपनी का नाम",
+        "location_unit": "स्थान / यूनिट नंबर",
+        "monthly_rent": "मासिक मूल किराया (₹)",
+        "security_deposit": "सुरक्षा जमा प्राप्त (₹)",
+        "elec_config": "⚡ **बिजली कॉन्फ़िगरेशन**",
+        "elec_billing_type": "बिजली बिलिंग प्रकार",
+        "rate_per_unit": "प्रति यूनिट दर (₹) - केवल वेरिएबल के लिए",
+        "elec_paid_by": "बिजली का भुगतान कौन करता है",
+        "initial_meter": "प्रारंभिक मीटर रीडिंग (बेस यूनिट)",
+        "billing_cycle": "📅 **बिलिंग चक्र और प्रवेश**",
+        "date_keys_given": "चाबी देने की तारीख (बिलिंग शुरू)",
+        "billing_logic": "बिलिंग तर्क",
+        "pro_rata_option": "प्रो-राटा (हर महीने की 1 तारीख को बिल)",
+        "fixed_cycle_option": "फिक्स्ड साइकल (वर्षगांठ तारीख पर बिल)",
+        "create_tenant": "किरायेदार प्रोफ़ाइल बनाएं",
+        "name_required": "नाम आवश्यक है।",
+        "tenant_added_prorata": "किरायेदार जोड़ा गया! ₹{amt} का पहला प्रो-राटा किराया स्वचालित रूप से चार्ज हुआ।",
+        "tenant_added_fixed": "किरायेदार जोड़ा गया! बिलिंग हर महीने की {day} तारीख पर सेट है।",
+        "edit_vacate": "### ⚙️ मौजूदा किरायेदार संपादित / खाली करें",
+        "modify_details": "**विवरण बदलें या बाहर जाने की प्रक्रिया करें**",
+        "location_label": "स्थान",
+        "monthly_rent_edit": "मासिक किराया (बढ़ाएं/घटाएं)",
+        "elec_type": "बिजली प्रकार",
+        "per_unit_rate": "प्रति यूनिट दर (वेरिएबल के लिए)",
+        "security_held": "सुरक्षा जमा रखी गई",
+        "pro_rata_q": "प्रो-राटा बिलिंग?",
+        "tenant_status": "किरायेदार स्थिति",
+        "save_all": "💾 सभी बदलाव सहेजें",
+        "tenant_updated": "{name} की किरायेदार प्रोफ़ाइल अपडेट हो गई!",
+        "error_updating": "किरायेदार अपडेट करने में त्रुटि: {err}",
+    }
+}